@@ -0,0 +1,164 @@
+"""ミドルウェアスタックのオーバーヘッド計測スクリプト。
+
+app_factory.pyと同じ順序でカスタムミドルウェアを登録した最小構成のアプリケーションに対して
+プロセス内（httpx.ASGITransport）でリクエストを送信し、レイテンシ（p50/p99）とスループットを計測します。
+ミドルウェアなしの同じアプリケーションも計測し、ミドルウェアスタックによる増分を表示します。
+
+計測対象:
+    - エンドポイント: GET /health（DBアクセスなし、{"status": "ok"}を返すだけ）
+    - /health はメンテナンスモード・操作履歴記録の対象外のため、DB・Redisなしで計測できます
+    - レート制限はRedis未接続時のインメモリ判定で計測します（制限にかからないよう上限を大きく設定）
+
+使用方法:
+    $ cd C:/developments/genai-app-docs
+    $ uv run python scripts/benchmark_middleware.py
+    $ uv run python scripts/benchmark_middleware.py --requests 20000 --concurrency 8
+
+    変更前後の比較は、各リビジョンをチェックアウトして同じコマンドを実行してください
+    （ミドルウェアのクラス名・引数が同じであれば、どのリビジョンでも実行できます）。
+
+Note:
+    - ログ出力のI/Oが計測結果を支配しないよう、ERROR未満のログは破棄します
+    - 計測値はプロセス内のASGI呼び出しの時間であり、ネットワーク・サーバーのオーバーヘッドは含みません
+"""
+
+import argparse
+import asyncio
+import io
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Windows環境でのUnicode出力を有効化
+if sys.platform == "win32":
+    if isinstance(sys.stdout, io.TextIOWrapper):
+        sys.stdout.reconfigure(encoding="utf-8")
+
+# プロジェクトルートをPythonパスに追加
+project_root = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(project_root))
+
+import httpx  # noqa: E402
+import structlog  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+from fastapi.middleware.cors import CORSMiddleware  # noqa: E402
+
+from app.api.middlewares import (  # noqa: E402
+    ActivityTrackingMiddleware,
+    AuditLogMiddleware,
+    CSRFMiddleware,
+    LoggingMiddleware,
+    MaintenanceModeMiddleware,
+    PrometheusMetricsMiddleware,
+    RateLimitMiddleware,
+    SecurityHeadersMiddleware,
+)
+
+
+def create_benchmark_app(with_middlewares: bool) -> FastAPI:
+    """計測用のアプリケーションを作成します。
+
+    Args:
+        with_middlewares: app_factory.pyと同じミドルウェアスタックを登録する場合True
+
+    Returns:
+        FastAPI: 計測用アプリケーション
+    """
+    app = FastAPI()
+
+    @app.get("/health")
+    async def health() -> dict[str, str]:
+        return {"status": "ok"}
+
+    if with_middlewares:
+        # app_factory.pyと同じ登録順（後に追加したものが先に実行される）
+        app.add_middleware(PrometheusMetricsMiddleware)
+        app.add_middleware(ActivityTrackingMiddleware)
+        app.add_middleware(AuditLogMiddleware)
+        app.add_middleware(LoggingMiddleware)
+        app.add_middleware(MaintenanceModeMiddleware)
+        app.add_middleware(RateLimitMiddleware, calls=10**9, period=60)
+        app.add_middleware(
+            CORSMiddleware,
+            allow_origins=["http://localhost:3000"],
+            allow_credentials=True,
+            allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH"],
+            allow_headers=["Accept", "Content-Type", "Authorization", "X-API-Key", "X-CSRF-Token"],
+        )
+        app.add_middleware(CSRFMiddleware, secret_key="benchmark-secret-key", cookie_secure=False)
+        app.add_middleware(SecurityHeadersMiddleware)
+
+    return app
+
+
+async def run_benchmark(app: FastAPI, total_requests: int, concurrency: int) -> dict[str, float]:
+    """アプリケーションにリクエストを送信し、レイテンシとスループットを計測します。
+
+    Args:
+        app: 計測対象のアプリケーション
+        total_requests: 送信するリクエスト数
+        concurrency: 同時に送信するリクエスト数
+
+    Returns:
+        dict[str, float]: p50・p99レイテンシ（ミリ秒）とスループット（リクエスト/秒）
+    """
+    transport = httpx.ASGITransport(app=app)
+    latencies: list[float] = []
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        # ウォームアップ
+        for _ in range(100):
+            await client.get("/health")
+
+        remaining = total_requests
+
+        async def worker() -> None:
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                start = time.perf_counter()
+                response = await client.get("/health")
+                latencies.append(time.perf_counter() - start)
+                if response.status_code != 200:
+                    raise RuntimeError(f"予期しないステータスコード: {response.status_code}")
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "p50_ms": quantiles[49] * 1000,
+        "p99_ms": quantiles[98] * 1000,
+        "rps": len(latencies) / elapsed,
+    }
+
+
+def main() -> None:
+    """ミドルウェアなし・ミドルウェアありの計測結果を表示します。"""
+    parser = argparse.ArgumentParser(description="ミドルウェアスタックのオーバーヘッドを計測します")
+    parser.add_argument("--requests", type=int, default=5000, help="送信するリクエスト数")
+    parser.add_argument("--concurrency", type=int, default=1, help="同時に送信するリクエスト数")
+    args = parser.parse_args()
+
+    # ログ出力のI/Oを計測から除外する
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.ERROR))
+    logging.disable(logging.WARNING)
+
+    print(f"GET /health x {args.requests} (concurrency={args.concurrency})")
+    print(f"{'stack':<12} {'p50 (ms)':>10} {'p99 (ms)':>10} {'req/s':>10}")
+    results = {}
+    for name, with_middlewares in (("none", False), ("middleware", True)):
+        app = create_benchmark_app(with_middlewares)
+        results[name] = asyncio.run(run_benchmark(app, args.requests, args.concurrency))
+        result = results[name]
+        print(f"{name:<12} {result['p50_ms']:>10.3f} {result['p99_ms']:>10.3f} {result['rps']:>10.0f}")
+
+    overhead = results["middleware"]["p50_ms"] - results["none"]["p50_ms"]
+    print(f"ミドルウェアスタックによるp50の増分: {overhead:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
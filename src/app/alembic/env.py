@@ -27,6 +27,7 @@ from app.models.analysis import (  # noqa: F401
     AnalysisSession,
     AnalysisSnapshot,
     AnalysisStep,
+    AnalysisStepConfig,
     AnalysisValidationMaster,
 )
 from app.models.base import Base
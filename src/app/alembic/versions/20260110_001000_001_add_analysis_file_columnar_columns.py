@@ -0,0 +1,42 @@
+"""add_analysis_file_columnar_columns
+
+Revision ID: 20260110_001000_001
+Revises: 20260101_001000_001
+Create Date: 2026-01-10 00:10:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "20260110_001000_001"
+down_revision: str | None = "20260101_001000_001"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """analysis_fileに入力データ（Parquet）の参照カラムを追加。"""
+    op.add_column(
+        "analysis_file",
+        sa.Column("data_path", sa.String(length=512), nullable=True, comment="入力データ（Parquet）のストレージパス"),
+    )
+    op.add_column(
+        "analysis_file",
+        sa.Column("data_schema", postgresql.JSONB(astext_type=sa.Text()), nullable=True, comment="入力データのスキーマ"),
+    )
+    op.add_column(
+        "analysis_file",
+        sa.Column("row_count", sa.Integer(), nullable=True, comment="入力データの行数"),
+    )
+
+
+def downgrade() -> None:
+    """analysis_fileの入力データ参照カラムを削除。"""
+    op.drop_column("analysis_file", "row_count")
+    op.drop_column("analysis_file", "data_schema")
+    op.drop_column("analysis_file", "data_path")
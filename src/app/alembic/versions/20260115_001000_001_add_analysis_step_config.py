@@ -0,0 +1,88 @@
+"""add_analysis_step_config
+
+Revision ID: 20260115_001000_001
+Revises: 20260110_001000_001
+Create Date: 2026-01-15 00:10:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "20260115_001000_001"
+down_revision: str | None = "20260110_001000_001"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """ステップ設定を内容アドレスのanalysis_step_configへ移行。
+
+    既存行のハッシュはPostgreSQL側（jsonbのテキスト表現のSHA-256）で計算します。
+    アプリケーションが計算するハッシュと表現が異なる場合は同じ内容の設定が2行になりますが、
+    ハッシュと内容の対応は常に一意のため参照結果には影響しません。
+    """
+    op.create_table(
+        "analysis_step_config",
+        sa.Column("config_hash", sa.String(length=64), nullable=False, comment="設定の内容ハッシュ（SHA-256）"),
+        sa.Column("config", postgresql.JSONB(astext_type=sa.Text()), nullable=False, comment="ステップ設定"),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("config_hash"),
+    )
+    op.add_column(
+        "analysis_step",
+        sa.Column("config_hash", sa.String(length=64), nullable=True, comment="ステップ設定の内容ハッシュ"),
+    )
+
+    op.execute(
+        """
+        UPDATE analysis_step
+        SET config_hash = encode(sha256(convert_to(config::text, 'UTF8')), 'hex')
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO analysis_step_config (config_hash, config, created_at, updated_at)
+        SELECT DISTINCT ON (config_hash) config_hash, config, now(), now()
+        FROM analysis_step
+        ON CONFLICT (config_hash) DO NOTHING
+        """
+    )
+
+    op.alter_column("analysis_step", "config_hash", nullable=False)
+    op.create_index(op.f("ix_analysis_step_config_hash"), "analysis_step", ["config_hash"], unique=False)
+    op.create_foreign_key(
+        "analysis_step_config_hash_fkey",
+        "analysis_step",
+        "analysis_step_config",
+        ["config_hash"],
+        ["config_hash"],
+    )
+    op.drop_column("analysis_step", "config")
+
+
+def downgrade() -> None:
+    """ステップ設定をanalysis_stepのconfigカラムへ戻す。"""
+    op.add_column(
+        "analysis_step",
+        sa.Column("config", postgresql.JSONB(astext_type=sa.Text()), nullable=True, comment="ステップ設定"),
+    )
+    op.execute(
+        """
+        UPDATE analysis_step AS s
+        SET config = c.config
+        FROM analysis_step_config AS c
+        WHERE s.config_hash = c.config_hash
+        """
+    )
+    op.alter_column("analysis_step", "config", nullable=False)
+
+    op.drop_constraint("analysis_step_config_hash_fkey", "analysis_step", type_="foreignkey")
+    op.drop_index(op.f("ix_analysis_step_config_hash"), table_name="analysis_step")
+    op.drop_column("analysis_step", "config_hash")
+    op.drop_table("analysis_step_config")
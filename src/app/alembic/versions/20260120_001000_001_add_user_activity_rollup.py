@@ -0,0 +1,55 @@
+"""add_user_activity_rollup
+
+Revision ID: 20260120_001000_001
+Revises: 20260115_001000_001
+Create Date: 2026-01-20 00:10:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "20260120_001000_001"
+down_revision: str | None = "20260115_001000_001"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """操作履歴の集計テーブルを追加。
+
+    既存の操作履歴は、起動後にActivityRollupServiceが古い時間帯から順に集計します。
+    """
+    op.create_table(
+        "user_activity_hourly_stat",
+        sa.Column("bucket_start", sa.DateTime(timezone=True), nullable=False, comment="集計時間帯の開始日時（1時間単位）"),
+        sa.Column("response_status", sa.Integer(), nullable=False, comment="HTTPレスポンスステータス"),
+        sa.Column("request_count", sa.BigInteger(), nullable=False, comment="リクエスト数"),
+        sa.Column("duration_ms_sum", sa.BigInteger(), nullable=False, comment="処理時間の合計（ミリ秒）"),
+        sa.PrimaryKeyConstraint("bucket_start", "response_status"),
+    )
+    op.create_table(
+        "user_activity_daily_user",
+        sa.Column("activity_date", sa.Date(), nullable=False, comment="操作日"),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=False, comment="操作ユーザーID"),
+        sa.PrimaryKeyConstraint("activity_date", "user_id"),
+    )
+    op.create_table(
+        "user_activity_rollup_state",
+        sa.Column("name", sa.String(length=50), nullable=False, comment="集計の名前"),
+        sa.Column("rolled_until", sa.DateTime(timezone=True), nullable=False, comment="集計済みの終了日時"),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+
+
+def downgrade() -> None:
+    """操作履歴の集計テーブルを削除。"""
+    op.drop_table("user_activity_rollup_state")
+    op.drop_table("user_activity_daily_user")
+    op.drop_table("user_activity_hourly_stat")
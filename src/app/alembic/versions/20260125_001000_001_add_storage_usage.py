@@ -0,0 +1,73 @@
+"""add_storage_usage
+
+Revision ID: 20260125_001000_001
+Revises: 20260120_001000_001
+Create Date: 2026-01-25 00:10:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "20260125_001000_001"
+down_revision: str | None = "20260120_001000_001"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """ストレージ使用量の集計テーブルと日次スナップショットを追加。
+
+    既存ファイルの使用量はproject_fileから集計して投入します。
+    """
+    op.create_table(
+        "project_storage_usage",
+        sa.Column("project_id", postgresql.UUID(as_uuid=True), nullable=False, comment="プロジェクトID"),
+        sa.Column("file_count", sa.BigInteger(), nullable=False, comment="ファイル数（全バージョン）"),
+        sa.Column("total_bytes", sa.BigInteger(), nullable=False, comment="ファイルサイズの合計（バイト）"),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["project_id"], ["project.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("project_id"),
+    )
+    op.create_table(
+        "storage_usage_snapshot",
+        sa.Column("snapshot_date", sa.Date(), nullable=False, comment="日付"),
+        sa.Column("file_count", sa.BigInteger(), nullable=False, comment="ファイル数"),
+        sa.Column("total_bytes", sa.BigInteger(), nullable=False, comment="ファイルサイズの合計（バイト）"),
+        sa.Column("blob_count", sa.BigInteger(), nullable=True, comment="ストレージ上のファイル数（整合処理の結果）"),
+        sa.Column(
+            "orphan_blob_count",
+            sa.BigInteger(),
+            nullable=True,
+            comment="ProjectFileに存在しないストレージ上のファイル数（整合処理の結果）",
+        ),
+        sa.Column(
+            "missing_blob_count",
+            sa.BigInteger(),
+            nullable=True,
+            comment="ストレージに存在しないProjectFileの数（整合処理の結果）",
+        ),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("snapshot_date"),
+    )
+
+    op.execute(
+        """
+        INSERT INTO project_storage_usage (project_id, file_count, total_bytes, created_at, updated_at)
+        SELECT project_id, count(*), coalesce(sum(file_size), 0), now(), now()
+        FROM project_file
+        GROUP BY project_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """ストレージ使用量の集計テーブルと日次スナップショットを削除。"""
+    op.drop_table("storage_usage_snapshot")
+    op.drop_table("project_storage_usage")
@@ -0,0 +1,48 @@
+"""add_driver_tree_versions
+
+Revision ID: 20260201_001000_001
+Revises: 20260125_001000_001
+Create Date: 2026-02-01 00:10:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20260201_001000_001"
+down_revision: str | None = "20260125_001000_001"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """ドライバーツリーに計算結果キャッシュ検証用のバージョン列を追加。"""
+    op.add_column(
+        "driver_tree",
+        sa.Column(
+            "structure_version",
+            sa.Integer(),
+            nullable=False,
+            server_default="0",
+            comment="構造バージョン（計算プランのキャッシュ検証用）",
+        ),
+    )
+    op.add_column(
+        "driver_tree",
+        sa.Column(
+            "data_version",
+            sa.Integer(),
+            nullable=False,
+            server_default="0",
+            comment="データバージョン（計算結果のキャッシュ検証用）",
+        ),
+    )
+
+
+def downgrade() -> None:
+    """ドライバーツリーのバージョン列を削除。"""
+    op.drop_column("driver_tree", "data_version")
+    op.drop_column("driver_tree", "structure_version")
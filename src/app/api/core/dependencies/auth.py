@@ -11,7 +11,7 @@
 from collections.abc import Callable
 from typing import TYPE_CHECKING, Annotated, Any, NoReturn
 
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Request
 
 from app.api.core.dependencies.user_account import UserServiceDep
 from app.core.config import settings
@@ -102,6 +102,7 @@ def get_auth_user_dependency() -> Callable[..., Any]:
 
 
 async def get_current_user_account(
+    request: Request,
     user_service: UserServiceDep,
     auth_user: AuthUserType = Depends(get_auth_user_dependency()),
 ) -> UserAccount:
@@ -112,6 +113,7 @@ async def get_current_user_account(
     - development: モックトークン検証
 
     Args:
+        request: リクエスト（自動注入）
         user_service: ユーザーサービス（自動注入）
         auth_user: Azure ADまたはDevユーザー（自動注入）
 
@@ -124,6 +126,9 @@ async def get_current_user_account(
     Note:
         - Azure OIDでユーザーを検索、存在しない場合は自動作成します
         - 既存ユーザーの場合、メール/表示名が変わっていれば更新します
+        - 取得したユーザーは request.state.user に保持し、同一リクエスト内
+          （操作履歴の記録など）で再利用します。リクエストをまたいだキャッシュは
+          principal_cache（プロセス内 + Redis）で行います
         - ユーザーの is_active フィールドは検証されません
         - アクティブユーザーのみを許可する場合は get_current_active_user を使用してください
     """
@@ -132,6 +137,10 @@ async def get_current_user_account(
     if not azure_oid or not email:
         raise HTTPException(status_code=400, detail="認証情報が不足しています")
 
+    cached_user: UserAccount | None = getattr(request.state, "user", None)
+    if cached_user is not None and cached_user.azure_oid == azure_oid:
+        return cached_user
+
     user = await user_service.get_or_create_by_azure_oid(
         azure_oid=azure_oid,
         email=email,
@@ -142,6 +151,7 @@ async def get_current_user_account(
     if not user:
         raise HTTPException(status_code=404, detail="ユーザーが見つからない、または作成できませんでした")
 
+    request.state.user = user
     return user
 
 
@@ -26,6 +26,7 @@ from app.api.core.dependencies.auth import CurrentUserAccountDep
 from app.api.core.dependencies.database import DatabaseDep
 from app.core.exceptions import AuthorizationError
 from app.core.logging import get_logger
+from app.core.principal_cache import principal_cache
 from app.models import ProjectMember
 from app.models.enums import ProjectRole
 from app.repositories import ProjectMemberRepository
@@ -64,9 +65,18 @@ async def get_project_member(
 
     Raises:
         AuthorizationError: ユーザーがプロジェクトメンバーでない場合
+
+    Note:
+        - メンバーシップは principal_cache（プロセス内 + Redis）にキャッシュされ、
+          ロール変更・メンバー削除・退出時に破棄されます
+        - メンバーでない場合の結果はキャッシュしません（メンバー追加を即時に反映するため）
     """
-    repository = ProjectMemberRepository(db)
-    member = await repository.get_by_project_and_user(project_id, current_user.id)
+    member = await principal_cache.get_member(db, project_id, current_user.id)
+    if member is None:
+        repository = ProjectMemberRepository(db)
+        member = await repository.get_by_project_and_user(project_id, current_user.id)
+        if member:
+            await principal_cache.set_member(member)
 
     if not member:
         logger.warning(
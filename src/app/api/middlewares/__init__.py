@@ -15,7 +15,8 @@
        - Grafanaダッシュボードと連携
 
     3. **RateLimitMiddleware**: レート制限
-       - Redisベーススライディングウィンドウアルゴリズム
+       - RedisのLuaスクリプトによるGCRA（Redis障害時はインメモリのトークンバケット）
+       - ルート別・クライアント別の制限を設定可能
        - デフォルト: 100リクエスト/60秒
        - クライアント識別: ユーザーID、APIキー、IPアドレス
 
@@ -30,6 +31,9 @@
        - 重要なデータ変更操作を監査ログに記録
        - セキュリティイベントの記録
 
+    操作履歴・監査ログはAuditRecordWriter（audit_writer.py）のキューに追加し、
+    バックグラウンドで複数行INSERTにまとめて書き込みます
+
     7. **MaintenanceModeMiddleware**: メンテナンスモード時のアクセス制御
        - メンテナンス中は管理者以外のアクセスを制限
 
@@ -66,12 +70,16 @@
 
 Note:
     - ミドルウェアは後に追加したものが先に実行されます
-    - すべてのミドルウェアは非同期（async/await）対応
-    - Starlette BaseHTTPMiddlewareを継承
+    - すべてのミドルウェアは純粋なASGIミドルウェア（__call__(scope, receive, send)）として実装
+      （BaseHTTPMiddlewareのようにレスポンスをラップ・バッファリングしない）
+    - 処理開始時刻・クライアントIP・リクエストボディ等はRequestContext（context.py）で
+      1リクエストにつき1回だけ計算し、ミドルウェア間で共有します
 """
 
 from app.api.middlewares.activity_tracking import ActivityTrackingMiddleware
 from app.api.middlewares.audit_log import AuditLogMiddleware
+from app.api.middlewares.audit_writer import AuditRecordWriter, audit_record_writer
+from app.api.middlewares.context import RequestContext
 from app.api.middlewares.csrf import CSRFMiddleware
 from app.api.middlewares.logging import LoggingMiddleware
 from app.api.middlewares.maintenance_mode import MaintenanceModeMiddleware
@@ -82,10 +90,13 @@ from app.api.middlewares.security_headers import SecurityHeadersMiddleware
 __all__ = [
     "ActivityTrackingMiddleware",
     "AuditLogMiddleware",
+    "AuditRecordWriter",
     "CSRFMiddleware",
     "LoggingMiddleware",
     "MaintenanceModeMiddleware",
     "PrometheusMetricsMiddleware",
     "RateLimitMiddleware",
+    "RequestContext",
     "SecurityHeadersMiddleware",
+    "audit_record_writer",
 ]
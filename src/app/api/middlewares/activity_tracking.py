@@ -3,28 +3,22 @@
 全APIリクエストを自動的に記録し、操作履歴として保存します。
 """
 
-import asyncio
 import json
 import re
-import time
 import uuid
-from collections.abc import Awaitable, Callable
 from typing import Any
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from app.core.database import get_async_session_context
+from app.api.middlewares.audit_writer import audit_record_writer
+from app.api.middlewares.context import RequestContext
 from app.core.logging import get_logger
 from app.models import ActionType, UserActivity
-from app.utils import RequestHelper
-from app.utils.sensitive_data import mask_sensitive_data
 
 logger = get_logger(__name__)
 
 
-class ActivityTrackingMiddleware(BaseHTTPMiddleware):
+class ActivityTrackingMiddleware:
     """ユーザー操作履歴を自動記録するミドルウェア。
 
     全リクエストの基本情報を記録し、エラー発生時もエラー情報を含めて記録します。
@@ -35,6 +29,7 @@ class ActivityTrackingMiddleware(BaseHTTPMiddleware):
         EXCLUDE_PATTERNS: 除外するパスパターン（正規表現）
         SENSITIVE_KEYS: マスク対象の機密情報キー
         RESOURCE_PATTERNS: リソース情報抽出用パターン
+        MAX_ERROR_BODY_BYTES: エラー情報抽出のために保持するエラーレスポンスボディの最大サイズ
     """
 
     # 除外する固定パス
@@ -68,52 +63,61 @@ class ActivityTrackingMiddleware(BaseHTTPMiddleware):
         (re.compile(r"/api/v1/admin/alerts?/([0-9a-f-]{36})"), "ALERT"),
     ]
 
+    # エラー情報抽出のために保持するエラーレスポンスボディの最大サイズ
+    MAX_ERROR_BODY_BYTES: int = 64 * 1024
+
     def __init__(self, app: ASGIApp) -> None:
         """ミドルウェアを初期化します。
 
         Args:
             app: ASGIアプリケーション
         """
-        super().__init__(app)
+        self.app = app
 
-    async def dispatch(
-        self,
-        request: Request,
-        call_next: Callable[[Request], Awaitable[Response]],
-    ) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """リクエストを処理し、操作履歴を記録します。
 
-        Args:
-            request: HTTPリクエスト
-            call_next: 次のミドルウェア/エンドポイント
+        リクエストボディはミドルウェア共有のRequestContextで1回だけ読み込み、
+        エラーレスポンス（ステータス400以上）の場合のみレスポンスボディを保持してエラー情報を抽出します。
 
-        Returns:
-            Response: HTTPレスポンス
+        Args:
+            scope: ASGIスコープ
+            receive: ASGIのreceive
+            send: ASGIのsend
         """
         # 除外パスチェック
-        if self._should_skip(request.url.path):
-            return await call_next(request)
+        if scope["type"] != "http" or self._should_skip(scope["path"]):
+            await self.app(scope, receive, send)
+            return
 
-        start_time = time.perf_counter()
+        context = RequestContext.from_scope(scope)
         response_status = 500
         error_message: str | None = None
         error_code: str | None = None
-        request_body: dict[str, Any] | None = None
+        error_body: list[bytes] = []
+        error_body_size = 0
+
+        async def send_with_capture(message: Message) -> None:
+            nonlocal response_status, error_body_size
+            if message["type"] == "http.response.start":
+                response_status = message["status"]
+            elif message["type"] == "http.response.body" and response_status >= 400:
+                chunk = message.get("body", b"")
+                if error_body_size + len(chunk) <= self.MAX_ERROR_BODY_BYTES:
+                    error_body.append(chunk)
+                error_body_size += len(chunk)
+            await send(message)
 
         try:
-            # リクエストボディの取得（POSTなどのみ）
-            if request.method in {"POST", "PUT", "PATCH"}:
-                request_body = await self._get_masked_request_body(request)
+            # リクエストボディの取得（JSONのPOSTなどのみ）
+            receive = await context.buffer_body(receive)
 
             # リクエスト処理
-            response = await call_next(request)
-            response_status = response.status_code
+            await self.app(scope, receive, send_with_capture)
 
             # エラーレスポンスの場合、エラー情報を抽出
-            if response_status >= 400:
-                error_message, error_code = await self._extract_error_info(response)
-
-            return response
+            if response_status >= 400 and error_body_size <= self.MAX_ERROR_BODY_BYTES:
+                error_message, error_code = self._extract_error_info(b"".join(error_body))
 
         except Exception as e:
             response_status = 500
@@ -121,25 +125,23 @@ class ActivityTrackingMiddleware(BaseHTTPMiddleware):
             error_code = type(e).__name__
             logger.exception(
                 "リクエスト処理中にエラーが発生しました",
-                path=request.url.path,
-                method=request.method,
+                path=context.path,
+                method=context.method,
             )
             raise
 
         finally:
             # 処理時間計算
-            duration_ms = int((time.perf_counter() - start_time) * 1000)
-
-            # 操作履歴をバックグラウンドタスクで記録（レスポンスをブロックしない）
-            asyncio.create_task(
-                self._record_activity(
-                    request=request,
-                    request_body=request_body,
-                    response_status=response_status,
-                    error_message=error_message,
-                    error_code=error_code,
-                    duration_ms=duration_ms,
-                )
+            duration_ms = int(context.elapsed * 1000)
+
+            # 操作履歴を一括書き込みのキューに追加（DBへの書き込みはバックグラウンドで行う）
+            self._record_activity(
+                context=context,
+                request_body=context.masked_json_body,
+                response_status=response_status,
+                error_message=error_message,
+                error_code=error_code,
+                duration_ms=duration_ms,
             )
 
     def _should_skip(self, path: str) -> bool:
@@ -162,57 +164,23 @@ class ActivityTrackingMiddleware(BaseHTTPMiddleware):
 
         return False
 
-    async def _get_masked_request_body(self, request: Request) -> dict[str, Any] | None:
-        """リクエストボディを取得し、機密情報をマスクします。
-
-        注意: リクエストボディは一度しか読めないため、読み取り後はキャッシュします。
-        これにより、エンドポイントでもボディを再度読み取ることが可能になります。
+    def _extract_error_info(self, body: bytes) -> tuple[str | None, str | None]:
+        """エラーレスポンスのボディからエラー情報を抽出します。
 
         Args:
-            request: HTTPリクエスト
-
-        Returns:
-            dict | None: マスク済みリクエストボディ
-        """
-        try:
-            # ボディをバイト列として取得
-            body_bytes = await request.body()
-
-            # リクエストにキャッシュして再利用可能にする
-            # FastAPIは内部で_bodyをチェックするため、これで再読み取りが可能
-            request._body = body_bytes  # type: ignore[attr-defined]
-
-            # JSONとしてパース
-            body = json.loads(body_bytes)
-            return mask_sensitive_data(body)
-        except Exception:
-            return None
-
-    async def _extract_error_info(
-        self,
-        response: Response,
-    ) -> tuple[str | None, str | None]:
-        """レスポンスからエラー情報を抽出します。
-
-        Args:
-            response: HTTPレスポンス
+            body: レスポンスボディ
 
         Returns:
             tuple[str | None, str | None]: (エラーメッセージ, エラーコード)
         """
         try:
-            # StreamingResponseの場合はボディを読めないのでスキップ
-            if hasattr(response, "body"):
-                body_data = response.body
-                # memoryviewの場合はbytesに変換
-                if isinstance(body_data, memoryview):
-                    body_data = bytes(body_data)
-                body = json.loads(body_data)
+            data = json.loads(body)
+            if isinstance(data, dict):
                 return (
-                    body.get("message") or body.get("detail"),
-                    body.get("code") or body.get("error_code"),
+                    data.get("message") or data.get("detail"),
+                    data.get("code") or data.get("error_code"),
                 )
-        except Exception:
+        except ValueError:
             pass
 
         return None, None
@@ -260,19 +228,21 @@ class ActivityTrackingMiddleware(BaseHTTPMiddleware):
 
         return mapping.get(method, ActionType.READ.value)
 
-    async def _record_activity(
+    def _record_activity(
         self,
-        request: Request,
+        context: RequestContext,
         request_body: dict[str, Any] | None,
         response_status: int,
         error_message: str | None,
         error_code: str | None,
         duration_ms: int,
     ) -> None:
-        """操作履歴をデータベースに記録します。
+        """操作履歴を一括書き込みのキューに追加します。
+
+        キューが満杯の場合、操作履歴は破棄されます（audit_records_totalのdroppedで計測）。
 
         Args:
-            request: HTTPリクエスト
+            context: リクエストコンテキスト
             request_body: リクエストボディ
             response_status: レスポンスステータス
             error_message: エラーメッセージ
@@ -281,43 +251,39 @@ class ActivityTrackingMiddleware(BaseHTTPMiddleware):
         """
         try:
             # リソース情報を抽出
-            resource_type, resource_id = self._extract_resource_info(request.url.path)
+            resource_type, resource_id = self._extract_resource_info(context.path)
 
             # アクション種別を推定
-            action_type = self._infer_action_type(request.method, response_status)
+            action_type = self._infer_action_type(context.method, response_status)
 
             # ユーザーIDを取得（認証済みの場合）
-            user_id = None
-            if hasattr(request.state, "user") and request.state.user:
-                user_id = request.state.user.id
-
-            # 操作履歴オブジェクトを作成
-            activity = UserActivity(
-                user_id=user_id,
-                action_type=action_type,
-                resource_type=resource_type,
-                resource_id=resource_id,
-                endpoint=request.url.path,
-                method=request.method,
-                request_body=request_body,
-                response_status=response_status,
-                error_message=error_message,
-                error_code=error_code,
-                ip_address=RequestHelper.get_client_ip(request),
-                user_agent=request.headers.get("user-agent", "")[:500],
-                duration_ms=duration_ms,
+            user = context.user
+            user_id = user.id if user else None
+
+            audit_record_writer.submit(
+                UserActivity,
+                {
+                    "user_id": user_id,
+                    "action_type": action_type,
+                    "resource_type": resource_type,
+                    "resource_id": resource_id,
+                    "endpoint": context.path,
+                    "method": context.method,
+                    "request_body": request_body,
+                    "response_status": response_status,
+                    "error_message": error_message,
+                    "error_code": error_code,
+                    "ip_address": context.client_ip,
+                    "user_agent": context.request.headers.get("user-agent", "")[:500],
+                    "duration_ms": duration_ms,
+                },
             )
 
-            # 非同期でDB保存
-            async with get_async_session_context() as session:
-                session.add(activity)
-                await session.commit()
-
         except Exception as e:
             # 記録失敗はログのみ（リクエスト処理には影響させない）
             logger.error(
                 "操作履歴の記録に失敗しました",
                 error=str(e),
-                path=request.url.path,
-                method=request.method,
+                path=context.path,
+                method=context.method,
             )
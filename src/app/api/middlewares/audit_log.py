@@ -3,26 +3,22 @@
 重要なデータ変更操作を監査ログに記録します。
 """
 
-import asyncio
-import json
 import re
 import uuid
-from collections.abc import Awaitable, Callable
 from datetime import date, datetime
 from enum import Enum
 from typing import Any
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from app.api.middlewares.audit_writer import audit_record_writer
+from app.api.middlewares.context import RequestContext
 from app.core.database import get_async_session_context
 from app.core.logging import get_logger
 from app.models import AuditEventType, AuditLog, AuditSeverity
 from app.models.project import Project
 from app.models.system import SystemSetting
 from app.models.user_account import UserAccount
-from app.utils import RequestHelper
 from app.utils.sensitive_data import mask_sensitive_data
 
 logger = get_logger(__name__)
@@ -37,7 +33,7 @@ RESOURCE_MODEL_MAPPING: dict[str, type] = {
 }
 
 
-class AuditLogMiddleware(BaseHTTPMiddleware):
+class AuditLogMiddleware:
     """監査ログミドルウェア。
 
     データ変更・セキュリティイベントを監査ログに記録します。
@@ -112,29 +108,28 @@ class AuditLogMiddleware(BaseHTTPMiddleware):
         Args:
             app: ASGIアプリケーション
         """
-        super().__init__(app)
+        self.app = app
 
-    async def dispatch(
-        self,
-        request: Request,
-        call_next: Callable[[Request], Awaitable[Response]],
-    ) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """リクエストを処理し、必要に応じて監査ログを記録します。
 
         Args:
-            request: HTTPリクエスト
-            call_next: 次のミドルウェア/エンドポイント
-
-        Returns:
-            Response: HTTPレスポンス
+            scope: ASGIスコープ
+            receive: ASGIのreceive
+            send: ASGIのsend
         """
-        path = request.url.path
-        method = request.method
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        method = scope["method"]
 
         # 監査対象かチェック
         audit_config = self._get_audit_config(path, method)
         if not audit_config:
-            return await call_next(request)
+            await self.app(scope, receive, send)
+            return
 
         # 変更前の値を取得（リクエスト処理の前に実行）
         old_value: dict[str, Any] | None = None
@@ -150,32 +145,30 @@ class AuditLogMiddleware(BaseHTTPMiddleware):
                 except Exception as e:
                     logger.warning("old_value取得エラー", error=str(e))
 
-        # リクエストボディを取得
-        request_body: dict[str, Any] | None = None
-        if method in {"POST", "PUT", "PATCH"}:
-            try:
-                body_bytes = await request.body()
-                request._body = body_bytes  # キャッシュして後続処理で再利用可能に
-                request_body = json.loads(body_bytes)
-            except Exception:
-                pass
+        # リクエストボディを取得（ミドルウェア間で共有し、後続処理でも再利用）
+        context = RequestContext.from_scope(scope)
+        receive = await context.buffer_body(receive)
+
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
 
         # リクエスト処理
-        response = await call_next(request)
-
-        # 成功時のみ監査ログを記録（2xxのみ）- バックグラウンドタスクで実行
-        if 200 <= response.status_code < 300:
-            asyncio.create_task(
-                self._record_audit_log(
-                    request=request,
-                    request_body=request_body,
-                    old_value=old_value,
-                    response=response,
-                    audit_config=audit_config,
-                )
-            )
+        await self.app(scope, receive, send_with_status)
 
-        return response
+        # 成功時のみ監査ログを記録（2xxのみ）- 一括書き込みのキューに追加
+        # レスポンスの送信は完了しているため、キューの空き待ちはクライアントを待たせない
+        if 200 <= status_code < 300:
+            await self._record_audit_log(
+                context=context,
+                old_value=old_value,
+                status_code=status_code,
+                audit_config=audit_config,
+            )
 
     def _get_audit_config(self, path: str, method: str) -> dict[str, Any] | None:
         """パスとメソッドから監査設定を取得します。
@@ -252,23 +245,6 @@ class AuditLogMiddleware(BaseHTTPMiddleware):
 
         return changed
 
-    def _mask_request_body(self, body: dict[str, Any] | None) -> dict[str, Any] | None:
-        """リクエストボディから機密情報をマスクします。
-
-        共通モジュールのmask_sensitive_dataを使用して、
-        ネストされた辞書やリストも再帰的に処理します。
-
-        Args:
-            body: リクエストボディ
-
-        Returns:
-            dict | None: マスク処理済みのリクエストボディ
-        """
-        if not body:
-            return None
-
-        return mask_sensitive_data(body)
-
     def _serialize_value(self, value: Any) -> Any:
         """値をシリアライズ可能な形式に変換します。
 
@@ -330,75 +306,73 @@ class AuditLogMiddleware(BaseHTTPMiddleware):
 
     async def _record_audit_log(
         self,
-        request: Request,
-        request_body: dict[str, Any] | None,
+        context: RequestContext,
         old_value: dict[str, Any] | None,
-        response: Response,
+        status_code: int,
         audit_config: dict[str, Any],
     ) -> None:
-        """監査ログを記録します。
+        """監査ログを一括書き込みのキューに追加します。
+
+        キューが満杯の場合はAUDIT_WRITER_PUT_TIMEOUT_SECONDSまで空きを待機し、
+        超過した場合は破棄します（audit_records_totalのdroppedで計測）。
 
         Args:
-            request: HTTPリクエスト
-            request_body: リクエストボディ
+            context: リクエストコンテキスト（パース済みのリクエストボディを含む）
             old_value: 変更前の値（リクエスト処理前に取得済み）
-            response: HTTPレスポンス
+            status_code: レスポンスのステータスコード
             audit_config: 監査設定
         """
         try:
             # リソースIDを抽出
             resource_id_str = self._extract_resource_id(
-                request.url.path,
+                context.path,
                 audit_config["pattern"],
             )
 
             # ユーザーIDを取得
-            user_id = None
-            if hasattr(request.state, "user") and request.state.user:
-                user_id = request.state.user.id
+            user = context.user
+            user_id = user.id if user else None
 
-            # リクエストボディから機密情報をマスク
-            masked_request_body = self._mask_request_body(request_body)
+            # リクエストボディ（JSONオブジェクトのみ）と機密情報をマスクしたボディ
+            request_body = context.json_body if isinstance(context.json_body, dict) else None
+            masked_request_body = context.masked_json_body if request_body else None
 
             # 変更されたフィールドを特定
             changed_fields = self._get_changed_fields(old_value, request_body)
             if not changed_fields and request_body:
                 changed_fields = list(request_body.keys())
 
-            # 監査ログを作成
-            audit_log = AuditLog(
-                user_id=user_id,
-                event_type=audit_config["event_type"].value,
-                action=self._infer_action(request.method),
-                resource_type=audit_config["resource_type"],
-                resource_id=uuid.UUID(resource_id_str) if resource_id_str else None,
-                old_value=old_value,
-                new_value=masked_request_body,  # マスク処理済みのデータを使用
-                changed_fields=changed_fields,
-                ip_address=RequestHelper.get_client_ip(request),
-                user_agent=request.headers.get("user-agent", "")[:500],
-                severity=audit_config["severity"].value,
-                metadata={
-                    "endpoint": request.url.path,
-                    "method": request.method,
-                    "status_code": response.status_code,
+            await audit_record_writer.put(
+                AuditLog,
+                {
+                    "user_id": user_id,
+                    "event_type": audit_config["event_type"].value,
+                    "action": self._infer_action(context.method),
+                    "resource_type": audit_config["resource_type"],
+                    "resource_id": uuid.UUID(resource_id_str) if resource_id_str else None,
+                    "old_value": old_value,
+                    "new_value": masked_request_body,  # マスク処理済みのデータを使用
+                    "changed_fields": changed_fields,
+                    "ip_address": context.client_ip,
+                    "user_agent": context.request.headers.get("user-agent", "")[:500],
+                    "severity": audit_config["severity"].value,
+                    "extra_metadata": {
+                        "endpoint": context.path,
+                        "method": context.method,
+                        "status_code": status_code,
+                    },
                 },
             )
 
-            # DB保存
-            async with get_async_session_context() as session:
-                session.add(audit_log)
-                await session.commit()
-
         except Exception as e:
-            # NOTE: バックグラウンドタスクでは例外は親に伝播しないため、
-            # 失敗時はエラーログを記録して監視システムでアラート検知する
+            # NOTE: 監査ログの記録失敗でリクエスト処理を失敗させないため、
+            # エラーログを記録して監視システムでアラート検知する
             logger.error(
                 "監査ログの記録に失敗しました（要調査）",
                 error=str(e),
                 error_type=type(e).__name__,
-                path=request.url.path,
-                method=request.method,
+                path=context.path,
+                method=context.method,
                 resource_type=audit_config.get("resource_type"),
                 severity="CRITICAL",  # 監視システムでアラート対象とする
             )
@@ -0,0 +1,236 @@
+"""操作履歴・監査ログの一括書き込み。
+
+ミドルウェアが記録する操作履歴（UserActivity）と監査ログ（AuditLog）を
+プロセス内の上限付きキューに貯め、バックグラウンドのタスクで複数行INSERTにまとめて書き込みます。
+リクエスト毎のセッション生成・接続取得・コミットを、一括書き込み1回あたりに集約します。
+
+書き込み仕様:
+    - 一括書き込み: 最初のレコードを受け付けてからAUDIT_WRITER_FLUSH_INTERVAL_MS経過するか、
+      AUDIT_WRITER_BATCH_SIZE件に達した時点でテーブル毎に1回のINSERTで書き込む
+    - 上限: キューにはAUDIT_WRITER_QUEUE_SIZE件まで保持する
+        - 操作履歴（submit）: キューが満杯の場合は即座に破棄する
+        - 監査ログ（put）: AUDIT_WRITER_PUT_TIMEOUT_SECONDSまで空きを待ち、超過時は破棄する
+    - 停止: shutdown()でキューに残ったレコードを書き込んでから停止する（lifespanの終了時）
+    - 失敗: テーブル毎に別トランザクションで書き込み、失敗したテーブルのレコードのみ破棄する
+
+Note:
+    - キューはワーカープロセス毎に独立しています。プロセスが強制終了した場合、
+      書き込み前のレコード（最大でフラッシュ間隔分）は失われます。
+    - 作成日時（created_at）はキューに追加した時刻を設定するため、書き込みの遅延は記録内容に影響しません。
+"""
+
+import asyncio
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy import insert
+
+from app.api.middlewares.metrics import audit_record_flush_seconds, audit_record_queue_depth, audit_records_total
+from app.core.config import settings
+from app.core.database import get_async_session_context
+from app.core.logging import get_logger
+from app.models.base import Base
+
+logger = get_logger(__name__)
+
+AuditRecord = tuple[type[Base], dict[str, Any]]
+
+
+class AuditRecordWriter:
+    """操作履歴・監査ログを一括で書き込むクラス。"""
+
+    def __init__(self, max_queue_size: int, batch_size: int, flush_interval_ms: int, put_timeout_seconds: float):
+        """一括書き込みを初期化します。
+
+        Args:
+            max_queue_size: 書き込み待ちにできるレコード数の上限
+            batch_size: 1回の一括書き込みのレコード数の上限
+            flush_interval_ms: 最初のレコードを受け付けてから書き込むまでの最大待機時間（ミリ秒）
+            put_timeout_seconds: put()でキューの空きを待機する最大時間（秒）
+        """
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.put_timeout_seconds = put_timeout_seconds
+        self.session_factory: Callable[[], Any] = get_async_session_context
+        self._queue: asyncio.Queue[AuditRecord] | None = None
+        self._task: asyncio.Task | None = None
+        self._writing: asyncio.Task | None = None
+        self._batch: list[AuditRecord] = []
+        self._closed = False
+        self._last_drop_logged: dict[str, float] = {}
+
+    @property
+    def queue_depth(self) -> int:
+        """書き込み待ちのレコード数（収集中のバッチを含む）。"""
+        return (self._queue.qsize() if self._queue is not None else 0) + len(self._batch)
+
+    def start(self) -> None:
+        """バックグラウンドの書き込みタスクを開始します（起動済みの場合は何もしません）。"""
+        if self._task is not None and not self._task.done():
+            return
+        self._closed = False
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._batch = []
+        self._task = asyncio.create_task(self._run(), name="audit-record-writer")
+
+    def submit(self, model: type[Base], values: dict[str, Any]) -> bool:
+        """レコードをキューに追加します。キューが満杯の場合は破棄します。
+
+        Args:
+            model: 書き込み先のモデル
+            values: カラム名と値の辞書
+
+        Returns:
+            bool: キューに追加した場合True、破棄した場合False
+        """
+        queue = self._ensure_started()
+        if queue is None:
+            return self._drop(model, "停止済みのため")
+        try:
+            queue.put_nowait((model, self._stamp(values)))
+        except asyncio.QueueFull:
+            return self._drop(model, "キューが満杯のため")
+        audit_record_queue_depth.set(self.queue_depth)
+        return True
+
+    async def put(self, model: type[Base], values: dict[str, Any]) -> bool:
+        """レコードをキューに追加します。キューが満杯の場合は空きを待機します。
+
+        put_timeout_secondsまでに空きができない場合は破棄します。
+
+        Args:
+            model: 書き込み先のモデル
+            values: カラム名と値の辞書
+
+        Returns:
+            bool: キューに追加した場合True、破棄した場合False
+        """
+        queue = self._ensure_started()
+        if queue is None:
+            return self._drop(model, "停止済みのため")
+        try:
+            await asyncio.wait_for(queue.put((model, self._stamp(values))), timeout=self.put_timeout_seconds)
+        except TimeoutError:
+            return self._drop(model, "キューの空き待ちがタイムアウトしたため")
+        audit_record_queue_depth.set(self.queue_depth)
+        return True
+
+    async def shutdown(self) -> None:
+        """新しいレコードの受け付けを停止し、キューに残ったレコードを書き込みます。"""
+        self._closed = True
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._writing is not None:
+            await asyncio.gather(self._writing, return_exceptions=True)
+            self._writing = None
+
+        remaining, self._batch = self._batch, []
+        if self._queue is not None:
+            while not self._queue.empty():
+                remaining.append(self._queue.get_nowait())
+        for start in range(0, len(remaining), self.batch_size):
+            await self._write(remaining[start : start + self.batch_size])
+        audit_record_queue_depth.set(0)
+        if remaining:
+            logger.info("停止時に操作履歴・監査ログを書き込みました", count=len(remaining))
+
+    def _ensure_started(self) -> asyncio.Queue[AuditRecord] | None:
+        """書き込みタスクが未起動の場合は起動し、キューを返します（停止済みの場合はNone）。"""
+        if self._closed:
+            return None
+        if self._task is None or self._task.done() or self._task.get_loop() is not asyncio.get_running_loop():
+            self._task = None
+            self.start()
+        return self._queue
+
+    @staticmethod
+    def _stamp(values: dict[str, Any]) -> dict[str, Any]:
+        """受け付け時刻を作成日時・更新日時として設定します。"""
+        now = datetime.now(UTC)
+        values.setdefault("created_at", now)
+        values.setdefault("updated_at", now)
+        return values
+
+    def _drop(self, model: type[Base], reason: str) -> bool:
+        """レコードを破棄し、破棄数を記録します（ログはテーブル毎に1秒に1回まで）。"""
+        table = model.__tablename__
+        audit_records_total.labels(table=table, result="dropped").inc()
+        now = time.monotonic()
+        if now - self._last_drop_logged.get(table, float("-inf")) >= 1.0:
+            self._last_drop_logged[table] = now
+            logger.warning(f"{reason}レコードを破棄しました", table=table, queue_depth=self.queue_depth)
+        return False
+
+    async def _run(self) -> None:
+        """キューからレコードを集め、一括書き込みを繰り返します。"""
+        assert self._queue is not None
+        queue = self._queue
+        loop = asyncio.get_running_loop()
+        while True:
+            self._batch.append(await queue.get())
+            deadline = loop.time() + self.flush_interval
+            while len(self._batch) < self.batch_size:
+                if not queue.empty():
+                    self._batch.append(queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    self._batch.append(await asyncio.wait_for(queue.get(), timeout=timeout))
+                except TimeoutError:
+                    break
+
+            batch, self._batch = self._batch, []
+            # 停止時にキャンセルされても書き込み中のバッチは最後まで書き込む
+            self._writing = asyncio.create_task(self._write(batch))
+            await asyncio.shield(self._writing)
+            self._writing = None
+            audit_record_queue_depth.set(self.queue_depth)
+
+    async def _write(self, batch: list[AuditRecord]) -> None:
+        """レコードをテーブル毎に1回のINSERTで書き込みます。
+
+        Args:
+            batch: 書き込むレコード
+        """
+        rows_by_model: dict[type[Base], list[dict[str, Any]]] = {}
+        for model, values in batch:
+            rows_by_model.setdefault(model, []).append(values)
+
+        for model, rows in rows_by_model.items():
+            table = model.__tablename__
+            started = time.perf_counter()
+            try:
+                async with self.session_factory() as session:
+                    await session.execute(insert(model), rows)
+                    await session.commit()
+            except Exception as e:
+                audit_records_total.labels(table=table, result="failed").inc(len(rows))
+                # NOTE: 監査ログの書き込み失敗は監視システムでアラート検知する
+                logger.error(
+                    "操作履歴・監査ログの一括書き込みに失敗しました（要調査）",
+                    table=table,
+                    count=len(rows),
+                    error=str(e),
+                    error_type=type(e).__name__,
+                    severity="CRITICAL",
+                )
+            else:
+                audit_records_total.labels(table=table, result="written").inc(len(rows))
+            finally:
+                audit_record_flush_seconds.observe(time.perf_counter() - started)
+
+
+# グローバルインスタンス
+audit_record_writer = AuditRecordWriter(
+    max_queue_size=settings.AUDIT_WRITER_QUEUE_SIZE,
+    batch_size=settings.AUDIT_WRITER_BATCH_SIZE,
+    flush_interval_ms=settings.AUDIT_WRITER_FLUSH_INTERVAL_MS,
+    put_timeout_seconds=settings.AUDIT_WRITER_PUT_TIMEOUT_SECONDS,
+)
@@ -0,0 +1,195 @@
+"""ミドルウェア間で共有するリクエストコンテキスト。
+
+このモジュールは、純粋なASGIミドルウェア間で1リクエストにつき1つだけ生成される
+コンテキストオブジェクトを提供します。
+
+共有される情報:
+    - 処理開始時刻（time.perf_counter）と経過時間
+    - Starletteリクエストオブジェクト（ヘッダー・Cookie等のパース結果）
+    - クライアントIPアドレス（RequestHelper.get_client_ip の結果）
+    - リクエストボディ（JSONリクエストのみ1回だけ読み込み、パース結果もキャッシュ）
+
+使用方法:
+    >>> async def __call__(self, scope, receive, send):
+    ...     context = RequestContext.from_scope(scope)
+    ...     receive = await context.buffer_body(receive)
+    ...     body = context.masked_json_body
+
+Note:
+    - コンテキストは scope["state"] に保存されるため、エンドポイントからも
+      request.state.request_context として参照できます
+    - リクエストボディの読み込みはJSONリクエスト（Content-Type: application/json）のみです。
+      ファイルアップロード等の大きなボディはバッファリングせずにそのまま後続へ流します
+"""
+
+import json
+import time
+from typing import Any
+
+from starlette.requests import Request
+from starlette.types import Message, Receive, Scope
+
+from app.utils import RequestHelper
+from app.utils.sensitive_data import mask_sensitive_data
+
+_UNSET: Any = object()
+
+
+class RequestContext:
+    """1リクエスト分のミドルウェア共有コンテキスト。
+
+    Attributes:
+        STATE_KEY: scope["state"] に保存する際のキー
+        BODY_METHODS: リクエストボディを読み込む対象のHTTPメソッド
+        scope: ASGIスコープ
+        start_time: 処理開始時刻（time.perf_counter）
+        body: 読み込み済みのリクエストボディ（未読み込みの場合はNone）
+    """
+
+    STATE_KEY = "request_context"
+    BODY_METHODS: frozenset[str] = frozenset({"POST", "PUT", "PATCH"})
+
+    __slots__ = ("scope", "start_time", "body", "_request", "_client_ip", "_json_body", "_masked_json_body")
+
+    def __init__(self, scope: Scope) -> None:
+        """リクエストコンテキストを初期化します。
+
+        Args:
+            scope: ASGIスコープ
+        """
+        self.scope = scope
+        self.start_time = time.perf_counter()
+        self.body: bytes | None = None
+        self._request: Request | None = None
+        self._client_ip: str | None = _UNSET
+        self._json_body: Any = _UNSET
+        self._masked_json_body: Any = _UNSET
+
+    @classmethod
+    def from_scope(cls, scope: Scope) -> "RequestContext":
+        """スコープに紐づくコンテキストを取得します（未作成の場合は作成）。
+
+        Args:
+            scope: ASGIスコープ
+
+        Returns:
+            RequestContext: リクエストコンテキスト
+        """
+        state = scope.setdefault("state", {})
+        context = state.get(cls.STATE_KEY)
+        if context is None:
+            context = cls(scope)
+            state[cls.STATE_KEY] = context
+        return context
+
+    @property
+    def method(self) -> str:
+        """HTTPメソッド。"""
+        return self.scope["method"]
+
+    @property
+    def path(self) -> str:
+        """URLパス。"""
+        return self.scope["path"]
+
+    @property
+    def elapsed(self) -> float:
+        """処理開始からの経過時間（秒）。"""
+        return time.perf_counter() - self.start_time
+
+    @property
+    def request(self) -> Request:
+        """Starletteリクエストオブジェクト（初回アクセス時に生成）。"""
+        if self._request is None:
+            self._request = Request(self.scope)
+        return self._request
+
+    @property
+    def user(self) -> Any:
+        """認証済みユーザー（request.state.user。未設定の場合はNone）。"""
+        return self.scope.get("state", {}).get("user")
+
+    @property
+    def client_ip(self) -> str | None:
+        """クライアントIPアドレス（信頼できるプロキシのX-Forwarded-Forを考慮）。"""
+        if self._client_ip is _UNSET:
+            self._client_ip = RequestHelper.get_client_ip(self.request)
+        return self._client_ip
+
+    def should_read_body(self) -> bool:
+        """リクエストボディを読み込む対象かどうかを判定します。
+
+        Returns:
+            bool: POST/PUT/PATCHのJSONリクエストの場合True
+        """
+        if self.method not in self.BODY_METHODS:
+            return False
+        content_type = self.request.headers.get("content-type", "")
+        return content_type.split(";", 1)[0].strip().lower() == "application/json"
+
+    async def buffer_body(self, receive: Receive) -> Receive:
+        """リクエストボディを読み込み、後続に同じボディを渡すreceiveを返します。
+
+        読み込みは1リクエストにつき1回だけ行い、2回目以降の呼び出しでは
+        受け取ったreceiveをそのまま返します。対象外のリクエストでは何もしません。
+
+        Args:
+            receive: ASGIのreceive
+
+        Returns:
+            Receive: 後続のアプリケーションに渡すreceive
+        """
+        if self.body is not None or not self.should_read_body():
+            return receive
+
+        chunks: list[bytes] = []
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] != "http.request":
+                # 読み込み途中で切断された場合は切断メッセージを後続へ渡す
+                pending: list[Message] = [message]
+                self.body = b"".join(chunks)
+                return self._replay(pending, receive)
+            chunks.append(message.get("body", b""))
+            more_body = message.get("more_body", False)
+
+        self.body = b"".join(chunks)
+        return self._replay([{"type": "http.request", "body": self.body, "more_body": False}], receive)
+
+    @staticmethod
+    def _replay(pending: list[Message], receive: Receive) -> Receive:
+        """読み込み済みのメッセージを先に返すreceiveを作成します。
+
+        Args:
+            pending: 先に返すメッセージ
+            receive: 読み込み済みメッセージを返した後に使用する元のreceive
+
+        Returns:
+            Receive: 読み込み済みメッセージを再生するreceive
+        """
+
+        async def replay() -> Message:
+            if pending:
+                return pending.pop(0)
+            return await receive()
+
+        return replay
+
+    @property
+    def json_body(self) -> Any:
+        """JSONとしてパースしたリクエストボディ（未読み込み・パース失敗時はNone）。"""
+        if self._json_body is _UNSET:
+            try:
+                self._json_body = json.loads(self.body) if self.body else None
+            except ValueError:
+                self._json_body = None
+        return self._json_body
+
+    @property
+    def masked_json_body(self) -> Any:
+        """機密情報をマスクしたリクエストボディ（未読み込み・パース失敗時はNone）。"""
+        if self._masked_json_body is _UNSET:
+            body = self.json_body
+            self._masked_json_body = mask_sensitive_data(body) if body is not None else None
+        return self._masked_json_body
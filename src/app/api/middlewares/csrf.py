@@ -47,13 +47,15 @@ import hmac
 import secrets
 import time
 
-from fastapi import HTTPException
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
 from starlette.requests import Request
-from starlette.responses import Response
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from app.api.middlewares.context import RequestContext
 
-class CSRFMiddleware(BaseHTTPMiddleware):
+
+class CSRFMiddleware:
     """CSRF保護ミドルウェア。
 
     SameSite Cookie属性とカスタムヘッダー検証による二重防御を実装します。
@@ -80,19 +82,19 @@ class CSRFMiddleware(BaseHTTPMiddleware):
     CSRF_HEADER_NAME = "X-CSRF-Token"
     CSRF_COOKIE_NAME = "csrf_token"
 
-    def __init__(self, app, secret_key: str, cookie_secure: bool = True) -> None:
+    def __init__(self, app: ASGIApp, secret_key: str, cookie_secure: bool = True) -> None:
         """CSRFミドルウェアを初期化します。
 
         Args:
-            app: FastAPIアプリケーションインスタンス
+            app: 次のASGIアプリケーション
             secret_key: CSRF トークン生成用のシークレットキー
             cookie_secure: Cookie の Secure 属性
         """
-        super().__init__(app)
+        self.app = app
         self.secret_key = secret_key
         self.cookie_secure = cookie_secure
 
-    async def dispatch(self, request: Request, call_next) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """リクエストを処理し、CSRF検証を実行します。
 
         処理フロー:
@@ -100,55 +102,68 @@ class CSRFMiddleware(BaseHTTPMiddleware):
             2. Bearer token認証 → スキップ（APIクライアント）
             3. Cookie認証 → CSRFトークン検証を実施
 
+        検証に失敗した場合は、後続を呼び出さずに403 Forbidden（{"detail": ...}）を返します。
+
+        Args:
+            scope: ASGIスコープ
+            receive: ASGIのreceive
+            send: ASGIのsend
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = RequestContext.from_scope(scope).request
+        error = self._check_csrf(request)
+        if error is not None:
+            response = JSONResponse({"detail": error}, status_code=403)
+            await response(scope, receive, send)
+            return
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # CSRFトークンをCookieに設定（フロントエンドで使用）
+                MutableHeaders(scope=message).append("set-cookie", self._build_csrf_cookie(request))
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
+
+    def _check_csrf(self, request: Request) -> str | None:
+        """CSRFトークンを検証します。
+
         Args:
             request: HTTPリクエスト
-            call_next: 次のミドルウェアまたはエンドポイント
 
         Returns:
-            Response: HTTPレスポンス（CSRFトークンCookieを含む）
-
-        Raises:
-            HTTPException: CSRFトークンが一致しない場合（403 Forbidden）
+            str | None: 検証に失敗した場合はエラーメッセージ、成功またはスキップの場合はNone
         """
         # 1. 安全なメソッドはCSRF検証をスキップ
         if request.method in self.SAFE_METHODS:
-            response = await call_next(request)
-            # CSRFトークンをCookieに設定（フロントエンドで使用）
-            self._set_csrf_cookie(response, request)
-            return response
+            return None
 
         # 2. API認証（Bearer token）の場合はCSRFチェックをスキップ
         # 理由: APIクライアントはCookieベース認証を使用しないため、CSRF攻撃のリスクがない
         auth_header = request.headers.get("Authorization", "")
         if auth_header.lower().startswith("bearer "):
-            response = await call_next(request)
-            self._set_csrf_cookie(response, request)
-            return response
+            return None
 
         # 3. Cookie認証の場合のみCSRFトークン検証
         csrf_cookie = request.cookies.get(self.CSRF_COOKIE_NAME)
         csrf_header = request.headers.get(self.CSRF_HEADER_NAME)
 
         # Cookieにトークンがある場合は検証必須
+        # 初回リクエスト（Cookieなし）の場合は、レスポンスでトークンを設定するだけ
         if csrf_cookie:
             if not csrf_header:
-                raise HTTPException(
-                    status_code=403, detail="CSRF token missing in request header"
-                )
+                return "CSRF token missing in request header"
             # トークン一致チェック（タイミング攻撃対策）
             if not secrets.compare_digest(csrf_cookie, csrf_header):
-                raise HTTPException(status_code=403, detail="CSRF token mismatch")
+                return "CSRF token mismatch"
 
             # 有効期限と署名の検証（HMAC署名と有効期限のサーバー側検証）
             if not self._verify_csrf_token(csrf_cookie):
-                raise HTTPException(
-                    status_code=403, detail="CSRF token expired or invalid"
-                )
-        # 初回リクエスト（Cookieなし）の場合は、レスポンスでトークンを設定するだけ
-
-        response = await call_next(request)
-        self._set_csrf_cookie(response, request)
-        return response
+                return "CSRF token expired or invalid"
+        return None
 
     def _generate_csrf_token(self) -> str:
         """有効期限付きHMAC署名CSRFトークンを生成します。
@@ -241,8 +256,8 @@ class CSRFMiddleware(BaseHTTPMiddleware):
             # エラー詳細を返さないことで情報漏洩を防止
             return False
 
-    def _set_csrf_cookie(self, response: Response, request: Request) -> None:
-        """CSRFトークンをCookieに設定します（有効な場合は再利用）。
+    def _build_csrf_cookie(self, request: Request) -> str:
+        """CSRFトークンを設定するSet-Cookieヘッダーの値を作成します（有効な場合は再利用）。
 
         トークン再利用ロジック:
             1. 既存のCookieからトークンを取得
@@ -258,9 +273,11 @@ class CSRFMiddleware(BaseHTTPMiddleware):
             - max_age=3600: ブラウザ側の有効期限（1時間）
 
         Args:
-            response: HTTPレスポンス
             request: HTTPリクエスト（既存トークン取得用）
 
+        Returns:
+            str: Set-Cookieヘッダーの値
+
         Note:
             有効なトークンを再利用することで、以下のメリットがあります：
             - 不要なトークン再生成を防止（パフォーマンス向上）
@@ -275,13 +292,16 @@ class CSRFMiddleware(BaseHTTPMiddleware):
         else:
             token = self._generate_csrf_token()
 
-        response.set_cookie(
-            key=self.CSRF_COOKIE_NAME,
-            value=token,
-            httponly=False,  # JavaScriptからアクセス可能にする
-            secure=self.cookie_secure,  # HTTPS環境では True
-            samesite="lax",  # クロスサイトリクエストでの送信を制限
-            max_age=3600,  # 1時間の有効期限（ブラウザ側）
-            # domain: 設定しない場合は現在のドメインのみ
-            # path: デフォルトは "/" （全パスで有効）
-        )
+        # トークン（URL安全なbase64）はCookie値として有効な文字のみのため、引用符で囲まずに設定する
+        # （引用符で囲むと、Cookieから読み取った値をヘッダーに設定した際にトークンが一致しなくなる）
+        attributes = [
+            f"{self.CSRF_COOKIE_NAME}={token}",
+            "Max-Age=3600",  # 1時間の有効期限（ブラウザ側）
+            "Path=/",  # 全パスで有効
+            "SameSite=lax",  # クロスサイトリクエストでの送信を制限
+        ]
+        if self.cookie_secure:
+            attributes.append("Secure")  # HTTPS環境では True
+        # HttpOnly: 設定しない（JavaScriptからアクセス可能にする）
+        # Domain: 設定しない場合は現在のドメインのみ
+        return "; ".join(attributes)
@@ -31,20 +31,20 @@ Note:
     - 機密情報（パスワード、トークン等）はログに含めないよう注意してください
     - 本番環境ではstructlog JSON出力がCloudWatch/ELKなどで集約・分析されます
     - 処理時間はX-Process-Timeヘッダーとしてクライアントにも返されます
+      （ヘッダーの値はレスポンス開始時点、完了ログの値はレスポンス送信完了時点の処理時間）
     - ログ形式はapp/core/logging.pyのstructlog設定に従います
 """
 
-import time
-from collections.abc import Callable
-
 import structlog
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.api.middlewares.context import RequestContext
 
 logger = structlog.get_logger(__name__)
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
+class LoggingMiddleware:
     """HTTPリクエストとレスポンスをロギングするミドルウェア。
 
     すべてのHTTPリクエストの開始時と完了時にログを出力し、
@@ -54,34 +54,32 @@ class LoggingMiddleware(BaseHTTPMiddleware):
         RateLimitMiddleware → LoggingMiddleware → PrometheusMetricsMiddleware → ...
 
     Note:
-        - Starlette BaseHTTPMiddlewareを継承
-        - 非同期処理に対応（async/await）
+        - 純粋なASGIミドルウェアとして実装（レスポンスをバッファリングしない）
+        - 処理開始時刻はミドルウェア共有のRequestContextから取得
         - すべてのエンドポイントに自動適用
     """
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    def __init__(self, app: ASGIApp):
+        """ロギングミドルウェアを初期化します。
+
+        Args:
+            app (ASGIApp): 次のASGIアプリケーション
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """リクエストとレスポンスをログに記録し、処理時間を計測します。
 
         実行フロー:
-            1. 処理開始時刻を記録
-            2. リクエスト開始ログを出力（メソッド、パス、IP等）
-            3. 次のミドルウェア/ハンドラーを呼び出し
-            4. レスポンス取得後、処理時間を計算
-            5. リクエスト完了ログを出力（ステータス、処理時間）
-            6. X-Process-Timeヘッダーを追加してレスポンス返却
+            1. リクエスト開始ログを出力（メソッド、パス、IP等）
+            2. 次のミドルウェア/ハンドラーを呼び出し
+            3. レスポンス開始時にX-Process-Timeヘッダーを追加
+            4. レスポンス送信完了後、リクエスト完了ログを出力（ステータス、処理時間）
 
         Args:
-            request (Request): FastAPI/Starletteリクエストオブジェクト
-                - method: HTTPメソッド（GET, POST等）
-                - url: リクエストURL
-                - headers: リクエストヘッダー
-                - client: クライアント情報（IPアドレス等）
-            call_next (Callable): 次のミドルウェアまたはエンドポイントハンドラー
-                - 非同期関数（await call_next(request)で呼び出し）
-
-        Returns:
-            Response: HTTPレスポンスオブジェクト
-                - X-Process-Timeヘッダー付き（処理時間、秒単位）
+            scope (Scope): ASGIスコープ
+            receive (Receive): ASGIのreceive
+            send (Send): ASGIのsend
 
         Example:
             >>> # リクエスト: GET /api/v1/agents/chat?session_id=123
@@ -107,38 +105,45 @@ class LoggingMiddleware(BaseHTTPMiddleware):
             >>> # X-Process-Time: 0.234
 
         Note:
-            - 処理時間はtime.time()で計測（精度: マイクロ秒）
+            - 処理時間はtime.perf_counter()で計測
             - ログはstructlog構造化ログ形式（キー-値ペア）
-            - 本番環境ではstructlog JSONフォーマットでログ集約システムに送信
+            - 例外が発生した場合も完了ログを出力します（ステータスコード500）
         """
-        # タイマーを開始
-        start_time = time.time()
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        # リクエストをログ記録
-        logger.info(
-            f"Request started: {request.method} {request.url.path}",
-            method=request.method,
-            path=request.url.path,
-            query_params=str(request.query_params),
-            client=request.client.host if request.client else None,
-        )
-
-        # リクエストを処理
-        response = await call_next(request)
+        context = RequestContext.from_scope(scope)
+        method = context.method
+        path = context.path
+        client = scope.get("client")
 
-        # 処理時間を計算
-        duration = time.time() - start_time
-
-        # レスポンスをログ記録
+        # リクエストをログ記録
         logger.info(
-            f"Request completed: {request.method} {request.url.path} - {response.status_code}",
-            method=request.method,
-            path=request.url.path,
-            status_code=response.status_code,
-            duration=f"{duration:.3f}s",
+            f"Request started: {method} {path}",
+            method=method,
+            path=path,
+            query_params=scope.get("query_string", b"").decode("latin-1"),
+            client=client[0] if client else None,
         )
 
-        # カスタムヘッダーを追加
-        response.headers["X-Process-Time"] = str(duration)
-
-        return response
+        status_code = 500
+
+        async def send_with_process_time(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message).append("X-Process-Time", str(context.elapsed))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_process_time)
+        finally:
+            # レスポンスをログ記録
+            logger.info(
+                f"Request completed: {method} {path} - {status_code}",
+                method=method,
+                path=path,
+                status_code=status_code,
+                duration=f"{context.elapsed:.3f}s",
+            )
@@ -5,14 +5,12 @@
 
 import re
 import time
-from collections.abc import Awaitable, Callable
 from typing import Any
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import JSONResponse
-from starlette.types import ASGIApp
+from starlette.types import ASGIApp, Receive, Scope, Send
 
+from app.api.middlewares.context import RequestContext
 from app.core.database import get_async_session_context
 from app.core.logging import get_logger
 from app.core.maintenance import get_maintenance_settings
@@ -20,7 +18,7 @@ from app.core.maintenance import get_maintenance_settings
 logger = get_logger(__name__)
 
 
-class MaintenanceModeMiddleware(BaseHTTPMiddleware):
+class MaintenanceModeMiddleware:
     """メンテナンスモードミドルウェア。
 
     メンテナンスモード中は管理者以外のアクセスを503で拒否します。
@@ -49,35 +47,35 @@ class MaintenanceModeMiddleware(BaseHTTPMiddleware):
         Args:
             app: ASGIアプリケーション
         """
-        super().__init__(app)
+        self.app = app
         self._maintenance_cache: dict[str, bool | str] | None = None
         self._cache_ttl: float = 0
 
-    async def dispatch(
-        self,
-        request: Request,
-        call_next: Callable[[Request], Awaitable[Response]],
-    ) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """リクエストを処理し、メンテナンスモードをチェックします。
 
         Args:
-            request: HTTPリクエスト
-            call_next: 次のミドルウェア/エンドポイント
-
-        Returns:
-            Response: HTTPレスポンス
+            scope: ASGIスコープ
+            receive: ASGIのreceive
+            send: ASGIのsend
         """
-        path = request.url.path
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
 
         # 常にアクセス可能なパスはスキップ
         if path in self.ALWAYS_ALLOWED_PATHS:
-            return await call_next(request)
+            await self.app(scope, receive, send)
+            return
 
         # メンテナンスモード設定を取得
         maintenance_settings = await self._get_maintenance_settings()
 
         if not maintenance_settings.get("enabled", False):
-            return await call_next(request)
+            await self.app(scope, receive, send)
+            return
 
         # メンテナンスモード中
         allow_admin_access = maintenance_settings.get("allow_admin_access", True)
@@ -89,18 +87,15 @@ class MaintenanceModeMiddleware(BaseHTTPMiddleware):
         # 管理者アクセスが許可されている場合
         if allow_admin_access:
             # 認証済みユーザーかチェック
-            if hasattr(request.state, "user") and request.state.user:
-                user = request.state.user
-                # システム管理者の場合はアクセス許可
-                if user.is_system_admin():
-                    return await call_next(request)
-
+            user = RequestContext.from_scope(scope).user
+            # システム管理者の場合はアクセス許可
             # 管理者パスへのアクセスは認証後に判定
-            if self.ADMIN_PATH_PATTERN.match(path):
-                return await call_next(request)
+            if (user and user.is_system_admin()) or self.ADMIN_PATH_PATTERN.match(path):
+                await self.app(scope, receive, send)
+                return
 
         # 503 Service Unavailableを返す
-        return JSONResponse(
+        response = JSONResponse(
             status_code=503,
             content={
                 "status": "error",
@@ -114,6 +109,7 @@ class MaintenanceModeMiddleware(BaseHTTPMiddleware):
                 "Retry-After": "3600",
             },
         )
+        await response(scope, receive, send)
 
     async def _get_maintenance_settings(self) -> dict[str, bool | str]:
         """メンテナンスモード設定を取得します。
@@ -26,6 +26,49 @@ Prometheus形式で公開します。/metricsエンドポイントから取得
           ラベル: content_type
         - file_upload_size_bytes: アップロードファイルサイズ（Histogram）
 
+    **分析ステートキャッシュメトリクス**:
+        - analysis_state_cache_hits_total: キャッシュヒット数（Counter）
+        - analysis_state_cache_misses_total: キャッシュミス数（Counter）
+        - analysis_state_cache_evictions_total: エントリ破棄数（Counter）
+          ラベル: reason (capacity, invalidated, stale, replaced)
+        - analysis_state_cache_bytes: 保持中のDataFrame合計バイト数（Gauge）
+        - analysis_state_cache_entries: 保持中のエントリ数（Gauge）
+
+    **ドライバーツリー計算キャッシュメトリクス**:
+        - driver_tree_calculation_cache_lookups_total: キャッシュ参照数（Counter）
+          ラベル: result (hit, incremental, rebind, miss)
+        - driver_tree_calculation_cache_evictions_total: エントリ破棄数（Counter）
+          ラベル: reason (capacity, invalidated, stale)
+        - driver_tree_calculation_cache_entries: 保持中のエントリ数（Gauge）
+
+    **分析エージェント実行メトリクス**:
+        - analysis_agent_queue_depth: 実行枠の空きを待機中のチャット数（Gauge）
+        - analysis_agent_active_chats: 実行中のチャット数（Gauge）
+        - analysis_agent_wait_seconds: 待機時間（Histogram）
+          ラベル: stage (chat, task)
+        - analysis_agent_rejected_total: 待機上限超過で拒否したチャット数（Counter）
+        - analysis_chat_jobs_total: チャットジョブ数（Counter）
+          ラベル: status (submitted, succeeded, failed, rejected)
+        - analysis_chat_jobs_running: 実行中のチャットジョブ数（Gauge）
+        - analysis_chat_jobs_pending: 実行待ちのチャットジョブ数（Gauge）
+
+    **操作履歴・監査ログ書き込みメトリクス**:
+        - audit_record_queue_depth: 書き込み待ちのレコード数（Gauge）
+        - audit_records_total: レコード数（Counter）
+          ラベル: table (user_activity, audit_log), result (written, dropped, failed)
+        - audit_record_flush_seconds: 1回の一括書き込みの処理時間（Histogram）
+
+    **認証キャッシュメトリクス**:
+        - principal_cache_requests_total: 認証ユーザー・メンバーシップのキャッシュ参照数（Counter）
+          ラベル: kind (user, member), result (hit, miss)
+
+    **キャッシュメトリクス**（app.core.cacheで定義）:
+        - cache_requests_total: キャッシュ参照数（Counter）
+          ラベル: result (l1_hit, l2_hit, stale, miss)
+        - cache_coalesced_total: 計算中の同一キーの結果を待機したキャッシュミス数（Counter）
+        - cache_local_entries: プロセス内キャッシュのエントリ数（Gauge）
+        - cache_local_bytes: プロセス内キャッシュのバイト数（Gauge）
+
 メトリクスの確認:
     $ curl http://localhost:8000/metrics
     # HELP http_requests_total Total HTTP requests
@@ -48,13 +91,11 @@ Note:
     - Grafanaダッシュボードで可視化できます
 """
 
+import re
 import time
-from collections.abc import Callable
 
-from prometheus_client import Counter, Histogram
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from prometheus_client import Counter, Gauge, Histogram
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 # HTTPメトリクス
 http_requests_total = Counter(
@@ -111,8 +152,121 @@ file_upload_size_bytes = Histogram(
     "ファイルアップロードサイズ（バイト）",
 )
 
+# 分析ステートキャッシュのメトリクス
+analysis_state_cache_hits_total = Counter(
+    "analysis_state_cache_hits_total",
+    "分析ステートキャッシュのヒット数",
+)
+
+analysis_state_cache_misses_total = Counter(
+    "analysis_state_cache_misses_total",
+    "分析ステートキャッシュのミス数",
+)
+
+analysis_state_cache_evictions_total = Counter(
+    "analysis_state_cache_evictions_total",
+    "分析ステートキャッシュから破棄されたエントリ数",
+    ["reason"],  # capacity, invalidated, stale, replaced
+)
+
+analysis_state_cache_bytes = Gauge(
+    "analysis_state_cache_bytes",
+    "分析ステートキャッシュが保持するDataFrameの合計バイト数",
+)
+
+analysis_state_cache_entries = Gauge(
+    "analysis_state_cache_entries",
+    "分析ステートキャッシュのエントリ数",
+)
+
+# ドライバーツリー計算キャッシュのメトリクス
+driver_tree_calculation_cache_lookups_total = Counter(
+    "driver_tree_calculation_cache_lookups_total",
+    "ドライバーツリー計算キャッシュの参照数",
+    ["result"],  # hit, incremental, rebind, miss
+)
+
+driver_tree_calculation_cache_evictions_total = Counter(
+    "driver_tree_calculation_cache_evictions_total",
+    "ドライバーツリー計算キャッシュから破棄されたエントリ数",
+    ["reason"],  # capacity, invalidated, stale
+)
+
+driver_tree_calculation_cache_entries = Gauge(
+    "driver_tree_calculation_cache_entries",
+    "ドライバーツリー計算キャッシュのエントリ数",
+)
+
+# 分析エージェント実行のメトリクス
+analysis_agent_queue_depth = Gauge(
+    "analysis_agent_queue_depth",
+    "実行枠の空きを待機中のチャット数",
+)
+
+analysis_agent_active_chats = Gauge(
+    "analysis_agent_active_chats",
+    "実行中のチャット数",
+)
+
+analysis_agent_wait_seconds = Histogram(
+    "analysis_agent_wait_seconds",
+    "チャット実行枠・ワーカースレッドの待機時間（秒）",
+    ["stage"],  # chat, task
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0),
+)
+
+analysis_agent_rejected_total = Counter(
+    "analysis_agent_rejected_total",
+    "待機上限を超えたため拒否したチャット数",
+)
+
+analysis_chat_jobs_total = Counter(
+    "analysis_chat_jobs_total",
+    "チャットジョブ数",
+    ["status"],  # submitted, succeeded, failed, rejected
+)
 
-class PrometheusMetricsMiddleware(BaseHTTPMiddleware):
+analysis_chat_jobs_running = Gauge(
+    "analysis_chat_jobs_running",
+    "実行中のチャットジョブ数",
+)
+
+analysis_chat_jobs_pending = Gauge(
+    "analysis_chat_jobs_pending",
+    "プロジェクトの同時実行数上限により実行待ちのチャットジョブ数",
+)
+
+# 操作履歴・監査ログ書き込みのメトリクス
+audit_record_queue_depth = Gauge(
+    "audit_record_queue_depth",
+    "書き込み待ちの操作履歴・監査ログのレコード数",
+)
+
+audit_records_total = Counter(
+    "audit_records_total",
+    "操作履歴・監査ログのレコード数",
+    ["table", "result"],  # result: written, dropped, failed
+)
+
+audit_record_flush_seconds = Histogram(
+    "audit_record_flush_seconds",
+    "操作履歴・監査ログの一括書き込み1回の処理時間（秒）",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+# 認証キャッシュのメトリクス
+principal_cache_requests_total = Counter(
+    "principal_cache_requests_total",
+    "認証ユーザー・プロジェクトメンバーシップのキャッシュ参照数",
+    ["kind", "result"],  # kind: user, member / result: hit, miss
+)
+
+
+_UUID_SEGMENT = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$", re.IGNORECASE)
+_HASH_SEGMENT = re.compile(r"^[a-zA-Z0-9_-]{32,}$")
+
+
+class PrometheusMetricsMiddleware:
     """Prometheusメトリクス収集ミドルウェア。
 
     すべてのHTTPリクエスト/レスポンスからメトリクスを自動収集します。
@@ -120,7 +274,7 @@ class PrometheusMetricsMiddleware(BaseHTTPMiddleware):
 
     収集タイミング:
         - リクエスト受信時: リクエストサイズを記録
-        - レスポンス送信時: 処理時間、ステータスコード、レスポンスサイズを記録
+        - レスポンス送信完了時: 処理時間、ステータスコード、レスポンスサイズを記録
 
     Note:
         - エラー発生時もメトリクスは記録されます（status_code=500）
@@ -128,28 +282,28 @@ class PrometheusMetricsMiddleware(BaseHTTPMiddleware):
         - Prometheusのベストプラクティスに従った命名規則
     """
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    def __init__(self, app: ASGIApp):
+        """メトリクス収集ミドルウェアを初期化します。
+
+        Args:
+            app (ASGIApp): 次のASGIアプリケーション
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """リクエストを処理し、各種メトリクスを収集・記録します。
 
         実行フロー:
             1. リクエストサイズ取得（Content-Lengthヘッダー）
             2. エンドポイントパスを正規化（/users/123 → /users/{id}）
             3. リクエストサイズをHistogramに記録
-            4. 処理開始時刻を記録
-            5. 次のミドルウェア/ハンドラーを呼び出し
-            6. レスポンス取得後、処理時間とステータスコードを記録
-            7. レスポンスサイズを記録
-            8. レスポンス返却
+            4. 次のミドルウェア/ハンドラーを呼び出し、送信されたステータスコードとボディサイズを記録
+            5. レスポンス送信完了後、処理時間・リクエスト総数・レスポンスサイズを記録
 
         Args:
-            request (Request): HTTPリクエストオブジェクト
-                - method: HTTPメソッド（GET, POST等）
-                - url.path: エンドポイントパス
-                - headers: リクエストヘッダー（Content-Length含む）
-            call_next (Callable): 次のミドルウェア/ハンドラー
-
-        Returns:
-            Response: HTTPレスポンス（元のレスポンスをそのまま返す）
+            scope (Scope): ASGIスコープ
+            receive (Receive): ASGIのreceive
+            send (Send): ASGIのsend
 
         Example:
             >>> # リクエスト: POST /api/v1/files （Content-Length: 10240）
@@ -165,45 +319,56 @@ class PrometheusMetricsMiddleware(BaseHTTPMiddleware):
 
         Note:
             - 例外発生時もfinallyブロックでメトリクス記録（status_code=500）
+            - レスポンスサイズは実際に送信したボディのバイト数（ストリーミングレスポンスにも対応）
             - パス正規化により、異なるIDでも同じメトリクスラベル
-            - Histogramはバケット単位で集計（レスポンスタイム分析に有用）
         """
-        # リクエストサイズを記録
-        request_size = int(request.headers.get("content-length", 0))
-        method = request.method
-        path = request.url.path
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        # エンドポイントパスを正規化（パスパラメータを除く）
-        endpoint = self._normalize_path(path)
+        method = scope["method"]
+        endpoint = self._normalize_path(scope["path"])
 
+        # リクエストサイズを記録
+        request_size = 0
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                request_size = int(value)
+                break
         http_request_size_bytes.labels(method=method, endpoint=endpoint).observe(request_size)
 
         # リクエスト処理時間を計測
-        start_time = time.time()
-        response = None
+        start_time = time.perf_counter()
         status_code = 500  # デフォルトは500（エラー時）
+        response_size = 0
+        response_started = False
+
+        async def send_with_metrics(message: Message) -> None:
+            nonlocal status_code, response_size, response_started
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                response_started = True
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+            await send(message)
 
         try:
-            response = await call_next(request)
-            status_code = response.status_code
+            await self.app(scope, receive, send_with_metrics)
         except Exception:
             # エラー発生時もメトリクスを記録
             status_code = 500
             raise
         finally:
             # 処理時間を記録
-            duration = time.time() - start_time
+            duration = time.perf_counter() - start_time
             http_request_duration_seconds.labels(method=method, endpoint=endpoint).observe(duration)
 
             # リクエスト総数を記録
             http_requests_total.labels(method=method, endpoint=endpoint, status_code=status_code).inc()
 
-        # レスポンスサイズを記録（エラー時はスキップ）
-        if response is not None:
-            response_size = int(response.headers.get("content-length", 0))
-            http_response_size_bytes.labels(method=method, endpoint=endpoint).observe(response_size)
-
-        return response
+            # レスポンスサイズを記録（レスポンス未送信の場合はスキップ）
+            if response_started:
+                http_response_size_bytes.labels(method=method, endpoint=endpoint).observe(response_size)
 
     def _normalize_path(self, path: str) -> str:
         """パスパラメータを正規化してエンドポイントパスを取得します。
@@ -234,8 +399,6 @@ class PrometheusMetricsMiddleware(BaseHTTPMiddleware):
             - UUID、数値、英数字ハッシュ（32文字以上）を {id} に正規化
             - 本番環境ではFastAPIのルーティング情報を使用することを推奨
         """
-        import re
-
         parts = path.split("/")
         normalized_parts: list[str] = []
 
@@ -248,10 +411,10 @@ class PrometheusMetricsMiddleware(BaseHTTPMiddleware):
             if part.isdigit():
                 normalized_parts.append("{id}")
             # UUID形式 (例: 123e4567-e89b-12d3-a456-426614174000)
-            elif re.match(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$", part, re.IGNORECASE):
+            elif _UUID_SEGMENT.match(part):
                 normalized_parts.append("{id}")
             # 英数字ハッシュ (32文字以上)
-            elif re.match(r"^[a-zA-Z0-9_-]{32,}$", part):
+            elif _HASH_SEGMENT.match(part):
                 normalized_parts.append("{id}")
             else:
                 normalized_parts.append(part)
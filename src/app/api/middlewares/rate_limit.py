@@ -1,18 +1,25 @@
 """Redisベースのレート制限ミドルウェア。
 
-このモジュールは、スライディングウィンドウアルゴリズムを使用して
+このモジュールは、GCRA（Generic Cell Rate Algorithm）を使用して
 リクエストレート制限を実装します。複数ワーカー環境と分散環境に対応しています。
 
 主な機能:
-    1. **スライディングウィンドウ**: 固定ウィンドウより精度が高い
+    1. **アトミックな判定**: 判定と更新をRedisのLuaスクリプトで1往復で実行
     2. **クライアント識別**: ユーザーID、APIキー、IPアドレスで識別
-    3. **Redis使用**: 複数ワーカー/サーバー間で共有
-    4. **グレースフルデグラデーション**: Redis障害時は制限をスキップ
+    3. **ルート別・クライアント別の制限**: 設定で上限を個別に指定可能
+    4. **グレースフルデグラデーション**: Redis障害時はインメモリのトークンバケットで制限
 
 レート制限の仕組み:
-    - デフォルト: 100リクエスト/60秒
-    - Redis Sorted Setを使用してタイムスタンプ管理
-    - 期間外のリクエストは自動削除
+    - デフォルト: 100リクエスト/60秒（最大100リクエストのバースト）
+    - Redisにはクライアントごとに理論到着時刻（TAT）を1つだけ保存
+    - 判定ロジックは app.core.rate_limiter を参照
+
+適用するルールの優先順位:
+    1. クライアント識別子ごとの制限（RATE_LIMIT_USER_LIMITS）
+    2. パスプレフィックスごとの制限（RATE_LIMIT_ROUTE_LIMITS、最長一致）
+    3. デフォルトの制限（RATE_LIMIT_CALLS / RATE_LIMIT_PERIOD）
+
+    パスプレフィックスに一致したリクエストは、プレフィックスごとに別枠でカウントします。
 
 クライアント識別の優先順位:
     1. 認証済みユーザーのuser_id
@@ -26,93 +33,113 @@
       "details": {
         "limit": 100,
         "period": 60,
-        "retry_after": 60
+        "retry_after": 1
       }
     }
     Headers:
-      Retry-After: 60
+      Retry-After: 1
 
 レート制限ヘッダー（すべてのレスポンスに追加）:
     - X-RateLimit-Limit: リクエスト制限数
     - X-RateLimit-Remaining: 残りリクエスト数
-    - X-RateLimit-Reset: リセット時刻（Unixタイムスタンプ）
+    - X-RateLimit-Reset: 残りリクエスト数が上限まで回復する時刻（Unixタイムスタンプ）
 
 Note:
     - 開発環境（DEBUG=True）では制限は無効化されます
-    - Redis接続エラー時は制限をスキップします（可用性優先）
+    - Redis接続エラー時はワーカーごとのインメモリ判定になります（可用性優先）
     - プロキシ経由の場合はX-Forwarded-Forヘッダーを使用してください
 """
 
 import hashlib
+import math
 import time
-from collections.abc import Callable
+from collections.abc import Mapping
 
 import structlog
-from fastapi import Request, Response, status
+from fastapi import Request, status
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from app.core.cache import cache_manager
+from app.api.middlewares.context import RequestContext
 from app.core.config import settings
+from app.core.rate_limiter import RateLimiter, RateLimitResult, RateLimitRule
 
 logger = structlog.get_logger(__name__)
 
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
+class RateLimitMiddleware:
     """Redisベースのリクエストレート制限ミドルウェア。
 
-    スライディングウィンドウアルゴリズムを使用してレート制限を実装します。
-    Redis Sorted Setでタイムスタンプ付きリクエストを管理し、
-    複数ワーカー/サーバー環境でも正確に動作します。
+    GCRAを使用してレート制限を実装します。判定と更新はRedisのLuaスクリプトで
+    アトミックに実行されるため、複数ワーカー/サーバー環境でも正確に動作します。
 
-    アルゴリズム:
-        1. 現在のウィンドウ開始時刻を計算（現在時刻 - period）
-        2. ウィンドウ外の古いリクエストを削除（ZREMRANGEBYSCORE）
-        3. 現在のリクエスト数をカウント（ZCARD）
-        4. 制限超過チェック
-        5. 新しいリクエストを追加（ZADD）
-        6. TTL設定（EXPIRE）
+    アルゴリズム（GCRA）:
+        1. クライアントの理論到着時刻（TAT）を取得（未記録・過去の場合は現在時刻）
+        2. 新しいTAT = TAT + period / calls
+        3. 新しいTAT - period が現在時刻より未来なら制限超過
+        4. 制限内なら新しいTATを保存（PXで自動失効）
 
     Note:
-        - Redis Sorted Set使用（key: rate_limit:{client_id}, score: timestamp）
+        - Redisキー: rate_limit:{client_id}[:{route_prefix}]、値: TAT（ミリ秒）
         - 開発環境では自動的に無効化
-        - Redis障害時はグレースフルにスキップ
+        - Redis障害時はインメモリのトークンバケットで制限
     """
 
-    def __init__(self, app, calls: int = 100, period: int = 60, max_memory_entries: int = 10000):
+    def __init__(
+        self,
+        app: ASGIApp,
+        calls: int = 100,
+        period: int = 60,
+        max_memory_entries: int = 10000,
+        route_limits: Mapping[str, tuple[int, int]] | None = None,
+        user_limits: Mapping[str, tuple[int, int]] | None = None,
+    ):
         """レート制限を初期化します。
 
         Args:
-            app: FastAPIアプリケーションインスタンス
-                - BaseHTTPMiddlewareに渡される
+            app: 次のASGIアプリケーション
             calls (int): 期間ごとに許可されるリクエスト数
                 - デフォルト: 100
                 - 例: calls=100で100リクエスト/periodまで許可
             period (int): レート制限の期間（秒単位）
                 - デフォルト: 60
                 - 例: period=60で60秒間のウィンドウ
-            max_memory_entries (int): インメモリストアの最大エントリ数
+            max_memory_entries (int): インメモリフォールバックで保持するクライアント数の上限
                 - デフォルト: 10000
                 - メモリリーク防止のための上限
+            route_limits: パスプレフィックスごとの (calls, period)
+                - 例: {"/api/v1/auth": (10, 60)}
+            user_limits: クライアント識別子ごとの (calls, period)
+                - 例: {"user:123": (1000, 60)}
 
         Example:
             >>> # 厳しい制限: 10リクエスト/分
             >>> app.add_middleware(RateLimitMiddleware, calls=10, period=60)
             >>>
-            >>> # 緩い制限: 1000リクエスト/10分
-            >>> app.add_middleware(RateLimitMiddleware, calls=1000, period=600)
+            >>> # 緩い制限: 1000リクエスト/10分、認証APIのみ10リクエスト/分
+            >>> app.add_middleware(
+            ...     RateLimitMiddleware,
+            ...     calls=1000,
+            ...     period=600,
+            ...     route_limits={"/api/v1/auth": (10, 60)},
+            ... )
 
         Note:
-            - main.pyでは calls=100, period=60 で登録されています
+            - app_factory.pyでは RATE_LIMIT_* の設定値で登録されています
             - 本番環境では適切な値に調整してください
         """
-        super().__init__(app)
+        self.app = app
         self.calls = calls
         self.period = period
-        self.max_memory_entries = max_memory_entries
-        # Redisが利用できない場合のインメモリフォールバック
-        # 形式: {client_id: [timestamp1, timestamp2, ...]}
-        self._memory_store: dict[str, list[float]] = {}
+        self.default_rule = RateLimitRule(calls=calls, period=period)
+        self.route_rules = {
+            prefix.rstrip("/") or "/": RateLimitRule(calls=limit[0], period=limit[1]) for prefix, limit in (route_limits or {}).items()
+        }
+        # 最長一致で判定するため長い順に並べる
+        self._route_prefixes = sorted(self.route_rules, key=len, reverse=True)
+        self.user_rules = {identifier: RateLimitRule(calls=limit[0], period=limit[1]) for identifier, limit in (user_limits or {}).items()}
+        self.limiter = RateLimiter(max_local_entries=max_memory_entries)
 
     def _get_client_identifier(self, request: Request) -> str:
         """クライアント識別子を取得します。
@@ -184,9 +211,35 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
 
         return f"ip:{client_ip}"
 
-    def _create_rate_limit_response(self) -> JSONResponse:
+    def _resolve_rule(self, client_identifier: str, path: str) -> tuple[str, RateLimitRule]:
+        """リクエストに適用するルールとレート制限キーを決定します。
+
+        Args:
+            client_identifier (str): クライアント識別子
+            path (str): URLパス
+
+        Returns:
+            tuple[str, RateLimitRule]: (レート制限キー, 適用するルール)
+                - パスプレフィックスに一致した場合のキー: "{client_identifier}:{prefix}"
+                - それ以外のキー: "{client_identifier}"
+        """
+        key = client_identifier
+        rule = self.default_rule
+        for prefix in self._route_prefixes:
+            if prefix == "/" or path == prefix or path.startswith(prefix + "/"):
+                key = f"{client_identifier}:{prefix}"
+                rule = self.route_rules[prefix]
+                break
+
+        return key, self.user_rules.get(client_identifier, rule)
+
+    def _create_rate_limit_response(self, rule: RateLimitRule | None = None, retry_after: float | None = None) -> JSONResponse:
         """レート制限超過時のレスポンスを生成します。
 
+        Args:
+            rule (RateLimitRule | None): 適用したルール（省略時はデフォルトのルール）
+            retry_after (float | None): 再試行までの秒数（省略時はルールの期間）
+
         Returns:
             JSONResponse: HTTP 429レスポンス
                 - ステータス: 429 Too Many Requests
@@ -200,109 +253,51 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             >>> response.headers["Retry-After"]
             "60"
         """
+        rule = rule or self.default_rule
+        retry_seconds = rule.period if retry_after is None else max(1, math.ceil(retry_after))
         return JSONResponse(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
             content={
                 "error": "Rate limit exceeded",
                 "details": {
-                    "limit": self.calls,
-                    "period": self.period,
-                    "retry_after": self.period,
+                    "limit": rule.calls,
+                    "period": rule.period,
+                    "retry_after": retry_seconds,
                 },
             },
-            headers={"Retry-After": str(self.period)},
+            headers={"Retry-After": str(retry_seconds)},
         )
 
-    def _cleanup_memory_store(self) -> None:
-        """メモリストアをクリーンアップしてメモリリークを防止します。
-
-        インメモリストアのエントリ数が上限を超えた場合、
-        最も古いエントリ（最後にアクセスされた時刻が最も古い）を削除します。
+    async def _check_rate_limit(self, client_identifier: str, path: str) -> tuple[RateLimitRule, RateLimitResult]:
+        """リクエストに適用するルールでレート制限をチェックします。
 
-        Note:
-            - LRU（Least Recently Used）戦略を使用
-            - max_memory_entriesを超えた場合のみ実行
-        """
-        if len(self._memory_store) > self.max_memory_entries:
-            # 最も古いエントリを削除（簡易LRU）
-            # 各クライアントの最新タイムスタンプでソート
-            sorted_clients = sorted(self._memory_store.items(), key=lambda x: max(x[1]) if x[1] else 0)
-            # 上限の80%まで削除（頻繁なクリーンアップを避ける）
-            target_size = int(self.max_memory_entries * 0.8)
-            to_remove = len(self._memory_store) - target_size
-            for client_id, _ in sorted_clients[:to_remove]:
-                del self._memory_store[client_id]
-            logger.warning(
-                "メモリストアクリーンアップ実行",
-                removed=to_remove,
-                remaining=len(self._memory_store),
-            )
-
-    def _check_rate_limit_memory(self, client_identifier: str, current_time: float) -> tuple[bool, int]:
-        """インメモリストアを使用してレート制限をチェックします。
-
-        Redisが利用できない場合のフォールバック機能です。
-        シンプルなスライディングウィンドウアルゴリズムを実装しています。
-
-        警告:
-            - 複数ワーカー間で共有されません
-            - サーバー再起動でリセットされます
-            - メモリ使用量が増加する可能性があります
+        Redisが利用できない場合やRedisエラー時はインメモリのトークンバケットで判定します。
 
         Args:
             client_identifier (str): クライアント識別子
-            current_time (float): 現在のタイムスタンプ
+            path (str): URLパス
 
         Returns:
-            tuple[bool, int]: (制限超過か, 現在のリクエスト数)
-                - True: 制限超過
-                - False: 制限内
+            tuple[RateLimitRule, RateLimitResult]: (適用したルール, 判定結果)
         """
-        # メモリリーク防止のクリーンアップ
-        self._cleanup_memory_store()
-
-        # 古いエントリをクリーンアップ
-        window_start = current_time - self.period
-        if client_identifier in self._memory_store:
-            self._memory_store[client_identifier] = [ts for ts in self._memory_store[client_identifier] if ts > window_start]
-
-        # 現在のリクエスト数を取得
-        request_count = len(self._memory_store.get(client_identifier, []))
-
-        # 制限チェック
-        if request_count >= self.calls:
-            return True, request_count
-
-        # 新しいリクエストを追加
-        if client_identifier not in self._memory_store:
-            self._memory_store[client_identifier] = []
-        self._memory_store[client_identifier].append(current_time)
-
-        return False, request_count
+        key, rule = self._resolve_rule(client_identifier, path)
+        return rule, await self.limiter.hit(key, rule)
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """レート制限をチェックし、超過していなければリクエストを処理します。
 
         実行フロー:
             1. 開発環境チェック（DEBUG=Trueなら制限スキップ）
             2. クライアント識別子を取得
-            3. Redisキー生成（rate_limit:{client_id}）
-            4. スライディングウィンドウで古いエントリ削除
-            5. 現在のリクエスト数をカウント
-            6. 制限超過チェック:
-               - 超過: HTTP 429エラー返却
-               - OK: 新しいリクエストをRedisに追加
-            7. レスポンスにレート制限ヘッダーを追加
-            8. レスポンス返却
+            3. 適用するルールを決定し、GCRAで判定（Redis、障害時はインメモリのトークンバケット）
+            4. 制限超過チェック:
+               - 超過: HTTP 429エラー返却（後続は呼び出さない）
+               - OK: 後続を呼び出し、レスポンス開始時にレート制限ヘッダーを追加
 
         Args:
-            request (Request): HTTPリクエストオブジェクト
-            call_next (Callable): 次のミドルウェア/ハンドラー
-
-        Returns:
-            Response: HTTPレスポンス
-                - 制限内: 元のレスポンス + レート制限ヘッダー
-                - 制限超過: HTTP 429 + Retry-Afterヘッダー
+            scope (Scope): ASGIスコープ
+            receive (Receive): ASGIのreceive
+            send (Send): ASGIのsend
 
         Example:
             >>> # 正常なリクエスト（50/100）
@@ -318,84 +313,42 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             >>>   "details": {
             >>>     "limit": 100,
             >>>     "period": 60,
-            >>>     "retry_after": 60
+            >>>     "retry_after": 1
             >>>   }
             >>> }
             >>> # ヘッダー:
-            >>> # Retry-After: 60
+            >>> # Retry-After: 1
 
         Note:
             - 開発環境（DEBUG=True）では自動的にスキップ
-            - Redis接続エラー時もスキップ（可用性優先）
-            - スライディングウィンドウ: 固定ウィンドウより精度が高い
-            - Redis Sorted Set使用: 複数ワーカー/サーバー間で共有
+            - Redis接続エラー時はインメモリのトークンバケットで制限（可用性優先）
+            - Redisの判定は1リクエストにつき1往復（Luaスクリプト）
         """
         # 開発環境ではレート制限をスキップ
-        if settings.DEBUG:
-            return await call_next(request)
+        if scope["type"] != "http" or settings.DEBUG:
+            await self.app(scope, receive, send)
+            return
 
         # クライアント識別子を取得
-        client_identifier = self._get_client_identifier(request)
-        cache_key = f"rate_limit:{client_identifier}"
-
-        # Redisから現在のカウントを取得
-        current_time = int(time.time())
-        window_start = current_time - self.period
-
-        try:
-            # Redisが利用できない場合はインメモリフォールバックを使用
-            if not cache_manager.is_redis_available():
-                logger.warning("Redisが利用できません。インメモリレート制限にフォールバックします")
-                is_limited, request_count = self._check_rate_limit_memory(client_identifier, current_time)
-                if is_limited:
-                    return self._create_rate_limit_response()
-                response = await call_next(request)
-                remaining = max(0, self.calls - request_count - 1)
-                response.headers["X-RateLimit-Limit"] = str(self.calls)
-                response.headers["X-RateLimit-Remaining"] = str(remaining)
-                response.headers["X-RateLimit-Reset"] = str(int(current_time + self.period))
-                return response
-
-            # Redis Sorted Setを使用したスライディングウィンドウアルゴリズム
-            # 古いエントリを削除
-            await cache_manager.zremrangebyscore(cache_key, 0, window_start)
-
-            # 現在のリクエスト数をカウント
-            request_count = await cache_manager.zcard(cache_key)
-
-            if request_count >= self.calls:
-                return self._create_rate_limit_response()
-
-            # 現在のリクエストを追加
-            request_id = f"{current_time}:{hashlib.sha256(str(time.time()).encode()).hexdigest()}"
-            await cache_manager.zadd(cache_key, {request_id: current_time})
-            await cache_manager.expire_key(cache_key, self.period)
-
-            # リクエストを処理
-            response = await call_next(request)
-
-            # レート制限ヘッダーを追加
-            remaining = max(0, self.calls - request_count - 1)
-            response.headers["X-RateLimit-Limit"] = str(self.calls)
-            response.headers["X-RateLimit-Remaining"] = str(remaining)
-            response.headers["X-RateLimit-Reset"] = str(current_time + self.period)
-
-            return response
-
-        except Exception as e:
-            logger.exception(
-                "レート制限エラー",
-                error_type=type(e).__name__,
-                error_message=str(e),
-            )
-            # エラー時はインメモリフォールバックを使用
-            logger.warning("Redisエラー、インメモリレート制限にフォールバックします")
-            is_limited, request_count = self._check_rate_limit_memory(client_identifier, current_time)
-            if is_limited:
-                return self._create_rate_limit_response()
-            response = await call_next(request)
-            remaining = max(0, self.calls - request_count - 1)
-            response.headers["X-RateLimit-Limit"] = str(self.calls)
-            response.headers["X-RateLimit-Remaining"] = str(remaining)
-            response.headers["X-RateLimit-Reset"] = str(int(current_time + self.period))
-            return response
+        client_identifier = self._get_client_identifier(RequestContext.from_scope(scope).request)
+        rule, result = await self._check_rate_limit(client_identifier, scope["path"])
+        if not result.allowed:
+            response = self._create_rate_limit_response(rule, result.retry_after)
+            await response(scope, receive, send)
+            return
+
+        # レート制限ヘッダー
+        rate_limit_headers = (
+            ("X-RateLimit-Limit", str(result.limit)),
+            ("X-RateLimit-Remaining", str(result.remaining)),
+            ("X-RateLimit-Reset", str(math.ceil(time.time() + result.reset_after))),
+        )
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for name, value in rate_limit_headers:
+                    headers.append(name, value)
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
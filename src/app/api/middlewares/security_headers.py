@@ -42,18 +42,15 @@ Note:
     - レスポンスの内容を変更せず、ヘッダーのみ追加します
 """
 
-from collections.abc import Callable
-
 import structlog
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.config import settings
 
 logger = structlog.get_logger(__name__)
 
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+class SecurityHeadersMiddleware:
     """セキュリティヘッダーを自動的に追加するミドルウェア。
 
     すべてのHTTPレスポンスに推奨されるセキュリティヘッダーを追加します。
@@ -68,66 +65,80 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
 
     Note:
         - このミドルウェアはレスポンスを変更せず、ヘッダーのみ追加します
-        - 既存のヘッダーは上書きされません
         - 開発環境（DEBUG=True）ではHSTSは無効化されます
+        - 追加するヘッダーは初期化時に1回だけ組み立てます
     """
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """リクエストを処理し、セキュリティヘッダーを追加します。
-
-        実行フロー:
-            1. 次のミドルウェア/ハンドラーを呼び出してレスポンスを取得
-            2. レスポンスに基本的なセキュリティヘッダーを追加:
-               - X-Content-Type-Options: nosniff
-               - X-Frame-Options: DENY
-               - X-XSS-Protection: 1; mode=block
-            3. 本番環境（DEBUG=False）の場合のみ追加:
-               - Strict-Transport-Security (HSTS)
-            4. レスポンスを返却
+    def __init__(self, app: ASGIApp):
+        """セキュリティヘッダーミドルウェアを初期化します。
 
         Args:
-            request (Request): HTTPリクエストオブジェクト
-            call_next (Callable): 次のミドルウェア/ハンドラー
-
-        Returns:
-            Response: セキュリティヘッダーが追加されたHTTPレスポンス
+            app (ASGIApp): 次のASGIアプリケーション
+        """
+        self.app = app
+        self.headers = self._build_headers()
+        # ASGIメッセージにそのまま追加できる形式（小文字・バイト列）に変換しておく
+        self._raw_headers = [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in self.headers]
+        self._raw_header_names = {name for name, _ in self._raw_headers}
 
-        Example:
-            >>> # すべてのレスポンスに自動的に以下が追加されます:
-            >>> # X-Content-Type-Options: nosniff
-            >>> # X-Frame-Options: DENY
-            >>> # X-XSS-Protection: 1; mode=block
-            >>> # Strict-Transport-Security: max-age=31536000; includeSubDomains (本番のみ)
+    @staticmethod
+    def _build_headers() -> list[tuple[str, str]]:
+        """レスポンスに追加するセキュリティヘッダーを組み立てます。
 
-        Note:
-            - ミドルウェアの順序は重要です
-            - app_factory.pyで適切な順序で登録してください
-            - 通常、CORSミドルウェアより後に配置します
+        Returns:
+            list[tuple[str, str]]: ヘッダー名と値のリスト
         """
-        # リクエストを処理
-        response = await call_next(request)
-
-        # 基本的なセキュリティヘッダーを追加
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
+        # 基本的なセキュリティヘッダー
+        headers = [
+            ("X-Content-Type-Options", "nosniff"),
+            ("X-Frame-Options", "DENY"),
+            ("X-XSS-Protection", "1; mode=block"),
+        ]
 
         # 本番環境のみ: HSTS (HTTP Strict Transport Security)
         # HTTPSを強制し、中間者攻撃を防止
         if not settings.DEBUG:
-            response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
+            headers.append(("Strict-Transport-Security", "max-age=31536000; includeSubDomains"))
 
         # Content Security Policy (CSP)
         # XSS、データインジェクション攻撃を防止
         # Note: Swagger UI用にcdn.jsdelivr.netを許可
         if settings.ENABLE_CSP:
-            response.headers["Content-Security-Policy"] = (
-                "default-src 'self'; "
-                "script-src 'self' 'unsafe-inline' 'unsafe-eval' https://cdn.jsdelivr.net; "
-                "style-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net; "
-                "img-src 'self' data: https:; "
-                "font-src 'self' data:; "
-                "connect-src 'self'"
+            headers.append(
+                (
+                    "Content-Security-Policy",
+                    "default-src 'self'; "
+                    "script-src 'self' 'unsafe-inline' 'unsafe-eval' https://cdn.jsdelivr.net; "
+                    "style-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net; "
+                    "img-src 'self' data: https:; "
+                    "font-src 'self' data:; "
+                    "connect-src 'self'",
+                )
             )
+        return headers
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """リクエストを処理し、レスポンス開始時にセキュリティヘッダーを追加します。
 
-        return response
+        Args:
+            scope (Scope): ASGIスコープ
+            receive (Receive): ASGIのreceive
+            send (Send): ASGIのsend
+
+        Note:
+            - ミドルウェアの順序は重要です
+            - app_factory.pyで適切な順序で登録してください
+            - 通常、CORSミドルウェアより後に配置します
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # 同名のヘッダーは置き換える
+                headers = [header for header in message.get("headers", []) if header[0].lower() not in self._raw_header_names]
+                message["headers"] = headers + self._raw_headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
@@ -10,27 +10,34 @@
     - 分析セッション更新 (入力ファイル選択／スナップショット復元)(PUT /api/v1/project/{project_id}/analysis/session/{session_id})
     - 分析セッション削除(DELETE /api/v1/project/{project_id}/analysis/session/{session_id})
     - ファイル管理(GET/POST /api/v1/project/{project_id}/analysis/session/{session_id}/file)
+    - ファイルデータ行取得(GET /api/v1/project/{project_id}/analysis/session/{session_id}/file/{file_id}/rows)
     - ファイル設定更新(PATCH /api/v1/project/{project_id}/analysis/session/{session_id}/file/{file_id})
-    - AIチャット実行(POST /api/v1/project/{project_id}/analysis/session/{session_id}/chat)
+    - AIチャット実行ジョブ受付(POST /api/v1/project/{project_id}/analysis/session/{session_id}/chat)
+    - AIチャット実行ジョブ取得(GET /api/v1/project/{project_id}/analysis/session/{session_id}/chat/job/{job_id})
+    - AIチャット進捗配信(GET /api/v1/project/{project_id}/analysis/session/{session_id}/chat/job/{job_id}/events)
     - 分析ステップ作成(POST /api/v1/project/{project_id}/analysis/session/{session_id}/step)
     - 分析ステップ更新削除(PUT/DELETE /api/v1/project/{project_id}/analysis/session/{session_id}/step/{step_id})
 """
 
 import uuid
+from typing import Literal
 
-from fastapi import APIRouter, Body, Path, Query, status
+from fastapi import APIRouter, Body, Header, Path, Query, status
+from fastapi.responses import StreamingResponse
 
 from app.api.core import AnalysisSessionServiceDep, ProjectMemberDep
-from app.core.decorators import async_timeout, handle_service_errors
+from app.core.decorators import handle_service_errors
 from app.core.exceptions import ValidationError
 from app.core.logging import get_logger
 from app.schemas.analysis import (
     AnalysisChatCreate,
+    AnalysisChatJobResponse,
     AnalysisChatListResponse,
     AnalysisFileConfigResponse,
     AnalysisFileCreate,
     AnalysisFileListResponse,
     AnalysisFileResponse,
+    AnalysisFileRowsResponse,
     AnalysisFileUpdate,
     AnalysisSessionCreate,
     AnalysisSessionDetailResponse,
@@ -224,6 +231,10 @@ async def create_session(
     指定されたIDの分析セッション情報を取得します。
     ステップ、ファイル、チャット履歴を含む完全な情報を返します。
 
+    view=compactの場合は現在のスナップショットのみチャット・ステップを含め、
+    その他のスナップショットはヘッダー（ID、順序、日時）のみ、ファイルはデータ（data）を省略して返します。
+    履歴は GET .../snapshot、ファイルのデータ行は GET .../file/{file_id}/rows でページ単位に取得してください。
+
     **認証が必要です。**
     **セッションが属するプロジェクトのメンバーのみアクセス可能です。**
 
@@ -231,6 +242,11 @@ async def create_session(
         - project_id: uuid - プロジェクトID（必須）
         - session_id: uuid - セッションID（必須）
 
+    クエリパラメータ:
+        - view: str - 表示形式（full: 完全、compact: 軽量。デフォルト: full）
+        - result_offset: int - 各ステップのresult_dataの開始行（デフォルト: 0）
+        - result_limit: int | None - 各ステップのresult_dataの取得行数（デフォルト: 全行、最大: 10000）
+
     レスポンス:
         - AnalysisSessionDetailResponse: 分析セッション詳細情報
             - id (uuid): セッションID
@@ -257,6 +273,9 @@ async def get_session(
     session_service: AnalysisSessionServiceDep,
     project_id: uuid.UUID = Path(..., description="プロジェクトID"),
     session_id: uuid.UUID = Path(..., description="分析セッションID"),
+    view: Literal["full", "compact"] = Query("full", description="表示形式（full: 完全、compact: 軽量）"),
+    result_offset: int = Query(0, ge=0, description="各ステップのresult_dataの開始行"),
+    result_limit: int | None = Query(None, ge=1, le=10000, description="各ステップのresult_dataの取得行数"),
 ) -> AnalysisSessionDetailResponse:
     """分析セッション詳細を取得します。
 
@@ -264,6 +283,9 @@ async def get_session(
         session_id (uuid.UUID): セッションID
         member (ProjectMemberDep): プロジェクトメンバー（権限チェック済み）
         session_service (AnalysisSessionServiceDep): 分析セッションサービス
+        view (str): 表示形式
+        result_offset (int): 各ステップのresult_dataの開始行
+        result_limit (int | None): 各ステップのresult_dataの取得行数
 
     Returns:
         AnalysisSessionDetailResponse: 分析セッション詳細
@@ -272,10 +294,17 @@ async def get_session(
         "分析セッション詳細取得リクエスト",
         user_id=str(member.user_id),
         session_id=str(session_id),
+        view=view,
         action="get_session",
     )
 
-    session = await session_service.get_session(project_id, session_id)
+    session = await session_service.get_session(
+        project_id,
+        session_id,
+        compact=view == "compact",
+        result_offset=result_offset,
+        result_limit=result_limit,
+    )
 
     logger.info(
         "分析セッション詳細を取得しました",
@@ -655,6 +684,87 @@ async def list_session_files(
     )
 
 
+@analysis_sessions_router.get(
+    "/project/{project_id}/analysis/session/{session_id}/file/{file_id}/rows",
+    response_model=AnalysisFileRowsResponse,
+    status_code=status.HTTP_200_OK,
+    summary="ファイルデータ行取得",
+    description="""
+    分析セッションに登録されたファイルの入力データを指定範囲の行だけ取得します。
+
+    **認証が必要です。**
+    **セッションが属するプロジェクトのメンバーのみアクセス可能です。**
+
+    パスパラメータ:
+        - project_id: uuid - プロジェクトID（必須）
+        - session_id: uuid - セッションID（必須）
+        - file_id: uuid - 分析ファイルID（必須）
+
+    クエリパラメータ:
+        - skip: int - スキップする行数（デフォルト: 0）
+        - limit: int - 取得する行数（デフォルト: 1000、最大: 10000）
+
+    レスポンス:
+        - AnalysisFileRowsResponse: データ行一覧
+            - file_id (uuid): 分析ファイルID
+            - rows (list[dict[str, Any]]): データ行（pandas DataFrameのrecord形式）
+            - total (int): 総行数
+            - skip (int): スキップ数
+            - limit (int): 取得件数
+
+    ステータスコード:
+        - 200: 成功
+        - 401: 認証されていない
+        - 403: 権限なし（メンバーではない）
+        - 404: セッションまたはファイルが見つからない
+    """,
+)
+@handle_service_errors
+async def get_file_rows(
+    member: ProjectMemberDep,
+    session_service: AnalysisSessionServiceDep,
+    project_id: uuid.UUID = Path(..., description="プロジェクトID"),
+    session_id: uuid.UUID = Path(..., description="分析セッションID"),
+    file_id: uuid.UUID = Path(..., description="分析ファイルID"),
+    skip: int = Query(0, ge=0, description="スキップする行数"),
+    limit: int = Query(1000, ge=1, le=10000, description="取得する行数"),
+) -> AnalysisFileRowsResponse:
+    """ファイルの入力データを指定範囲の行だけ取得します。
+
+    Args:
+        member (ProjectMemberDep): プロジェクトメンバー（権限チェック済み）
+        session_service (AnalysisSessionServiceDep): 分析セッションサービス
+        project_id (uuid.UUID): プロジェクトID
+        session_id (uuid.UUID): セッションID
+        file_id (uuid.UUID): 分析ファイルID
+        skip (int): スキップする行数
+        limit (int): 取得する行数
+
+    Returns:
+        AnalysisFileRowsResponse: データ行一覧
+    """
+    logger.info(
+        "ファイルデータ行取得リクエスト",
+        user_id=str(member.user_id),
+        session_id=str(session_id),
+        file_id=str(file_id),
+        skip=skip,
+        limit=limit,
+        action="get_file_rows",
+    )
+
+    rows = await session_service.get_file_rows(project_id, session_id, file_id, skip, limit)
+
+    logger.info(
+        "ファイルデータ行を取得しました",
+        user_id=str(member.user_id),
+        file_id=str(file_id),
+        count=len(rows.rows),
+    )
+
+    return rows
+
+
 @analysis_sessions_router.post(
     "/project/{project_id}/analysis/session/{session_id}/file",
     response_model=AnalysisFileConfigResponse,
@@ -831,6 +941,10 @@ async def update_file_config(
         - project_id: uuid - プロジェクトID（必須）
         - session_id: uuid - セッションID（必須）
 
+    クエリパラメータ:
+        - skip: int - スキップ数（デフォルト: 0）
+        - limit: int | None - 取得件数（デフォルト: 全件、最大: 500）
+
     レスポンス:
         - AnalysisSnapshotListResponse: スナップショット一覧
             - snapshots (list[AnalysisSnapshotResponse]): スナップショットリスト
@@ -842,6 +956,8 @@ async def update_file_config(
                 - created_at (datetime): 作成日時
                 - updated_at (datetime): 更新日時
             - total (int): 総件数
+            - skip (int): スキップ数
+            - limit (int | None): 取得件数
 
     ステータスコード:
         - 200: 成功
@@ -856,6 +972,8 @@ async def list_snapshots(
     session_service: AnalysisSessionServiceDep,
     project_id: uuid.UUID = Path(..., description="プロジェクトID"),
     session_id: uuid.UUID = Path(..., description="分析セッションID"),
+    skip: int = Query(0, ge=0, description="スキップするレコード数"),
+    limit: int | None = Query(None, ge=1, le=500, description="取得する最大レコード数"),
 ) -> AnalysisSnapshotListResponse:
     """スナップショット一覧を取得します。
 
@@ -864,6 +982,8 @@ async def list_snapshots(
         session_service (AnalysisSessionServiceDep): 分析セッションサービス
         project_id (uuid.UUID): プロジェクトID
         session_id (uuid.UUID): セッションID
+        skip (int): スキップ数
+        limit (int | None): 取得件数
 
     Returns:
         AnalysisSnapshotListResponse: スナップショット一覧
@@ -872,10 +992,16 @@ async def list_snapshots(
         "スナップショット一覧取得リクエスト",
         user_id=str(member.user_id),
         session_id=str(session_id),
+        skip=skip,
+        limit=limit,
         action="list_snapshots",
     )
 
-    snapshots = await session_service.list_snapshots(project_id, session_id)
+    snapshots = await session_service.list_snapshots(project_id, session_id, skip, limit)
+    if skip == 0 and (limit is None or len(snapshots) < limit):
+        total = len(snapshots)
+    else:
+        total = await session_service.count_snapshots(project_id, session_id)
 
     logger.info(
         "スナップショット一覧を取得しました",
@@ -886,7 +1012,9 @@ async def list_snapshots(
 
     return AnalysisSnapshotListResponse(
         snapshots=snapshots,
-        total=len(snapshots),
+        total=total,
+        skip=skip,
+        limit=limit,
     )
 
 
@@ -1125,15 +1253,20 @@ async def delete_chat_message(
 
 @analysis_sessions_router.post(
     "/project/{project_id}/analysis/session/{session_id}/chat",
-    response_model=AnalysisSessionDetailResponse,
-    status_code=status.HTTP_200_OK,
+    response_model=AnalysisChatJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
     summary="AIチャット実行",
     description="""
-    AIエージェントとチャットを実行します(準備中)。
+    AIエージェントとのチャットをバックグラウンドジョブとして受け付けます。
 
     **認証が必要です。**
     **セッションが属するプロジェクトのメンバーのみアクセス可能です。**
 
+    - ジョブIDを即座に返します。チャットはサーバー側で実行され、クライアントが切断しても継続します
+    - 進捗はイベント配信エンドポイント（.../chat/job/{job_id}/events）で取得できます
+    - 完了時に新しいスナップショットが保存され、ジョブ取得エンドポイントで更新後のセッション詳細を取得できます
+    - プロジェクト毎に同時実行数の上限があり、超過分は受付順に実行されます
+
     パスパラメータ:
         - project_id: uuid - プロジェクトID（必須）
         - session_id: uuid - セッションID（必須）
@@ -1145,36 +1278,35 @@ async def delete_chat_message(
         - message (str): ユーザーメッセージ（必須）
 
     レスポンス:
-        - AnalysisSessionDetailResponse: 分析セッション詳細情報
-            - id (uuid): セッションID
-            - project_id (uuid): プロジェクトID
-            - issue_id (uuid): 課題ID
-            - creator_id (uuid): 作成者ID
-            - current_snapshot (int): 現在のスナップショット番号
-            - input_file_id (uuid | None): 入力ファイルID
-            - snapshot_list (list[AnalysisSnapshotResponse]): スナップショット一覧
-            - file_list (list[AnalysisFileResponse]): 分析ファイル一覧
-            - created_at (datetime): 作成日時
-            - updated_at (datetime): 更新日時
+        - AnalysisChatJobResponse: チャット実行ジョブ
+            - job_id (uuid): ジョブID
+            - session_id (uuid): セッションID
+            - status (str): ジョブ状態（queued, running, succeeded, failed）
+            - message (str): ユーザーメッセージ
+            - error (str | None): エラーメッセージ
+            - result (AnalysisSessionDetailResponse | None): 更新後のセッション詳細
+            - created_at (datetime): 受付日時
+            - started_at (datetime | None): 実行開始日時
+            - finished_at (datetime | None): 終了日時
 
     ステータスコード:
-        - 200: 成功
+        - 202: 受付成功
         - 401: 認証されていない
         - 403: 権限なし（メンバーではない）
-        - 404: セッションが見つからない
-        - 504: タイムアウト（10分）
+        - 404: セッションが見つからない、入力ファイルが未選択
+        - 422: メッセージが空
+        - 503: プロジェクトの実行待ち数が上限に達している
     """,
 )
 @handle_service_errors
-@async_timeout(600.0)  # 10分タイムアウト(AIチャット処理)
 async def execute_chat(
     member: ProjectMemberDep,  # 権限チェック（プロジェクトメンバーであることを確認）
     session_service: AnalysisSessionServiceDep,
     project_id: uuid.UUID = Path(..., description="プロジェクトID"),
     session_id: uuid.UUID = Path(..., description="分析セッションID"),
     chat_create: AnalysisChatCreate = Body(..., description="AIチャット実行リクエスト"),
-) -> AnalysisSessionDetailResponse:
-    """AIチャットを実行します。
+) -> AnalysisChatJobResponse:
+    """AIチャットの実行ジョブを受け付けます。
 
     Args:
         session_id (uuid.UUID): セッションID
@@ -1183,7 +1315,7 @@ async def execute_chat(
         chat_create (AnalysisChatCreate): チャット作成データ
 
     Returns:
-        AnalysisSessionDetailResponse: 更新されたセッション詳細
+        AnalysisChatJobResponse: 受け付けたジョブ
     """
     logger.info(
         "AIチャット実行リクエスト",
@@ -1192,17 +1324,130 @@ async def execute_chat(
         action="execute_chat",
     )
 
-    response = await session_service.execute_chat(project_id, session_id, chat_create)
+    response = await session_service.submit_chat(project_id, session_id, member.user_id, chat_create)
 
     logger.info(
-        "AIチャットを実行しました",
+        "AIチャットジョブを受け付けました",
         user_id=str(member.user_id),
         session_id=str(session_id),
+        job_id=str(response.job_id),
     )
 
     return response
 
 
+@analysis_sessions_router.get(
+    "/project/{project_id}/analysis/session/{session_id}/chat/job/{job_id}",
+    response_model=AnalysisChatJobResponse,
+    status_code=status.HTTP_200_OK,
+    summary="AIチャット実行ジョブ取得",
+    description="""
+    AIチャット実行ジョブの状態を取得します。
+
+    **認証が必要です。**
+    **セッションが属するプロジェクトのメンバーのみアクセス可能です。**
+
+    - 成功したジョブは更新後のセッション詳細（result）を含みます
+    - 終了したジョブは一定時間（既定1時間）経過後に取得できなくなります
+
+    パスパラメータ:
+        - project_id: uuid - プロジェクトID（必須）
+        - session_id: uuid - セッションID（必須）
+        - job_id: uuid - ジョブID（必須）
+
+    レスポンス:
+        - AnalysisChatJobResponse: チャット実行ジョブ
+
+    ステータスコード:
+        - 200: 成功
+        - 401: 認証されていない
+        - 403: 権限なし（メンバーではない）
+        - 404: ジョブが見つからない
+    """,
+)
+@handle_service_errors
+async def get_chat_job(
+    member: ProjectMemberDep,  # 権限チェック（プロジェクトメンバーであることを確認）
+    session_service: AnalysisSessionServiceDep,
+    project_id: uuid.UUID = Path(..., description="プロジェクトID"),
+    session_id: uuid.UUID = Path(..., description="分析セッションID"),
+    job_id: uuid.UUID = Path(..., description="ジョブID"),
+) -> AnalysisChatJobResponse:
+    """AIチャット実行ジョブの状態を取得します。
+
+    Args:
+        member (ProjectMemberDep): プロジェクトメンバー（権限チェック済み）
+        session_service (AnalysisSessionServiceDep): 分析セッションサービス
+        project_id (uuid.UUID): プロジェクトID
+        session_id (uuid.UUID): セッションID
+        job_id (uuid.UUID): ジョブID
+
+    Returns:
+        AnalysisChatJobResponse: チャット実行ジョブ
+    """
+    return session_service.get_chat_job(project_id, session_id, job_id).to_response()
+
+
+@analysis_sessions_router.get(
+    "/project/{project_id}/analysis/session/{session_id}/chat/job/{job_id}/events",
+    status_code=status.HTTP_200_OK,
+    summary="AIチャット実行ジョブのイベント配信",
+    response_class=StreamingResponse,
+    description="""
+    AIチャット実行ジョブの進捗をServer-Sent Events（text/event-stream）で配信します。
+
+    **認証が必要です。**
+    **セッションが属するプロジェクトのメンバーのみアクセス可能です。**
+
+    - イベント種別: status, tool_start, tool_end, token, completed, failed
+    - ジョブが終了し、全イベントを配信した時点でストリームを終了します
+    - 再接続時はLast-Event-IDヘッダーで取得済みのイベント番号を指定すると、続きから配信します
+
+    パスパラメータ:
+        - project_id: uuid - プロジェクトID（必須）
+        - session_id: uuid - セッションID（必須）
+        - job_id: uuid - ジョブID（必須）
+
+    ヘッダー:
+        - Last-Event-ID: int - 取得済みのイベント番号（任意）
+
+    ステータスコード:
+        - 200: 成功
+        - 401: 認証されていない
+        - 403: 権限なし（メンバーではない）
+        - 404: ジョブが見つからない
+    """,
+)
+@handle_service_errors
+async def stream_chat_job_events(
+    member: ProjectMemberDep,  # 権限チェック（プロジェクトメンバーであることを確認）
+    session_service: AnalysisSessionServiceDep,
+    project_id: uuid.UUID = Path(..., description="プロジェクトID"),
+    session_id: uuid.UUID = Path(..., description="分析セッションID"),
+    job_id: uuid.UUID = Path(..., description="ジョブID"),
+    last_event_id: int = Header(0, alias="Last-Event-ID", ge=0, description="取得済みのイベント番号"),
+) -> StreamingResponse:
+    """AIチャット実行ジョブの進捗をServer-Sent Eventsで配信します。
+
+    Args:
+        member (ProjectMemberDep): プロジェクトメンバー（権限チェック済み）
+        session_service (AnalysisSessionServiceDep): 分析セッションサービス
+        project_id (uuid.UUID): プロジェクトID
+        session_id (uuid.UUID): セッションID
+        job_id (uuid.UUID): ジョブID
+        last_event_id (int): 取得済みのイベント番号
+
+    Returns:
+        StreamingResponse: text/event-streamのレスポンス
+    """
+    job = session_service.get_chat_job(project_id, session_id, job_id)
+    return StreamingResponse(
+        job.stream_sse(last_event_id=last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 # ================================================================================
 # 分析ステップ管理
 # ================================================================================
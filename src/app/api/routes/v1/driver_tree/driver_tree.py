@@ -12,6 +12,7 @@
     - 業界分類/業界/ドライバーツリー型/KPI選択肢取得（GET /api/v1/project/{project_id}/driver-tree/category）
     - 数式取得（GET /api/v1/project/{project_id}/driver-tree/formula）
     - ドライバーツリー計算結果取得（GET /api/v1/project/{project_id}/driver-tree/tree/{tree_id}/data）
+    - 施策シミュレーション（POST /api/v1/project/{project_id}/driver-tree/tree/{tree_id}/simulation）
     - シミュレーションファイルダウンロード（GET /api/v1/project/{project_id}/driver-tree/tree/{tree_id}/output）
 """
 
@@ -35,6 +36,8 @@ from app.schemas.driver_tree import (
     DriverTreeInfo,
     DriverTreeListResponse,
     DriverTreeResetResponse,
+    DriverTreeSimulationRequest,
+    DriverTreeSimulationResponse,
     TreePoliciesResponse,
 )
 
@@ -697,6 +700,77 @@ async def get_tree_data(
     return DriverTreeCalculatedDataResponse(**result)
 
 
+@driver_tree_trees_router.post(
+    "/project/{project_id}/driver-tree/tree/{tree_id}/simulation",
+    response_model=DriverTreeSimulationResponse,
+    status_code=status.HTTP_200_OK,
+    summary="施策シミュレーション",
+    description="""
+    施策の組み合わせ（シナリオ）毎に、施策の値を対象ノードに加算した場合の
+    KPI（ルートノードの全行の合計値）への効果を一括計算し、費用対効果の順に返します。
+
+    **認証が必要です。**
+
+    パスパラメータ:
+        - project_id: uuid - プロジェクトID（必須）
+        - tree_id: uuid - ツリーID（必須）
+
+    リクエストボディ:
+        - DriverTreeSimulationRequest: 施策シミュレーションリクエスト
+            - policy_id_list (list[uuid]): 対象の施策IDリスト（オプション、省略時はツリーの全施策）
+            - scenario_list (list[list[uuid]]): シナリオ毎の施策IDリスト（オプション、省略時は全ての組み合わせ）
+
+    レスポンス:
+        - DriverTreeSimulationResponse: 施策シミュレーションレスポンス
+            - tree_id (uuid): ツリーID
+            - kpi_node_id (uuid): KPIノードID
+            - kpi_node_label (str): KPIノード名
+            - baseline_value (float): 施策適用前のKPI値
+            - scenarios (list): シナリオ結果（費用対効果の順）
+            - scenario_count (int): シナリオ数
+
+    ステータスコード:
+        - 200: 計算成功
+        - 401: 認証されていない
+        - 403: 権限なし（メンバーではない）
+        - 404: ツリー・施策が見つからない
+        - 422: 計算エラー、シナリオ数が上限を超える場合
+    """,
+)
+@handle_service_errors
+async def simulate_policies(
+    project_id: uuid.UUID,
+    tree_id: uuid.UUID,
+    simulation_data: DriverTreeSimulationRequest,
+    member: ProjectMemberDep,  # 権限チェック（プロジェクトメンバーであることを確認）
+    tree_service: DriverTreeServiceDep,
+) -> DriverTreeSimulationResponse:
+    """施策シミュレーションを実行します。"""
+    logger.info(
+        "施策シミュレーションリクエスト",
+        user_id=str(member.user_id),
+        tree_id=str(tree_id),
+        action="simulate_policies",
+    )
+
+    result = await tree_service.simulate_policies(
+        project_id=project_id,
+        tree_id=tree_id,
+        policy_id_list=simulation_data.policy_id_list,
+        scenario_list=simulation_data.scenario_list,
+        user_id=member.user_id,
+    )
+
+    logger.info(
+        "施策シミュレーションを実行しました",
+        user_id=str(member.user_id),
+        tree_id=str(tree_id),
+        scenario_count=result["scenario_count"],
+    )
+
+    return DriverTreeSimulationResponse(**result)
+
+
 @driver_tree_trees_router.get(
     "/project/{project_id}/driver-tree/tree/{tree_id}/output",
     status_code=status.HTTP_200_OK,
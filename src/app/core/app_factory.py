@@ -201,6 +201,8 @@ def create_app() -> FastAPI:
     #   7. AuditLogMiddleware（監査ログ記録）
     #   8. ActivityTrackingMiddleware（操作履歴記録）
     #   9. PrometheusMetricsMiddleware（最内層 - メトリクス収集）
+    # カスタムミドルウェアはすべて純粋なASGIミドルウェアで、処理開始時刻・クライアントIP・
+    # リクエストボディ等はRequestContext（app/api/middlewares/context.py）で共有する
 
     app.add_middleware(PrometheusMetricsMiddleware)
 
@@ -219,6 +221,8 @@ def create_app() -> FastAPI:
         RateLimitMiddleware,
         calls=settings.RATE_LIMIT_CALLS,
         period=settings.RATE_LIMIT_PERIOD,
+        route_limits=settings.RATE_LIMIT_ROUTE_LIMITS,
+        user_limits=settings.RATE_LIMIT_USER_LIMITS,
     )
 
     # CORSミドルウェア（config.pyで必ずALLOWED_ORIGINSが設定されている）
@@ -1,16 +1,19 @@
 """Redisを使用したアプリケーションキャッシュ管理システム。
 
-このモジュールは、Redisをバックエンドとしたキャッシュシステムを提供します。
+このモジュールは、プロセス内キャッシュ（L1）とRedis（L2）の2段構成の
+キャッシュシステムを提供します。
 データベースクエリ結果やAPI応答のキャッシュにより、アプリケーションの
 パフォーマンスを向上させます。グレースフルデグラデーション設計により、
 Redis接続エラー時もアプリケーションは正常に動作します。
 
 主な機能:
     キャッシュ操作:
-        - get(): データ取得
-        - set(): データ保存（TTL設定可能）
+        - get(): データ取得（L1 → L2の順に参照）
+        - set(): データ保存（TTL・L1保持時間・タグ設定可能）
+        - get_or_set(): 取得、なければ計算して保存（同時実行の集約・期限切れ値の返却付き）
         - delete(): データ削除
         - exists(): 存在チェック
+        - invalidate_tags(): タグ単位の削除
         - clear(): パターン一致削除
 
     接続管理:
@@ -69,10 +72,26 @@ Redis接続エラー時もアプリケーションは正常に動作します。
     - 長TTL（86400秒 = 24時間）: ほぼ不変のデータ（マスターデータ等）
     - 無期限: 明示的に削除されるまで保持（TTL=0）
 
+2段キャッシュ（L1 + L2）:
+    - L1: ワーカープロセス内のLRU（CACHE_LOCAL_MAX_ENTRIES件・CACHE_LOCAL_MAX_BYTESバイトで上限）
+        - set(local_ttl=...)・get_or_set()で保存した値のみ保持します
+        - シリアライズ済みの値を保持するため、取得した値を変更してもキャッシュには影響しません
+        - 他ワーカーでの削除は反映されないため、L1の保持時間は短く設定してください
+    - L2: Redis（全ワーカーで共有）
+
+スタンピード対策（get_or_set）:
+    - 同一キーのキャッシュミスはワーカー内で1回だけ計算し、同時に待機した呼び出しは結果を共有する
+    - stale_ttlを指定すると、有効期限（expire）切れ後もstale_ttlの間は古い値を即座に返し、
+      バックグラウンドで再計算する（stale-while-revalidate）
+
+タグによる無効化:
+    - set()・get_or_set()にtagsを指定すると、invalidate_tags()でタグ単位に削除できます
+    - Redis上ではタグ毎にキーの集合を保持し、Luaスクリプト1回で削除します（SCANを使用しません）
+
 データシリアライゼーション:
-    - JSON形式で保存（json.dumps/json.loads）
-    - ensure_ascii=False で日本語もそのまま保存
-    - datetime等はdefault=strで文字列に変換
+    - orjsonでJSON形式にシリアライズ（json.dumpsより高速、UTF-8のまま保存）
+    - datetime・UUID・Enum・dataclassはorjsonが変換、それ以外はstrで文字列に変換
+    - Redisには {"v": 値, "f": 新鮮期限} の形式で保存（get()は値のみを返す）
 
 Note:
     - REDIS_URLが設定されていない場合、キャッシュは無効化されます
@@ -81,16 +100,202 @@ Note:
     - シャットダウン時は必ず disconnect() を呼び出してください
 """
 
-import json
+import asyncio
+import fnmatch
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
 from typing import Any
 
+import orjson
+from prometheus_client import Counter, Gauge
 from redis.asyncio import Redis
+from redis.commands.core import AsyncScript
 
 from app.core.config import settings
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# NOTE: app.api.middlewares.metrics はミドルウェア経由で本モジュールをインポートするため、
+# 循環インポートを避けてキャッシュのメトリクスはここで定義する
+cache_requests_total = Counter(
+    "cache_requests_total",
+    "キャッシュ参照数",
+    ["result"],  # l1_hit, l2_hit, stale, miss
+)
+
+cache_coalesced_total = Counter(
+    "cache_coalesced_total",
+    "計算中の同一キーの結果を待機したキャッシュミス数",
+)
+
+cache_local_entries = Gauge(
+    "cache_local_entries",
+    "プロセス内キャッシュ（L1）のエントリ数",
+)
+
+cache_local_bytes = Gauge(
+    "cache_local_bytes",
+    "プロセス内キャッシュ（L1）が保持するシリアライズ済みデータのバイト数",
+)
+
+# 値の保存とタグへの登録を1回の往復で行う
+# KEYS[1]: 値のキー, KEYS[2..]: タグのキー / ARGV[1]: 値, ARGV[2]: TTL（秒、0で無期限）
+SET_WITH_TAGS_SCRIPT = """
+local ttl = tonumber(ARGV[2])
+if ttl > 0 then
+    redis.call('SET', KEYS[1], ARGV[1], 'EX', ttl)
+else
+    redis.call('SET', KEYS[1], ARGV[1])
+end
+for i = 2, #KEYS do
+    local existed = redis.call('EXISTS', KEYS[i])
+    redis.call('SADD', KEYS[i], KEYS[1])
+    local current = redis.call('TTL', KEYS[i])
+    if ttl == 0 then
+        redis.call('PERSIST', KEYS[i])
+    elseif existed == 0 or (current >= 0 and current < ttl) then
+        redis.call('EXPIRE', KEYS[i], ttl)
+    end
+end
+return 1
+"""
+
+# タグに登録されたキーとタグ自体を削除する
+# KEYS: タグのキー
+INVALIDATE_TAGS_SCRIPT = """
+local deleted = 0
+for i = 1, #KEYS do
+    local members = redis.call('SMEMBERS', KEYS[i])
+    for j = 1, #members, 500 do
+        deleted = deleted + redis.call('DEL', unpack(members, j, math.min(j + 499, #members)))
+    end
+    redis.call('DEL', KEYS[i])
+end
+return deleted
+"""
+
+
+def _dumps(value: Any) -> bytes:
+    """値をJSON（UTF-8）にシリアライズします。"""
+    return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+def _unwrap(raw: str | bytes) -> tuple[Any, float | None]:
+    """保存形式から値と新鮮期限（UNIX時刻）を取り出します。
+
+    {"v": 値, "f": 新鮮期限} 形式でない値（以前の形式）はそのまま値として扱います。
+    """
+    data = orjson.loads(raw)
+    if isinstance(data, dict) and data.keys() == {"v", "f"}:
+        return data["v"], data["f"]
+    return data, None
+
+
+@dataclass
+class _LocalEntry:
+    """プロセス内キャッシュのエントリ。
+
+    Attributes:
+        data: シリアライズ済みの値（保存形式）
+        expires_at: L1から破棄する時刻（time.monotonic基準）
+        fresh_until: 新鮮期限（UNIX時刻、Noneは期限なし）
+        tags: 付与されたタグ
+    """
+
+    data: str | bytes
+    expires_at: float
+    fresh_until: float | None
+    tags: frozenset[str]
+
+
+class LocalCache:
+    """件数・バイト数上限付きのプロセス内LRUキャッシュ。"""
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        """キャッシュを初期化します。
+
+        Args:
+            max_entries: 保持するエントリ数の上限（0以下でL1無効）
+            max_bytes: 保持するシリアライズ済みデータの合計バイト数の上限
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, _LocalEntry] = OrderedDict()
+        self._tags: dict[str, set[str]] = {}
+        self._current_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> _LocalEntry | None:
+        """有効期限内のエントリを取得します（期限切れのエントリは破棄します）。"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            self.delete(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: str, data: str | bytes, ttl: float, fresh_until: float | None, tags: Iterable[str]) -> None:
+        """エントリを登録します（上限を超える場合は最も長く使われていないエントリから破棄します）。"""
+        if self.max_entries <= 0 or ttl <= 0 or len(data) > self.max_bytes:
+            self.delete(key)
+            return
+        self.delete(key)
+        entry = _LocalEntry(data=data, expires_at=time.monotonic() + ttl, fresh_until=fresh_until, tags=frozenset(tags))
+        self._entries[key] = entry
+        self._current_bytes += len(data)
+        for tag in entry.tags:
+            self._tags.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries or self._current_bytes > self.max_bytes:
+            self.delete(next(iter(self._entries)))
+        self._update_gauges()
+
+    def delete(self, key: str) -> bool:
+        """エントリを削除します。"""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self._current_bytes -= len(entry.data)
+        for tag in entry.tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+        self._update_gauges()
+        return True
+
+    def delete_tags(self, tags: Iterable[str]) -> int:
+        """タグが付与されたエントリを削除します。"""
+        keys = {key for tag in tags for key in self._tags.get(tag, ())}
+        for key in keys:
+            self.delete(key)
+        return len(keys)
+
+    def delete_matching(self, pattern: str) -> int:
+        """globパターンに一致するエントリを削除します。"""
+        keys = [key for key in self._entries if fnmatch.fnmatchcase(key, pattern)]
+        for key in keys:
+            self.delete(key)
+        return len(keys)
+
+    def clear(self) -> None:
+        """全エントリを削除します。"""
+        self._entries.clear()
+        self._tags.clear()
+        self._current_bytes = 0
+        self._update_gauges()
+
+    def _update_gauges(self) -> None:
+        cache_local_entries.set(len(self._entries))
+        cache_local_bytes.set(self._current_bytes)
+
 
 class CacheManager:
     """Redisベースのキャッシュ管理クラス。
@@ -162,7 +367,10 @@ class CacheManager:
             - Redis接続は __init__ では確立されません（connect() を呼び出す必要があります）
         """
         self._redis: Redis[str] | None = None
+        self._scripts: dict[str, AsyncScript] = {}
         self.key_prefix = f"{settings.APP_NAME}:{settings.ENVIRONMENT}:{key_prefix}"
+        self._local = LocalCache(max_entries=settings.CACHE_LOCAL_MAX_ENTRIES, max_bytes=settings.CACHE_LOCAL_MAX_BYTES)
+        self._inflight: dict[str, asyncio.Task[Any]] = {}
 
     def _make_key(self, key: str) -> str:
         """キープレフィックスを元のキーに付与して完全なキーを生成します。
@@ -231,6 +439,8 @@ class CacheManager:
             ValueError: REDIS_URLの形式が不正な場合
         """
         if settings.REDIS_URL:
+            # 登録済みスクリプトは接続ごとのクライアントに紐づくため破棄する
+            self._scripts.clear()
             self._redis = await Redis.from_url(
                 settings.REDIS_URL,
                 encoding="utf-8",
@@ -298,20 +508,49 @@ class CacheManager:
             ...     print(f"Session found: {session}")
 
         Note:
+            - L1（プロセス内）に保持されていればRedisに問い合わせずに返します
             - データはJSON形式でRedisに保存されています
             - 取得時に自動的にPythonオブジェクトにデシリアライズされます
+              （datetime・UUID等は文字列として返ります）
+            - 新鮮期限（stale_ttl指定時）を過ぎた値もRedisに残っている間は返します
             - Redis接続エラーはログに記録され、Noneを返します
             - アプリケーションは正常に動作を継続します（キャッシュなしモード）
         """
+        found = await self._lookup(key)
+        return found[0] if found is not None else None
+
+    async def _lookup(
+        self,
+        key: str,
+        local_ttl: float | None = None,
+        tags: Iterable[str] = (),
+    ) -> tuple[Any, float | None] | None:
+        """L1、L2の順に値と新鮮期限を取得します。
+
+        Args:
+            key: キャッシュキー（プレフィックスなし）
+            local_ttl: L2ヒット時にL1へ保持する時間（秒、Noneの場合は保持しない）
+            tags: L1へ保持する際に付与するタグ
+
+        Returns:
+            tuple[Any, float | None] | None: (値, 新鮮期限)、キャッシュにない場合はNone
+        """
+        full_key = self._make_key(key)
+        entry = self._local.get(full_key)
+        if entry is not None:
+            cache_requests_total.labels(result="l1_hit").inc()
+            return _unwrap(entry.data)[0], entry.fresh_until
+
         if not self._redis:
+            cache_requests_total.labels(result="miss").inc()
             return None
 
-        full_key = self._make_key(key)
         try:
-            value = await self._redis.get(full_key)
-            if value:
-                return json.loads(value)
-            return None
+            raw = await self._redis.get(full_key)
+            if raw is None:
+                cache_requests_total.labels(result="miss").inc()
+                return None
+            value, fresh_until = _unwrap(raw)
         except Exception as e:
             logger.exception(
                 "キャッシュ取得エラー",
@@ -321,11 +560,20 @@ class CacheManager:
             )
             return None  # エラー時はキャッシュなしとして動作
 
+        cache_requests_total.labels(result="l2_hit").inc()
+        if local_ttl:
+            self._local.set(full_key, raw, local_ttl, fresh_until, tags)
+        return value, fresh_until
+
     async def set(
         self,
         key: str,
         value: Any,
         expire: int | None = None,
+        *,
+        stale_ttl: int = 0,
+        local_ttl: float | None = None,
+        tags: Iterable[str] = (),
     ) -> bool:
         """データをキャッシュに保存します。
 
@@ -343,6 +591,11 @@ class CacheManager:
                 - None: デフォルトTTL（settings.CACHE_TTL）を使用
                 - 0: 無期限（明示的削除まで保持）
                 - 正の整数: 指定秒数後に自動削除
+            stale_ttl (int): 有効期限切れ後も古い値として保持する時間（秒）
+                - get_or_set() はこの間、古い値を返しつつバックグラウンドで再計算します
+            local_ttl (float | None): L1（プロセス内）に保持する時間（秒）
+                - None: L1に保持しない
+            tags (Iterable[str]): invalidate_tags() で削除するためのタグ
 
         Returns:
             bool: 成功時True、失敗時False
@@ -366,22 +619,42 @@ class CacheManager:
             >>> await cache_manager.set("log:123", log_data, expire=60)
 
         Note:
-            - データはJSON形式でシリアライズされます
-            - ensure_ascii=Falseで日本語も正しく保存されます
-            - datetime等の非JSON型はdefault=strで自動変換されます
+            - データはorjsonでJSON形式にシリアライズされます（日本語もそのまま保存）
+            - datetime・UUID以外の非JSON型はstrで自動変換されます
+            - local_ttl指定時はRedis未接続でもL1には保存されます（戻り値はFalse）
             - Redis接続エラーはログに記録され、Falseを返します
             - エラー時もアプリケーションは正常に動作を継続します
         """
+        full_key = self._make_key(key)
+        tags = tuple(tags)
+        ttl = expire if expire is not None else settings.CACHE_TTL
+        fresh_until = time.time() + ttl if ttl > 0 and stale_ttl > 0 else None
+        redis_ttl = ttl + stale_ttl if ttl > 0 else 0
+        try:
+            serialized = _dumps({"v": value, "f": fresh_until})
+        except Exception as e:
+            logger.exception(
+                "キャッシュ設定エラー",
+                cache_key=full_key,
+                error_type=type(e).__name__,
+                error_message=str(e),
+            )
+            return False
+
+        if local_ttl:
+            self._local.set(full_key, serialized, local_ttl, fresh_until, tags)
+        else:
+            self._local.delete(full_key)
+
         if not self._redis:
             return False
 
-        full_key = self._make_key(key)
         try:
-            serialized = json.dumps(value, ensure_ascii=False, default=str)
-            ttl = expire if expire is not None else settings.CACHE_TTL
-
-            if ttl > 0:
-                await self._redis.setex(full_key, ttl, serialized)
+            if tags:
+                tag_keys = [self._make_key(f"tag:{tag}") for tag in tags]
+                await self._eval(SET_WITH_TAGS_SCRIPT, [full_key, *tag_keys], [serialized, redis_ttl])
+            elif redis_ttl > 0:
+                await self._redis.setex(full_key, redis_ttl, serialized)
             else:
                 await self._redis.set(full_key, serialized)
             return True
@@ -424,13 +697,15 @@ class CacheManager:
 
         Note:
             - キーが存在しない場合でもTrueを返します
+            - L1（このワーカーのみ）とRedisの両方から削除します
             - Redis接続エラーはログに記録され、Falseを返します
             - データ更新時は必ずキャッシュを削除してください（整合性維持）
         """
+        full_key = self._make_key(key)
+        self._local.delete(full_key)
         if not self._redis:
             return False
 
-        full_key = self._make_key(key)
         try:
             await self._redis.delete(full_key)
             return True
@@ -481,10 +756,12 @@ class CacheManager:
             - Redis接続エラーはログに記録され、Falseを返します
             - TTL切れの直前にTrue判定される場合があります（競合状態）
         """
+        full_key = self._make_key(key)
+        if self._local.get(full_key) is not None:
+            return True
         if not self._redis:
             return False
 
-        full_key = self._make_key(key)
         try:
             return await self._redis.exists(full_key) > 0
         except Exception as e:
@@ -529,6 +806,9 @@ class CacheManager:
 
         Note:
             - SCAN操作により、大量のキーでもブロッキングしません
+            - 関連するキャッシュをまとめて削除する用途では、保存時にtagsを指定して
+              invalidate_tags() を使用してください（SCANより高速です）
+            - L1（このワーカーのみ）からも一致するキーを削除します
             - パターンマッチングはRedis標準のglob形式です
             - "*" パターンは全キャッシュを削除するため、本番環境では注意してください
             - Redis接続エラーはログに記録され、Falseを返します
@@ -538,10 +818,11 @@ class CacheManager:
             - 大量のキー削除はRedisサーバーに負荷をかけます
             - 本番環境での全キャッシュクリア（"*"）は慎重に実行してください
         """
+        full_pattern = self._make_key(pattern)
+        self._local.delete_matching(full_pattern)
         if not self._redis:
             return False
 
-        full_pattern = self._make_key(pattern)
         try:
             async for key in self._redis.scan_iter(match=full_pattern):
                 await self._redis.delete(key)
@@ -555,117 +836,200 @@ class CacheManager:
             )
             return False
 
-    # ========================================================================
-    # Public API for advanced Redis operations (レート制限等で使用)
-    # ========================================================================
-
-    def is_redis_available(self) -> bool:
-        """Redis接続が利用可能かを確認します。
+    async def invalidate_tags(self, *tags: str) -> bool:
+        """タグが付与されたキャッシュをすべて削除します。
 
-        Returns:
-            bool: Redis接続が確立されている場合True、それ以外False
-        """
-        return self._redis is not None
-
-    async def zremrangebyscore(self, key: str, min_score: float, max_score: float) -> int:
-        """Sorted Setから指定スコア範囲の要素を削除します（レート制限用）。
+        set()・get_or_set() でtagsを指定して保存したキーを、Luaスクリプト1回で削除します。
 
         Args:
-            key (str): Sorted Setのキー
-            min_score (float): 最小スコア
-            max_score (float): 最大スコア
+            *tags (str): 削除するタグ
+                例: "dashboard", "project:123"
 
         Returns:
-            int: 削除された要素数（Redis未接続時は0）
+            bool: 成功時True、失敗時False
+                - True: 削除成功（タグが付与されたキーがない場合も含む）
+                - False: Redis未接続またはエラー
+
+        Example:
+            >>> await cache_manager.set("dashboard:stats", stats, expire=60, tags=["dashboard"])
+            >>> await cache_manager.invalidate_tags("dashboard")
+
+        Note:
+            - L1（このワーカーのみ）からもタグが付与されたキーを削除します
+            - 他ワーカーのL1はlocal_ttl経過後に失効します
         """
-        if not self._redis:
-            return 0
+        self._local.delete_tags(tags)
+        if not self._redis or not tags:
+            return False
 
-        full_key = self._make_key(key)
+        tag_keys = [self._make_key(f"tag:{tag}") for tag in tags]
         try:
-            return await self._redis.zremrangebyscore(full_key, min_score, max_score)
+            await self._eval(INVALIDATE_TAGS_SCRIPT, tag_keys, [])
+            return True
         except Exception as e:
             logger.exception(
-                "Sorted Set範囲削除エラー",
-                cache_key=full_key,
+                "キャッシュタグ削除エラー",
+                tags=list(tags),
                 error_type=type(e).__name__,
                 error_message=str(e),
             )
-            return 0
+            return False
 
-    async def zcard(self, key: str) -> int:
-        """Sorted Setの要素数を取得します（レート制限用）。
+    async def get_or_set(
+        self,
+        key: str,
+        factory: Callable[[], Awaitable[Any]],
+        expire: int | None = None,
+        *,
+        stale_ttl: int = 0,
+        local_ttl: float | None = None,
+        tags: Iterable[str] = (),
+        refresh: Callable[[], Awaitable[Any]] | None = None,
+    ) -> Any:
+        """キャッシュから取得し、存在しない場合はfactoryで計算して保存します。
+
+        スタンピード対策:
+            - 同一キーのキャッシュミスはワーカー内で1回だけfactoryを実行し、
+              同時に待機した呼び出しは結果を共有します
+            - stale_ttlを指定した場合、有効期限切れ後もstale_ttlの間は古い値を即座に返し、
+              バックグラウンドで再計算します（stale-while-revalidate）
 
         Args:
-            key (str): Sorted Setのキー
+            key (str): キャッシュキー
+            factory: 値を計算する関数（JSON変換可能な値を返すこと）
+            expire (int | None): 有効期限（秒、Noneの場合はsettings.CACHE_TTL）
+            stale_ttl (int): 有効期限切れ後に古い値を返す時間（秒）
+            local_ttl (float | None): L1に保持する時間（秒、Noneの場合はsettings.CACHE_LOCAL_TTL、0でL1無効）
+            tags (Iterable[str]): invalidate_tags() で削除するためのタグ
+            refresh: バックグラウンド再計算に使用する関数（省略時はfactory）
+                - factoryがリクエストのDBセッションを使用する場合は、
+                  独自のセッションを開く関数を指定してください
 
         Returns:
-            int: 要素数（Redis未接続時は0）
-        """
-        if not self._redis:
-            return 0
+            Any: キャッシュされた値、または計算した値
 
-        full_key = self._make_key(key)
-        try:
-            return await self._redis.zcard(full_key)
-        except Exception as e:
-            logger.exception(
-                "Sorted Setカウントエラー",
-                cache_key=full_key,
-                error_type=type(e).__name__,
-                error_message=str(e),
-            )
-            return 0
+        Example:
+            >>> stats = await cache_manager.get_or_set(
+            ...     "dashboard:stats",
+            ...     compute_stats,
+            ...     expire=60,
+            ...     stale_ttl=300,
+            ...     tags=["dashboard"],
+            ... )
 
-    async def zadd(self, key: str, mapping: dict[str | bytes, float]) -> int:
-        """Sorted Setに要素を追加します（レート制限用）。
+        Note:
+            - キャッシュから取得した値はJSONからの復元値です（datetime等は文字列）。
+              計算直後と型を揃える必要がある場合は、factoryでJSON互換の値を返してください
+            - factoryの例外は呼び出し元（待機中の全呼び出し）に送出され、キャッシュには保存されません
+            - Redis未接続時もL1・同時実行の集約は有効です
+        """
+        ttl = expire if expire is not None else settings.CACHE_TTL
+        local_ttl = settings.CACHE_LOCAL_TTL if local_ttl is None else local_ttl
+        tags = tuple(tags)
+
+        found = await self._lookup(key, local_ttl=local_ttl, tags=tags)
+        if found is not None:
+            value, fresh_until = found
+            if fresh_until is not None and fresh_until <= time.time():
+                cache_requests_total.labels(result="stale").inc()
+                if key not in self._inflight:
+                    self._start_compute(key, refresh or factory, ttl, stale_ttl, local_ttl, tags)
+            return value
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._start_compute(key, factory, ttl, stale_ttl, local_ttl, tags)
+        else:
+            cache_coalesced_total.inc()
+        # 待機側がキャンセルされても計算は継続し、他の待機中の呼び出しに結果を返す
+        return await asyncio.shield(task)
+
+    def clear_local(self) -> None:
+        """L1（このワーカーのプロセス内キャッシュ）の全エントリを削除します。"""
+        self._local.clear()
+
+    def _start_compute(
+        self,
+        key: str,
+        factory: Callable[[], Awaitable[Any]],
+        ttl: int,
+        stale_ttl: int,
+        local_ttl: float,
+        tags: tuple[str, ...],
+    ) -> asyncio.Task[Any]:
+        """値の計算と保存をタスクとして開始し、同一キーの計算中タスクとして登録します。"""
+
+        async def compute() -> Any:
+            value = await factory()
+            await self.set(key, value, ttl, stale_ttl=stale_ttl, local_ttl=local_ttl, tags=tags)
+            return value
+
+        task = asyncio.create_task(compute(), name=f"cache-compute:{key}")
+        self._inflight[key] = task
+
+        def done(finished: asyncio.Task[Any]) -> None:
+            if self._inflight.get(key) is finished:
+                del self._inflight[key]
+            if not finished.cancelled() and finished.exception() is not None:
+                logger.warning(
+                    "キャッシュ値の計算に失敗しました",
+                    cache_key=key,
+                    error_type=type(finished.exception()).__name__,
+                    error_message=str(finished.exception()),
+                )
+
+        task.add_done_callback(done)
+        return task
 
-        Args:
-            key (str): Sorted Setのキー
-            mapping (dict[str, float]): {要素: スコア} の辞書
+    # ========================================================================
+    # Public API for advanced Redis operations (レート制限等で使用)
+    # ========================================================================
+
+    def is_redis_available(self) -> bool:
+        """Redis接続が利用可能かを確認します。
 
         Returns:
-            int: 追加された要素数（Redis未接続時は0）
+            bool: Redis接続が確立されている場合True、それ以外False
         """
-        if not self._redis:
-            return 0
+        return self._redis is not None
 
-        full_key = self._make_key(key)
-        try:
-            return await self._redis.zadd(full_key, mapping)
-        except Exception as e:
-            logger.exception(
-                "Sorted Set追加エラー",
-                cache_key=full_key,
-                error_type=type(e).__name__,
-                error_message=str(e),
-            )
-            return 0
+    async def run_script(self, script: str, keys: list[str], args: list[str | int | float]) -> Any:
+        """Luaスクリプトをサーバー側で実行します（レート制限用）。
 
-    async def expire_key(self, key: str, seconds: int) -> bool:
-        """キーにTTLを設定します（レート制限用）。
+        スクリプトは初回実行時に登録し、以降はEVALSHAで実行します。
+        キーにはプレフィックスが自動的に付与されます。
 
         Args:
-            key (str): キー
-            seconds (int): TTL（秒）
+            script (str): Luaスクリプト
+            keys (list[str]): スクリプトに渡すキー（KEYS）
+            args (list[str | int | float]): スクリプトに渡す引数（ARGV）
 
         Returns:
-            bool: 成功時True、失敗時False
+            Any: スクリプトの戻り値（Redis未接続時・エラー時はNone）
         """
         if not self._redis:
-            return False
+            return None
 
-        full_key = self._make_key(key)
+        full_keys = [self._make_key(key) for key in keys]
         try:
-            return await self._redis.expire(full_key, seconds)
+            return await self._eval(script, full_keys, args)
         except Exception as e:
             logger.exception(
-                "TTL設定エラー",
-                cache_key=full_key,
+                "Luaスクリプト実行エラー",
+                cache_keys=full_keys,
                 error_type=type(e).__name__,
                 error_message=str(e),
             )
-            return False
+            return None
+
+    async def _eval(self, script: str, full_keys: list[str], args: list[Any]) -> Any:
+        """登録済みのLuaスクリプトを実行します（未登録の場合は登録します）。"""
+        assert self._redis is not None
+        registered = self._scripts.get(script)
+        if registered is None:
+            registered = self._redis.register_script(script)
+            self._scripts[script] = registered
+        return await registered(keys=full_keys, args=args)
 
 
 # グローバルキャッシュマネージャーインスタンス
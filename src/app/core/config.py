@@ -150,13 +150,14 @@ class Settings(BaseSettings):
            - SECRET_KEY（必須、32文字以上）
            - ALGORITHM（JWT署名アルゴリズム）
            - ACCESS_TOKEN_EXPIRE_MINUTES
-           - RATE_LIMIT_CALLS、RATE_LIMIT_PERIOD
+           - RATE_LIMIT_CALLS、RATE_LIMIT_PERIOD、RATE_LIMIT_ROUTE_LIMITS、RATE_LIMIT_USER_LIMITS
            - MAX_LOGIN_ATTEMPTS、ACCOUNT_LOCK_DURATION_HOURS
 
         4. **データベース設定**:
            - DATABASE_URL（本番用）
            - TEST_DATABASE_URL、TEST_DATABASE_ADMIN_URL、TEST_DATABASE_NAME
            - DB_POOL_SIZE、DB_MAX_OVERFLOW、DB_POOL_RECYCLE、DB_POOL_PRE_PING
+           - DB_PARALLEL_QUERY_MAX_CONCURRENCY
 
         5. **Redisキャッシュ設定**:
            - REDIS_URL、CACHE_TTL
@@ -252,6 +253,17 @@ class Settings(BaseSettings):
     # レート制限設定
     RATE_LIMIT_CALLS: int = 100
     RATE_LIMIT_PERIOD: int = 60  # 秒単位
+    RATE_LIMIT_ROUTE_LIMITS: dict[str, tuple[int, int]] = Field(
+        default_factory=dict,
+        description=(
+            'パスプレフィックスごとのレート制限（例: {"/api/v1/auth": [10, 60]} = 10リクエスト/60秒）。'
+            "最長一致のプレフィックスを適用し、プレフィックスごとに別枠でカウントする"
+        ),
+    )
+    RATE_LIMIT_USER_LIMITS: dict[str, tuple[int, int]] = Field(
+        default_factory=dict,
+        description='クライアント識別子ごとのレート制限（例: {"user:<user_id>": [1000, 60]}）。ルート・デフォルトの制限より優先する',
+    )
 
     # セキュリティヘッダー設定
     ENABLE_CSP: bool = Field(
@@ -300,10 +312,161 @@ class Settings(BaseSettings):
         default=True,
         description="接続前のPINGチェック",
     )
+    DB_PARALLEL_QUERY_MAX_CONCURRENCY: int = Field(
+        default=4,
+        ge=1,
+        description=(
+            "読み取りクエリの並行実行（parallel_query_executor）で同時に使用する接続数の上限（プロセス全体）。"
+            "DB_POOL_SIZE + DB_MAX_OVERFLOW より小さい値を設定する。1の場合は呼び出し元のセッションで順に実行する"
+        ),
+    )
 
     # Redisキャッシュ設定
     REDIS_URL: str | None = None  # 例: "redis://localhost:6379/0"
     CACHE_TTL: int = 300  # デフォルトキャッシュTTL（秒）
+    CACHE_LOCAL_TTL: float = Field(
+        default=10.0,
+        ge=0,
+        description="get_or_set()でプロセス内キャッシュ（L1）に保持するデフォルト時間（秒）。0でL1を使用しない。",
+    )
+    CACHE_LOCAL_MAX_ENTRIES: int = Field(
+        default=2048,
+        ge=0,
+        description="プロセス内キャッシュ（L1）に保持する最大件数。0でL1を無効化。",
+    )
+    CACHE_LOCAL_MAX_BYTES: int = Field(
+        default=64 * 1024 * 1024,
+        ge=0,
+        description="プロセス内キャッシュ（L1）に保持するシリアライズ済みデータの合計バイト数の上限。",
+    )
+
+    # ダッシュボードキャッシュ設定
+    DASHBOARD_CACHE_TTL_SECONDS: int = Field(
+        default=60,
+        ge=1,
+        description="ダッシュボードの統計・チャートをキャッシュする時間（秒）。",
+    )
+    DASHBOARD_CACHE_STALE_SECONDS: int = Field(
+        default=300,
+        ge=0,
+        description="有効期限切れ後も古い統計・チャートを返しつつバックグラウンドで再計算する時間（秒）。",
+    )
+
+    # 統計情報の定期処理設定（操作履歴の集計・ストレージ使用量のスナップショット）
+    STATISTICS_JOBS_ENABLED: bool = Field(
+        default=True,
+        description="統計情報の定期処理（操作履歴の集計、ストレージ使用量のスナップショット・整合処理）を実行するか。",
+    )
+    STATISTICS_JOBS_INTERVAL_SECONDS: int = Field(
+        default=300,
+        ge=1,
+        description="統計情報の定期処理の実行間隔（秒）。",
+    )
+    STATISTICS_ROLLUP_LAG_SECONDS: int = Field(
+        default=300,
+        ge=0,
+        description="集計対象とする時間帯の終了から待機する時間（秒）。書き込みの遅延した操作履歴を取りこぼさないための猶予。",
+    )
+    STATISTICS_ROLLUP_MAX_HOURS_PER_RUN: int = Field(
+        default=168,
+        ge=1,
+        description="1回の集計処理で集計する最大時間数。初回の集計（既存データ）はこの単位で分割して実行する。",
+    )
+
+    # 分析ステートキャッシュ設定（プロセス内LRU）
+    ANALYSIS_STATE_CACHE_MAX_BYTES: int = Field(
+        default=256 * 1024 * 1024,
+        ge=0,
+        description="構築済みAnalysisStateを保持するプロセス内キャッシュの上限（バイト）。0で無効化。",
+    )
+    ANALYSIS_INPUT_FRAME_CACHE_SIZE: int = Field(
+        default=32,
+        ge=0,
+        description="Parquetからデコードした分析入力データを保持するプロセス内キャッシュの最大件数。0で無効化。",
+    )
+
+    # ドライバーツリー計算設定（計算結果キャッシュはプロセス内LRU）
+    DRIVER_TREE_CALCULATION_CACHE_SIZE: int = Field(
+        default=128,
+        ge=0,
+        description="コンパイル済みの計算プランとノード毎の計算結果を保持するツリー数の上限。0で無効化。",
+    )
+    DRIVER_TREE_SIMULATION_MAX_SCENARIOS: int = Field(
+        default=1024,
+        ge=1,
+        description="施策シミュレーションで1回に評価するシナリオ数の上限（施策の組み合わせ数）。",
+    )
+
+    # 認証キャッシュ設定（認証ユーザー・プロジェクトメンバーシップ）
+    PRINCIPAL_CACHE_TTL_SECONDS: int = Field(
+        default=60,
+        ge=1,
+        description="認証ユーザー・メンバーシップをRedisに保持する時間（秒）。",
+    )
+    PRINCIPAL_CACHE_LOCAL_TTL_SECONDS: float = Field(
+        default=5.0,
+        ge=0,
+        description="認証ユーザー・メンバーシップをプロセス内に保持する時間（秒）。0でプロセス内の保持を無効化。",
+    )
+
+    # 分析エージェント実行設定（ワーカー単位）
+    ANALYSIS_AGENT_WORKER_THREADS: int = Field(
+        default=4,
+        ge=1,
+        description="エージェントのツール処理（pandas）を実行するスレッドプールのスレッド数。",
+    )
+    ANALYSIS_CHAT_MAX_CONCURRENCY: int = Field(
+        default=4,
+        ge=1,
+        description="1ワーカーで同時に実行するチャット数の上限。",
+    )
+    ANALYSIS_CHAT_MAX_QUEUE: int = Field(
+        default=16,
+        ge=0,
+        description="実行枠の空きを待機できるチャット数の上限。超過時は503を返す。",
+    )
+    ANALYSIS_CHAT_MAX_RUNS_PER_PROJECT: int = Field(
+        default=2,
+        ge=1,
+        description="1プロジェクトで同時に実行するチャットジョブ数の上限。",
+    )
+    ANALYSIS_CHAT_MAX_PENDING_PER_PROJECT: int = Field(
+        default=10,
+        ge=0,
+        description="1プロジェクトで実行待ちにできるチャットジョブ数の上限。超過時は503を返す。",
+    )
+    ANALYSIS_CHAT_JOB_TIMEOUT_SECONDS: float = Field(
+        default=600.0,
+        gt=0,
+        description="チャットジョブのタイムアウト（秒）。",
+    )
+    ANALYSIS_CHAT_JOB_RETENTION_SECONDS: int = Field(
+        default=3600,
+        ge=0,
+        description="終了したチャットジョブの状態・イベントを保持する時間（秒）。",
+    )
+
+    # 操作履歴・監査ログの書き込み設定（ワーカー単位）
+    AUDIT_WRITER_QUEUE_SIZE: int = Field(
+        default=10000,
+        ge=1,
+        description="書き込み待ちにできる操作履歴・監査ログのレコード数の上限。超過時は操作履歴を破棄する。",
+    )
+    AUDIT_WRITER_BATCH_SIZE: int = Field(
+        default=500,
+        ge=1,
+        description="1回の一括INSERTで書き込むレコード数の上限。",
+    )
+    AUDIT_WRITER_FLUSH_INTERVAL_MS: int = Field(
+        default=200,
+        ge=1,
+        description="最初のレコードを受け付けてから一括書き込みするまでの最大待機時間（ミリ秒）。",
+    )
+    AUDIT_WRITER_PUT_TIMEOUT_SECONDS: float = Field(
+        default=1.0,
+        ge=0,
+        description="キューが満杯の場合に監査ログの追加を待機する最大時間（秒）。超過時は監査ログを破棄する。",
+    )
 
     # ストレージ設定
     STORAGE_BACKEND: Literal["local", "azure"] = "local"
@@ -311,6 +474,16 @@ class Settings(BaseSettings):
     AZURE_STORAGE_ACCOUNT_NAME: str | None = None
     AZURE_STORAGE_CONNECTION_STRING: str | None = None
     AZURE_STORAGE_CONTAINER_NAME: str = "uploads"
+    STORAGE_CAPACITY_BYTES: int = Field(
+        default=0,
+        ge=0,
+        description="ストレージ容量（バイト）。統計情報の使用率の算出に使用する。0の場合は使用率を0%とする。",
+    )
+    STORAGE_RECONCILE_INTERVAL_HOURS: int = Field(
+        default=24,
+        ge=0,
+        description="ストレージ使用量とストレージ上のファイルの整合処理の実行間隔（時間）。0で無効化。",
+    )
 
     # LLM設定
     LLM_PROVIDER: Literal["anthropic", "openai", "azure_openai"] = "anthropic"
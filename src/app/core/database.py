@@ -8,6 +8,7 @@
     2. **セッションファクトリの提供**: AsyncSessionLocalでセッション生成
     3. **依存性注入用ジェネレータ**: get_db()でFastAPIエンドポイントにセッション提供
     4. **ライフサイクル管理**: init_db()とclose_db()でアプリ起動・終了時の処理
+    5. **読み取りクエリの並行実行**: parallel_query_executorで独立したセッションに分けて並行実行
 
 SQLAlchemy非同期パターン:
     このモジュールはSQLAlchemy 2.0の非同期APIを使用しています:
@@ -54,8 +55,11 @@ Note:
     - トランザクション管理はサービス層またはリポジトリ層で行います
 """
 
+import asyncio
 import contextlib
-from collections.abc import AsyncGenerator
+import weakref
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from typing import Any
 from urllib.parse import urlparse, urlunparse
 
 from azure.identity import DefaultAzureCredential
@@ -276,6 +280,85 @@ async def get_async_session_context() -> AsyncGenerator[AsyncSession]:
             raise
 
 
+class ParallelQueryExecutor:
+    """読み取りクエリを独立したセッションで並行実行するクラス。
+
+    AsyncSessionは同時に複数のクエリを実行できないため、1つのセッションに対して
+    asyncio.gatherでクエリを発行すると、直列化されるかエラーになります。
+    このクラスはクエリ毎に接続プールから別のセッションを取得して並行実行します。
+
+    Note:
+        - 読み取り専用のクエリにのみ使用してください（各セッションはコミットせずにクローズします）
+        - 各クエリは別の接続で実行されるため、呼び出し元のセッションの未コミットの変更は参照できません
+        - 同時に使用する接続数はプロセス全体でmax_concurrencyまでに制限されます。
+          並行実行するクエリの中から、さらに並行実行を呼び出さないでください（枠の待機でデッドロックします）
+        - 戻り値のORMオブジェクトはセッションから切り離された状態になるため、
+          未ロードの属性（遅延ロードのリレーション等）にはアクセスできません
+    """
+
+    def __init__(self, max_concurrency: int):
+        """並行実行を初期化します。
+
+        Args:
+            max_concurrency: 同時に使用する接続数の上限（1の場合は呼び出し元のセッションで順に実行）
+        """
+        self.max_concurrency = max_concurrency
+        self._semaphores: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = weakref.WeakKeyDictionary()
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """実行中のイベントループに対応する接続数制限のセマフォを取得します。"""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    async def run(self, session: AsyncSession, *queries: Callable[[AsyncSession], Awaitable[Any]]) -> list[Any]:
+        """クエリを並行実行し、結果を引数の順に返します。
+
+        各クエリはセッションを受け取る関数として渡します。呼び出し元のセッションと同じ
+        エンジン（接続プール）から、クエリ毎に新しいセッションを作成して実行します。
+        いずれかのクエリが失敗した場合は、残りのクエリをキャンセルして例外を送出します。
+
+        Args:
+            session: 呼び出し元のセッション（接続先のエンジンの特定と、順次実行時に使用）
+            *queries: セッションを受け取り、クエリを実行する関数
+
+        Returns:
+            list[Any]: 各クエリの結果（引数の順）
+
+        Example:
+            >>> stats, total = await parallel_query_executor.run(
+            ...     db,
+            ...     lambda session: StatisticsService(session)._get_user_summary(),
+            ...     lambda session: session.scalar(select(func.count()).select_from(Project)),
+            ... )
+        """
+        if len(queries) <= 1 or self.max_concurrency <= 1:
+            return [await query(session) for query in queries]
+
+        bind = session.bind or engine
+        semaphore = self._get_semaphore()
+
+        async def run_query(query: Callable[[AsyncSession], Awaitable[Any]]) -> Any:
+            async with semaphore, AsyncSession(bind, expire_on_commit=False, autoflush=False) as query_session:
+                return await query(query_session)
+
+        tasks = [asyncio.ensure_future(run_query(query)) for query in queries]
+        try:
+            return list(await asyncio.gather(*tasks))
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+
+# グローバルインスタンス
+parallel_query_executor = ParallelQueryExecutor(max_concurrency=settings.DB_PARALLEL_QUERY_MAX_CONCURRENCY)
+
+
 async def close_db() -> None:
     """データベース接続プールを解放し、すべての接続をクローズします。
 
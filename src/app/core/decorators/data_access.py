@@ -104,7 +104,7 @@ def transactional[T](
     return wrapper
 
 
-def cache_result(ttl: int = 300, key_prefix: str = "func"):
+def cache_result(ttl: int = 300, key_prefix: str = "func", local_ttl: float = 0):
     """関数の結果をRedisにキャッシュするデコレータ。
 
     頻繁にアクセスされる読み取り専用データ（ユーザー情報、設定情報など）に
@@ -115,9 +115,10 @@ def cache_result(ttl: int = 300, key_prefix: str = "func"):
         - プレフィックスにより機能別にキャッシュを分離
 
     キャッシュ戦略:
-        - Cache-Aside パターン
-        - キャッシュヒット: Redisから即座に返却
+        - Cache-Aside パターン（cache_manager.get_or_set）
+        - キャッシュヒット: L1（プロセス内）またはRedisから即座に返却
         - キャッシュミス: 関数実行後にRedisに保存
+        - 同じ引数の同時呼び出しは1回だけ関数を実行し、結果を共有
 
     Args:
         ttl (int): キャッシュの有効期限（秒）
@@ -126,6 +127,9 @@ def cache_result(ttl: int = 300, key_prefix: str = "func"):
         key_prefix (str): キャッシュキーのプレフィックス
             - デフォルト: "func"
             - 例: "user", "config", "api_response"
+        local_ttl (float): プロセス内キャッシュ（L1）に保持する時間（秒）
+            - デフォルト: 0（L1を使用しない）
+            - 引数の文字列表現がリクエストをまたいで一意な関数のみ指定してください
 
     Returns:
         Callable: キャッシュ機能が適用されたデコレータ
@@ -141,7 +145,7 @@ def cache_result(ttl: int = 300, key_prefix: str = "func"):
         >>> user = await get_user_profile(123)
 
     Note:
-        - Redis未接続時は通常の関数として動作（グレースフルデグラデーション）
+        - Redis未接続時は通常の関数として動作（グレースフルデグラデーション、local_ttl指定時はL1のみ有効）
         - 引数が変わると別のキャッシュキーが生成される
         - データ更新時は cache_manager.delete() で手動削除が必要
         - キャッシュキーはSHA256ハッシュの先頭16文字を使用
@@ -163,30 +167,17 @@ def cache_result(ttl: int = 300, key_prefix: str = "func"):
             args_hash = hashlib.sha256(args_str.encode()).hexdigest()[:16]
             cache_key = f"{key_prefix}:{func.__name__}:{args_hash}"
 
-            # キャッシュから取得試行
-            cached = await cache_manager.get(cache_key)
-            if cached is not None:
+            async def compute() -> Any:
+                # キャッシュミスの場合のみ実行される
                 logger.debug(
-                    "cache_hit",
+                    "cache_miss",
                     function=func.__name__,
                     cache_key=cache_key,
                     key_prefix=key_prefix,
                 )
-                return cached
+                return await func(*args, **kwargs)
 
-            # キャッシュミスの場合は実行
-            logger.debug(
-                "cache_miss",
-                function=func.__name__,
-                cache_key=cache_key,
-                key_prefix=key_prefix,
-            )
-            result = await func(*args, **kwargs)
-
-            # 結果をキャッシュに保存
-            await cache_manager.set(cache_key, result, ttl)
-
-            return result
+            return await cache_manager.get_or_set(cache_key, compute, ttl, local_ttl=local_ttl)
 
         return wrapper
 
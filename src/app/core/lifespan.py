@@ -4,7 +4,7 @@
 
 主な役割:
     1. **起動時処理**: データベース初期化、シードデータ投入、Redis接続、設定情報ロギング
-    2. **終了時処理**: Redis切断、データベース接続クローズ
+    2. **終了時処理**: 操作履歴・監査ログの書き込み、Redis切断、データベース接続クローズ
 
 Usage:
     >>> from app.core.lifespan import lifespan
@@ -17,6 +17,7 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
+from app.api.middlewares.audit_writer import audit_record_writer
 from app.core.cache import cache_manager
 from app.core.config import get_env_file, settings
 from app.core.database import AsyncSessionLocal, close_db, init_db
@@ -66,10 +67,14 @@ async def lifespan(app: FastAPI):
         1. ログ出力: アプリ名、バージョン、環境、設定ファイル、DB接続先
         2. データベース初期化: init_db()を呼び出し
         3. Redis接続: REDIS_URLが設定されていれば接続
+        4. 操作履歴・監査ログの一括書き込みタスクを開始
+        5. 統計情報の定期処理（操作履歴の集計・ストレージ使用量）を開始（STATISTICS_JOBS_ENABLED）
 
     終了時の処理（yieldの後）:
-        1. Redis切断: 接続していた場合はgracefulに切断
-        2. データベース接続クローズ: 全てのコネクションプールを解放
+        1. 分析エージェント実行プール・統計情報の定期処理の停止
+        2. 操作履歴・監査ログの書き込み: キューに残ったレコードを書き込んでから停止
+        3. Redis切断: 接続していた場合はgracefulに切断
+        4. データベース接続クローズ: 全てのコネクションプールを解放
 
     Args:
         app (FastAPI): FastAPIアプリケーションインスタンス
@@ -127,6 +132,15 @@ async def lifespan(app: FastAPI):
     else:
         logger.info("Redisキャッシュが無効です（REDIS_URLが設定されていません）")
 
+    # 操作履歴・監査ログの一括書き込みを開始
+    audit_record_writer.start()
+
+    # 統計情報の定期処理（操作履歴の集計・ストレージ使用量）を開始
+    from app.services.admin.statistics_jobs import statistics_job_scheduler
+
+    if settings.STATISTICS_JOBS_ENABLED:
+        statistics_job_scheduler.start()
+
     # Azure AD認証の初期化（本番モードのみ）
     if settings.AUTH_MODE == "production":
         try:
@@ -150,6 +164,22 @@ async def lifespan(app: FastAPI):
     # アプリケーションシャットダウン処理
     logger.info("シャットダウン中...")
 
+    # 実行中のチャットジョブをキャンセルし、分析エージェント実行プールを停止
+    from app.services.analysis.agent.worker_pool import agent_worker_pool
+    from app.services.analysis.analysis_session.chat_job import chat_job_manager
+
+    await chat_job_manager.shutdown()
+    agent_worker_pool.shutdown()
+
+    # 統計情報の定期処理を停止
+    await statistics_job_scheduler.shutdown()
+
+    # キューに残った操作履歴・監査ログを書き込む（データベース接続クローズの前）
+    try:
+        await audit_record_writer.shutdown()
+    except Exception as e:
+        logger.exception("操作履歴・監査ログの書き込みエラー", error_type=type(e).__name__, error_message=str(e))
+
     # Redis接続を切断
     try:
         if settings.REDIS_URL:
@@ -4,7 +4,6 @@
 データアクセス層への直接依存を避け、レイヤー分離を維持します。
 """
 
-import asyncio
 from typing import Any
 
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -27,21 +26,11 @@ async def get_maintenance_settings(session: AsyncSession) -> dict[str, Any]:
     """
     repository = SystemSettingRepository(session)
 
-    # メンテナンスモード設定を並行取得
-    maintenance_mode, maintenance_message, allow_admin = await asyncio.gather(
-        repository.get_by_category_and_key(
-            category=SettingCategory.MAINTENANCE,
-            key="maintenance_mode",
-        ),
-        repository.get_by_category_and_key(
-            category=SettingCategory.MAINTENANCE,
-            key="maintenance_message",
-        ),
-        repository.get_by_category_and_key(
-            category=SettingCategory.MAINTENANCE,
-            key="allow_admin_access",
-        ),
-    )
+    # メンテナンスモード設定を1クエリでまとめて取得
+    settings = {setting.key: setting for setting in await repository.list_by_category(SettingCategory.MAINTENANCE)}
+    maintenance_mode = settings.get("maintenance_mode")
+    maintenance_message = settings.get("maintenance_message")
+    allow_admin = settings.get("allow_admin_access")
 
     return {
         "enabled": _get_setting_value(maintenance_mode, False),
@@ -0,0 +1,208 @@
+"""認証ユーザー・プロジェクトメンバーシップのキャッシュ。
+
+認証のたびに実行されるユーザー取得（Azure OID）とメンバーシップ取得（プロジェクト+ユーザー）の
+結果を、CacheManagerのプロセス内（L1）とRedis（L2）の2段でキャッシュします。
+
+キャッシュ仕様:
+    - ユーザー: キー "auth:user:{azure_oid}"
+    - メンバーシップ: キー "auth:member:{project_id}:{user_id}"（メンバーである場合のみ保持）、
+      タグ "auth:project:{project_id}"
+    - L1: ワーカープロセス内、PRINCIPAL_CACHE_LOCAL_TTL_SECONDS で失効
+    - L2: Redis、PRINCIPAL_CACHE_TTL_SECONDS で失効（Redis未接続時はL1のみ）
+    - 保持する値はカラム値のみです。取得時はセッションに読み込み済みの状態で
+      結合するため（merge(load=False)）、DBへの問い合わせは発生しません。
+
+無効化:
+    - ユーザー情報・ロール・有効状態の更新、削除時: invalidate_user()
+    - メンバーのロール変更・削除・退出時: invalidate_member()
+    - プロジェクト削除時: invalidate_project()
+
+Note:
+    - L1はワーカー毎に独立しているため、他ワーカーでの更新はL1のTTL経過後に反映されます。
+"""
+
+import enum
+import uuid
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.api.middlewares.metrics import principal_cache_requests_total
+from app.core.cache import CacheManager, cache_manager
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.models import ProjectMember, UserAccount
+from app.models.base import Base
+
+logger = get_logger(__name__)
+
+
+def _dump(instance: Base) -> dict[str, Any]:
+    """モデルインスタンスのカラム値を辞書に変換します。"""
+    return {attr.key: getattr(instance, attr.key) for attr in inspect(type(instance)).column_attrs}
+
+
+def _decode(model: type[Base], values: dict[str, Any]) -> dict[str, Any]:
+    """キャッシュから取得した値（JSON）をカラムの型に戻します。"""
+    decoded: dict[str, Any] = {}
+    for attr in inspect(model).column_attrs:
+        value = values.get(attr.key)
+        if isinstance(value, str):
+            try:
+                python_type = attr.columns[0].type.python_type
+            except NotImplementedError:
+                python_type = str
+            if python_type is datetime:
+                value = datetime.fromisoformat(value)
+            elif python_type is uuid.UUID or issubclass(python_type, enum.Enum):
+                value = python_type(value)
+        decoded[attr.key] = value
+    return decoded
+
+
+class PrincipalCache:
+    """認証ユーザー・プロジェクトメンバーシップの2段キャッシュ。"""
+
+    def __init__(self, cache: CacheManager, ttl_seconds: int, local_ttl_seconds: float):
+        """キャッシュを初期化します。
+
+        Args:
+            cache: 使用するキャッシュマネージャー
+            ttl_seconds: L2（Redis）の有効期限（秒）
+            local_ttl_seconds: L1（プロセス内）の有効期限（秒、0でL1無効）
+        """
+        self.cache = cache
+        self.ttl_seconds = ttl_seconds
+        self.local_ttl_seconds = local_ttl_seconds
+
+    # ================================================================================
+    # ユーザー
+    # ================================================================================
+
+    async def get_user(self, db: AsyncSession, azure_oid: str) -> UserAccount | None:
+        """キャッシュからユーザーを取得し、セッションに結合して返します。
+
+        Args:
+            db: 結合先のデータベースセッション
+            azure_oid: Azure AD Object ID
+
+        Returns:
+            UserAccount | None: セッションに結合したユーザー、キャッシュにない場合はNone
+        """
+        values = await self._get("user", f"user:{azure_oid}", UserAccount)
+        return await self._attach(db, UserAccount, values) if values is not None else None
+
+    async def set_user(self, user: UserAccount) -> None:
+        """ユーザーをキャッシュに登録します。
+
+        Args:
+            user: 登録するユーザー
+        """
+        await self._set(f"user:{user.azure_oid}", _dump(user))
+
+    async def invalidate_user(self, azure_oid: str) -> None:
+        """ユーザーのキャッシュを破棄します。
+
+        Args:
+            azure_oid: Azure AD Object ID
+        """
+        await self._delete(f"user:{azure_oid}")
+
+    # ================================================================================
+    # プロジェクトメンバーシップ
+    # ================================================================================
+
+    async def get_member(self, db: AsyncSession, project_id: uuid.UUID, user_id: uuid.UUID) -> ProjectMember | None:
+        """キャッシュからメンバーシップを取得し、セッションに結合して返します。
+
+        Args:
+            db: 結合先のデータベースセッション
+            project_id: プロジェクトID
+            user_id: ユーザーID
+
+        Returns:
+            ProjectMember | None: セッションに結合したメンバー、キャッシュにない場合はNone
+        """
+        values = await self._get("member", f"member:{project_id}:{user_id}", ProjectMember)
+        return await self._attach(db, ProjectMember, values) if values is not None else None
+
+    async def set_member(self, member: ProjectMember) -> None:
+        """メンバーシップをキャッシュに登録します。
+
+        Args:
+            member: 登録するメンバー
+        """
+        await self._set(
+            f"member:{member.project_id}:{member.user_id}",
+            _dump(member),
+            tags=[f"auth:project:{member.project_id}"],
+        )
+
+    async def invalidate_member(self, project_id: uuid.UUID, user_id: uuid.UUID) -> None:
+        """メンバーシップのキャッシュを破棄します。
+
+        Args:
+            project_id: プロジェクトID
+            user_id: ユーザーID
+        """
+        await self._delete(f"member:{project_id}:{user_id}")
+
+    async def invalidate_project(self, project_id: uuid.UUID) -> None:
+        """プロジェクトの全メンバーシップのキャッシュを破棄します。
+
+        Args:
+            project_id: プロジェクトID
+        """
+        await self.cache.invalidate_tags(f"auth:project:{project_id}")
+
+    # ================================================================================
+    # 内部処理
+    # ================================================================================
+
+    async def _get(self, kind: str, key: str, model: type[Base]) -> dict[str, Any] | None:
+        """キャッシュからカラム値を取得します。"""
+        key = f"auth:{key}"
+        cached = await self.cache.get(key)
+        if isinstance(cached, dict):
+            try:
+                values = _decode(model, cached)
+            except (TypeError, ValueError) as e:
+                logger.warning("認証キャッシュの値が不正なため破棄します", cache_key=key, error=str(e))
+                await self.cache.delete(key)
+            else:
+                principal_cache_requests_total.labels(kind=kind, result="hit").inc()
+                return values
+
+        principal_cache_requests_total.labels(kind=kind, result="miss").inc()
+        return None
+
+    async def _set(self, key: str, values: dict[str, Any], tags: list[str] | None = None) -> None:
+        """カラム値をキャッシュに登録します。"""
+        await self.cache.set(
+            f"auth:{key}",
+            values,
+            expire=self.ttl_seconds,
+            local_ttl=self.local_ttl_seconds,
+            tags=tags or (),
+        )
+
+    async def _delete(self, key: str) -> None:
+        """キャッシュからエントリを削除します。"""
+        await self.cache.delete(f"auth:{key}")
+
+    @staticmethod
+    async def _attach[ModelT: Base](db: AsyncSession, model: type[ModelT], values: dict[str, Any]) -> ModelT:
+        """カラム値からインスタンスを復元し、読み込み済みの状態でセッションに結合します。"""
+        instance = model(**values)
+        make_transient_to_detached(instance)
+        return await db.merge(instance, load=False)
+
+
+principal_cache = PrincipalCache(
+    cache=cache_manager,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    local_ttl_seconds=settings.PRINCIPAL_CACHE_LOCAL_TTL_SECONDS,
+)
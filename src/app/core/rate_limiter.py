@@ -0,0 +1,219 @@
+"""アトミックなレート制限の判定ロジック。
+
+このモジュールは、RateLimitMiddlewareが使用するレート制限の判定処理を提供します。
+
+判定方式:
+    1. **Redis（GCRA）**: Generic Cell Rate Algorithmの判定と更新を
+       1つのLuaスクリプトで実行します（1リクエストにつき1往復、競合状態なし）
+       - キーごとに保存するのは理論到着時刻（TAT）1つだけです
+       - 時刻はRedisサーバーのTIMEを使用するため、ワーカー間の時計のずれの影響を受けません
+    2. **ローカルトークンバケット**: Redis未接続・エラー時のフォールバック
+       - 判定はO(1)で、クライアント数の上限を超えた場合は最も古いクライアントを破棄します（LRU）
+       - ワーカー間では共有されません
+
+使用方法:
+    >>> from app.core.rate_limiter import RateLimiter, RateLimitRule
+    >>>
+    >>> limiter = RateLimiter()
+    >>> result = await limiter.hit("ip:192.168.1.100", RateLimitRule(calls=100, period=60))
+    >>> if not result.allowed:
+    ...     print(f"{result.retry_after}秒後に再試行してください")
+
+Note:
+    - どちらの方式も「period秒あたりcalls回（最大calls回のバースト）」として判定します
+    - ワーカーごとのローカル判定のため、フォールバック中の実効上限はワーカー数倍になります
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from app.core.cache import CacheManager, cache_manager
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# GCRAによる判定と更新を1往復で行うLuaスクリプト
+#   KEYS[1]: レート制限キー
+#   ARGV[1]: 期間あたりの許可リクエスト数
+#   ARGV[2]: 期間（ミリ秒）
+#   戻り値: {許可(1/0), 残りリクエスト数, 再試行までのミリ秒, 全回復までのミリ秒}
+GCRA_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local emission = period / limit
+local clock = redis.call("TIME")
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+local tat = tonumber(redis.call("GET", KEYS[1]))
+if tat == nil or tat < now then
+    tat = now
+end
+local new_tat = tat + emission
+local allow_at = new_tat - period
+if allow_at > now then
+    return {0, 0, math.ceil(allow_at - now), math.ceil(tat - now)}
+end
+redis.call("SET", KEYS[1], tostring(new_tat), "PX", math.ceil(new_tat - now))
+return {1, math.floor((now - allow_at) / emission), 0, math.ceil(new_tat - now)}
+"""
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    """レート制限のルール。
+
+    Attributes:
+        calls: 期間あたりの許可リクエスト数
+        period: 期間（秒）
+    """
+
+    calls: int
+    period: int
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    """レート制限の判定結果。
+
+    Attributes:
+        allowed: リクエストを許可する場合True
+        limit: 適用したルールの許可リクエスト数
+        remaining: 残りリクエスト数
+        retry_after: 次のリクエストが許可されるまでの秒数（許可時は0）
+        reset_after: 残りリクエスト数が上限まで回復するまでの秒数
+    """
+
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float
+    reset_after: float
+
+
+class LocalTokenBucket:
+    """プロセス内のトークンバケット（Redis未接続時のフォールバック）。
+
+    クライアントごとに（トークン数, 最終更新時刻）だけを保持し、
+    判定時に経過時間分のトークンを補充します。
+
+    Attributes:
+        max_entries: 保持するクライアント数の上限
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        """トークンバケットを初期化します。
+
+        Args:
+            max_entries: 保持するクライアント数の上限（超過時は最も古いクライアントを破棄）
+        """
+        self.max_entries = max_entries
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def consume(self, key: str, rule: RateLimitRule, now: float | None = None) -> RateLimitResult:
+        """トークンを1つ消費してリクエストの可否を判定します。
+
+        Args:
+            key: レート制限キー
+            rule: 適用するルール
+            now: 現在時刻（time.monotonic、省略時は現在時刻）
+
+        Returns:
+            RateLimitResult: 判定結果
+        """
+        if now is None:
+            now = time.monotonic()
+        rate = rule.calls / rule.period
+
+        entry = self._buckets.pop(key, None)
+        if entry is None:
+            tokens = float(rule.calls)
+        else:
+            tokens, updated = entry
+            tokens = min(float(rule.calls), tokens + (now - updated) * rate)
+
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+            retry_after = 0.0
+        else:
+            retry_after = (1 - tokens) / rate
+
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_entries:
+            self._buckets.popitem(last=False)
+
+        return RateLimitResult(
+            allowed=allowed,
+            limit=rule.calls,
+            remaining=int(tokens),
+            retry_after=retry_after,
+            reset_after=(rule.calls - tokens) / rate,
+        )
+
+
+class RateLimiter:
+    """Redis（GCRA）とローカルトークンバケットを切り替えるレート制限。
+
+    Redisが利用可能な場合はLuaスクリプトで判定し、
+    Redis未接続・スクリプト実行エラー時はローカルトークンバケットで判定します。
+    """
+
+    KEY_PREFIX = "rate_limit"
+
+    def __init__(self, cache: CacheManager = cache_manager, max_local_entries: int = 10000):
+        """レート制限を初期化します。
+
+        Args:
+            cache: 判定に使用するキャッシュマネージャー
+            max_local_entries: フォールバック時に保持するクライアント数の上限
+        """
+        self._cache = cache
+        self.local = LocalTokenBucket(max_entries=max_local_entries)
+        self._using_fallback = False
+
+    async def hit(self, key: str, rule: RateLimitRule) -> RateLimitResult:
+        """リクエストを1回分記録し、許可するかどうかを判定します。
+
+        Args:
+            key: レート制限キー（クライアント識別子・ルート等）
+            rule: 適用するルール
+
+        Returns:
+            RateLimitResult: 判定結果
+        """
+        if self._cache.is_redis_available():
+            reply = await self._cache.run_script(
+                GCRA_SCRIPT,
+                keys=[f"{self.KEY_PREFIX}:{key}"],
+                args=[rule.calls, rule.period * 1000],
+            )
+            if reply is not None:
+                self._set_fallback(False)
+                allowed, remaining, retry_after_ms, reset_after_ms = (int(value) for value in reply)
+                return RateLimitResult(
+                    allowed=bool(allowed),
+                    limit=rule.calls,
+                    remaining=remaining,
+                    retry_after=retry_after_ms / 1000,
+                    reset_after=reset_after_ms / 1000,
+                )
+
+        self._set_fallback(True)
+        return self.local.consume(key, rule)
+
+    def _set_fallback(self, using_fallback: bool) -> None:
+        """フォールバック状態を更新し、切り替え時のみログを出力します。
+
+        Args:
+            using_fallback: ローカルトークンバケットで判定する場合True
+        """
+        if using_fallback == self._using_fallback:
+            return
+        self._using_fallback = using_fallback
+        if using_fallback:
+            logger.warning("Redisが利用できません。インメモリレート制限にフォールバックします")
+        else:
+            logger.info("Redisによるレート制限に復帰しました")
@@ -11,12 +11,19 @@ from app.models.analysis import (
     AnalysisSession,
     AnalysisSnapshot,
     AnalysisStep,
+    AnalysisStepConfig,
     AnalysisTemplate,
     AnalysisValidationMaster,
 )
 
 # Audit models
-from app.models.audit import AuditLog, UserActivity
+from app.models.audit import (
+    AuditLog,
+    UserActivity,
+    UserActivityDailyUser,
+    UserActivityHourlyStat,
+    UserActivityRollupState,
+)
 
 # Base classes
 from app.models.base import Base, PrimaryKeyMixin, TimestampMixin
@@ -70,13 +77,14 @@ from app.models.notification import (
 )
 
 # Project models
-from app.models.project import Project, ProjectFile, ProjectMember
+from app.models.project import Project, ProjectFile, ProjectMember, ProjectStorageUsage
 
 # System models
 from app.models.system import (
     NotificationTemplate,
     SystemAlert,
     SystemAnnouncement,
+    StorageUsageSnapshot,
     SystemSetting,
 )
 
@@ -126,6 +134,7 @@ __all__ = [
     "Project",
     "ProjectFile",
     "ProjectMember",
+    "ProjectStorageUsage",
     # Analysis models - Master
     "AnalysisValidationMaster",
     "AnalysisIssueMaster",
@@ -138,6 +147,7 @@ __all__ = [
     "AnalysisSnapshot",
     "AnalysisChat",
     "AnalysisStep",
+    "AnalysisStepConfig",
     # Analysis models - Template
     "AnalysisTemplate",
     # Driver Tree models
@@ -156,9 +166,13 @@ __all__ = [
     # Audit models
     "UserActivity",
     "AuditLog",
+    "UserActivityHourlyStat",
+    "UserActivityDailyUser",
+    "UserActivityRollupState",
     # System models
     "SystemSetting",
     "SystemAnnouncement",
     "NotificationTemplate",
     "SystemAlert",
+    "StorageUsageSnapshot",
 ]
@@ -6,7 +6,7 @@
 import uuid
 from typing import TYPE_CHECKING, Any
 
-from sqlalchemy import ForeignKey, String
+from sqlalchemy import ForeignKey, Integer, String
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -29,7 +29,10 @@ class AnalysisFile(Base, TimestampMixin):
         project_file_id: プロジェクトファイルID（外部キー）
         sheet_name: シート名
         axis_config: 軸設定（JSONB）
-        data: データ（JSONB）
+        data: データ（JSONB、data_path未設定の既存行のみ使用）
+        data_path: 入力データ（Parquet）のストレージパス
+        data_schema: 入力データのスキーマ（列名と型）
+        row_count: 入力データの行数
         added_by: 追加者ユーザーID（外部キー、任意）
     """
 
@@ -75,6 +78,24 @@ class AnalysisFile(Base, TimestampMixin):
         comment="データ",
     )
 
+    data_path: Mapped[str | None] = mapped_column(
+        String(512),
+        nullable=True,
+        comment="入力データ（Parquet）のストレージパス",
+    )
+
+    data_schema: Mapped[list[dict[str, Any]] | None] = mapped_column(
+        JSONB,
+        nullable=True,
+        comment="入力データのスキーマ",
+    )
+
+    row_count: Mapped[int | None] = mapped_column(
+        Integer,
+        nullable=True,
+        comment="入力データの行数",
+    )
+
     added_by: Mapped[uuid.UUID | None] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("user_account.id", ondelete="SET NULL"),
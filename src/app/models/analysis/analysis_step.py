@@ -1,15 +1,22 @@
 """分析ステップモデル。
 
 このモジュールは、分析セッションのステップを管理するモデルを定義します。
+
+ステップ設定は内容アドレスのAnalysisStepConfigに保存し、ステップはハッシュで参照します。
+configプロパティで従来どおり辞書として読み書きでき、設定した内容はフラッシュ時に
+未保存のハッシュのみAnalysisStepConfigへ保存されます。
 """
 
 import uuid
+from itertools import chain
 from typing import TYPE_CHECKING, Any
 
-from sqlalchemy import ForeignKey, Index, Integer, String, UniqueConstraint
-from sqlalchemy.dialects.postgresql import JSONB, UUID
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import ForeignKey, Index, Integer, String, UniqueConstraint, event, inspect
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Mapped, Session, mapped_column, relationship
 
+from app.models.analysis.analysis_step_config import AnalysisStepConfig, compute_config_hash
 from app.models.base import Base, TimestampMixin
 
 if TYPE_CHECKING:
@@ -26,7 +33,8 @@ class AnalysisStep(Base, TimestampMixin):
         id: 主キー（UUID）
         snapshot_id: スナップショットID（外部キー）
         triggered_by_chat_id: トリガーチャットID（外部キー、任意）
-        config: ステップ設定（JSONB）
+        config_hash: ステップ設定の内容ハッシュ（外部キー）
+        config: ステップ設定（config_hashが参照する設定、プロパティ）
         name: ステップ名
         step_order: ステップ順序
         type: ステップタイプ
@@ -62,10 +70,12 @@ class AnalysisStep(Base, TimestampMixin):
         comment="トリガーチャットID（このステップを生成したチャット）",
     )
 
-    config: Mapped[dict[str, Any]] = mapped_column(
-        JSONB,
+    config_hash: Mapped[str] = mapped_column(
+        String(64),
+        ForeignKey("analysis_step_config.config_hash"),
         nullable=False,
-        comment="ステップ設定",
+        index=True,
+        comment="ステップ設定の内容ハッシュ",
     )
 
     name: Mapped[str] = mapped_column(
@@ -103,5 +113,51 @@ class AnalysisStep(Base, TimestampMixin):
         foreign_keys=[triggered_by_chat_id],
     )
 
+    # ステップ取得時に設定も結合して取得する（非同期セッションでの遅延ロードを避ける）
+    config_entry: Mapped[AnalysisStepConfig] = relationship(
+        AnalysisStepConfig,
+        lazy="joined",
+        innerjoin=True,
+    )
+
+    @property
+    def config(self) -> dict[str, Any]:
+        """ステップ設定。"""
+        staged = getattr(self, "_staged_config", None)
+        if staged is not None:
+            return staged
+        return self.config_entry.config
+
+    @config.setter
+    def config(self, value: dict[str, Any]) -> None:
+        """ステップ設定を変更します（内容ハッシュを再計算し、フラッシュ時に設定を保存）。"""
+        self._staged_config = value
+        self.config_hash = compute_config_hash(value)
+
     def __repr__(self) -> str:
         return f"<AnalysisStep(id={self.id}, name={self.name})>"
+
+
+@event.listens_for(Session, "before_flush")
+def _store_staged_step_configs(session: Session, flush_context: Any, instances: Any) -> None:
+    """追加・変更されたステップの設定をAnalysisStepConfigに保存します。
+
+    同じハッシュの設定が既に存在する場合は書き込みません（ON CONFLICT DO NOTHING）。
+    """
+    staged: dict[str, dict[str, Any]] = {}
+    for obj in chain(session.new, session.dirty):
+        if not isinstance(obj, AnalysisStep):
+            continue
+        config = getattr(obj, "_staged_config", None)
+        if config is None:
+            continue
+        if obj in session.dirty and not inspect(obj).attrs.config_hash.history.has_changes():
+            continue
+        staged[obj.config_hash] = config
+
+    if staged:
+        session.connection().execute(
+            pg_insert(AnalysisStepConfig.__table__)
+            .values([{"config_hash": config_hash, "config": config} for config_hash, config in staged.items()])
+            .on_conflict_do_nothing(index_elements=["config_hash"])
+        )
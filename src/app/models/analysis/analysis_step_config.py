@@ -0,0 +1,60 @@
+"""分析ステップ設定モデル。
+
+このモジュールは、分析ステップの設定（JSONB）を内容アドレスで管理するモデルを定義します。
+
+同じ内容の設定は1行だけ保存され、各スナップショットのステップはハッシュで参照します。
+設定は不変で、変更されたステップは新しいハッシュの行を参照します（コピーオンライト）。
+"""
+
+import hashlib
+import json
+from typing import Any
+
+from sqlalchemy import String
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base, TimestampMixin
+
+
+def compute_config_hash(config: dict[str, Any]) -> str:
+    """ステップ設定の内容ハッシュを計算します。
+
+    キー順序に依存しない正規化JSONのSHA-256を返します。
+
+    Args:
+        config: ステップ設定
+
+    Returns:
+        str: 16進数64文字のハッシュ
+    """
+    canonical = json.dumps(config, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class AnalysisStepConfig(Base, TimestampMixin):
+    """分析ステップ設定。
+
+    ステップ設定（result_chart, result_table等の結果を含む）を内容ハッシュ単位で保存します。
+
+    Attributes:
+        config_hash: 設定の内容ハッシュ（主キー）
+        config: ステップ設定（JSONB）
+    """
+
+    __tablename__ = "analysis_step_config"
+
+    config_hash: Mapped[str] = mapped_column(
+        String(64),
+        primary_key=True,
+        comment="設定の内容ハッシュ（SHA-256）",
+    )
+
+    config: Mapped[dict[str, Any]] = mapped_column(
+        JSONB,
+        nullable=False,
+        comment="ステップ設定",
+    )
+
+    def __repr__(self) -> str:
+        return f"<AnalysisStepConfig(config_hash={self.config_hash})>"
@@ -2,8 +2,16 @@
 
 from app.models.audit.audit_log import AuditLog
 from app.models.audit.user_activity import UserActivity
+from app.models.audit.user_activity_rollup import (
+    UserActivityDailyUser,
+    UserActivityHourlyStat,
+    UserActivityRollupState,
+)
 
 __all__ = [
     "UserActivity",
     "AuditLog",
+    "UserActivityHourlyStat",
+    "UserActivityDailyUser",
+    "UserActivityRollupState",
 ]
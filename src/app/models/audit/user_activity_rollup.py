@@ -0,0 +1,122 @@
+"""ユーザー操作履歴の集計（ロールアップ）モデル。
+
+このモジュールは、統計情報の表示に使用する操作履歴（user_activity）の集計テーブルを定義します。
+
+テーブル設計:
+    - user_activity_hourly_stat: 1時間・ステータスコード毎のリクエスト数と処理時間の合計
+    - user_activity_daily_user: 日毎の操作ユーザー（日別アクティブユーザー数の集計用）
+    - user_activity_rollup_state: 集計済みの範囲（この日時より前の操作履歴は集計済み）
+
+Note:
+    - 集計はActivityRollupServiceが1時間単位で追記します（集計済みの時間帯は再集計しません）
+    - 統計情報は集計済みの範囲を集計テーブルから、以降の範囲を操作履歴から取得します
+"""
+
+import uuid
+from datetime import date, datetime
+
+from sqlalchemy import BigInteger, Date, DateTime, Integer, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base, TimestampMixin
+
+
+class UserActivityHourlyStat(Base):
+    """1時間・ステータスコード毎の操作履歴の集計。
+
+    Attributes:
+        bucket_start (datetime): 集計時間帯の開始日時（主キー）
+        response_status (int): HTTPレスポンスステータス（主キー）
+        request_count (int): リクエスト数
+        duration_ms_sum (int): 処理時間の合計（ミリ秒）
+    """
+
+    __tablename__ = "user_activity_hourly_stat"
+
+    bucket_start: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        primary_key=True,
+        comment="集計時間帯の開始日時（1時間単位）",
+    )
+
+    response_status: Mapped[int] = mapped_column(
+        Integer,
+        primary_key=True,
+        comment="HTTPレスポンスステータス",
+    )
+
+    request_count: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        default=0,
+        comment="リクエスト数",
+    )
+
+    duration_ms_sum: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        default=0,
+        comment="処理時間の合計（ミリ秒）",
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<UserActivityHourlyStat(bucket_start={self.bucket_start}, "
+            f"status={self.response_status}, count={self.request_count})>"
+        )
+
+
+class UserActivityDailyUser(Base):
+    """日毎の操作ユーザー。
+
+    日別アクティブユーザー数（ユーザーの重複を除いた件数）は時間毎の件数から合算できないため、
+    日付とユーザーの組を保持します。
+
+    Attributes:
+        activity_date (date): 操作日（主キー）
+        user_id (UUID): 操作ユーザーID（主キー）
+    """
+
+    __tablename__ = "user_activity_daily_user"
+
+    activity_date: Mapped[date] = mapped_column(
+        Date,
+        primary_key=True,
+        comment="操作日",
+    )
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        comment="操作ユーザーID",
+    )
+
+    def __repr__(self) -> str:
+        return f"<UserActivityDailyUser(date={self.activity_date}, user_id={self.user_id})>"
+
+
+class UserActivityRollupState(Base, TimestampMixin):
+    """操作履歴の集計済み範囲。
+
+    Attributes:
+        name (str): 集計の名前（主キー）
+        rolled_until (datetime): 集計済みの終了日時（この日時より前の操作履歴は集計済み）
+    """
+
+    __tablename__ = "user_activity_rollup_state"
+
+    name: Mapped[str] = mapped_column(
+        String(50),
+        primary_key=True,
+        comment="集計の名前",
+    )
+
+    rolled_until: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        comment="集計済みの終了日時",
+    )
+
+    def __repr__(self) -> str:
+        return f"<UserActivityRollupState(name={self.name}, rolled_until={self.rolled_until})>"
@@ -6,7 +6,7 @@
 import uuid
 from typing import TYPE_CHECKING
 
-from sqlalchemy import CheckConstraint, ForeignKey, Index, String, Text
+from sqlalchemy import CheckConstraint, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -34,6 +34,8 @@ class DriverTree(Base, TimestampMixin):
         formula_id: 数式テンプレートID（外部キー、任意）
         status: ツリー状態（draft/active/completed）
         created_by: 作成者ID（外部キー、任意）
+        structure_version: 構造バージョン（ノード・リレーションシップの追加・削除・変更で増加）
+        data_version: データバージョン（計算結果に影響する全ての変更で増加）
     """
 
     __tablename__ = "driver_tree"
@@ -95,6 +97,22 @@ class DriverTree(Base, TimestampMixin):
         comment="作成者ユーザーID",
     )
 
+    structure_version: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0",
+        comment="構造バージョン（計算プランのキャッシュ検証用）",
+    )
+
+    data_version: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0",
+        comment="データバージョン（計算結果のキャッシュ検証用）",
+    )
+
     # リレーションシップ
     project: Mapped["Project"] = relationship(
         "Project",
@@ -6,6 +6,7 @@
     - Project: プロジェクトメインモデル（タイトル、説明、ステータス等）
     - ProjectMember: プロジェクトメンバー（ユーザーとプロジェクトの紐付け、ロール管理）
     - ProjectFile: プロジェクトファイル（アップロードファイルのメタデータ）
+    - ProjectStorageUsage: プロジェクトのストレージ使用量（ファイル数・合計サイズ）
 
 Enum定義はapp.models.enumsパッケージで一元管理されています:
     - ProjectRole: プロジェクトロール（owner, manager, member, viewer）
@@ -28,5 +29,6 @@ Enum定義はapp.models.enumsパッケージで一元管理されています:
 from app.models.project.project import Project
 from app.models.project.project_file import ProjectFile
 from app.models.project.project_member import ProjectMember
+from app.models.project.project_storage_usage import ProjectStorageUsage
 
-__all__ = ["Project", "ProjectFile", "ProjectMember"]
+__all__ = ["Project", "ProjectFile", "ProjectMember", "ProjectStorageUsage"]
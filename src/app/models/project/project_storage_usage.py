@@ -0,0 +1,105 @@
+"""プロジェクトのストレージ使用量モデル。
+
+このモジュールは、プロジェクト毎のファイル数・合計サイズを保持する集計テーブルを定義します。
+
+使用量はProjectFileの追加・削除（アップロード、新バージョン、バージョン復元、ファイル・プロジェクト削除）の
+フラッシュ時に差分を加算して更新します（ファイルの走査やストレージへの問い合わせは行いません）。
+差分の取りこぼしは、StorageUsageServiceの整合処理でProjectFileから再計算して補正します。
+"""
+
+import uuid
+from collections import defaultdict
+from itertools import chain
+from typing import Any
+
+from sqlalchemy import BigInteger, ForeignKey, event, exists, func, inspect, literal, select
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Mapped, Session, mapped_column
+
+from app.models.base import Base, TimestampMixin
+from app.models.project.project import Project
+from app.models.project.project_file import ProjectFile
+
+
+class ProjectStorageUsage(Base, TimestampMixin):
+    """プロジェクトのストレージ使用量。
+
+    Attributes:
+        project_id (UUID): プロジェクトID（主キー、FK: project）
+        file_count (int): ファイル数（全バージョン）
+        total_bytes (int): ファイルサイズの合計（バイト）
+    """
+
+    __tablename__ = "project_storage_usage"
+
+    project_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("project.id", ondelete="CASCADE"),
+        primary_key=True,
+        comment="プロジェクトID",
+    )
+
+    file_count: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        default=0,
+        comment="ファイル数（全バージョン）",
+    )
+
+    total_bytes: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        default=0,
+        comment="ファイルサイズの合計（バイト）",
+    )
+
+    def __repr__(self) -> str:
+        return f"<ProjectStorageUsage(project_id={self.project_id}, total_bytes={self.total_bytes})>"
+
+
+@event.listens_for(Session, "after_flush")
+def _apply_storage_usage_deltas(session: Session, flush_context: Any) -> None:
+    """フラッシュしたProjectFileの追加・削除・サイズ変更をストレージ使用量に加算します。
+
+    削除されたプロジェクトの使用量はCASCADEで削除されるため加算しません。
+    """
+    deltas: dict[uuid.UUID, list[int]] = defaultdict(lambda: [0, 0])
+    for obj in chain(session.new, session.deleted, session.dirty):
+        if not isinstance(obj, ProjectFile):
+            continue
+        if obj in session.new:
+            deltas[obj.project_id][0] += 1
+            deltas[obj.project_id][1] += obj.file_size or 0
+        elif obj in session.deleted:
+            deltas[obj.project_id][0] -= 1
+            deltas[obj.project_id][1] -= obj.file_size or 0
+        else:
+            history = inspect(obj).attrs.file_size.history
+            if history.has_changes():
+                deltas[obj.project_id][1] += sum(history.added or ()) - sum(history.deleted or ())
+
+    deleted_projects = {obj.id for obj in session.deleted if isinstance(obj, Project)}
+    for project_id, (file_count, total_bytes) in deltas.items():
+        if project_id in deleted_projects or (file_count == 0 and total_bytes == 0):
+            continue
+        # プロジェクトが同じトランザクションで削除済みの場合は行を作成しない
+        stmt = pg_insert(ProjectStorageUsage).from_select(
+            ["project_id", "file_count", "total_bytes", "created_at", "updated_at"],
+            select(
+                literal(project_id, UUID(as_uuid=True)),
+                literal(file_count, BigInteger),
+                literal(total_bytes, BigInteger),
+                func.now(),
+                func.now(),
+            ).where(exists().where(Project.id == project_id)),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["project_id"],
+            set_={
+                "file_count": ProjectStorageUsage.file_count + stmt.excluded.file_count,
+                "total_bytes": ProjectStorageUsage.total_bytes + stmt.excluded.total_bytes,
+                "updated_at": func.now(),
+            },
+        )
+        session.connection().execute(stmt)
@@ -3,6 +3,7 @@
 from app.models.system.notification_template import NotificationTemplate
 from app.models.system.system_alert import SystemAlert
 from app.models.system.system_announcement import SystemAnnouncement
+from app.models.system.storage_usage_snapshot import StorageUsageSnapshot
 from app.models.system.system_setting import SystemSetting
 
 __all__ = [
@@ -10,4 +11,5 @@ __all__ = [
     "SystemAnnouncement",
     "NotificationTemplate",
     "SystemAlert",
+    "StorageUsageSnapshot",
 ]
@@ -0,0 +1,68 @@
+"""ストレージ使用量の日次スナップショットモデル。
+
+このモジュールは、ストレージ使用量の推移を表示するための日次スナップショットを定義します。
+スナップショットは定期処理（StorageUsageService.snapshot）が当日分を上書きします。
+"""
+
+from datetime import date
+
+from sqlalchemy import BigInteger, Date
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base, TimestampMixin
+
+
+class StorageUsageSnapshot(Base, TimestampMixin):
+    """ストレージ使用量の日次スナップショット。
+
+    Attributes:
+        snapshot_date (date): 日付（主キー）
+        file_count (int): ファイル数
+        total_bytes (int): ファイルサイズの合計（バイト）
+        blob_count (int | None): ストレージ上のファイル数（整合処理を実行した日のみ）
+        orphan_blob_count (int | None): ProjectFileに存在しないストレージ上のファイル数（整合処理を実行した日のみ）
+        missing_blob_count (int | None): ストレージに存在しないProjectFileの数（整合処理を実行した日のみ）
+    """
+
+    __tablename__ = "storage_usage_snapshot"
+
+    snapshot_date: Mapped[date] = mapped_column(
+        Date,
+        primary_key=True,
+        comment="日付",
+    )
+
+    file_count: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        default=0,
+        comment="ファイル数",
+    )
+
+    total_bytes: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        default=0,
+        comment="ファイルサイズの合計（バイト）",
+    )
+
+    blob_count: Mapped[int | None] = mapped_column(
+        BigInteger,
+        nullable=True,
+        comment="ストレージ上のファイル数（整合処理の結果）",
+    )
+
+    orphan_blob_count: Mapped[int | None] = mapped_column(
+        BigInteger,
+        nullable=True,
+        comment="ProjectFileに存在しないストレージ上のファイル数（整合処理の結果）",
+    )
+
+    missing_blob_count: Mapped[int | None] = mapped_column(
+        BigInteger,
+        nullable=True,
+        comment="ストレージに存在しないProjectFileの数（整合処理の結果）",
+    )
+
+    def __repr__(self) -> str:
+        return f"<StorageUsageSnapshot(date={self.snapshot_date}, total_bytes={self.total_bytes})>"
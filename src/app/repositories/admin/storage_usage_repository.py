@@ -0,0 +1,133 @@
+"""ストレージ使用量リポジトリ。
+
+このモジュールは、プロジェクト毎のストレージ使用量（集計テーブル）と
+日次スナップショットのデータアクセスを提供します。
+"""
+
+from datetime import date
+from typing import Any
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.project.project_file import ProjectFile
+from app.models.project.project_storage_usage import ProjectStorageUsage
+from app.models.system.storage_usage_snapshot import StorageUsageSnapshot
+
+
+class StorageUsageRepository:
+    """ストレージ使用量リポジトリ。
+
+    メソッド:
+        - get_totals: 全プロジェクトのファイル数・合計サイズを取得
+        - rebuild_usage: ProjectFileから使用量を再計算
+        - list_file_paths: ProjectFileのストレージパスを取得
+        - upsert_snapshot: 日次スナップショットを登録（同日は上書き）
+        - list_snapshots: 期間内の日次スナップショットを取得
+        - get_last_snapshot_before: 指定日より前の直近の日次スナップショットを取得
+    """
+
+    def __init__(self, db: AsyncSession):
+        """リポジトリを初期化します。
+
+        Args:
+            db: SQLAlchemyの非同期データベースセッション
+        """
+        self.db = db
+
+    async def get_totals(self) -> tuple[int, int]:
+        """全プロジェクトのファイル数・合計サイズを取得します。
+
+        Returns:
+            tuple[int, int]: (ファイル数, 合計サイズ（バイト）)
+        """
+        row = (
+            await self.db.execute(
+                select(
+                    func.coalesce(func.sum(ProjectStorageUsage.file_count), 0),
+                    func.coalesce(func.sum(ProjectStorageUsage.total_bytes), 0),
+                )
+            )
+        ).one()
+        return int(row[0]), int(row[1])
+
+    async def rebuild_usage(self) -> None:
+        """使用量をProjectFileから再計算して置き換えます。"""
+        await self.db.execute(delete(ProjectStorageUsage))
+        await self.db.execute(
+            pg_insert(ProjectStorageUsage).from_select(
+                ["project_id", "file_count", "total_bytes", "created_at", "updated_at"],
+                select(
+                    ProjectFile.project_id,
+                    func.count(),
+                    func.coalesce(func.sum(ProjectFile.file_size), 0),
+                    func.now(),
+                    func.now(),
+                ).group_by(ProjectFile.project_id),
+            )
+        )
+
+    async def list_file_paths(self) -> set[str]:
+        """ProjectFileのストレージパスを取得します。
+
+        Returns:
+            set[str]: ストレージパス
+        """
+        result = await self.db.scalars(select(ProjectFile.file_path))
+        return set(result.all())
+
+    async def upsert_snapshot(self, snapshot_date: date, file_count: int, total_bytes: int, **reconciled: Any) -> None:
+        """日次スナップショットを登録します（同日のスナップショットは上書きします）。
+
+        Args:
+            snapshot_date: 日付
+            file_count: ファイル数
+            total_bytes: 合計サイズ（バイト）
+            **reconciled: 整合処理の結果（blob_count, orphan_blob_count, missing_blob_count）
+        """
+        values = {"file_count": file_count, "total_bytes": total_bytes, **reconciled}
+        stmt = pg_insert(StorageUsageSnapshot).values(
+            snapshot_date=snapshot_date,
+            created_at=func.now(),
+            updated_at=func.now(),
+            **values,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["snapshot_date"],
+            set_={**{key: stmt.excluded[key] for key in values}, "updated_at": func.now()},
+        )
+        await self.db.execute(stmt)
+
+    async def list_snapshots(self, start_date: date, end_date: date) -> list[StorageUsageSnapshot]:
+        """期間内の日次スナップショットを日付順に取得します。
+
+        Args:
+            start_date: 開始日
+            end_date: 終了日（この日を含む）
+
+        Returns:
+            list[StorageUsageSnapshot]: スナップショット
+        """
+        result = await self.db.scalars(
+            select(StorageUsageSnapshot)
+            .where(StorageUsageSnapshot.snapshot_date >= start_date, StorageUsageSnapshot.snapshot_date <= end_date)
+            .order_by(StorageUsageSnapshot.snapshot_date)
+        )
+        return list(result.all())
+
+    async def get_last_snapshot_before(self, target_date: date) -> StorageUsageSnapshot | None:
+        """指定日より前の直近の日次スナップショットを取得します。
+
+        Args:
+            target_date: 基準日
+
+        Returns:
+            StorageUsageSnapshot | None: スナップショット、存在しない場合はNone
+        """
+        return await self.db.scalar(
+            select(StorageUsageSnapshot)
+            .where(StorageUsageSnapshot.snapshot_date < target_date)
+            .order_by(StorageUsageSnapshot.snapshot_date.desc())
+            .limit(1)
+        )
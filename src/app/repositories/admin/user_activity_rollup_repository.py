@@ -0,0 +1,409 @@
+"""操作履歴の集計（ロールアップ）リポジトリ。
+
+このモジュールは、操作履歴の集計テーブルへの書き込みと、
+集計テーブルと操作履歴を組み合わせた統計値の取得を提供します。
+
+取得範囲の分割:
+    集計済みの終了日時（rolled_until）より前は集計テーブル、以降は操作履歴（user_activity）から取得し、
+    結果を合算します。操作履歴の走査は未集計の範囲（通常は直近1時間程度）に限られます。
+"""
+
+from datetime import date, datetime
+from typing import Any
+
+from sqlalchemy import ColumnElement, Date, case, cast, func, select, union
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.audit.user_activity import UserActivity
+from app.models.audit.user_activity_rollup import (
+    UserActivityDailyUser,
+    UserActivityHourlyStat,
+    UserActivityRollupState,
+)
+
+# 集計状態の名前
+ROLLUP_NAME = "user_activity"
+
+# 集計処理の排他に使用するアドバイザリロックのキー
+ROLLUP_LOCK_KEY = 0x5553_4552_4143_5456
+
+# エラーとして扱うHTTPステータスの下限
+ERROR_STATUS_MIN = 400
+
+TimeRange = tuple[datetime | None, datetime | None]
+
+
+def split_range(
+    start: datetime | None,
+    end: datetime | None,
+    rolled_until: datetime | None,
+) -> tuple[TimeRange | None, TimeRange | None]:
+    """取得範囲を集計テーブルの範囲と操作履歴の範囲に分割します。
+
+    Args:
+        start: 開始日時（Noneは制限なし）
+        end: 終了日時（この日時を含まない、Noneは制限なし）
+        rolled_until: 集計済みの終了日時（Noneは未集計）
+
+    Returns:
+        tuple[TimeRange | None, TimeRange | None]: (集計テーブルの範囲, 操作履歴の範囲)、該当しない場合はNone
+    """
+    if rolled_until is None:
+        return None, (start, end)
+
+    rolled_end = rolled_until if end is None else min(end, rolled_until)
+    rolled = (start, rolled_end) if start is None or start < rolled_end else None
+    raw_start = rolled_until if start is None else max(start, rolled_until)
+    raw = (raw_start, end) if end is None or raw_start < end else None
+    return rolled, raw
+
+
+def _range_conditions(column: Any, time_range: TimeRange) -> list[ColumnElement[bool]]:
+    """日時カラムの範囲条件を作成します。"""
+    start, end = time_range
+    conditions: list[ColumnElement[bool]] = []
+    if start is not None:
+        conditions.append(column >= start)
+    if end is not None:
+        conditions.append(column < end)
+    return conditions
+
+
+class UserActivityRollupRepository:
+    """操作履歴の集計リポジトリ。
+
+    メソッド:
+        - get_rolled_until: 集計済みの終了日時を取得
+        - try_lock: 集計処理の排他ロックを取得
+        - rollup: 指定範囲の操作履歴を集計テーブルに追記
+        - get_request_totals: リクエスト数・エラー数・処理時間の合計を取得
+        - get_request_counts_by_date: 日別のリクエスト数・エラー数を取得
+        - get_error_counts_by_status: ステータスコード別のエラー数を取得
+        - get_active_users_by_date: 日別アクティブユーザー数を取得
+        - count_active_users: 期間内のアクティブユーザー数を取得
+    """
+
+    def __init__(self, db: AsyncSession):
+        """リポジトリを初期化します。
+
+        Args:
+            db: SQLAlchemyの非同期データベースセッション
+        """
+        self.db = db
+
+    # ================================================================================
+    # 集計
+    # ================================================================================
+
+    async def get_rolled_until(self) -> datetime | None:
+        """集計済みの終了日時を取得します。
+
+        Returns:
+            datetime | None: 集計済みの終了日時、未集計の場合はNone
+        """
+        return await self.db.scalar(
+            select(UserActivityRollupState.rolled_until).where(UserActivityRollupState.name == ROLLUP_NAME)
+        )
+
+    async def try_lock(self) -> bool:
+        """集計処理の排他ロック（トランザクション終了まで有効）を取得します。
+
+        Returns:
+            bool: 取得できた場合True、他のワーカーが集計中の場合False
+        """
+        return bool(await self.db.scalar(select(func.pg_try_advisory_xact_lock(ROLLUP_LOCK_KEY))))
+
+    async def get_oldest_activity_at(self) -> datetime | None:
+        """最も古い操作履歴の日時を取得します。"""
+        return await self.db.scalar(select(func.min(UserActivity.created_at)))
+
+    async def rollup(self, start: datetime, end: datetime) -> None:
+        """指定範囲の操作履歴を集計テーブルに追記し、集計済みの終了日時を更新します。
+
+        範囲は集計済みの終了日時から連続している必要があります（同じ範囲を2回集計すると二重計上されます）。
+
+        Args:
+            start: 開始日時（集計済みの終了日時）
+            end: 終了日時（この日時を含まない）
+        """
+        conditions = _range_conditions(UserActivity.created_at, (start, end))
+
+        bucket = func.date_trunc("hour", UserActivity.created_at)
+        hourly = pg_insert(UserActivityHourlyStat).from_select(
+            ["bucket_start", "response_status", "request_count", "duration_ms_sum"],
+            select(
+                bucket,
+                UserActivity.response_status,
+                func.count(),
+                func.coalesce(func.sum(UserActivity.duration_ms), 0),
+            )
+            .where(*conditions)
+            .group_by(bucket, UserActivity.response_status),
+        )
+        # 時間帯が範囲の境界をまたぐ場合（UTCとの時差が1時間単位でない場合）は加算する
+        hourly = hourly.on_conflict_do_update(
+            index_elements=["bucket_start", "response_status"],
+            set_={
+                "request_count": UserActivityHourlyStat.request_count + hourly.excluded.request_count,
+                "duration_ms_sum": UserActivityHourlyStat.duration_ms_sum + hourly.excluded.duration_ms_sum,
+            },
+        )
+        await self.db.execute(hourly)
+
+        daily_users = (
+            pg_insert(UserActivityDailyUser)
+            .from_select(
+                ["activity_date", "user_id"],
+                select(cast(UserActivity.created_at, Date), UserActivity.user_id)
+                .where(*conditions, UserActivity.user_id.isnot(None))
+                .distinct(),
+            )
+            .on_conflict_do_nothing(index_elements=["activity_date", "user_id"])
+        )
+        await self.db.execute(daily_users)
+
+        state = pg_insert(UserActivityRollupState).values(
+            name=ROLLUP_NAME,
+            rolled_until=end,
+            created_at=func.now(),
+            updated_at=func.now(),
+        )
+        state = state.on_conflict_do_update(
+            index_elements=["name"],
+            set_={"rolled_until": state.excluded.rolled_until, "updated_at": func.now()},
+        )
+        await self.db.execute(state)
+
+    # ================================================================================
+    # 統計値の取得
+    # ================================================================================
+
+    async def get_request_totals(
+        self,
+        start: datetime | None,
+        end: datetime | None,
+        rolled_until: datetime | None,
+    ) -> dict[str, int]:
+        """期間内のリクエスト数・エラー数・処理時間の合計を取得します。
+
+        Args:
+            start: 開始日時（Noneは制限なし）
+            end: 終了日時（この日時を含まない、Noneは制限なし）
+            rolled_until: 集計済みの終了日時
+
+        Returns:
+            dict[str, int]: 統計値
+                - total_count: リクエスト数
+                - error_count: エラー数（ステータス400以上）
+                - duration_ms_sum: 処理時間の合計（ミリ秒）
+        """
+        rolled, raw = split_range(start, end, rolled_until)
+        totals = {"total_count": 0, "error_count": 0, "duration_ms_sum": 0}
+
+        if rolled is not None:
+            row = (
+                await self.db.execute(
+                    select(
+                        func.sum(UserActivityHourlyStat.request_count),
+                        func.sum(
+                            case(
+                                (
+                                    UserActivityHourlyStat.response_status >= ERROR_STATUS_MIN,
+                                    UserActivityHourlyStat.request_count,
+                                ),
+                                else_=0,
+                            )
+                        ),
+                        func.sum(UserActivityHourlyStat.duration_ms_sum),
+                    ).where(*_range_conditions(UserActivityHourlyStat.bucket_start, rolled))
+                )
+            ).one()
+            self._add_totals(totals, row)
+
+        if raw is not None:
+            row = (
+                await self.db.execute(
+                    select(
+                        func.count(),
+                        func.count(case((UserActivity.response_status >= ERROR_STATUS_MIN, 1))),
+                        func.sum(UserActivity.duration_ms),
+                    ).where(*_range_conditions(UserActivity.created_at, raw))
+                )
+            ).one()
+            self._add_totals(totals, row)
+
+        return totals
+
+    async def get_request_counts_by_date(
+        self,
+        start: datetime,
+        end: datetime,
+        rolled_until: datetime | None,
+    ) -> dict[date, tuple[int, int]]:
+        """日別のリクエスト数・エラー数を取得します。
+
+        Args:
+            start: 開始日時
+            end: 終了日時（この日時を含まない）
+            rolled_until: 集計済みの終了日時
+
+        Returns:
+            dict[date, tuple[int, int]]: 日付 → (リクエスト数, エラー数)
+        """
+        rolled, raw = split_range(start, end, rolled_until)
+        counts: dict[date, tuple[int, int]] = {}
+
+        if rolled is not None:
+            day = cast(UserActivityHourlyStat.bucket_start, Date)
+            result = await self.db.execute(
+                select(
+                    day,
+                    func.sum(UserActivityHourlyStat.request_count),
+                    func.sum(
+                        case(
+                            (
+                                UserActivityHourlyStat.response_status >= ERROR_STATUS_MIN,
+                                UserActivityHourlyStat.request_count,
+                            ),
+                            else_=0,
+                        )
+                    ),
+                )
+                .where(*_range_conditions(UserActivityHourlyStat.bucket_start, rolled))
+                .group_by(day)
+            )
+            self._add_counts(counts, result.all())
+
+        if raw is not None:
+            day = cast(UserActivity.created_at, Date)
+            result = await self.db.execute(
+                select(
+                    day,
+                    func.count(),
+                    func.count(case((UserActivity.response_status >= ERROR_STATUS_MIN, 1))),
+                )
+                .where(*_range_conditions(UserActivity.created_at, raw))
+                .group_by(day)
+            )
+            self._add_counts(counts, result.all())
+
+        return counts
+
+    async def get_error_counts_by_status(
+        self,
+        start: datetime | None,
+        end: datetime | None,
+        rolled_until: datetime | None,
+    ) -> dict[int, int]:
+        """ステータスコード別のエラー数を取得します。
+
+        Args:
+            start: 開始日時（Noneは制限なし）
+            end: 終了日時（この日時を含まない、Noneは制限なし）
+            rolled_until: 集計済みの終了日時
+
+        Returns:
+            dict[int, int]: ステータスコード → エラー数
+        """
+        rolled, raw = split_range(start, end, rolled_until)
+        counts: dict[int, int] = {}
+
+        if rolled is not None:
+            result = await self.db.execute(
+                select(UserActivityHourlyStat.response_status, func.sum(UserActivityHourlyStat.request_count))
+                .where(
+                    UserActivityHourlyStat.response_status >= ERROR_STATUS_MIN,
+                    *_range_conditions(UserActivityHourlyStat.bucket_start, rolled),
+                )
+                .group_by(UserActivityHourlyStat.response_status)
+            )
+            for status_code, count in result.all():
+                counts[status_code] = counts.get(status_code, 0) + int(count or 0)
+
+        if raw is not None:
+            result = await self.db.execute(
+                select(UserActivity.response_status, func.count())
+                .where(
+                    UserActivity.response_status >= ERROR_STATUS_MIN,
+                    *_range_conditions(UserActivity.created_at, raw),
+                )
+                .group_by(UserActivity.response_status)
+            )
+            for status_code, count in result.all():
+                counts[status_code] = counts.get(status_code, 0) + int(count or 0)
+
+        return counts
+
+    async def get_active_users_by_date(
+        self,
+        start: datetime,
+        end: datetime,
+        rolled_until: datetime | None,
+    ) -> dict[date, int]:
+        """日別アクティブユーザー数（ユーザーの重複を除く）を取得します。
+
+        Args:
+            start: 開始日時（日付の境界）
+            end: 終了日時（日付の境界、この日時を含まない）
+            rolled_until: 集計済みの終了日時
+
+        Returns:
+            dict[date, int]: 日付 → アクティブユーザー数
+        """
+        users = self._active_users(start, end, rolled_until)
+        result = await self.db.execute(select(users.c.day, func.count()).group_by(users.c.day))
+        return {day: int(count) for day, count in result.all()}
+
+    async def count_active_users(self, start: datetime, end: datetime | None, rolled_until: datetime | None) -> int:
+        """期間内のアクティブユーザー数（ユーザーの重複を除く）を取得します。
+
+        Args:
+            start: 開始日時（日付の境界）
+            end: 終了日時（日付の境界、この日時を含まない、Noneは制限なし）
+            rolled_until: 集計済みの終了日時
+
+        Returns:
+            int: アクティブユーザー数
+        """
+        users = self._active_users(start, end, rolled_until)
+        return int(await self.db.scalar(select(func.count(func.distinct(users.c.user_id)))) or 0)
+
+    def _active_users(self, start: datetime, end: datetime | None, rolled_until: datetime | None) -> Any:
+        """期間内の（日付, ユーザーID）の組を返すサブクエリを作成します。"""
+        rolled, raw = split_range(start, end, rolled_until)
+        queries = []
+
+        if rolled is not None:
+            conditions = [UserActivityDailyUser.activity_date >= start.date()]
+            if end is not None:
+                conditions.append(UserActivityDailyUser.activity_date < end.date())
+            queries.append(
+                select(UserActivityDailyUser.activity_date.label("day"), UserActivityDailyUser.user_id).where(
+                    *conditions
+                )
+            )
+
+        if raw is not None or not queries:
+            queries.append(
+                select(cast(UserActivity.created_at, Date).label("day"), UserActivity.user_id).where(
+                    UserActivity.user_id.isnot(None),
+                    *_range_conditions(UserActivity.created_at, raw or (start, end)),
+                )
+            )
+
+        return (union(*queries) if len(queries) > 1 else queries[0].distinct()).subquery()
+
+    @staticmethod
+    def _add_totals(totals: dict[str, int], row: Any) -> None:
+        """合計値を加算します。"""
+        totals["total_count"] += int(row[0] or 0)
+        totals["error_count"] += int(row[1] or 0)
+        totals["duration_ms_sum"] += int(row[2] or 0)
+
+    @staticmethod
+    def _add_counts(counts: dict[date, tuple[int, int]], rows: Any) -> None:
+        """日別の件数を加算します。"""
+        for day, total_count, error_count in rows:
+            total, errors = counts.get(day, (0, 0))
+            counts[day] = (total + int(total_count or 0), errors + int(error_count or 0))
@@ -5,12 +5,12 @@
 
 import uuid
 
-from sqlalchemy import delete, func, select
+from sqlalchemy import delete, func, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.logging import get_logger
 from app.models.analysis import AnalysisChat
-from app.repositories.base import BaseRepository
+from app.repositories.base import BaseRepository, id_mapping
 
 logger = get_logger(__name__)
 
@@ -34,14 +34,14 @@ class AnalysisChatRepository(BaseRepository[AnalysisChat, uuid.UUID]):
         self,
         snapshot_id: uuid.UUID,
         skip: int = 0,
-        limit: int = 100,
+        limit: int | None = 100,
     ) -> list[AnalysisChat]:
         """スナップショットのチャット一覧を取得します。
 
         Args:
             snapshot_id: スナップショットID
             skip: スキップ数（デフォルト: 0）
-            limit: 取得件数（デフォルト: 100）
+            limit: 取得件数（デフォルト: 100、Noneの場合は全件）
 
         Returns:
             list[AnalysisChat]: チャット一覧（順序順）
@@ -126,30 +126,85 @@ class AnalysisChatRepository(BaseRepository[AnalysisChat, uuid.UUID]):
     async def bulk_create(
         self,
         snapshot_id: uuid.UUID,
-        chat_list: list[list[str]],
+        chat_list: list[list[str]] | list[tuple[str, str]],
+        start_order: int | None = None,
     ) -> list[AnalysisChat]:
         """複数のチャットを一括作成します。
 
+        1回の複数行INSERT ... RETURNINGで保存します。
+
         Args:
             snapshot_id: スナップショットID
             chat_list: チャットのリスト（[["role", "message"], ...]形式）
+            start_order: 先頭のチャット順序（未指定の場合は既存の最大順序の次から）
 
         Returns:
             list[AnalysisChat]: 作成されたチャット
         """
-        # 現在の最大順序を取得
-        max_order = await self.get_max_order(snapshot_id)
-
-        chats = []
-        for i, (role, message) in enumerate(chat_list):
-            chat = AnalysisChat(
-                snapshot_id=snapshot_id,
-                chat_order=max_order + 1 + i,
-                role=role,
-                message=message,
-            )
-            chats.append(chat)
+        if start_order is None:
+            start_order = await self.get_max_order(snapshot_id) + 1
+
+        return await self.create_many(
+            [
+                {
+                    "snapshot_id": snapshot_id,
+                    "chat_order": start_order + i,
+                    "role": role,
+                    "message": message,
+                }
+                for i, (role, message) in enumerate(chat_list)
+            ]
+        )
+
+    async def copy_to_snapshot(
+        self,
+        chats: list[AnalysisChat],
+        snapshot_id: uuid.UUID,
+    ) -> list[AnalysisChat]:
+        """チャットを別のスナップショットへ一括複製します（順序は維持）。
+
+        Args:
+            chats: 複製元のチャット
+            snapshot_id: 複製先のスナップショットID
+
+        Returns:
+            list[AnalysisChat]: 作成されたチャット
+        """
+        return await self.create_many(
+            [
+                {
+                    "snapshot_id": snapshot_id,
+                    "chat_order": chat.chat_order,
+                    "role": chat.role,
+                    "message": chat.message,
+                }
+                for chat in chats
+            ]
+        )
+
+    async def copy_from_snapshots(self, snapshot_mapping: dict[uuid.UUID, uuid.UUID]) -> None:
+        """複数スナップショットのチャットを、対応する新しいスナップショットへ一括複製します。
 
-        self.db.add_all(chats)
-        await self.db.flush()
-        return chats
+        1回のINSERT ... SELECTでサーバー側で複製します（順序は維持）。
+
+        Args:
+            snapshot_mapping: 複製元スナップショットIDと複製先スナップショットIDの対応表
+        """
+        if not snapshot_mapping:
+            return
+        snapshot_map = id_mapping(snapshot_mapping, "snapshot_map")
+        now = func.now()
+        await self.db.execute(
+            insert(AnalysisChat).from_select(
+                ["id", "snapshot_id", "chat_order", "role", "message", "created_at", "updated_at"],
+                select(
+                    func.gen_random_uuid(),
+                    snapshot_map.c.new_id,
+                    AnalysisChat.chat_order,
+                    AnalysisChat.role,
+                    AnalysisChat.message,
+                    now,
+                    now,
+                ).join_from(AnalysisChat, snapshot_map, snapshot_map.c.old_id == AnalysisChat.snapshot_id),
+            )
+        )
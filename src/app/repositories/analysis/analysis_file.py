@@ -5,13 +5,14 @@
 
 import uuid
 
-from sqlalchemy import select
+from sqlalchemy import func, insert, literal, select
+from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.core.logging import get_logger
 from app.models.analysis import AnalysisFile
-from app.repositories.base import BaseRepository
+from app.repositories.base import BaseRepository, id_mapping
 
 logger = get_logger(__name__)
 
@@ -81,3 +82,58 @@ class AnalysisFileRepository(BaseRepository[AnalysisFile, uuid.UUID]):
             select(AnalysisFile).where(AnalysisFile.project_file_id == project_file_id).where(AnalysisFile.sheet_name == sheet_name)
         )
         return result.scalar_one_or_none()
+
+    async def copy_to_session(
+        self,
+        source_session_id: uuid.UUID,
+        target_session_id: uuid.UUID,
+    ) -> dict[uuid.UUID, uuid.UUID]:
+        """セッションのファイルを別のセッションへ一括複製します。
+
+        INSERT ... SELECTでサーバー側で複製します（入力データはアプリケーションを経由しません）。
+
+        Args:
+            source_session_id: 複製元セッションID
+            target_session_id: 複製先セッションID
+
+        Returns:
+            dict[uuid.UUID, uuid.UUID]: 複製元ファイルIDと新しいファイルIDの対応表
+        """
+        result = await self.db.execute(select(AnalysisFile.id).where(AnalysisFile.session_id == source_session_id))
+        mapping = {file_id: uuid.uuid4() for file_id in result.scalars().all()}
+        if not mapping:
+            return mapping
+
+        file_map = id_mapping(mapping, "file_map")
+        now = func.now()
+        await self.db.execute(
+            insert(AnalysisFile).from_select(
+                [
+                    "id",
+                    "session_id",
+                    "project_file_id",
+                    "sheet_name",
+                    "axis_config",
+                    "data",
+                    "data_path",
+                    "data_schema",
+                    "row_count",
+                    "created_at",
+                    "updated_at",
+                ],
+                select(
+                    file_map.c.new_id,
+                    literal(target_session_id, UUID(as_uuid=True)),
+                    AnalysisFile.project_file_id,
+                    AnalysisFile.sheet_name,
+                    AnalysisFile.axis_config,
+                    AnalysisFile.data,
+                    AnalysisFile.data_path,
+                    AnalysisFile.data_schema,
+                    AnalysisFile.row_count,
+                    now,
+                    now,
+                ).join_from(AnalysisFile, file_map, file_map.c.old_id == AnalysisFile.id),
+            )
+        )
+        return mapping
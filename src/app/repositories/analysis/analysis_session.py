@@ -55,6 +55,38 @@ class AnalysisSessionRepository(BaseRepository[AnalysisSession, uuid.UUID]):
         )
         return result.scalar_one_or_none()
 
+    async def get_with_snapshots(self, session_id: uuid.UUID) -> AnalysisSession | None:
+        """スナップショット（ステップ、チャット含む）まで含めてセッションを取得します。
+
+        スナップショット数に関わらず一定回数のクエリでレスポンスに必要な関連を一括取得します。
+        同一トランザクション内で作成したスナップショットを反映するため、
+        既に読み込み済みのインスタンスも再読み込みします（populate_existing）。
+
+        Args:
+            session_id: セッションID
+
+        Returns:
+            AnalysisSession | None: セッション（スナップショットは順序順）
+        """
+        from app.models.analysis.analysis_issue_master import AnalysisIssueMaster
+
+        result = await self.db.execute(
+            select(AnalysisSession)
+            .where(AnalysisSession.id == session_id)
+            .options(
+                selectinload(AnalysisSession.snapshots).options(
+                    selectinload(AnalysisSnapshot.steps),
+                    selectinload(AnalysisSnapshot.chats),
+                ),
+                selectinload(AnalysisSession.issue).selectinload(AnalysisIssueMaster.validation),
+                selectinload(AnalysisSession.creator),
+                selectinload(AnalysisSession.input_file),
+                selectinload(AnalysisSession.current_snapshot),
+            )
+            .execution_options(populate_existing=True)
+        )
+        return result.scalar_one_or_none()
+
     async def list_by_project(
         self,
         project_id: uuid.UUID,
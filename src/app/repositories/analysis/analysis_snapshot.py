@@ -5,13 +5,14 @@
 
 import uuid
 
-from sqlalchemy import func, select
+from sqlalchemy import func, insert, literal, select
+from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.core.logging import get_logger
 from app.models.analysis import AnalysisSnapshot
-from app.repositories.base import BaseRepository
+from app.repositories.base import BaseRepository, id_mapping
 
 logger = get_logger(__name__)
 
@@ -34,6 +35,9 @@ class AnalysisSnapshotRepository(BaseRepository[AnalysisSnapshot, uuid.UUID]):
     async def get_with_relations(self, snapshot_id: uuid.UUID) -> AnalysisSnapshot | None:
         """リレーションシップを含めてスナップショットを取得します。
 
+        セッション内に読み込み済みのスナップショットでもステップ・チャットをロードするため、
+        populate_existingで既存のインスタンスを更新します。
+
         Args:
             snapshot_id: スナップショットID
 
@@ -47,6 +51,7 @@ class AnalysisSnapshotRepository(BaseRepository[AnalysisSnapshot, uuid.UUID]):
                 selectinload(AnalysisSnapshot.steps),
                 selectinload(AnalysisSnapshot.chats),
             )
+            .execution_options(populate_existing=True)
         )
         return result.scalar_one_or_none()
 
@@ -98,13 +103,20 @@ class AnalysisSnapshotRepository(BaseRepository[AnalysisSnapshot, uuid.UUID]):
         max_order = result.scalar_one()
         return max_order if max_order is not None else -1
 
-    async def list_by_session_with_relations(self, session_id: uuid.UUID) -> list[AnalysisSnapshot]:
+    async def list_by_session_with_relations(
+        self,
+        session_id: uuid.UUID,
+        skip: int = 0,
+        limit: int | None = None,
+    ) -> list[AnalysisSnapshot]:
         """セッションのスナップショット一覧をリレーションシップ付きで取得します。
 
         N+1クエリを回避するため、selectinloadを使用して一括取得します。
 
         Args:
             session_id: セッションID
+            skip: スキップするレコード数
+            limit: 取得する最大レコード数（Noneの場合は全件）
 
         Returns:
             list[AnalysisSnapshot]: スナップショット一覧（ステップ、チャット含む）
@@ -117,5 +129,49 @@ class AnalysisSnapshotRepository(BaseRepository[AnalysisSnapshot, uuid.UUID]):
                 selectinload(AnalysisSnapshot.chats),
             )
             .order_by(AnalysisSnapshot.snapshot_order.asc())
+            .offset(skip)
+            .limit(limit)
         )
         return list(result.scalars().all())
+
+    async def copy_to_session(
+        self,
+        source_session_id: uuid.UUID,
+        target_session_id: uuid.UUID,
+    ) -> dict[uuid.UUID, uuid.UUID]:
+        """セッションのスナップショットを別のセッションへ一括複製します。
+
+        INSERT ... SELECTでサーバー側で複製し、親スナップショットIDも新しいIDに付け替えます。
+        ステップ・チャットは複製しません（戻り値の対応表を使って各リポジトリで複製してください）。
+
+        Args:
+            source_session_id: 複製元セッションID
+            target_session_id: 複製先セッションID
+
+        Returns:
+            dict[uuid.UUID, uuid.UUID]: 複製元スナップショットIDと新しいスナップショットIDの対応表
+        """
+        result = await self.db.execute(select(AnalysisSnapshot.id).where(AnalysisSnapshot.session_id == source_session_id))
+        mapping = {snapshot_id: uuid.uuid4() for snapshot_id in result.scalars().all()}
+        if not mapping:
+            return mapping
+
+        snapshot_map = id_mapping(mapping, "snapshot_map")
+        parent_map = id_mapping(mapping, "parent_snapshot_map")
+        now = func.now()
+        await self.db.execute(
+            insert(AnalysisSnapshot).from_select(
+                ["id", "session_id", "parent_snapshot_id", "snapshot_order", "created_at", "updated_at"],
+                select(
+                    snapshot_map.c.new_id,
+                    literal(target_session_id, UUID(as_uuid=True)),
+                    parent_map.c.new_id,
+                    AnalysisSnapshot.snapshot_order,
+                    now,
+                    now,
+                )
+                .join_from(AnalysisSnapshot, snapshot_map, snapshot_map.c.old_id == AnalysisSnapshot.id)
+                .outerjoin(parent_map, parent_map.c.old_id == AnalysisSnapshot.parent_snapshot_id),
+            )
+        )
+        return mapping
@@ -4,13 +4,17 @@
 """
 
 import uuid
+from typing import Any
 
-from sqlalchemy import delete, func, select
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.core.logging import get_logger
-from app.models.analysis import AnalysisStep
-from app.repositories.base import BaseRepository
+from app.models.analysis import AnalysisStep, AnalysisStepConfig
+from app.models.analysis.analysis_step_config import compute_config_hash
+from app.repositories.base import BaseRepository, id_mapping
 
 logger = get_logger(__name__)
 
@@ -81,6 +85,127 @@ class AnalysisStepRepository(BaseRepository[AnalysisStep, uuid.UUID]):
         max_order = result.scalar_one()
         return max_order if max_order is not None else -1
 
+    async def bulk_create(
+        self,
+        snapshot_id: uuid.UUID,
+        steps: list[dict[str, Any]],
+    ) -> list[AnalysisStep]:
+        """複数のステップを一括作成します。
+
+        設定は未保存のハッシュのみAnalysisStepConfigへ書き込み、
+        ステップは1回の複数行INSERT ... RETURNINGで保存します。
+
+        Args:
+            snapshot_id: スナップショットID
+            steps: ステップのリスト（name, step_order, type, input, configをキーとする辞書）
+
+        Returns:
+            list[AnalysisStep]: 作成されたステップ（stepsと同じ順序）
+        """
+        config_hashes = [compute_config_hash(step["config"]) for step in steps]
+        await self.store_configs(dict(zip(config_hashes, (step["config"] for step in steps), strict=True)))
+
+        created = await self.create_many(
+            [
+                {
+                    "snapshot_id": snapshot_id,
+                    "name": step["name"],
+                    "step_order": step["step_order"],
+                    "type": step["type"],
+                    "input": step["input"],
+                    "config_hash": config_hash,
+                }
+                for step, config_hash in zip(steps, config_hashes, strict=True)
+            ]
+        )
+        for created_step, step in zip(created, steps, strict=True):
+            created_step.config = step["config"]
+        return created
+
+    async def copy_to_snapshot(
+        self,
+        steps: list[AnalysisStep],
+        snapshot_id: uuid.UUID,
+    ) -> list[AnalysisStep]:
+        """ステップを別のスナップショットへ一括複製します。
+
+        設定はハッシュの参照のみ複製し、設定本体は書き込みません。
+
+        Args:
+            steps: 複製元のステップ
+            snapshot_id: 複製先のスナップショットID
+
+        Returns:
+            list[AnalysisStep]: 作成されたステップ
+        """
+        created = await self.create_many(
+            [
+                {
+                    "snapshot_id": snapshot_id,
+                    "name": step.name,
+                    "step_order": step.step_order,
+                    "type": step.type,
+                    "input": step.input,
+                    "config_hash": step.config_hash,
+                }
+                for step in steps
+            ]
+        )
+        for created_step, step in zip(created, steps, strict=True):
+            set_committed_value(created_step, "config_entry", step.config_entry)
+        return created
+
+    async def copy_from_snapshots(self, snapshot_mapping: dict[uuid.UUID, uuid.UUID]) -> None:
+        """複数スナップショットのステップを、対応する新しいスナップショットへ一括複製します。
+
+        1回のINSERT ... SELECTでサーバー側で複製します（設定はハッシュの参照のみ複製）。
+
+        Args:
+            snapshot_mapping: 複製元スナップショットIDと複製先スナップショットIDの対応表
+        """
+        if not snapshot_mapping:
+            return
+        snapshot_map = id_mapping(snapshot_mapping, "snapshot_map")
+        now = func.now()
+        await self.db.execute(
+            insert(AnalysisStep).from_select(
+                ["id", "snapshot_id", "name", "step_order", "type", "input", "config_hash", "created_at", "updated_at"],
+                select(
+                    func.gen_random_uuid(),
+                    snapshot_map.c.new_id,
+                    AnalysisStep.name,
+                    AnalysisStep.step_order,
+                    AnalysisStep.type,
+                    AnalysisStep.input,
+                    AnalysisStep.config_hash,
+                    now,
+                    now,
+                ).join_from(AnalysisStep, snapshot_map, snapshot_map.c.old_id == AnalysisStep.snapshot_id),
+            )
+        )
+
+    async def store_configs(self, configs: dict[str, dict[str, Any]]) -> int:
+        """ステップ設定を内容ハッシュ単位で保存します。
+
+        保存済みのハッシュを先に確認し、未保存の設定のみ書き込みます。
+
+        Args:
+            configs: 内容ハッシュをキーとするステップ設定
+
+        Returns:
+            int: 新たに書き込んだ設定の件数
+        """
+        if not configs:
+            return 0
+        result = await self.db.execute(select(AnalysisStepConfig.config_hash).where(AnalysisStepConfig.config_hash.in_(list(configs))))
+        existing = set(result.scalars().all())
+        missing = [{"config_hash": config_hash, "config": config} for config_hash, config in configs.items() if config_hash not in existing]
+        if missing:
+            await self.db.execute(
+                pg_insert(AnalysisStepConfig.__table__).values(missing).on_conflict_do_nothing(index_elements=["config_hash"])
+            )
+        return len(missing)
+
     async def get_summary_steps(self, snapshot_id: uuid.UUID) -> list[AnalysisStep]:
         """スナップショットのsummaryステップを取得します。
 
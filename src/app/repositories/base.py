@@ -14,7 +14,8 @@
 import uuid
 from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import Values, column, insert, select, values
+from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
 # from sqlalchemy.orm.attributes import flag_modified
@@ -24,6 +25,25 @@ from app.models.base import Base
 logger = get_logger(__name__)
 
 
+def id_mapping(mapping: dict[uuid.UUID, uuid.UUID], name: str) -> Values:
+    """旧IDと新IDの対応表をVALUES句として作成します。
+
+    INSERT ... SELECTで行を複製する際に、外部キーをサーバー側で付け替えるために使用します。
+
+    Args:
+        mapping: 旧IDをキー、新IDを値とする辞書（空でないこと）
+        name: VALUES句の名前
+
+    Returns:
+        Values: old_id, new_idカラムを持つVALUES句
+    """
+    return values(
+        column("old_id", UUID(as_uuid=True)),
+        column("new_id", UUID(as_uuid=True)),
+        name=name,
+    ).data(list(mapping.items()))
+
+
 class BaseRepository[ModelType: Base, IDType: (int, uuid.UUID)]:
     """SQLAlchemyモデルの共通CRUD操作を提供するベースリポジトリクラス。
 
@@ -294,6 +314,34 @@ class BaseRepository[ModelType: Base, IDType: (int, uuid.UUID)]:
         await self.db.refresh(db_obj)
         return db_obj
 
+    async def create_many(self, rows: list[dict[str, Any]]) -> list[ModelType]:
+        """複数のレコードを一括作成します。
+
+        1回の複数行INSERT ... RETURNINGで書き込み、作成されたインスタンスを返します。
+        create()のループと異なり、件数に関わらずラウンドトリップは1回です。
+
+        Args:
+            rows (list[dict[str, Any]]): 各レコードのデータ（モデルのフィールド名をキーとする）
+                - すべての行で同じキーを指定してください
+
+        Returns:
+            list[ModelType]: 作成されたモデルインスタンス（rowsと同じ順序）
+
+        Raises:
+            IntegrityError: 一意制約違反、外部キー違反、NULL制約違反など
+
+        Note:
+            - create()と同様にcommit()は実行しません
+            - 返却されるインスタンスはセッションのアイデンティティマップに登録されます
+        """
+        if not rows:
+            return []
+        result = await self.db.scalars(
+            insert(self.model).returning(self.model, sort_by_parameter_order=True),
+            rows,
+        )
+        return list(result.all())
+
     async def update(self, db_obj: ModelType, **update_data: Any) -> ModelType:
         """既存レコードを更新します。
 
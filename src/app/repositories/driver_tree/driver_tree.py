@@ -5,13 +5,21 @@
 
 import asyncio
 import uuid
+from collections.abc import Iterable
 
-from sqlalchemy import func, select
+from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.core.logging import get_logger
-from app.models.driver_tree import DriverTree, DriverTreeNode, DriverTreePolicy
+from app.models.driver_tree import (
+    DriverTree,
+    DriverTreeDataFrame,
+    DriverTreeNode,
+    DriverTreePolicy,
+    DriverTreeRelationship,
+    DriverTreeRelationshipChild,
+)
 from app.repositories.base import BaseRepository
 
 logger = get_logger(__name__)
@@ -90,6 +98,149 @@ class DriverTreeRepository(BaseRepository[DriverTree, uuid.UUID]):
         result = await self.db.execute(select(func.count()).select_from(DriverTree).where(DriverTree.project_id == project_id))
         return result.scalar_one()
 
+    async def get_calculation_graph(self, tree_id: uuid.UUID) -> tuple[list[DriverTreeNode], list[DriverTreeRelationship]]:
+        """ツリーの計算に必要なノードとリレーションシップを取得します。
+
+        Args:
+            tree_id: ツリーID
+
+        Returns:
+            tuple[list[DriverTreeNode], list[DriverTreeRelationship]]:
+                (ノード（データフレーム含む、作成順）, リレーションシップ（子ノード含む）)
+        """
+        nodes = await self.db.scalars(
+            select(DriverTreeNode)
+            .where(DriverTreeNode.driver_tree_id == tree_id)
+            .options(selectinload(DriverTreeNode.data_frame))
+            .order_by(DriverTreeNode.created_at, DriverTreeNode.id)
+        )
+        relationships = await self.db.scalars(
+            select(DriverTreeRelationship)
+            .where(DriverTreeRelationship.driver_tree_id == tree_id)
+            .options(selectinload(DriverTreeRelationship.children))
+        )
+        return list(nodes.all()), list(relationships.all())
+
+    async def get_graph_edges(
+        self,
+        tree_id: uuid.UUID | None = None,
+        node_id: uuid.UUID | None = None,
+    ) -> list[tuple[uuid.UUID, str | None, uuid.UUID | None]]:
+        """ツリーの隣接関係（親ノード・演算子・子ノード）を1回のクエリで取得します。
+
+        tree_id または node_id のいずれかを指定します。node_id を指定した場合はノードが属するツリーの隣接関係を取得します。
+
+        Args:
+            tree_id: ツリーID
+            node_id: ツリーに属するノードID
+
+        Returns:
+            list[tuple[uuid.UUID, str | None, uuid.UUID | None]]: (親ノードID, 演算子, 子ノードID) のリスト
+                （リレーションシップの作成順・子ノードのorder_index順、子ノードが無いリレーションシップは子ノードIDがNone）
+        """
+        if tree_id is None:
+            tree_filter = DriverTreeRelationship.driver_tree_id == (
+                select(DriverTreeNode.driver_tree_id).where(DriverTreeNode.id == node_id).scalar_subquery()
+            )
+        else:
+            tree_filter = DriverTreeRelationship.driver_tree_id == tree_id
+        result = await self.db.execute(
+            select(
+                DriverTreeRelationship.parent_node_id,
+                DriverTreeRelationship.operator,
+                DriverTreeRelationshipChild.child_node_id,
+            )
+            .outerjoin(DriverTreeRelationshipChild, DriverTreeRelationshipChild.relationship_id == DriverTreeRelationship.id)
+            .where(tree_filter)
+            .order_by(
+                DriverTreeRelationship.created_at,
+                DriverTreeRelationship.id,
+                DriverTreeRelationshipChild.order_index,
+            )
+        )
+        return [tuple(row) for row in result.all()]
+
+    async def get_calculation_nodes(self, tree_id: uuid.UUID, node_ids: Iterable[uuid.UUID]) -> list[DriverTreeNode]:
+        """ツリーの計算に必要なノードを指定したIDのみ取得します（変更ノードの再バインド用）。
+
+        Args:
+            tree_id: ツリーID
+            node_ids: ノードIDのリスト
+
+        Returns:
+            list[DriverTreeNode]: ノード（データフレーム含む）
+        """
+        nodes = await self.db.scalars(
+            select(DriverTreeNode)
+            .where(DriverTreeNode.driver_tree_id == tree_id, DriverTreeNode.id.in_(list(node_ids)))
+            .options(selectinload(DriverTreeNode.data_frame))
+        )
+        return list(nodes.all())
+
+    async def get_versions(self, tree_id: uuid.UUID) -> tuple[int, int]:
+        """ツリーの現在のバージョンをDBから取得します。
+
+        セッションに読み込み済みのツリーの値ではなく、常にDB上の最新の値を返します。
+
+        Args:
+            tree_id: ツリーID
+
+        Returns:
+            tuple[int, int]: (structure_version, data_version)
+        """
+        result = await self.db.execute(
+            select(DriverTree.structure_version, DriverTree.data_version).where(DriverTree.id == tree_id)
+        )
+        structure_version, data_version = result.one()
+        return structure_version, data_version
+
+    async def increment_versions(self, tree_ids: Iterable[uuid.UUID], structure: bool) -> dict[uuid.UUID, int]:
+        """ツリーのバージョンを増加させます（計算結果キャッシュの無効化用）。
+
+        data_versionは常に、structure_versionはstructure=Trueの場合のみ増加させます。
+
+        Args:
+            tree_ids: ツリーIDのリスト
+            structure: 構造（ノード・リレーションシップ）の変更かどうか
+
+        Returns:
+            dict[uuid.UUID, int]: ツリーID毎の増加後のdata_version
+        """
+        tree_ids = list(tree_ids)
+        if not tree_ids:
+            return {}
+        values = {DriverTree.data_version: DriverTree.data_version + 1}
+        if structure:
+            values[DriverTree.structure_version] = DriverTree.structure_version + 1
+        result = await self.db.execute(
+            update(DriverTree)
+            .where(DriverTree.id.in_(tree_ids))
+            .values(values)
+            .returning(DriverTree.id, DriverTree.data_version)
+            .execution_options(synchronize_session=False)
+        )
+        return {tree_id: data_version for tree_id, data_version in result.all()}
+
+    async def list_ids_by_sheets(self, driver_tree_file_ids: Iterable[uuid.UUID]) -> list[uuid.UUID]:
+        """シートのデータフレームを参照するノードを持つツリーのIDを取得します。
+
+        Args:
+            driver_tree_file_ids: シート（DriverTreeFile）IDのリスト
+
+        Returns:
+            list[uuid.UUID]: ツリーIDのリスト
+        """
+        driver_tree_file_ids = list(driver_tree_file_ids)
+        if not driver_tree_file_ids:
+            return []
+        result = await self.db.scalars(
+            select(DriverTreeNode.driver_tree_id)
+            .join(DriverTreeDataFrame, DriverTreeNode.data_frame_id == DriverTreeDataFrame.id)
+            .where(DriverTreeDataFrame.driver_tree_file_id.in_(driver_tree_file_ids))
+            .distinct()
+        )
+        return list(result.all())
+
     async def count_nodes_by_tree(self, tree_id: uuid.UUID) -> int:
         """ツリーに含まれるノード数を取得します。
 
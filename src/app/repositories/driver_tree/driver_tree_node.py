@@ -4,6 +4,7 @@
 """
 
 import uuid
+from collections.abc import Iterable
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -78,6 +79,22 @@ class DriverTreeNodeRepository(BaseRepository[DriverTreeNode, uuid.UUID]):
         )
         return result.scalar_one_or_none()
 
+    async def get_many(self, node_ids: Iterable[uuid.UUID]) -> dict[uuid.UUID, DriverTreeNode]:
+        """複数のノードを一括取得します。
+
+        Args:
+            node_ids: ノードIDのリスト
+
+        Returns:
+            dict[uuid.UUID, DriverTreeNode]: ノードIDをキーとした辞書
+        """
+        ids = list(node_ids)
+        if not ids:
+            return {}
+
+        result = await self.db.execute(select(DriverTreeNode).where(DriverTreeNode.id.in_(ids)))
+        return {node.id: node for node in result.scalars().all()}
+
     async def get_many_with_policies(self, node_ids: list[uuid.UUID]) -> dict[uuid.UUID, DriverTreeNode]:
         """複数のノードを施策付きで一括取得します。
 
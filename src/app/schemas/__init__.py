@@ -13,6 +13,7 @@ from app.schemas.analysis import (
     AnalysisFileCreate,
     AnalysisFileListResponse,
     AnalysisFileResponse,
+    AnalysisFileRowsResponse,
     AnalysisFileUpdate,
     AnalysisGraphAxisBase,
     AnalysisGraphAxisCreate,
@@ -126,6 +127,7 @@ __all__ = [
     "AnalysisFileCreate",
     "AnalysisFileListResponse",
     "AnalysisFileResponse",
+    "AnalysisFileRowsResponse",
     "AnalysisFileUpdate",
     # 分析セッションスキーマ
     "AnalysisSessionListResponse",
@@ -47,6 +47,7 @@
             - AnalysisChatCreate: チャット作成リクエスト
             - AnalysisChatUpdate: チャット更新リクエスト
             - AnalysisChatResponse: チャットレスポンス
+            - AnalysisChatJobResponse: チャット実行ジョブレスポンス
 
         ステップ:
             - AnalysisStepBase: ステップベース
@@ -81,6 +82,7 @@ from app.schemas.analysis.analysis_session import (
     # チャット
     AnalysisChatBase,
     AnalysisChatCreate,
+    AnalysisChatJobResponse,
     AnalysisChatListResponse,
     AnalysisChatResponse,
     AnalysisChatUpdate,
@@ -90,6 +92,7 @@ from app.schemas.analysis.analysis_session import (
     AnalysisFileCreate,
     AnalysisFileListResponse,
     AnalysisFileResponse,
+    AnalysisFileRowsResponse,
     AnalysisFileUpdate,
     # セッション
     AnalysisSessionBase,
@@ -179,10 +182,12 @@ __all__ = [
     "AnalysisFileResponse",
     "AnalysisFileConfigResponse",
     "AnalysisFileListResponse",
+    "AnalysisFileRowsResponse",
     "AnalysisFileUpdate",
     # チャット
     "AnalysisChatBase",
     "AnalysisChatCreate",
+    "AnalysisChatJobResponse",
     "AnalysisChatListResponse",
     "AnalysisChatResponse",
     "AnalysisChatUpdate",
@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from typing import Any
+from typing import Any, Literal
 
 from pydantic import Field
 
@@ -107,7 +107,7 @@ class AnalysisFileResponse(BaseCamelCaseORMModel):
         project_file_name (str): プロジェクトファイル名 (結合データ)
         sheet_name (str): シート名
         axis_config (dict[str, Any]): 軸設定JSON
-        data (dict[str, Any]): データJSON
+        data (list[dict[str, Any]] | None): データJSON（軽量表示では省略）
         created_at (datetime): 作成日時
         updated_at (datetime): 更新日時
 
@@ -128,7 +128,7 @@ class AnalysisFileResponse(BaseCamelCaseORMModel):
     id: uuid.UUID = Field(..., description="分析ファイルID")
     sheet_name: str = Field(..., max_length=255, description="シート名")
     axis_config: dict[str, Any] = Field(..., description="軸設定JSON")
-    data: list[dict[str, Any]] = Field(..., description="データJSON（pandas DataFrameのrecord形式）")
+    data: list[dict[str, Any]] | None = Field(default=None, description="データJSON（pandas DataFrameのrecord形式、軽量表示では省略）")
     session_id: uuid.UUID = Field(..., description="セッションID")
     project_file_id: uuid.UUID = Field(..., description="プロジェクトファイルID")
     project_file_name: str = Field(..., description="プロジェクトファイル名")
@@ -320,6 +320,7 @@ class AnalysisStepResponse(BaseCamelCaseORMModel):
         result_formula (list[dict[str, Any]] | None): 結果の数式リスト
         result_chart (dict[str, Any] | None): 結果のチャート (plotly の JSON)
         result_table (list[dict[str, Any]] | None): 結果のテーブル (pandasのto_dict(orient='records')形式)
+        result_data_total (int | None): 結果データの総行数（result_dataは範囲指定で一部のみの場合あり）
         created_at (datetime): 作成日時
         updated_at (datetime): 更新日時
         result_data (list[dict[str, Any]] | None): 結果データ (中間保存用)
@@ -355,6 +356,7 @@ class AnalysisStepResponse(BaseCamelCaseORMModel):
     result_formula: list[dict[str, Any]] | None = Field(default=None, description="結果の数式リスト")
     result_chart: dict[str, Any] | None = Field(default=None, description="結果のチャート (plotly の JSON)")
     result_table: list[dict[str, Any]] | None = Field(default=None, description="結果のテーブル (pandasのto_dict(orient='records')形式)")
+    result_data_total: int | None = Field(default=None, description="結果データの総行数")
     created_at: datetime = Field(..., description="作成日時")
     updated_at: datetime = Field(..., description="更新日時")
 
@@ -731,6 +733,35 @@ class AnalysisFileListResponse(BaseCamelCaseModel):
     total: int = Field(..., description="総件数")
 
 
+class AnalysisFileRowsResponse(BaseCamelCaseModel):
+    """分析ファイルデータ行一覧レスポンススキーマ。
+
+    分析ファイルの入力データをページ単位で返すAPIのレスポンス形式を定義します。
+
+    Attributes:
+        file_id (uuid.UUID): 分析ファイルID
+        rows (list[dict[str, Any]]): データ行（pandas DataFrameのrecord形式）
+        total (int): 総行数
+        skip (int): スキップ数（オフセット）
+        limit (int): 取得件数
+
+    Example:
+        >>> response = AnalysisFileRowsResponse(
+        ...     file_id=file_id,
+        ...     rows=[{"店舗名": "A店", "売上": 1000}, ...],
+        ...     total=120000,
+        ...     skip=0,
+        ...     limit=1000
+        ... )
+    """
+
+    file_id: uuid.UUID = Field(..., description="分析ファイルID")
+    rows: list[dict[str, Any]] = Field(..., description="データ行（pandas DataFrameのrecord形式）")
+    total: int = Field(..., description="総行数")
+    skip: int = Field(..., description="スキップ数（オフセット）")
+    limit: int = Field(..., description="取得件数")
+
+
 class AnalysisSessionResultListResponse(BaseCamelCaseModel):
     """分析セッション結果一覧レスポンススキーマ。
 
@@ -777,6 +808,47 @@ class AnalysisChatListResponse(BaseCamelCaseModel):
     limit: int = Field(..., description="取得件数")
 
 
+class AnalysisChatJobResponse(BaseCamelCaseModel):
+    """チャット実行ジョブレスポンススキーマ。
+
+    バックグラウンドで実行されるAIチャットジョブの状態を定義します。
+
+    Attributes:
+        job_id (uuid.UUID): ジョブID
+        session_id (uuid.UUID): セッションID
+        status (str): ジョブ状態（queued, running, succeeded, failed）
+        message (str): ユーザーメッセージ
+        error (str | None): エラーメッセージ（失敗時のみ）
+        result (AnalysisSessionDetailResponse | None): 更新後のセッション詳細（成功時のみ）
+        created_at (datetime): 受付日時
+        started_at (datetime | None): 実行開始日時
+        finished_at (datetime | None): 終了日時
+
+    Example:
+        >>> {
+        ...     "job_id": "623e4567-e89b-12d3-a456-426614174555",
+        ...     "session_id": "223e4567-e89b-12d3-a456-426614174111",
+        ...     "status": "running",
+        ...     "message": "売上の推移を分析してください",
+        ...     "error": None,
+        ...     "result": None,
+        ...     "created_at": "2025-01-01T00:00:00Z",
+        ...     "started_at": "2025-01-01T00:00:01Z",
+        ...     "finished_at": None
+        ... }
+    """
+
+    job_id: uuid.UUID = Field(..., description="ジョブID")
+    session_id: uuid.UUID = Field(..., description="セッションID")
+    status: Literal["queued", "running", "succeeded", "failed"] = Field(..., description="ジョブ状態")
+    message: str = Field(..., description="ユーザーメッセージ")
+    error: str | None = Field(default=None, description="エラーメッセージ")
+    result: AnalysisSessionDetailResponse | None = Field(default=None, description="更新後のセッション詳細")
+    created_at: datetime = Field(..., description="受付日時")
+    started_at: datetime | None = Field(default=None, description="実行開始日時")
+    finished_at: datetime | None = Field(default=None, description="終了日時")
+
+
 # ================================================================================
 # スナップショット管理スキーマ
 # ================================================================================
@@ -808,13 +880,19 @@ class AnalysisSnapshotListResponse(BaseCamelCaseModel):
     Attributes:
         snapshots (list[AnalysisSnapshotResponse]): スナップショットリスト
         total (int): 総件数
+        skip (int): スキップ数（オフセット）
+        limit (int | None): 取得件数
 
     Example:
         >>> response = AnalysisSnapshotListResponse(
         ...     snapshots=[snapshot1, snapshot2, snapshot3],
-        ...     total=3
+        ...     total=3,
+        ...     skip=0,
+        ...     limit=20
         ... )
     """
 
     snapshots: list[AnalysisSnapshotResponse] = Field(..., description="スナップショットリスト")
     total: int = Field(..., description="総件数")
+    skip: int = Field(default=0, description="スキップ数（オフセット）")
+    limit: int | None = Field(default=None, description="取得件数")
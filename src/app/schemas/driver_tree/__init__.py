@@ -53,6 +53,9 @@ from app.schemas.driver_tree.driver_tree import (
     DriverTreeListItem,
     DriverTreeListResponse,
     DriverTreeResetResponse,
+    DriverTreeSimulationRequest,
+    DriverTreeSimulationResponse,
+    DriverTreeSimulationScenario,
     PolicyEffectInfo,
     TreePoliciesResponse,
     TreePolicyItem,
@@ -161,6 +164,9 @@ __all__ = [
     "DriverTreeListItem",
     "DriverTreeListResponse",
     "DriverTreeResetResponse",
+    "DriverTreeSimulationRequest",
+    "DriverTreeSimulationResponse",
+    "DriverTreeSimulationScenario",
     "PolicyEffectInfo",
     "TreePoliciesResponse",
     "TreePolicyItem",
@@ -68,6 +68,7 @@ class DriverTreeNodeInfo(BaseCamelCaseModel):
         - node_type: str - ノードタイプ（入力|計算|定数）
         - position_x :int - 座標
         - position_y :int - 座標
+        - level: int | None - ルートノードからの階層
         - data: DriverTreeNodeData - 入力ノードのデータ
     """
 
@@ -76,6 +77,7 @@ class DriverTreeNodeInfo(BaseCamelCaseModel):
     node_type: DriverTreeNodeTypeEnum = Field(..., description="ノードタイプ")
     position_x: int = Field(..., description="X座標")
     position_y: int = Field(..., description="Y座標")
+    level: int | None = Field(default=None, description="ルートノードからの階層（ルートノードは0、到達できないノードはNone）")
     data: DriverTreeNodeData | None = Field(default=None, description="入力ノードのデータ")
 
 
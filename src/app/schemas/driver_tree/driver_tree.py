@@ -65,6 +65,19 @@ class DriverTreeImportFormulaRequest(BaseCamelCaseModel):
     sheet_id: uuid.UUID | None = Field(default=None, description="入力シートID")
 
 
+class DriverTreeSimulationRequest(BaseCamelCaseModel):
+    """施策シミュレーションリクエスト。
+
+    Request Body:
+        - policy_id_list: list[uuid] - 対象の施策IDリスト（オプション、省略時はツリーの全施策）
+        - scenario_list: list[list[uuid]] - シナリオ毎に適用する施策IDリスト
+          （オプション、省略時は対象の施策の全ての組み合わせ）
+    """
+
+    policy_id_list: list[uuid.UUID] | None = Field(default=None, description="対象の施策IDリスト")
+    scenario_list: list[list[uuid.UUID]] | None = Field(default=None, description="シナリオ毎に適用する施策IDリスト")
+
+
 # Response
 
 
@@ -269,3 +282,47 @@ class TreePoliciesResponse(BaseCamelCaseModel):
     tree_id: uuid.UUID = Field(..., description="ツリーID")
     policies: list[TreePolicyItem] = Field(default_factory=list, description="施策一覧")
     total_count: int = Field(default=0, description="施策総数")
+
+
+class DriverTreeSimulationScenario(BaseCamelCaseModel):
+    """施策シミュレーションのシナリオ結果。
+
+    Attributes:
+        rank (int): 費用対効果の順位（1始まり）
+        policy_id_list (list[uuid.UUID]): 適用した施策IDリスト
+        kpi_value (float | None): 施策適用後のKPI値（全行の合計）
+        difference (float | None): KPIの差分（kpi_value - 施策適用前の値）
+        difference_percent (float | None): KPIの差分率（%）
+        total_cost (float): 施策のコストの合計
+        duration_months (int | None): 実施期間（月、施策の実施期間の最大値）
+        cost_effectiveness (float | None): 費用対効果（difference / total_cost、コストが0の場合はNone）
+    """
+
+    rank: int = Field(..., description="費用対効果の順位")
+    policy_id_list: list[uuid.UUID] = Field(..., description="適用した施策IDリスト")
+    kpi_value: float | None = Field(default=None, description="施策適用後のKPI値")
+    difference: float | None = Field(default=None, description="KPIの差分")
+    difference_percent: float | None = Field(default=None, description="KPIの差分率（%）")
+    total_cost: float = Field(default=0.0, description="施策のコストの合計")
+    duration_months: int | None = Field(default=None, description="実施期間（月）")
+    cost_effectiveness: float | None = Field(default=None, description="費用対効果")
+
+
+class DriverTreeSimulationResponse(BaseCamelCaseModel):
+    """施策シミュレーションレスポンス。
+
+    Response:
+        - tree_id (uuid.UUID): ツリーID
+        - kpi_node_id (uuid.UUID): KPIノード（ルートノード）ID
+        - kpi_node_label (str): KPIノード名
+        - baseline_value (float | None): 施策適用前のKPI値（全行の合計）
+        - scenarios (list[DriverTreeSimulationScenario]): シナリオ結果（費用対効果の順）
+        - scenario_count (int): シナリオ数
+    """
+
+    tree_id: uuid.UUID = Field(..., description="ツリーID")
+    kpi_node_id: uuid.UUID = Field(..., description="KPIノードID")
+    kpi_node_label: str = Field(..., description="KPIノード名")
+    baseline_value: float | None = Field(default=None, description="施策適用前のKPI値")
+    scenarios: list[DriverTreeSimulationScenario] = Field(default_factory=list, description="シナリオ結果")
+    scenario_count: int = Field(default=0, description="シナリオ数")
@@ -0,0 +1,77 @@
+"""操作履歴の集計（ロールアップ）サービス。
+
+このモジュールは、操作履歴（user_activity）を1時間単位で集計テーブルに追記する処理を提供します。
+統計情報サービスは集計済みの範囲を集計テーブルから取得します。
+定期実行はStatisticsJobScheduler（app.services.admin.statistics_jobs）が行います。
+
+集計仕様:
+    - 集計済みの終了日時から、現在時刻 - STATISTICS_ROLLUP_LAG_SECONDS を切り捨てた時刻（1時間単位）までを集計する
+    - 1回の処理で集計する範囲はSTATISTICS_ROLLUP_MAX_HOURS_PER_RUN時間まで（未集計の範囲が残る場合は続けて実行する）
+    - 初回は最も古い操作履歴の時間帯から集計する
+    - 集計と集計済み範囲の更新は同一トランザクションで行い、アドバイザリロックで
+      ワーカー間の同時実行を防ぐ（二重計上しない）
+
+Note:
+    - 集計済みの時間帯に後から書き込まれた操作履歴は集計されません。
+      操作履歴の一括書き込みの遅延より十分大きいSTATISTICS_ROLLUP_LAG_SECONDSを設定してください。
+    - 操作履歴の保持期間による削除（データ管理）は集計テーブルに影響しません。
+"""
+
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.repositories.admin.user_activity_rollup_repository import UserActivityRollupRepository
+
+logger = get_logger(__name__)
+
+
+def _floor_hour(value: datetime) -> datetime:
+    """日時を1時間単位に切り捨てます。"""
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+class ActivityRollupService:
+    """操作履歴の集計サービス。
+
+    メソッド:
+        - rollup: 未集計の時間帯を集計テーブルに追記
+    """
+
+    def __init__(self, db: AsyncSession):
+        """サービスを初期化します。"""
+        self.db = db
+        self.repository = UserActivityRollupRepository(db)
+
+    async def rollup(self, now: datetime | None = None) -> tuple[datetime | None, bool]:
+        """未集計の時間帯を集計テーブルに追記してコミットします。
+
+        Args:
+            now: 現在時刻（省略時はdatetime.now(UTC)）
+
+        Returns:
+            tuple[datetime | None, bool]: (集計済みの終了日時, 未集計の時間帯が残っているか)。
+                他のワーカーが集計中の場合は (None, False)
+        """
+        now = now or datetime.now(UTC)
+        if not await self.repository.try_lock():
+            await self.db.rollback()
+            return None, False
+
+        cutoff = _floor_hour(now - timedelta(seconds=settings.STATISTICS_ROLLUP_LAG_SECONDS))
+        start = await self.repository.get_rolled_until()
+        if start is None:
+            oldest = await self.repository.get_oldest_activity_at()
+            start = _floor_hour(oldest.astimezone(UTC)) if oldest is not None else cutoff
+
+        end = min(cutoff, start + timedelta(hours=settings.STATISTICS_ROLLUP_MAX_HOURS_PER_RUN))
+        if end <= start:
+            await self.db.rollback()
+            return start, False
+
+        await self.repository.rollup(start, end)
+        await self.db.commit()
+        logger.info("操作履歴を集計しました", start=start.isoformat(), end=end.isoformat())
+        return end, end < cutoff
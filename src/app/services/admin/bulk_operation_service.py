@@ -15,6 +15,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.decorators import measure_performance, transactional
 from app.core.logging import get_logger
+from app.core.principal_cache import principal_cache
 from app.models import Project, UserAccount
 from app.models.audit.user_activity import UserActivity
 from app.schemas.admin.bulk_operation import (
@@ -354,6 +355,8 @@ class BulkOperationService:
             ctx.success_count += 1
 
         await self.db.flush()
+        for user, _ in target_users:
+            await principal_cache.invalidate_user(user.azure_oid)
 
         logger.warning(
             "非アクティブユーザー一括無効化を完了",
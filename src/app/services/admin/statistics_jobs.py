@@ -0,0 +1,104 @@
+"""統計情報の定期処理。
+
+このモジュールは、統計情報の表示に使用する集計データを更新する定期処理を提供します。
+lifespanで起動し、STATISTICS_JOBS_INTERVAL_SECONDS毎に以下を実行します。
+
+処理内容:
+    1. 操作履歴の集計（ActivityRollupService.rollup）: 未集計の時間帯が残っている間は続けて実行
+    2. ストレージ使用量の日次スナップショット（StorageUsageService.snapshot）
+    3. ストレージ使用量の整合処理（StorageUsageService.reconcile）:
+       STORAGE_RECONCILE_INTERVAL_HOURS毎（0で無効）
+
+Note:
+    - 各処理は独自のDBセッションで実行し、失敗しても他の処理・次回の実行は継続します
+    - 複数ワーカーで同時に実行されても集計が二重計上されることはありません
+      （操作履歴の集計はアドバイザリロックで排他、スナップショットは当日分の上書き）
+"""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import get_async_session_context
+from app.core.logging import get_logger
+from app.services.admin.activity_rollup_service import ActivityRollupService
+from app.services.admin.storage_usage_service import StorageUsageService
+
+logger = get_logger(__name__)
+
+
+class StatisticsJobScheduler:
+    """統計情報の定期処理を実行するクラス。"""
+
+    def __init__(self, interval_seconds: float, reconcile_interval_hours: float):
+        """定期処理を初期化します。
+
+        Args:
+            interval_seconds: 定期処理の実行間隔（秒）
+            reconcile_interval_hours: ストレージ使用量の整合処理の実行間隔（時間、0で無効）
+        """
+        self.interval_seconds = interval_seconds
+        self.reconcile_interval_seconds = reconcile_interval_hours * 3600
+        self.session_factory: Callable[[], Any] = get_async_session_context
+        self._task: asyncio.Task | None = None
+        self._last_reconciled: float | None = None
+
+    def start(self) -> None:
+        """定期処理タスクを開始します（起動済みの場合は何もしません）。"""
+        if self._task is not None and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._run(), name="statistics-jobs")
+
+    async def shutdown(self) -> None:
+        """定期処理タスクを停止します。"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def run_once(self) -> None:
+        """定期処理を1回実行します。"""
+
+        async def rollup(session: AsyncSession) -> None:
+            has_more = True
+            while has_more:
+                _, has_more = await ActivityRollupService(session).rollup()
+
+        await self._run_job("操作履歴の集計", rollup)
+
+        if self._reconcile_due():
+            self._last_reconciled = time.monotonic()
+            await self._run_job("ストレージ使用量の整合処理", lambda session: StorageUsageService(session).reconcile())
+        else:
+            await self._run_job("ストレージ使用量のスナップショット", lambda session: StorageUsageService(session).snapshot())
+
+    def _reconcile_due(self) -> bool:
+        """整合処理を実行する時期かを判定します（起動後の初回は実行します）。"""
+        if self.reconcile_interval_seconds <= 0:
+            return False
+        return self._last_reconciled is None or time.monotonic() - self._last_reconciled >= self.reconcile_interval_seconds
+
+    async def _run_job(self, name: str, job: Callable[[AsyncSession], Awaitable[Any]]) -> None:
+        """処理を独自のセッションで実行します（失敗はログに記録して継続します）。"""
+        try:
+            async with self.session_factory() as session:
+                await job(session)
+        except Exception as e:
+            logger.exception(f"{name}に失敗しました", error_type=type(e).__name__, error_message=str(e))
+
+    async def _run(self) -> None:
+        """定期処理を繰り返します。"""
+        while True:
+            await self.run_once()
+            await asyncio.sleep(self.interval_seconds)
+
+
+# グローバルインスタンス
+statistics_job_scheduler = StatisticsJobScheduler(
+    interval_seconds=settings.STATISTICS_JOBS_INTERVAL_SECONDS,
+    reconcile_interval_hours=settings.STORAGE_RECONCILE_INTERVAL_HOURS,
+)
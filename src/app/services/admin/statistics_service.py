@@ -1,18 +1,29 @@
 """統計情報サービス。
 
 このモジュールは、システム統計情報の集計機能を提供します。
+
+操作履歴（UserActivity）に基づく統計（アクティブユーザー・APIリクエスト・エラー）は、
+集計済みの範囲を集計テーブル（ActivityRollupServiceが1時間単位で追記）から取得し、
+未集計の直近の範囲のみ操作履歴から取得して合算します。
+
+ストレージ統計は、プロジェクト毎の使用量（ProjectFileの追加・削除時に差分更新）と
+日次スナップショット（StorageUsageServiceが登録）から取得します。
 """
 
-import asyncio
 from datetime import UTC, date, datetime, timedelta
 
 from sqlalchemy import Date, cast, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
+from app.core.database import parallel_query_executor
 from app.core.decorators import measure_performance
 from app.core.logging import get_logger
 from app.models import Project, UserAccount
-from app.models.audit.user_activity import UserActivity
+from app.repositories.admin.storage_usage_repository import StorageUsageRepository
+from app.repositories.admin.user_activity_rollup_repository import (
+    UserActivityRollupRepository,
+)
 from app.schemas.admin.statistics import (
     ApiStatistics,
     ApiStatisticsDetailResponse,
@@ -46,6 +57,8 @@ class StatisticsService:
     def __init__(self, db: AsyncSession):
         """サービスを初期化します。"""
         self.db = db
+        self.rollup_repository = UserActivityRollupRepository(db)
+        self.storage_repository = StorageUsageRepository(db)
 
     @measure_performance
     async def get_overview(
@@ -70,12 +83,13 @@ class StatisticsService:
             action="get_statistics_overview",
         )
 
-        # 4つの統計を並行実行
-        users, projects, storage, api = await asyncio.gather(
-            self._get_user_summary(),
-            self._get_project_summary(),
-            self._get_storage_summary(),
-            self._get_api_summary(),
+        # 4つの統計を別々のセッションで並行実行
+        users, projects, storage, api = await parallel_query_executor.run(
+            self.db,
+            lambda session: StatisticsService(session)._get_user_summary(),
+            lambda session: StatisticsService(session)._get_project_summary(),
+            lambda session: StatisticsService(session)._get_storage_summary(),
+            lambda session: StatisticsService(session)._get_api_summary(),
         )
 
         return StatisticsOverviewResponse(
@@ -90,13 +104,9 @@ class StatisticsService:
         # 総ユーザー数
         total_query = select(func.count()).select_from(UserAccount)
 
-        # 今日アクティブなユーザー数
         today_start = datetime.now(UTC).replace(
             hour=0, minute=0, second=0, microsecond=0
         )
-        active_query = select(func.count(func.distinct(UserActivity.user_id))).where(
-            UserActivity.created_at >= today_start
-        )
 
         # 今月の新規ユーザー数
         month_start = datetime.now(UTC).replace(
@@ -108,15 +118,16 @@ class StatisticsService:
             .where(UserAccount.created_at >= month_start)
         )
 
-        # 3つのクエリを並行実行
-        total_result, active_result, new_result = await asyncio.gather(
-            self.db.execute(total_query),
-            self.db.execute(active_query),
-            self.db.execute(new_query),
+        total_result = await self.db.execute(total_query)
+        new_result = await self.db.execute(new_query)
+
+        # 今日アクティブなユーザー数（集計テーブル + 未集計の操作履歴）
+        rolled_until = await self.rollup_repository.get_rolled_until()
+        active_today = await self.rollup_repository.count_active_users(
+            today_start, None, rolled_until
         )
 
         total = total_result.scalar_one() or 0
-        active_today = active_result.scalar_one() or 0
         new_this_month = new_result.scalar_one() or 0
 
         return UserStatistics(
@@ -155,10 +166,10 @@ class StatisticsService:
 
     async def _get_storage_summary(self) -> StorageStatistics:
         """ストレージ統計サマリーを取得します。"""
-        # TODO: 実際のストレージ使用量を計算
-        # ここではプレースホルダー値を返す
-        total_bytes = 0
-        used_percentage = 0.0
+        # プロジェクト毎の使用量（ファイル追加・削除時に差分更新）の合計
+        _, total_bytes = await self.storage_repository.get_totals()
+        capacity = settings.STORAGE_CAPACITY_BYTES
+        used_percentage = round(total_bytes / capacity * 100, 2) if capacity > 0 else 0.0
 
         return StorageStatistics(
             total_bytes=total_bytes,
@@ -172,38 +183,17 @@ class StatisticsService:
             hour=0, minute=0, second=0, microsecond=0
         )
 
-        # 今日のリクエスト数
-        request_query = (
-            select(func.count())
-            .select_from(UserActivity)
-            .where(UserActivity.created_at >= today_start)
-        )
-
-        # 平均レスポンス時間
-        avg_query = select(func.avg(UserActivity.duration_ms)).where(
-            UserActivity.created_at >= today_start
+        # 今日のリクエスト数・エラー数・処理時間の合計（集計テーブル + 未集計の操作履歴）
+        rolled_until = await self.rollup_repository.get_rolled_until()
+        totals = await self.rollup_repository.get_request_totals(
+            today_start, None, rolled_until
         )
 
-        # エラー率
-        error_query = (
-            select(func.count())
-            .select_from(UserActivity)
-            .where(
-                UserActivity.created_at >= today_start,
-                UserActivity.response_status >= 400,
-            )
+        requests_today = totals["total_count"]
+        average_response_ms = (
+            totals["duration_ms_sum"] / requests_today if requests_today > 0 else 0
         )
-
-        # 3つのクエリを並行実行
-        request_result, avg_result, error_result = await asyncio.gather(
-            self.db.execute(request_query),
-            self.db.execute(avg_query),
-            self.db.execute(error_query),
-        )
-
-        requests_today = request_result.scalar_one() or 0
-        average_response_ms = avg_result.scalar_one() or 0
-        error_count = error_result.scalar_one() or 0
+        error_count = totals["error_count"]
         error_rate = (error_count / requests_today * 100) if requests_today > 0 else 0
 
         return ApiStatistics(
@@ -244,28 +234,14 @@ class StatisticsService:
         today = date.today()
         start_date = today - timedelta(days=days - 1)
 
-        # 1回のGROUP BYクエリで全日付のカウントを取得
-        query = (
-            select(
-                cast(UserActivity.created_at, Date).label("date"),
-                func.count(func.distinct(UserActivity.user_id)).label("count"),
-            )
-            .where(
-                UserActivity.created_at
-                >= datetime.combine(start_date, datetime.min.time()).replace(
-                    tzinfo=UTC
-                ),
-                UserActivity.created_at
-                < datetime.combine(
-                    today + timedelta(days=1), datetime.min.time()
-                ).replace(tzinfo=UTC),
-            )
-            .group_by(cast(UserActivity.created_at, Date))
+        # 集計テーブルの日別ユーザーと未集計の操作履歴から日別のユニーク数を取得
+        rolled_until = await self.rollup_repository.get_rolled_until()
+        count_map = await self.rollup_repository.get_active_users_by_date(
+            self._day_start(start_date),
+            self._day_start(today + timedelta(days=1)),
+            rolled_until,
         )
 
-        result = await self.db.execute(query)
-        count_map: dict[date, int] = {row.date: row.count for row in result.all()}  # type: ignore[misc]
-
         # 結果を構築（0埋め）
         data_points = []
         for i in range(days):
@@ -330,11 +306,8 @@ class StatisticsService:
         Returns:
             StorageStatisticsDetailResponse: ストレージ統計詳細
         """
-        # TODO: 実際のストレージ使用量を計算
-        # 現在はプレースホルダー値を返す
-        total_bytes = 0
-
-        usage_trend = await self._get_storage_usage_trend(days)
+        _, total_bytes = await self.storage_repository.get_totals()
+        usage_trend = await self._get_storage_usage_trend(days, total_bytes)
 
         return StorageStatisticsDetailResponse(
             total_bytes=total_bytes,
@@ -342,18 +315,31 @@ class StatisticsService:
             usage_trend=usage_trend,
         )
 
-    async def _get_storage_usage_trend(self, days: int) -> list[TimeSeriesDataPoint]:
-        """ストレージ使用量推移を取得します。"""
-        # TODO: 実際のストレージ使用量を計算
-        # 現在はプレースホルダー値を返す
-        result = []
+    async def _get_storage_usage_trend(
+        self, days: int, current_bytes: int
+    ) -> list[TimeSeriesDataPoint]:
+        """ストレージ使用量推移を取得します。
+
+        日次スナップショットから構築し、スナップショットが無い日は直前の値を引き継ぎます。
+        当日は現在の使用量を使用します。
+        """
         today = date.today()
+        start_date = today - timedelta(days=days - 1)
 
-        for i in range(days - 1, -1, -1):
-            target_date = today - timedelta(days=i)
-            result.append(TimeSeriesDataPoint(date=target_date, value=0.0))
+        snapshots = await self.storage_repository.list_snapshots(start_date, today)
+        bytes_map = {snapshot.snapshot_date: snapshot.total_bytes for snapshot in snapshots}
+        previous = await self.storage_repository.get_last_snapshot_before(start_date)
+        value = previous.total_bytes if previous is not None else 0
 
-        return result
+        data_points = []
+        for i in range(days):
+            current_date = start_date + timedelta(days=i)
+            value = bytes_map.get(current_date, value)
+            if current_date == today:
+                value = current_bytes
+            data_points.append(TimeSeriesDataPoint(date=current_date, value=float(value)))
+
+        return data_points
 
     @measure_performance
     async def get_api_request_statistics(
@@ -373,10 +359,16 @@ class StatisticsService:
         # 総リクエスト数を計算
         total_requests = sum(int(point.value) for point in request_trend)
 
-        # 平均レスポンス時間を計算
-        avg_query = select(func.avg(UserActivity.duration_ms))
-        result = await self.db.execute(avg_query)
-        average_response_ms = result.scalar_one() or 0
+        # 平均レスポンス時間を計算（全期間）
+        rolled_until = await self.rollup_repository.get_rolled_until()
+        totals = await self.rollup_repository.get_request_totals(
+            None, None, rolled_until
+        )
+        average_response_ms = (
+            totals["duration_ms_sum"] / totals["total_count"]
+            if totals["total_count"] > 0
+            else 0
+        )
 
         return ApiStatisticsDetailResponse(
             total_requests=total_requests,
@@ -389,36 +381,15 @@ class StatisticsService:
         today = date.today()
         start_date = today - timedelta(days=days - 1)
 
-        # 1回のGROUP BYクエリで全日付のカウントを取得
-        query = (
-            select(
-                cast(UserActivity.created_at, Date).label("date"),
-                func.count().label("count"),
-            )
-            .where(
-                UserActivity.created_at
-                >= datetime.combine(start_date, datetime.min.time()).replace(
-                    tzinfo=UTC
-                ),
-                UserActivity.created_at
-                < datetime.combine(
-                    today + timedelta(days=1), datetime.min.time()
-                ).replace(tzinfo=UTC),
-            )
-            .group_by(cast(UserActivity.created_at, Date))
-        )
-
-        result = await self.db.execute(query)
-        count_map: dict[date, int] = {row.date: row.count for row in result.all()}  # type: ignore[misc]
+        count_map = await self._get_request_counts_by_date(start_date, today)
 
         # 結果を構築（0埋め）
         data_points = []
         for i in range(days):
             current_date = start_date + timedelta(days=i)
+            total_count, _ = count_map.get(current_date, (0, 0))
             data_points.append(
-                TimeSeriesDataPoint(
-                    date=current_date, value=float(count_map.get(current_date, 0))
-                )
+                TimeSeriesDataPoint(date=current_date, value=float(total_count))
             )
 
         return data_points
@@ -436,26 +407,16 @@ class StatisticsService:
         Returns:
             ErrorStatisticsDetailResponse: エラー統計詳細
         """
-        # 総エラー数を計算
-        error_query = (
-            select(func.count())
-            .select_from(UserActivity)
-            .where(UserActivity.response_status >= 400)
+        # 全期間のリクエスト数・エラー数（集計テーブル + 未集計の操作履歴）
+        rolled_until = await self.rollup_repository.get_rolled_until()
+        totals = await self.rollup_repository.get_request_totals(
+            None, None, rolled_until
         )
+        error_trend = await self._get_error_rate_trend(days)
+        error_by_type = await self._get_error_by_type()
 
-        # エラー率を計算
-        total_query = select(func.count()).select_from(UserActivity)
-
-        # 4つの処理を並行実行
-        error_trend, error_result, total_result, error_by_type = await asyncio.gather(
-            self._get_error_rate_trend(days),
-            self.db.execute(error_query),
-            self.db.execute(total_query),
-            self._get_error_by_type(),
-        )
-
-        total_errors = error_result.scalar_one() or 0
-        total_requests = total_result.scalar_one() or 0
+        total_errors = totals["error_count"]
+        total_requests = totals["total_count"]
         error_rate = (total_errors / total_requests * 100) if total_requests > 0 else 0
 
         return ErrorStatisticsDetailResponse(
@@ -470,32 +431,7 @@ class StatisticsService:
         today = date.today()
         start_date = today - timedelta(days=days - 1)
 
-        # 1回のGROUP BYクエリで全日付の総リクエスト数とエラー数を取得
-        query = (
-            select(
-                cast(UserActivity.created_at, Date).label("date"),
-                func.count().label("total_count"),
-                func.sum(
-                    func.case((UserActivity.response_status >= 400, 1), else_=0)
-                ).label("error_count"),
-            )
-            .where(
-                UserActivity.created_at
-                >= datetime.combine(start_date, datetime.min.time()).replace(
-                    tzinfo=UTC
-                ),
-                UserActivity.created_at
-                < datetime.combine(
-                    today + timedelta(days=1), datetime.min.time()
-                ).replace(tzinfo=UTC),
-            )
-            .group_by(cast(UserActivity.created_at, Date))
-        )
-
-        result = await self.db.execute(query)
-        stats_map = {
-            row.date: (row.total_count, row.error_count or 0) for row in result.all()
-        }
+        stats_map = await self._get_request_counts_by_date(start_date, today)
 
         # 結果を構築（0埋め）
         data_points = []
@@ -512,17 +448,13 @@ class StatisticsService:
 
     async def _get_error_by_type(self) -> dict[str, int]:
         """エラー種別ごとのカウントを取得します。"""
-        query = (
-            select(UserActivity.response_status, func.count())
-            .where(UserActivity.response_status >= 400)
-            .group_by(UserActivity.response_status)
+        rolled_until = await self.rollup_repository.get_rolled_until()
+        counts = await self.rollup_repository.get_error_counts_by_status(
+            None, None, rolled_until
         )
 
-        result = await self.db.execute(query)
-        rows = result.all()
-
         error_by_type = {}
-        for status_code, count in rows:
+        for status_code, count in sorted(counts.items()):
             status_name = {
                 400: "Bad Request",
                 401: "Unauthorized",
@@ -537,3 +469,27 @@ class StatisticsService:
             error_by_type[status_name] = count
 
         return error_by_type
+
+    async def _get_request_counts_by_date(
+        self, start_date: date, end_date: date
+    ) -> dict[date, tuple[int, int]]:
+        """日別のリクエスト数・エラー数を取得します（集計テーブル + 未集計の操作履歴）。
+
+        Args:
+            start_date: 開始日
+            end_date: 終了日（この日を含む）
+
+        Returns:
+            dict[date, tuple[int, int]]: 日付 → (リクエスト数, エラー数)
+        """
+        rolled_until = await self.rollup_repository.get_rolled_until()
+        return await self.rollup_repository.get_request_counts_by_date(
+            self._day_start(start_date),
+            self._day_start(end_date + timedelta(days=1)),
+            rolled_until,
+        )
+
+    @staticmethod
+    def _day_start(target_date: date) -> datetime:
+        """日付の開始日時（UTC）を返します。"""
+        return datetime.combine(target_date, datetime.min.time()).replace(tzinfo=UTC)
@@ -0,0 +1,92 @@
+"""ストレージ使用量サービス。
+
+このモジュールは、ストレージ使用量の日次スナップショットの登録と、
+集計値とストレージ（ローカル/Azure Blob）の整合処理を提供します。
+
+使用量の集計:
+    - プロジェクト毎の使用量（ProjectStorageUsage）はProjectFileの追加・削除時に差分で更新されます
+    - 統計情報は集計テーブルのみを参照し、リクエスト毎にファイルやストレージを走査しません
+
+整合処理（reconcile）:
+    - 使用量をProjectFileから再計算して差分の取りこぼしを補正します
+    - StorageService.list_blobs()でプロジェクトファイルの領域を一覧し、
+      ProjectFileに存在しないファイル（孤立）とストレージに存在しないProjectFile（欠損）の数を記録します
+    - ファイルの削除は行いません
+"""
+
+from datetime import date
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logging import get_logger
+from app.repositories.admin.storage_usage_repository import StorageUsageRepository
+from app.services.storage import StorageService, get_storage_service
+
+logger = get_logger(__name__)
+
+# プロジェクトファイルを保存するストレージパスのプレフィックス
+PROJECT_FILE_PREFIX = "projects/"
+
+
+class StorageUsageService:
+    """ストレージ使用量サービス。
+
+    メソッド:
+        - snapshot: 当日の日次スナップショットを登録
+        - reconcile: 使用量の再計算とストレージとの整合確認
+    """
+
+    def __init__(self, db: AsyncSession, storage: StorageService | None = None):
+        """サービスを初期化します。
+
+        Args:
+            db: データベースセッション
+            storage: ストレージサービス（省略時は設定に応じたサービス）
+        """
+        self.db = db
+        self.storage = storage
+        self.repository = StorageUsageRepository(db)
+
+    async def snapshot(self, today: date | None = None) -> None:
+        """現在の使用量を当日の日次スナップショットとして登録し、コミットします。
+
+        Args:
+            today: 日付（省略時は今日）
+        """
+        file_count, total_bytes = await self.repository.get_totals()
+        await self.repository.upsert_snapshot(today or date.today(), file_count, total_bytes)
+        await self.db.commit()
+
+    async def reconcile(self, today: date | None = None) -> dict[str, int]:
+        """使用量をProjectFileから再計算し、ストレージ上のファイルと突き合わせます。
+
+        結果は当日の日次スナップショットに記録し、コミットします。
+
+        Args:
+            today: 日付（省略時は今日）
+
+        Returns:
+            dict[str, int]: 整合処理の結果
+                - blob_count: ストレージ上のファイル数
+                - orphan_blob_count: ProjectFileに存在しないストレージ上のファイル数
+                - missing_blob_count: ストレージに存在しないProjectFileの数
+        """
+        storage = self.storage or get_storage_service()
+        blobs = set(await storage.list_blobs("", prefix=PROJECT_FILE_PREFIX))
+        paths = await self.repository.list_file_paths()
+
+        await self.repository.rebuild_usage()
+        file_count, total_bytes = await self.repository.get_totals()
+        reconciled = {
+            "blob_count": len(blobs),
+            "orphan_blob_count": len(blobs - paths),
+            "missing_blob_count": len(paths - blobs),
+        }
+        await self.repository.upsert_snapshot(today or date.today(), file_count, total_bytes, **reconciled)
+        await self.db.commit()
+
+        if reconciled["orphan_blob_count"] or reconciled["missing_blob_count"]:
+            logger.warning("ストレージとプロジェクトファイルの不整合を検出しました", **reconciled)
+        else:
+            logger.info("ストレージ使用量の整合処理が完了しました", total_bytes=total_bytes, **reconciled)
+        return reconciled
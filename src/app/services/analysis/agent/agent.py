@@ -1,5 +1,8 @@
+import asyncio
 import time
+from collections.abc import Callable
 from pathlib import Path
+from typing import Any
 
 from langchain_classic.agents import AgentExecutor, create_tool_calling_agent
 from langchain_classic.memory import ConversationBufferMemory
@@ -25,6 +28,7 @@ from .utils.tools import (
     SetTransformTool,
     ToolTrackingHandler,
 )
+from .worker_pool import agent_worker_pool
 
 # システムプロンプトファイルのパス（このファイルからの相対パス）
 SYSTEM_PROMPT_PATH = Path(__file__).parent / "utils" / "system_prompt.txt"
@@ -55,6 +59,10 @@ class AnalysisAgent:
             SetTransformTool(state),
             SetSummaryTool(state),
         ]
+        # 非同期実行時に同じstateを操作するツールを直列化する
+        tool_lock = asyncio.Lock()
+        for tool in self.tools:
+            tool.bind_state_lock(tool_lock)
 
         # メモリの初期化
         self.memory = ConversationBufferMemory(memory_key="chat_history", return_messages=True)
@@ -98,74 +106,114 @@ class AnalysisAgent:
         """ユーザーからの入力を処理し、エージェントに応答を求める"""
         for t in range(max_retry):
             try:
-                # チャット履歴の初期化（session_stateから)
-                self.memory.chat_memory.clear()
-                chat_history = self.state.chat_history  # デフォルト値を追加
-
-                # chat_historyがNoneまたは空でない場合のみ処理
-                if chat_history:
-                    for role, message_content in chat_history:
-                        if role == "system":
-                            self.memory.chat_memory.messages.append(SystemMessage(content=message_content))
-                        elif role == "user":
-                            self.memory.chat_memory.messages.append(HumanMessage(content=message_content))
-                        elif role == "assistant":
-                            self.memory.chat_memory.messages.append(AIMessage(content=message_content))
-
+                self._load_memory(self.get_current_context())
                 handler = ToolTrackingHandler()
-                current_context = self.get_current_context()
-                self.memory.chat_memory.messages.append(
-                    SystemMessage(content=current_context)
-                )  # 現在のデータとステップの状況をシステムメッセージとして追加
-
-                response = self.agent.invoke({"input": user_input}, callbacks=[handler])
-
-                # ツール使用履歴を整形
-                tool_usage_text = ""
-                if handler.tool_usage:
-                    tool_usage_text = "\n\n---\n*内部処理（ツール使用履歴）:*\n"
-                    for usage in handler.tool_usage:
-                        tool_name = usage.get("tool", "unknown")
-                        tool_input = usage.get("input", "")
-                        tool_output = usage.get("output", "出力なし")
-
-                        if len(str(tool_output)) > 200:
-                            tool_output = str(tool_output)[:200] + "..."
-
-                        tool_usage_text += f"  - **ツール名**: `{tool_name}`\n"
-                        tool_usage_text += f"    - **入力**: `{tool_input}`\n"
-                        tool_usage_text += f"    - **出力**: `{tool_output}`\n"
-
-                # チャット履歴を更新
-                output = response.get("output", "応答がありませんでした")
-
-                # chat_historyがNoneの場合は空リストで初期化
-                if user_input != "":
-                    chat_history.append(("user", user_input))
-                response_to_store = output + tool_usage_text if tool_usage_text else output
-                chat_history.append(("assistant", response_to_store))
-
-                # session_stateに保存
-                self.state.chat_history = chat_history
-
-                return response_to_store
+                response = self.agent.invoke({"input": user_input}, config={"callbacks": [handler]})
+                return self._record_response(user_input, response, handler)
             except Exception as e:
                 # if 400 error
                 if "400" in str(e) and t < max_retry - 1:
                     time.sleep(2)
-                    error_chat_history = self.state.chat_history
-                    error_chat_history.append(
-                        ("assistant", f"⚠️ 実行中にエラーが発生しました: {str(e)}。再開します。(試行 {t + 1}/{max_retry})")
-                    )
-                    self.state.chat_history = error_chat_history
-                    t += 1
+                    self._record_retry(e, t, max_retry)
                     continue
                 else:
-                    error_chat_history = self.state.chat_history
-                    if user_input != "":
-                        # ユーザー入力が空でない場合のみ追加
-                        error_chat_history.append(("user", user_input))
-                    error_chat_history.append(("assistant", f"申し訳ありません。エラーが発生しました: {str(e)}"))
-                    self.state.chat_history = error_chat_history
-                    return f"申し訳ありません。エラーが発生しました: {str(e)}"
+                    return self._record_error(user_input, e)
         return None
+
+    async def achat(
+        self,
+        user_input: str,
+        max_retry=3,
+        on_event: Callable[[str, dict[str, Any]], None] | None = None,
+    ) -> str | None:
+        """ユーザーからの入力を非同期に処理し、エージェントに応答を求める
+
+        LLM呼び出しはainvoke()で非同期に行い、コンテキスト生成とツール処理（pandas）は
+        エージェント実行プールのスレッドで実行するため、イベントループをブロックしない。
+        on_eventを指定すると、ツール呼び出しとトークン生成の経過がイベントループ上で通知される。
+        """
+        for t in range(max_retry):
+            try:
+                self._load_memory(await agent_worker_pool.run(self.get_current_context))
+                handler = ToolTrackingHandler(on_event=on_event)
+                response = await self.agent.ainvoke({"input": user_input}, config={"callbacks": [handler]})
+                return self._record_response(user_input, response, handler)
+            except Exception as e:
+                # if 400 error
+                if "400" in str(e) and t < max_retry - 1:
+                    await asyncio.sleep(2)
+                    self._record_retry(e, t, max_retry)
+                    continue
+                else:
+                    return self._record_error(user_input, e)
+        return None
+
+    def _load_memory(self, current_context: str) -> None:
+        """チャット履歴と現在のデータ・ステップの状況をメモリに設定する"""
+        # チャット履歴の初期化（session_stateから)
+        self.memory.chat_memory.clear()
+        chat_history = self.state.chat_history
+
+        # chat_historyがNoneまたは空でない場合のみ処理
+        if chat_history:
+            for role, message_content in chat_history:
+                if role == "system":
+                    self.memory.chat_memory.messages.append(SystemMessage(content=message_content))
+                elif role == "user":
+                    self.memory.chat_memory.messages.append(HumanMessage(content=message_content))
+                elif role == "assistant":
+                    self.memory.chat_memory.messages.append(AIMessage(content=message_content))
+
+        self.memory.chat_memory.messages.append(
+            SystemMessage(content=current_context)
+        )  # 現在のデータとステップの状況をシステムメッセージとして追加
+
+    def _record_response(self, user_input: str, response: dict, handler: ToolTrackingHandler) -> str:
+        """エージェントの応答とツール使用履歴をチャット履歴に追加する"""
+        # ツール使用履歴を整形
+        tool_usage_text = ""
+        if handler.tool_usage:
+            tool_usage_text = "\n\n---\n*内部処理（ツール使用履歴）:*\n"
+            for usage in handler.tool_usage:
+                tool_name = usage.get("tool", "unknown")
+                tool_input = usage.get("input", "")
+                tool_output = usage.get("output", "出力なし")
+
+                if len(str(tool_output)) > 200:
+                    tool_output = str(tool_output)[:200] + "..."
+
+                tool_usage_text += f"  - **ツール名**: `{tool_name}`\n"
+                tool_usage_text += f"    - **入力**: `{tool_input}`\n"
+                tool_usage_text += f"    - **出力**: `{tool_output}`\n"
+
+        # チャット履歴を更新
+        output = response.get("output", "応答がありませんでした")
+        chat_history = self.state.chat_history
+
+        if user_input != "":
+            chat_history.append(("user", user_input))
+        response_to_store = output + tool_usage_text if tool_usage_text else output
+        chat_history.append(("assistant", response_to_store))
+
+        # session_stateに保存
+        self.state.chat_history = chat_history
+
+        return response_to_store
+
+    def _record_retry(self, error: Exception, attempt: int, max_retry: int) -> None:
+        """再試行する旨をチャット履歴に追加する"""
+        error_chat_history = self.state.chat_history
+        error_chat_history.append(
+            ("assistant", f"⚠️ 実行中にエラーが発生しました: {str(error)}。再開します。(試行 {attempt + 1}/{max_retry})")
+        )
+        self.state.chat_history = error_chat_history
+
+    def _record_error(self, user_input: str, error: Exception) -> str:
+        """エラーをチャット履歴に追加し、エラーメッセージを返す"""
+        error_chat_history = self.state.chat_history
+        if user_input != "":
+            # ユーザー入力が空でない場合のみ追加
+            error_chat_history.append(("user", user_input))
+        error_chat_history.append(("assistant", f"申し訳ありません。エラーが発生しました: {str(error)}"))
+        self.state.chat_history = error_chat_history
+        return f"申し訳ありません。エラーが発生しました: {str(error)}"
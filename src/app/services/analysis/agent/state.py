@@ -1,3 +1,7 @@
+import hashlib
+import json
+from copy import deepcopy
+
 import pandas as pd
 
 from .utils.chart import (
@@ -19,6 +23,8 @@ class AnalysisState:
         self.original_df = input
         self.chat_history = chat
         self.all_steps = []
+        # 元データの世代番号（set_source_dataで更新され、フィンガープリントに反映される）
+        self._source_version = 0
         for s_i, s in enumerate(step):
             self.add_step(s["name"], s["type"], s["data_source"])
             if s["type"] == "filter":
@@ -32,6 +38,25 @@ class AnalysisState:
             else:
                 raise ValueError(f"不明なステップタイプ: {s['type']}")
 
+    def clone(self):
+        """
+        ステップ設定とチャット履歴を複製したstateを返す
+        DataFrame（元データ・結果データ）は共有する。各ステップの処理は結果を新しいDataFrameとして
+        作成し、既存のDataFrameを書き換えないため、共有しても複製元には影響しない
+        Returns:
+            AnalysisState: 複製したstate
+        """
+        new_state = AnalysisState.__new__(AnalysisState)
+        new_state.original_df = self.original_df
+        new_state.chat_history = list(self.chat_history)
+        new_state._source_version = self._source_version
+        new_state.all_steps = []
+        for step in self.all_steps:
+            new_step = dict(step)
+            new_step["config"] = deepcopy(step["config"])
+            new_state.all_steps.append(new_step)
+        return new_state
+
     def set_source_data(self, data):
         """
         アップロードされたデータを元に、元のデータフレームを設定する
@@ -42,6 +67,7 @@ class AnalysisState:
         """
         if isinstance(data, pd.DataFrame):
             self.original_df = data
+            self._source_version += 1
         else:
             raise ValueError("データはpandas DataFrameである必要があります。")
 
@@ -64,22 +90,47 @@ class AnalysisState:
     def apply(self, step_index: int, include_following=True):
         """
         指定したステップの設定を適用し、結果を更新する
+
+        各ステップの結果は「設定 + 上流ステップのフィンガープリント」から算出した
+        フィンガープリントで管理し、前回適用時から変化していないステップは再計算しない。
+        include_following=Trueの場合は、リスト順ではなくdata_source / table_filter.table_dfの
+        参照関係を辿り、指定ステップに依存する下流ステップのみを再適用する。
         Args:
             step_index (int): 設定を適用するステップのインデックス
+            include_following (bool): 依存する下流ステップも再適用するかどうか
+        Returns:
+            None
+        """
+        if step_index < 0:
+            step_index += len(self.all_steps)
+        self._apply_step(step_index)
+
+        # 指定したステップに依存する下流ステップを再適用
+        if include_following:
+            for i in self.get_downstream_steps(step_index):
+                self._apply_step(i)
+
+    def _apply_step(self, step_index: int):
+        """
+        単一ステップを適用する。フィンガープリントが前回と一致する場合は再計算しない
+        Args:
+            step_index (int): 適用するステップのインデックス
         Returns:
             None
         """
         step_data = self.all_steps[step_index]
+        fingerprint = self.compute_fingerprint(step_index)
+        if step_data.get("fingerprint") == fingerprint:
+            return
+
+        # 計算途中で失敗した場合に古い結果を再利用しないよう、先にクリアする
+        step_data["fingerprint"] = None
         source_data = self.get_source_data(step_index)
         if step_data["type"] == "filter":
-            if step_data.get("table_filter") and step_data["table_filter"].get("enable") and step_data["table_filter"]["enable"]:
-                # テーブルフィルタが有効な場合、テーブルフィルタを適用
-                if "table_df" in step_data["table_filter"].keys() and step_data["table_filter"]["table_df"] is not None:
-                    # テーブルフィルタのDataFrameを取得
-                    table_df_index = int(step_data["table_filter"]["table_df"].split("_")[1])
-                    table_filter_df = self.all_steps[table_df_index]["result_data"]
-                else:
-                    table_filter_df = None
+            table_filter = step_data["config"].get("table_filter") or {}
+            if table_filter.get("enable") and table_filter.get("table_df") is not None:
+                # テーブルフィルタが有効な場合、参照先のDataFrameを取得
+                table_filter_df = self._resolve_data_ref(table_filter["table_df"])
             else:
                 table_filter_df = None
             apply_filters(source_data, step_data, table_filter_df)
@@ -97,10 +148,90 @@ class AnalysisState:
         else:
             raise ValueError(f"不明なステップタイプ: {step_data['type']}")
 
-        # 指定したステップ以降のステップを再適用
-        if include_following:
-            for i in range(step_index + 1, len(self.all_steps)):
-                self.apply(i, include_following=False)
+        step_data["fingerprint"] = fingerprint
+
+    def _resolve_data_ref(self, data_ref):
+        """
+        'original' または 'step_N' 形式の参照からDataFrameを取得する
+        """
+        if data_ref == "original":
+            return self.original_df
+        ref_index = int(data_ref.split("_")[1])
+        if 0 <= ref_index < len(self.all_steps):
+            return self.all_steps[ref_index]["result_data"]
+        return None
+
+    def get_dependencies(self, step_index):
+        """
+        指定したステップが参照する上流ステップのインデックスを取得する
+        data_sourceと、有効なテーブルフィルタのtable_dfを依存関係とみなす
+        Args:
+            step_index (int): 対象ステップのインデックス
+        Returns:
+            list[int]: 上流ステップのインデックスのリスト（'original'は含まない）
+        """
+        dependencies = []
+        for data_ref in self._get_data_refs(step_index):
+            if data_ref != "original":
+                dependencies.append(int(data_ref.split("_")[1]))
+        return dependencies
+
+    def get_downstream_steps(self, step_index):
+        """
+        指定したステップの結果に（推移的に）依存する下流ステップのインデックスを取得する
+        Args:
+            step_index (int): 起点となるステップのインデックス
+        Returns:
+            list[int]: 下流ステップのインデックスのリスト（昇順）
+        """
+        dirty = {step_index}
+        downstream = []
+        for i in range(step_index + 1, len(self.all_steps)):
+            if any(dependency in dirty for dependency in self.get_dependencies(i)):
+                dirty.add(i)
+                downstream.append(i)
+        return downstream
+
+    def _get_data_refs(self, step_index):
+        """
+        ステップが参照するデータ（'original' / 'step_N'）の一覧を取得する
+        """
+        step_data = self.all_steps[step_index]
+        data_refs = [step_data["data_source"] or "original"]
+        if step_data["type"] == "filter":
+            table_filter = step_data["config"].get("table_filter") or {}
+            if table_filter.get("enable") and table_filter.get("table_df") is not None:
+                data_refs.append(table_filter["table_df"])
+        return data_refs
+
+    def compute_fingerprint(self, step_index):
+        """
+        ステップのフィンガープリントを算出する
+        ステップタイプ・設定と、上流データ（元データまたは上流ステップ）のフィンガープリントから算出するため、
+        上流のいずれかが変わると下流のフィンガープリントも変わる
+        Args:
+            step_index (int): 対象ステップのインデックス
+        Returns:
+            str: フィンガープリント（SHA-256の16進文字列）
+        """
+        step_data = self.all_steps[step_index]
+        upstream = []
+        for data_ref in self._get_data_refs(step_index):
+            if data_ref == "original":
+                upstream.append(f"original:{id(self.original_df)}:{self._source_version}")
+            else:
+                ref_index = int(data_ref.split("_")[1])
+                if 0 <= ref_index < len(self.all_steps):
+                    upstream.append(self.all_steps[ref_index].get("fingerprint"))
+                else:
+                    upstream.append(None)
+        payload = json.dumps(
+            {"type": step_data["type"], "config": step_data["config"], "upstream": upstream},
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
     def add_step(self, name, type, data="original"):
         """
@@ -121,6 +252,7 @@ class AnalysisState:
             "result_table": None,
             "result_chart": None,
             "result_formula": None,
+            "fingerprint": None,
         }
         # データソースが 'original' 以外の場合、インデックスを確認
         if data != "original":
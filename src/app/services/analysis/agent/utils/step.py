@@ -202,6 +202,9 @@ def apply_table(source_data, step_data):
 # ---------------------------
 
 
+AGGREGATION_METHODS = ["sum", "mean", "count", "max", "min"]
+
+
 def apply_aggregation(source_data, step_data):
     """
     集計設定に基づいてデータを集約する関数（四則演算対応版）
@@ -233,10 +236,13 @@ def apply_aggregation(source_data, step_data):
             raise ValueError(f"集計軸に指定された列がデータフレームに存在しません: {missing_columns}")
 
         # 元の順序を保持するため、group_by_axisの組み合わせの順序を記録
-        original_combinations = source_data[group_by_axis].drop_duplicates().reset_index(drop=True)
-        original_combinations["_original_order"] = range(len(original_combinations))
+        combination_index = _build_key_index(source_data[group_by_axis].drop_duplicates(), group_by_axis)
+
+        # 基本集計（sum, mean, count, max, min）は、値を一度だけ数値化し、1回のgroupbyでまとめて集計
+        grouped, valid_subjects = _aggregate_subjects(source_data, group_by_axis, aggregation_config)
+        grouped_subjects = set(grouped.index.get_level_values("科目")) if grouped is not None else set()
 
-        # 集計結果を格納するリスト
+        # 集計結果（科目名, 集計軸をインデックスとする値）を格納するリスト
         aggregated_results = []
         # 四則演算用の中間結果を格納する辞書
         intermediate_results = {}
@@ -252,50 +258,16 @@ def apply_aggregation(source_data, step_data):
                 continue
 
             # 基本集計処理（sum, mean, count, max, min）
-            if method in ["sum", "mean", "count", "max", "min"]:
-                # 科目が指定されていない場合はスキップ
-                if not subject:
-                    continue
-
-                # 指定科目のデータを抽出
-                subject_data = source_data[source_data["科目"] == subject].copy()
-
-                if subject_data.empty:
+            if method in AGGREGATION_METHODS:
+                # 科目が指定されていない、または数値データがない場合はスキップ
+                if not subject or subject not in valid_subjects:
                     continue
 
-                # 数値列を数値型に変換
-                subject_data["値"] = pd.to_numeric(subject_data["値"], errors="coerce")
-
-                # NaNを除外
-                subject_data = subject_data.dropna(subset=["値"])
-
-                if subject_data.empty:
-                    continue
-
-                # 集計軸でグループ化して集計実行（sort=Falseで元の順序を保持）
-                if method == "sum":
-                    agg_result = subject_data.groupby(group_by_axis, sort=False)["値"].sum()
-                elif method == "mean":
-                    agg_result = subject_data.groupby(group_by_axis, sort=False)["値"].mean()
-                elif method == "count":
-                    agg_result = subject_data.groupby(group_by_axis, sort=False)["値"].count()
-                elif method == "max":
-                    agg_result = subject_data.groupby(group_by_axis, sort=False)["値"].max()
-                elif method == "min":
-                    agg_result = subject_data.groupby(group_by_axis, sort=False)["値"].min()
-
-                # インデックスをリセットして通常の列に変換
-                agg_result = agg_result.reset_index()
-                agg_result["科目"] = name
-
-                # 元の順序を保持するためにマージ
-                agg_result = agg_result.merge(original_combinations, on=group_by_axis, how="left")
-
-                # 結果リストに追加
-                aggregated_results.append(agg_result)
-
-                # 中間結果として保存（四則演算で使用）
-                intermediate_results[name] = agg_result
+                if subject in grouped_subjects:
+                    agg_result = grouped[method].xs(subject, level="科目")
+                else:
+                    # 集計軸が欠損している行のみの場合は空の結果
+                    agg_result = grouped[method].iloc[:0].droplevel("科目")
 
             # 四則演算処理（+, -, *, /）
             elif method in ["+", "-", "*", "/"]:
@@ -308,56 +280,35 @@ def apply_aggregation(source_data, step_data):
                 if left_name not in intermediate_results or right_name not in intermediate_results:
                     continue
 
-                left_df = intermediate_results[left_name].copy()
-                right_df = intermediate_results[right_name].copy()
-
-                # 集計軸でマージ
-                merged_df = left_df.merge(right_df, on=group_by_axis, suffixes=("_left", "_right"))
-
-                if merged_df.empty:
+                # 集計軸が一致する組み合わせのみ（左側の順序）で計算
+                left = intermediate_results[left_name]
+                left = left[left.index.isin(intermediate_results[right_name].index)]
+                if left.empty:
                     continue
+                right = intermediate_results[right_name].reindex(left.index)
 
                 # 四則演算を実行
                 if method == "+":
-                    merged_df["値"] = merged_df["値_left"] + merged_df["値_right"]
+                    agg_result = left + right
                 elif method == "-":
-                    merged_df["値"] = merged_df["値_left"] - merged_df["値_right"]
+                    agg_result = left - right
                 elif method == "*":
-                    merged_df["値"] = merged_df["値_left"] * merged_df["値_right"]
-                elif method == "/":
+                    agg_result = left * right
+                else:
                     # ゼロ除算を防ぐ
                     # 分子分母両方が0の場合は0、分子が0でないが分母が0の場合のみNaN
-                    condition = (merged_df["値_left"] == 0) & (merged_df["値_right"] == 0)
-                    merged_df["値"] = merged_df["値_left"] / merged_df["値_right"].replace(0, float("nan"))
-                    merged_df.loc[condition, "値"] = 0
-
-                # _original_order列が存在するかチェックしてから選択
-                required_columns = group_by_axis + ["値", "科目"]
-                available_columns = required_columns.copy()
-
-                # _original_orderが両方のDataFrameに存在する場合のみ追加
-                if "_original_order_left" in merged_df.columns and "_original_order_right" in merged_df.columns:
-                    # 左側の順序を優先して使用
-                    merged_df["_original_order"] = merged_df["_original_order_left"]
-                    available_columns.append("_original_order")
-                elif "_original_order_left" in merged_df.columns:
-                    merged_df["_original_order"] = merged_df["_original_order_left"]
-                    available_columns.append("_original_order")
-                elif "_original_order_right" in merged_df.columns:
-                    merged_df["_original_order"] = merged_df["_original_order_right"]
-                    available_columns.append("_original_order")
-
-                # 科目を設定
-                merged_df["科目"] = name
-
-                # 利用可能な列のみを選択
-                result_df = merged_df[available_columns].copy()
-
-                # 結果リストに追加
-                aggregated_results.append(result_df)
-
-                # 中間結果として保存（他の四則演算で使用される可能性がある）
-                intermediate_results[name] = result_df
+                    condition = (left == 0) & (right == 0)
+                    agg_result = left / right.replace(0, float("nan"))
+                    agg_result[condition] = 0
+
+            else:
+                continue
+
+            # 結果リストに追加
+            aggregated_results.append((name, agg_result))
+
+            # 中間結果として保存（四則演算で使用）
+            intermediate_results[name] = agg_result
 
         # 結果が空の場合
         if not aggregated_results:
@@ -365,17 +316,18 @@ def apply_aggregation(source_data, step_data):
             return
 
         # 全ての集計結果を結合
-        final_result = pd.concat(aggregated_results, ignore_index=True)
-
-        # _original_order列が存在する場合のみソート
-        if "_original_order" in final_result.columns:
-            # 元の順序に基づいてソート（_original_order、次に科目名でソート）
-            final_result = final_result.sort_values(["_original_order", "科目"]).reset_index(drop=True)
-            # 順序管理用の列を削除
-            final_result = final_result.drop(columns=["_original_order"])
-        else:
-            # _original_order列がない場合は科目名のみでソート
-            final_result = final_result.sort_values(["科目"]).reset_index(drop=True)
+        result_frames = []
+        for name, agg_result in aggregated_results:
+            result_df = agg_result.rename("値").reset_index()
+            result_df["科目"] = name
+            result_df["_original_order"] = combination_index.get_indexer(agg_result.index)
+            result_frames.append(result_df)
+        final_result = pd.concat(result_frames, ignore_index=True)
+
+        # 元の順序に基づいてソート（_original_order、次に科目名でソート）
+        final_result = final_result.sort_values(["_original_order", "科目"]).reset_index(drop=True)
+        # 順序管理用の列を削除
+        final_result = final_result.drop(columns=["_original_order"])
 
         # 列の順序を調整（集計軸 + 科目 + 値）
         column_order = group_by_axis + ["科目", "値"]
@@ -388,6 +340,51 @@ def apply_aggregation(source_data, step_data):
         raise ValueError(f"集計処理中にエラーが発生しました: {str(e)}") from e
 
 
+def _aggregate_subjects(source_data, group_by_axis, aggregation_config):
+    """
+    基本集計の対象科目をまとめて集計する補助関数
+
+    値を一度だけ数値化（変換できない値は除外）し、集計軸 + 科目で1回groupbyして、
+    設定に含まれる全ての集計方法を一度に計算する。
+    Returns:
+        tuple[DataFrame | None, set]: 集計軸 + 科目をインデックス、集計方法を列とする集計結果（対象がない場合はNone）と、
+            数値データが存在する科目の集合
+    """
+    subjects = []
+    methods = []
+    for config in aggregation_config:
+        method = config.get("method", "sum")
+        subject = config.get("subject")
+        if not config.get("name") or method not in AGGREGATION_METHODS or not subject:
+            continue
+        if subject not in subjects:
+            subjects.append(subject)
+        if method not in methods:
+            methods.append(method)
+
+    if not subjects:
+        return None, set()
+
+    values = pd.to_numeric(source_data["値"], errors="coerce")
+    mask = source_data["科目"].isin(subjects) & values.notna()
+    if not mask.any():
+        return None, set()
+
+    target = source_data.loc[mask, group_by_axis + ["科目"]]
+    target["値"] = values[mask]
+    grouped = target.groupby(group_by_axis + ["科目"], sort=False)["値"].agg(methods)
+    return grouped, set(target["科目"])
+
+
+def _build_key_index(key_frame, key_columns):
+    """
+    キー列の組み合わせからインデックス（1列の場合はIndex、複数列の場合はMultiIndex）を作成する補助関数
+    """
+    if len(key_columns) == 1:
+        return pd.Index(key_frame[key_columns[0]])
+    return pd.MultiIndex.from_frame(key_frame[key_columns])
+
+
 # ---------------------------
 # Filters
 # ---------------------------
@@ -396,12 +393,11 @@ def apply_aggregation(source_data, step_data):
 def apply_filters(source_data, step_data, table_filter_df=None):
     """
     フィルタを適用する共通関数
-    """
-    filtered_data = source_data.copy()
 
+    カテゴリ・数値・テーブルフィルタを1つのマスクにまとめて評価し、結果を1回だけ生成する。
+    """
     # カテゴリフィルタ
-    if step_data["config"]["category_filter"]:
-        filtered_data = filter_data(filtered_data, category_filter=step_data["config"]["category_filter"])
+    category_filter = step_data["config"]["category_filter"] or None
 
     # 数値フィルタ
     numeric_filter = step_data["config"].get("numeric_filter", {})
@@ -418,23 +414,29 @@ def apply_filters(source_data, step_data, table_filter_df=None):
         max_pct = numeric_filter.get("max_percentile", 100)
         should_apply_numeric_filter = min_pct > 0 or max_pct < 100
 
-    if should_apply_numeric_filter:
-        filtered_data = filter_data(filtered_data, numeric_filter=numeric_filter)
-
     # テーブルフィルタ
+    table_filter = None
     if (
         step_data["config"]["table_filter"].get("enable")
         and table_filter_df is not None
         and step_data["config"]["table_filter"].get("key_columns")
     ):
-        filtered_data = filter_data(filtered_data, table_filter=[step_data["config"]["table_filter"], table_filter_df])
+        table_filter = [step_data["config"]["table_filter"], table_filter_df]
 
-    step_data["result_data"] = filtered_data
+    step_data["result_data"] = filter_data(
+        source_data,
+        category_filter=category_filter,
+        numeric_filter=numeric_filter if should_apply_numeric_filter else None,
+        table_filter=table_filter,
+    )
 
 
 def filter_data(df, category_filter=None, numeric_filter=None, table_filter=None):
     """
     DataFrameを指定された条件でフィルタリングする関数（TopK・パーセンテージ対応版）
+
+    カテゴリ → 数値 → テーブルの順に条件を1つの真偽値マスクへ合成し、最後に1回だけ行を抽出する。
+    数値フィルタのTopK・パーセンタイルは、カテゴリフィルタ適用後の行を対象に計算する。
     Args:
         df (DataFrame): フィルタ対象のDataFrame
         filters (dict): カテゴリフィルタ条件
@@ -462,100 +464,39 @@ def filter_data(df, category_filter=None, numeric_filter=None, table_filter=None
     Returns:
         DataFrame: フィルタリング済みのDataFrame
     """
-    filtered_df = df.copy()
+    mask = np.ones(len(df), dtype=bool)
+    sort_by_index = False
 
     # カテゴリフィルタの適用
     if category_filter is not None and len(category_filter) > 0:
         for column, condition in category_filter.items():
-            if column not in filtered_df.columns:
+            if column not in df.columns:
                 raise ValueError(f"カラム '{column}' がDataFrameに見つかりません")
 
             # 条件が単一値の場合はリストに変換
             if not isinstance(condition, (list, tuple, set)):
                 condition = [condition]
 
-            # フィルタリング実行
-            filtered_df = filtered_df[filtered_df[column].isin(condition)]
+            mask &= df[column].isin(condition).to_numpy()
 
     # 数値フィルタの適用
     if numeric_filter is not None and len(numeric_filter) > 0:
         column = numeric_filter.get("column")
-        filter_type = numeric_filter.get("filter_type", "range")
 
-        if column and column in filtered_df.columns:
+        if column and column in df.columns:
             try:
-                numeric_series = pd.to_numeric(filtered_df[column], errors="coerce")
-                # NaNでない値のみを対象とする
-                valid_mask = ~numeric_series.isna()
-                valid_df = filtered_df[valid_mask].copy()
-                valid_numeric = numeric_series[valid_mask]
-
-                if valid_df.empty:
-                    # 有効な数値データがない場合は元のデータを返す
-                    pass
-                elif filter_type == "range":
-                    # 既存の範囲フィルタ処理
-                    # 下限フィルタ
-                    if numeric_filter.get("enable_min", False):
-                        min_value = numeric_filter.get("min_value")
-                        if min_value is not None:
-                            include_min = numeric_filter.get("include_min", True)
-                            if include_min:
-                                min_mask = numeric_series >= min_value
-                            else:
-                                min_mask = numeric_series > min_value
-                            min_mask = min_mask | ~valid_mask
-                            filtered_df = filtered_df[min_mask]
-                            numeric_series = pd.to_numeric(filtered_df[column], errors="coerce")
-                            valid_mask = ~numeric_series.isna()
-
-                    # 上限フィルタ
-                    if numeric_filter.get("enable_max", False):
-                        max_value = numeric_filter.get("max_value")
-                        if max_value is not None:
-                            include_max = numeric_filter.get("include_max", True)
-                            if include_max:
-                                max_mask = numeric_series <= max_value
-                            else:
-                                max_mask = numeric_series < max_value
-                            max_mask = max_mask | ~valid_mask
-                            filtered_df = filtered_df[max_mask]
-
-                elif filter_type == "topk":
-                    # TopKフィルタ処理
-                    k_value = numeric_filter.get("k_value", 10)
-                    ascending = numeric_filter.get("ascending", False)  # False=上位K件
-
-                    if k_value > 0:
-                        # 数値でソートしてTopK件を取得
-                        sorted_valid_df = valid_df.sort_values(by=column, ascending=ascending)
-                        topk_df = sorted_valid_df.head(k_value)
-
-                        # NaNの行も含めて結果を構築
-                        nan_df = filtered_df[~valid_mask]
-                        filtered_df = pd.concat([topk_df, nan_df]).sort_index()
-
-                elif filter_type == "percentage":
-                    # パーセンテージフィルタ処理
-                    min_percentile = numeric_filter.get("min_percentile", 0)  # 0-100
-                    max_percentile = numeric_filter.get("max_percentile", 100)  # 0-100
-
-                    # パーセンタイル値を計算
-                    min_threshold = valid_numeric.quantile(min_percentile / 100.0)
-                    max_threshold = valid_numeric.quantile(max_percentile / 100.0)
-
-                    # パーセンタイル範囲内の値をフィルタ
-                    percentile_mask = (numeric_series >= min_threshold) & (numeric_series <= max_threshold)
-                    percentile_mask = percentile_mask | ~valid_mask  # NaNの行は保持
-                    filtered_df = filtered_df[percentile_mask]
-
-                else:
-                    raise ValueError(f"サポートされていないfilter_type: {filter_type}")
-
+                numeric_mask, sort_by_index = _numeric_filter_mask(df, column, numeric_filter, mask)
+                mask &= numeric_mask
             except Exception as e:
                 raise ValueError(f"カラム '{column}' への数値フィルタ適用中にエラーが発生しました: {str(e)}") from e
 
+    # 抽出対象の行位置（TopK適用時は元の実装と同じくインデックス順に並べる）
+    positions = np.flatnonzero(mask)
+    if sort_by_index and not df.index[positions].is_monotonic_increasing:
+        positions = positions[df.index[positions].argsort(kind="stable")]
+
     # 除外テーブルフィルタの適用
+    result_index = None
     if table_filter is not None and len(table_filter) == 2:
         table_df = table_filter[1]
         key_columns = table_filter[0].get("key_columns", [])
@@ -563,25 +504,101 @@ def filter_data(df, category_filter=None, numeric_filter=None, table_filter=None
 
         if table_df is not None and not table_df.empty and key_columns:
             # キー列が存在するかチェック
-            missing_cols = [col for col in key_columns if col not in filtered_df.columns]
+            missing_cols = [col for col in key_columns if col not in df.columns]
             if missing_cols:
                 raise ValueError(f"キーカラムがDataFrameに見つかりません: {missing_cols}")
 
-            # 除外対象の組み合わせを取得
-            table_combinations = table_df[key_columns].drop_duplicates()
+            # テーブルのキーの組み合わせをハッシュインデックス化して所属判定
+            candidate_keys = _build_key_index(df[key_columns].iloc[positions], key_columns)
+            matched = candidate_keys.isin(_build_key_index(table_df, key_columns))
+            # 除外モード：マッチしないレコードのみ残す／包含モード：マッチするレコードのみ残す
+            keep = ~matched if exclude_mode else matched
+            positions = positions[keep]
+            # 従来のマージ方式と同じく、テーブルフィルタ適用前の行番号をインデックスとする
+            result_index = pd.Index(np.flatnonzero(keep), dtype="int64")
+
+    filtered_df = df.iloc[positions]
+    if result_index is not None:
+        filtered_df.index = result_index
+    return filtered_df
 
-            # マージして除外/包含を実行
-            merge_indicator = "_merge_indicator"
-            merged_df = filtered_df.merge(table_combinations, on=key_columns, how="left", indicator=merge_indicator)
 
-            if exclude_mode:
-                # 除外モード：マッチしないレコードのみ残す
-                filtered_df = merged_df[merged_df[merge_indicator] == "left_only"].drop(columns=[merge_indicator])
-            else:
-                # 包含モード：マッチするレコードのみ残す
-                filtered_df = merged_df[merged_df[merge_indicator] == "both"].drop(columns=[merge_indicator])
+def _numeric_filter_mask(df, column, numeric_filter, base_mask):
+    """
+    数値フィルタの条件を真偽値マスクとして計算する補助関数
 
-    return filtered_df
+    数値に変換できない行（NaN）は常に保持する。
+    Args:
+        df (DataFrame): フィルタ対象のDataFrame
+        column (str): 対象列名
+        numeric_filter (dict): 数値フィルタ条件
+        base_mask (ndarray): 先行するフィルタ（カテゴリフィルタ）のマスク
+    Returns:
+        tuple[ndarray, bool]: 数値フィルタのマスクと、インデックス順に並べ直す必要があるかどうか
+    """
+    filter_type = numeric_filter.get("filter_type", "range")
+    numeric_values = pd.to_numeric(df[column], errors="coerce").to_numpy()
+    invalid = pd.isna(numeric_values)
+    candidates = base_mask & ~invalid
+
+    if not candidates.any():
+        # 有効な数値データがない場合はフィルタしない
+        return np.ones(len(df), dtype=bool), False
+
+    if filter_type == "range":
+        numeric_series = pd.Series(numeric_values)
+        result_mask = np.ones(len(df), dtype=bool)
+        # 下限フィルタ
+        if numeric_filter.get("enable_min", False):
+            min_value = numeric_filter.get("min_value")
+            if min_value is not None:
+                if numeric_filter.get("include_min", True):
+                    min_mask = numeric_series >= min_value
+                else:
+                    min_mask = numeric_series > min_value
+                result_mask &= min_mask.to_numpy() | invalid
+
+        # 上限フィルタ
+        if numeric_filter.get("enable_max", False):
+            max_value = numeric_filter.get("max_value")
+            if max_value is not None:
+                if numeric_filter.get("include_max", True):
+                    max_mask = numeric_series <= max_value
+                else:
+                    max_mask = numeric_series < max_value
+                result_mask &= max_mask.to_numpy() | invalid
+        return result_mask, False
+
+    elif filter_type == "topk":
+        k_value = numeric_filter.get("k_value", 10)
+        ascending = numeric_filter.get("ascending", False)  # False=上位K件
+
+        if k_value > 0:
+            # 数値でソートしてTopK件の位置を取得（NaNの行は保持）
+            positions = np.flatnonzero(candidates)
+            candidate_values = pd.Series(df[column].to_numpy()[positions], index=positions)
+            topk_positions = candidate_values.sort_values(ascending=ascending).head(k_value).index.to_numpy()
+            result_mask = invalid.copy()
+            result_mask[topk_positions] = True
+            return result_mask, True
+        return np.ones(len(df), dtype=bool), False
+
+    elif filter_type == "percentage":
+        min_percentile = numeric_filter.get("min_percentile", 0)  # 0-100
+        max_percentile = numeric_filter.get("max_percentile", 100)  # 0-100
+
+        # パーセンタイル値を計算（先行フィルタ後の有効な数値のみ対象）
+        valid_numeric = pd.Series(numeric_values[candidates])
+        min_threshold = valid_numeric.quantile(min_percentile / 100.0)
+        max_threshold = valid_numeric.quantile(max_percentile / 100.0)
+
+        # パーセンタイル範囲内の値をフィルタ
+        numeric_series = pd.Series(numeric_values)
+        percentile_mask = (numeric_series >= min_threshold) & (numeric_series <= max_threshold)
+        return percentile_mask.to_numpy() | invalid, False  # NaNの行は保持
+
+    else:
+        raise ValueError(f"サポートされていないfilter_type: {filter_type}")
 
 
 # ---------------------------
@@ -634,41 +651,8 @@ def apply_transform(source_data, step_data):
                     result_data[target_name] = calculated_values
 
             elif operation_type in ["add_subject", "modify_subject"]:
-                # 科目の追加または変更
-                if operation_type == "modify_subject":
-                    # 既存の科目を変更
-                    subject_mask = result_data["科目"] == target_name
-                    if subject_mask.any():
-                        # 該当する科目の各組み合わせで値を再計算
-                        unique_combinations = result_data[subject_mask].drop(["科目", "値"], axis=1).drop_duplicates()
-
-                        for _, combo in unique_combinations.iterrows():
-                            mask = subject_mask.copy()
-                            for col in combo.index:
-                                mask = mask & (result_data[col] == combo[col])
-
-                            new_value = _calculate_subject_value(result_data, calculation, mask, combo)
-                            result_data.loc[mask, "値"] = new_value
-                else:
-                    # 新しい科目を追加
-                    new_rows = []
-                    unique_combinations = result_data.drop(["科目", "値"], axis=1).drop_duplicates()
-
-                    for _, combo in unique_combinations.iterrows():
-                        new_row = combo.to_dict()
-                        new_row["科目"] = target_name
-
-                        # この組み合わせに対する計算値を取得
-                        mask = True
-                        for col in combo.index:
-                            mask = mask & (result_data[col] == combo[col])
-
-                        new_row["値"] = _calculate_subject_value(result_data, calculation, mask, combo)
-                        new_rows.append(new_row)
-
-                    if new_rows:
-                        new_df = pd.DataFrame(new_rows)
-                        result_data = pd.concat([result_data, new_df], ignore_index=True)
+                # 科目の追加または変更（軸の組み合わせ単位で列演算）
+                result_data = _transform_subject(result_data, operation_type, target_name, calculation)
 
         step_data["result_data"] = result_data
 
@@ -728,56 +712,135 @@ def _calculate_axis_values(data, calculation):
     return 0
 
 
-def _calculate_subject_value(data, calculation, mask, combo):
+def _transform_subject(data, operation_type, target_name, calculation):
+    """
+    科目の追加・変更を軸の組み合わせ単位でまとめて計算する補助関数
+
+    科目以外の軸列をキーとして、各科目の値を組み合わせ単位に引き当て、
+    四則演算・コピー・定数を列全体に対して一括で計算する。
+    - 追加: 軸の組み合わせ（出現順）ごとに1行を末尾に追加
+    - 変更: 対象科目の行の値を上書き（軸に欠損がある行は対象外）
     """
-    科目の値を計算する補助関数
+    key_columns = [col for col in data.columns if col not in ("科目", "値")]
+
+    if operation_type == "modify_subject":
+        subject_mask = data["科目"] == target_name
+        if not subject_mask.any():
+            return data
+        targets = data.loc[subject_mask, key_columns]
+        values = _calculate_subject_values(data, calculation, key_columns, targets)
+        # 軸に欠損がある行は、どの組み合わせにも一致しないため更新しない
+        matched = targets.notna().all(axis=1).to_numpy() if key_columns else np.ones(len(targets), dtype=bool)
+        update_mask = subject_mask.copy()
+        update_mask[subject_mask] = matched
+        if update_mask.any():
+            new_values = np.asarray(values)[matched]
+            column_dtype = data["値"].dtype
+            if isinstance(column_dtype, np.dtype) and column_dtype.kind in "iuf" and new_values.dtype.kind in "iuf":
+                # 整数列に小数を代入する場合は列ごと型を広げる
+                data["値"] = data["値"].astype(np.result_type(column_dtype, new_values.dtype))
+            data.loc[update_mask, "値"] = new_values
+        return data
+
+    targets = data.drop(["科目", "値"], axis=1).drop_duplicates()
+    if len(targets) == 0:
+        return data
+    values = _calculate_subject_values(data, calculation, key_columns, targets)
+    new_df = targets.reset_index(drop=True)
+    new_df["科目"] = target_name
+    new_df["値"] = values
+    return pd.concat([data, new_df], ignore_index=True)
+
+
+def _calculate_subject_values(data, calculation, key_columns, targets):
     """
+    科目の値を軸の組み合わせ（targetsの各行）ごとに計算する補助関数
+
+    存在しない科目の値は0、0除算の結果は0として扱う。
+    Returns:
+        ndarray: targetsの行順に並んだ計算結果
+    """
+    size = len(targets)
+
     if calculation["type"] == "formula" and calculation["formula_type"] in ["+", "-", "*", "/"]:
-        # 四則演算の場合、該当する科目の値を取得
-        operand_values = []
-        for operand in calculation["operands"]:
-            operand_mask = mask & (data["科目"] == operand)
-            if operand_mask.any():
-                operand_values.append(data.loc[operand_mask, "値"].iloc[0])
+        operands = calculation["operands"]
+        formula_type = calculation["formula_type"]
+
+        if len(operands) >= 2:
+            left = _lookup_subject_values(data, key_columns, operands[0], targets)
+            right = _lookup_subject_values(data, key_columns, operands[1], targets)
+            if formula_type == "+":
+                return left + right
+            elif formula_type == "-":
+                return left - right
+            elif formula_type == "*":
+                return left * right
             else:
-                operand_values.append(0)
-
-        if len(operand_values) >= 2:
-            if calculation["formula_type"] == "+":
-                return operand_values[0] + operand_values[1]
-            elif calculation["formula_type"] == "-":
-                return operand_values[0] - operand_values[1]
-            elif calculation["formula_type"] == "*":
-                return operand_values[0] * operand_values[1]
-            elif calculation["formula_type"] == "/":
-                return operand_values[0] / operand_values[1] if operand_values[1] != 0 else 0
-        elif len(operand_values) == 1 and calculation.get("constant_value") is not None:
+                nonzero = right != 0
+                safe_right = np.where(nonzero, right, 1)
+                return np.where(nonzero, left / safe_right, 0)
+        elif len(operands) == 1 and calculation.get("constant_value") is not None:
             # 定数との計算
+            values = _lookup_subject_values(data, key_columns, operands[0], targets)
             constant_value = calculation["constant_value"]
-            if calculation["formula_type"] == "+":
-                return operand_values[0] + constant_value
-            elif calculation["formula_type"] == "-":
-                return operand_values[0] - constant_value
-            elif calculation["formula_type"] == "*":
-                return operand_values[0] * constant_value
-            elif calculation["formula_type"] == "/":
-                return operand_values[0] / constant_value if constant_value != 0 else operand_values[0]
+            if formula_type == "+":
+                return values + constant_value
+            elif formula_type == "-":
+                return values - constant_value
+            elif formula_type == "*":
+                return values * constant_value
+            else:
+                return values / constant_value if constant_value != 0 else values
 
-        return 0
+        return np.zeros(size, dtype=int)
 
     elif calculation["type"] == "constant":
-        return calculation.get("constant_value", 0)
+        return np.full(size, calculation.get("constant_value", 0))
 
     elif calculation["type"] == "copy":
         copy_from = calculation.get("copy_from")
         if copy_from:
-            copy_mask = mask & (data["科目"] == copy_from)
-            if copy_mask.any():
-                return data.loc[copy_mask, "値"].iloc[0]
-        return 0
+            return _lookup_subject_values(data, key_columns, copy_from, targets)
+        return np.zeros(size, dtype=int)
+
+    else:
+        return np.zeros(size, dtype=int)
+
+
+def _lookup_subject_values(data, key_columns, subject, targets):
+    """
+    指定科目の値を、targetsの軸の組み合わせごとに引き当てる補助関数
+
+    同じ組み合わせに複数行ある場合は最初の行の値を使用し、
+    該当行がない組み合わせ（軸に欠損がある場合を含む）は0とする。
+    Returns:
+        ndarray: targetsの行順に並んだ科目の値
+    """
+    rows = data[data["科目"] == subject]
+    size = len(targets)
+
+    if not key_columns:
+        # 軸がない場合は全行が同じ組み合わせ
+        return np.full(size, rows["値"].iloc[0] if not rows.empty else 0)
+
+    # 軸に欠損がある行はどの組み合わせにも一致しない
+    rows = rows.dropna(subset=key_columns).drop_duplicates(subset=key_columns, keep="first")
+    if rows.empty:
+        return np.zeros(size, dtype=int)
 
+    if len(key_columns) == 1:
+        row_keys = pd.Index(rows[key_columns[0]])
+        target_keys = pd.Index(targets[key_columns[0]])
     else:
-        return 0
+        row_keys = pd.MultiIndex.from_frame(rows[key_columns])
+        target_keys = pd.MultiIndex.from_frame(targets[key_columns])
+
+    positions = row_keys.get_indexer(target_keys)
+    found = positions >= 0
+    if found.all():
+        return rows["値"].to_numpy()[positions]
+    found_values = rows["値"].to_numpy()[np.where(found, positions, 0)]
+    return np.where(found, found_values, 0)
 
 
 def init_category_filter(input_axis):
@@ -1,25 +1,74 @@
+import asyncio
 import json
+from collections.abc import Callable
+from typing import Any
 
 from langchain_classic.tools import BaseTool
 from langchain_core.callbacks import BaseCallbackHandler
+from pydantic import PrivateAttr
 
 from ..state import AnalysisState
+from ..worker_pool import agent_worker_pool
 
 
 class ToolTrackingHandler(BaseCallbackHandler):
-    def __init__(self):
+    # 非同期実行時もイベントループ上で呼び出し順に記録する
+    run_inline = True
+
+    def __init__(self, on_event: Callable[[str, dict[str, Any]], None] | None = None):
+        """
+        Args:
+            on_event: ツール呼び出し・トークン生成のたびに (イベント種別, データ) で呼び出される関数
+        """
         self.tool_usage = []
+        self.on_event = on_event
 
-    def on_tool_start(self, serialized, input_str, **kwargs):
+    def on_tool_start(self, serialized, input_str, run_id=None, **kwargs):
         tool_name = serialized.get("name", "unknown tool")
-        self.tool_usage.append({"tool": tool_name, "input": input_str})
+        self.tool_usage.append({"tool": tool_name, "input": input_str, "run_id": run_id})
+        if self.on_event is not None:
+            self.on_event("tool_start", {"tool": tool_name, "input": input_str, "run_id": str(run_id)})
+
+    def on_tool_end(self, output, run_id=None, **kwargs):
+        # 対応するツール呼び出しの出力を追加（run_idがない場合は最後に使用したツール）
+        for usage in reversed(self.tool_usage):
+            if run_id is None or usage.get("run_id") == run_id:
+                usage["output"] = output
+                if self.on_event is not None:
+                    self.on_event(
+                        "tool_end",
+                        {"tool": usage["tool"], "output": str(output), "run_id": str(run_id)},
+                    )
+                break
+
+    def on_llm_new_token(self, token, **kwargs):
+        if self.on_event is not None and token:
+            self.on_event("token", {"token": token})
+
+
+class AnalysisStateTool(BaseTool):
+    """AnalysisStateを操作するツールの基底クラス。
+
+    非同期実行時（AgentExecutor.ainvoke）は、_run()をエージェント実行プールのスレッドで実行する。
+    AgentExecutorは同一ステップの複数ツールを並行実行するため、同じstateを共有するツールは
+    ロックで直列化し、同期実行時と同じ順序で適用する。
+    """
+
+    analysis_state: AnalysisState
+    _state_lock: asyncio.Lock | None = PrivateAttr(default=None)
+
+    def bind_state_lock(self, lock: asyncio.Lock) -> None:
+        """同じstateを共有するツール間で使用するロックを設定する"""
+        self._state_lock = lock
 
-    def on_tool_end(self, output, **kwargs):
-        if self.tool_usage:  # 最後に使用したツールの出力を追加
-            self.tool_usage[-1]["output"] = output
+    async def _arun(self, *args, **kwargs) -> str:
+        if self._state_lock is None:
+            return await agent_worker_pool.run(self._run, *args, **kwargs)
+        async with self._state_lock:
+            return await agent_worker_pool.run(self._run, *args, **kwargs)
 
 
-class GetDataOverviewTool(BaseTool):
+class GetDataOverviewTool(AnalysisStateTool):
     name: str = "get_data_overview"
     description: str = "現在のデータセットの概要を取得します。データセットの数、各データセットの行数、列名などを含みます。"
     analysis_state: AnalysisState
@@ -32,7 +81,7 @@ class GetDataOverviewTool(BaseTool):
         return overview
 
 
-class GetStepOverviewTool(BaseTool):
+class GetStepOverviewTool(AnalysisStateTool):
     name: str = "get_step_overview"
     description: str = "現在の分析ステップの概要を取得します。各ステップの設定、フィルタ条件、結果データの概要などを含みます。"
     analysis_state: AnalysisState
@@ -45,7 +94,7 @@ class GetStepOverviewTool(BaseTool):
         return overview
 
 
-class AddStepTool(BaseTool):
+class AddStepTool(AnalysisStateTool):
     name: str = "add_step"
     description: str = (
         "新しい分析ステップを追加します。入力形式: "
@@ -175,7 +224,7 @@ class AddStepTool(BaseTool):
             return f"実行失敗: ステップの追加中にエラーが発生しました: {str(e)}"
 
 
-class DeleteStepTool(BaseTool):
+class DeleteStepTool(AnalysisStateTool):
     name: str = "delete_step"
     description: str = "指定したインデックスの分析ステップを削除します。入力形式: 'step_index' (数値)"
     analysis_state: AnalysisState
@@ -251,7 +300,7 @@ class DeleteStepTool(BaseTool):
 #             return f"計算式の取得中にエラーが発生しました: {str(e)}"
 
 
-class GetFilterTool(BaseTool):
+class GetFilterTool(AnalysisStateTool):
     name: str = "get_filter"
     description: str = "指定したステップのフィルタ設定を取得します。入力形式: 'step_index' (数値)"
     analysis_state: AnalysisState
@@ -342,7 +391,7 @@ class GetFilterTool(BaseTool):
             return f"実行失敗: フィルタ設定の取得中にエラーが発生しました: {str(e)}"
 
 
-class GetAggregationTool(BaseTool):
+class GetAggregationTool(AnalysisStateTool):
     name: str = "get_aggregation"
     description: str = "指定したステップの集計設定を取得します。入力形式: 'step_index' (数値)"
     analysis_state: AnalysisState
@@ -396,7 +445,7 @@ class GetAggregationTool(BaseTool):
             return f"実行失敗: 集計設定の取得中にエラーが発生しました: {str(e)}"
 
 
-class GetTransformTool(BaseTool):
+class GetTransformTool(AnalysisStateTool):
     name: str = "get_transform"
     description: str = "指定したステップの変換設定を取得します。入力形式: 'step_index' (数値)"
     analysis_state: AnalysisState
@@ -447,7 +496,7 @@ class GetTransformTool(BaseTool):
             return f"実行失敗: 変換設定の取得中にエラーが発生しました: {str(e)}"
 
 
-class GetSummaryTool(BaseTool):
+class GetSummaryTool(AnalysisStateTool):
     name: str = "get_summary"
     description: str = "指定したステップのサマリ設定（計算式とチャート設定）を取得します。入力形式: 'step_index' (数値)"
     analysis_state: AnalysisState
@@ -544,7 +593,7 @@ class GetSummaryTool(BaseTool):
 #             return f"計算式の設定中にエラーが発生しました: {e.args[0] if hasattr(e, 'args') and e.args else str(e)}"
 
 
-class SetFilterTool(BaseTool):
+class SetFilterTool(AnalysisStateTool):
     name: str = "set_filter"
     description: str = "指定したステップにフィルタ設定を適用します。入力形式: 'step_index, filter_json' (filter_jsonはフィルタ設定のJSON)"
     analysis_state: AnalysisState
@@ -587,7 +636,7 @@ class SetFilterTool(BaseTool):
             return f"実行失敗: フィルタ設定中にエラーが発生しました: {str(e)}"
 
 
-class SetAggregationTool(BaseTool):
+class SetAggregationTool(AnalysisStateTool):
     name: str = "set_aggregation"
     description: str = "指定したステップに集計設定を適用します。入力形式: 'step_index, aggregation_json' (aggregation_jsonは集計設定のJSON)"
     analysis_state: AnalysisState
@@ -629,7 +678,7 @@ class SetAggregationTool(BaseTool):
             return f"実行失敗: 集計設定中にエラーが発生しました: {str(e)}"
 
 
-class SetTransformTool(BaseTool):
+class SetTransformTool(AnalysisStateTool):
     name: str = "set_transform"
     description: str = "指定したステップに変換設定を適用します。入力形式: 'step_index, transform_json' (transform_jsonは変換設定のJSON)"
     analysis_state: AnalysisState
@@ -671,7 +720,7 @@ class SetTransformTool(BaseTool):
             return f"実行失敗: 変換設定中にエラーが発生しました: {str(e)}"
 
 
-class SetSummaryTool(BaseTool):
+class SetSummaryTool(AnalysisStateTool):
     name: str = "set_summary"
     description: str = "指定したステップにサマリ設定（計算式とチャート設定）を設定します。入力形式: 'step_index, summary_json'"
     analysis_state: AnalysisState
@@ -723,7 +772,7 @@ class SetSummaryTool(BaseTool):
             return f"実行失敗: サマリ設定中にエラーが発生しました: {str(e)}"
 
 
-class GetDataValueTool(BaseTool):
+class GetDataValueTool(AnalysisStateTool):
     name: str = "get_data_value"
     description: str = (
         "指定したステップの入力データから特定の軸・科目の組み合わせに対応する値を取得します。"
@@ -0,0 +1,163 @@
+"""分析エージェント実行プール。
+
+チャット実行時のLangChainエージェント処理をイベントループから切り離し、
+1ワーカー（Uvicornプロセス）あたりの同時実行数を制限します。
+
+実行仕様:
+    - チャット実行枠: 同時実行数はANALYSIS_CHAT_MAX_CONCURRENCYまで。枠の空きを待機できるのは
+      ANALYSIS_CHAT_MAX_QUEUE件までで、超過した場合はServiceUnavailableError（503）を返す
+    - LLM呼び出し: AgentExecutor.ainvoke()で非同期に実行する（イベントループをブロックしない）
+    - ツール処理・コンテキスト生成（pandas）: 有限のスレッドプール（ANALYSIS_AGENT_WORKER_THREADS）で実行する
+
+Note:
+    - スレッドプールはプロセス内で共有し、アプリケーション終了時にshutdown()で停止します。
+    - 実行枠のセマフォはイベントループ毎に作成します（ワーカー内のイベントループは通常1つ）。
+"""
+
+import asyncio
+import threading
+import time
+import weakref
+from collections.abc import AsyncIterator, Callable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, TypeVar
+
+from app.api.middlewares.metrics import (
+    analysis_agent_active_chats,
+    analysis_agent_queue_depth,
+    analysis_agent_rejected_total,
+    analysis_agent_wait_seconds,
+)
+from app.core.config import settings
+from app.core.exceptions import ServiceUnavailableError
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class AgentWorkerPool:
+    """チャット実行枠とツール処理用スレッドプールを管理するクラス。"""
+
+    def __init__(self, max_workers: int, max_concurrency: int, max_queue: int):
+        """実行プールを初期化します。
+
+        Args:
+            max_workers: ツール処理を実行するスレッド数
+            max_concurrency: 同時に実行するチャット数の上限
+            max_queue: 実行枠の空きを待機できるチャット数の上限
+        """
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self._executor: ThreadPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
+        self._semaphores: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = weakref.WeakKeyDictionary()
+        self._waiting = 0
+        self._active = 0
+
+    @property
+    def waiting(self) -> int:
+        """実行枠の空きを待機中のチャット数。"""
+        return self._waiting
+
+    @property
+    def active(self) -> int:
+        """実行中のチャット数。"""
+        return self._active
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """スレッドプールを取得します（未作成の場合は作成）。"""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="analysis-agent",
+                )
+            return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """実行中のイベントループに対応する実行枠のセマフォを取得します。"""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    @asynccontextmanager
+    async def chat_slot(self) -> AsyncIterator[None]:
+        """チャット実行枠を確保します。
+
+        枠に空きがない場合は空くまで待機します。
+
+        Raises:
+            ServiceUnavailableError: 待機中のチャット数が上限に達している場合
+        """
+        semaphore = self._get_semaphore()
+        if semaphore.locked() and self._waiting >= self.max_queue:
+            analysis_agent_rejected_total.inc()
+            logger.warning(
+                "チャット実行の待機数が上限に達しました",
+                waiting=self._waiting,
+                active=self._active,
+            )
+            raise ServiceUnavailableError(
+                "チャットの実行が混み合っています。しばらくしてから再度お試しください",
+                details={"reason": "overload", "retry_after": 10},
+            )
+
+        self._waiting += 1
+        analysis_agent_queue_depth.set(self._waiting)
+        start = time.perf_counter()
+        try:
+            await semaphore.acquire()
+        finally:
+            self._waiting -= 1
+            analysis_agent_queue_depth.set(self._waiting)
+        analysis_agent_wait_seconds.labels(stage="chat").observe(time.perf_counter() - start)
+
+        self._active += 1
+        analysis_agent_active_chats.set(self._active)
+        try:
+            yield
+        finally:
+            self._active -= 1
+            analysis_agent_active_chats.set(self._active)
+            semaphore.release()
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """同期関数をスレッドプールで実行します。
+
+        Args:
+            func: 実行する関数
+            *args: 関数の位置引数
+            **kwargs: 関数のキーワード引数
+
+        Returns:
+            T: 関数の戻り値
+        """
+        submitted = time.perf_counter()
+
+        def _run() -> T:
+            analysis_agent_wait_seconds.labels(stage="task").observe(time.perf_counter() - submitted)
+            return func(*args, **kwargs)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), _run)
+
+    def shutdown(self) -> None:
+        """スレッドプールを停止します（未実行のタスクは破棄）。"""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+agent_worker_pool = AgentWorkerPool(
+    max_workers=settings.ANALYSIS_AGENT_WORKER_THREADS,
+    max_concurrency=settings.ANALYSIS_CHAT_MAX_CONCURRENCY,
+    max_queue=settings.ANALYSIS_CHAT_MAX_QUEUE,
+)
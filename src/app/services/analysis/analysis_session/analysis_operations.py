@@ -4,6 +4,7 @@
 """
 
 import uuid
+from collections.abc import Callable
 from typing import Any
 
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -12,6 +13,8 @@ from app.core.decorators import transactional
 from app.core.exceptions import NotFoundError, ValidationError
 from app.core.logging import get_logger
 from app.schemas.analysis import (
+    AnalysisChatCreate,
+    AnalysisChatJobResponse,
     AnalysisChatResponse,
     AnalysisSessionDetailResponse,
     AnalysisSessionResultListResponse,
@@ -20,7 +23,10 @@ from app.schemas.analysis import (
     AnalysisSnapshotResponse,
     AnalysisStepResponse,
 )
+from app.services.analysis.agent.worker_pool import agent_worker_pool
 from app.services.analysis.analysis_session.base import AnalysisSessionServiceBase
+from app.services.analysis.analysis_session.chat_job import ChatJob, chat_job_manager
+from app.services.analysis.analysis_session.state_cache import analysis_state_cache
 
 logger = get_logger(__name__)
 
@@ -88,15 +94,96 @@ class AnalysisSessionAnalysisService(AnalysisSessionServiceBase):
 
         return AnalysisSessionResultListResponse(results=results, total=len(results))
 
+    async def submit_chat(
+        self,
+        project_id: uuid.UUID,
+        session_id: uuid.UUID,
+        user_id: uuid.UUID,
+        chat_create: Any,
+    ) -> AnalysisChatJobResponse:
+        """AIチャットの実行ジョブを受け付けます。
+
+        入力を検証した後、ジョブとして登録して即座に返します。
+        チャットはバックグラウンドでexecute_chat()により実行され、進捗はイベントとして配信されます。
+
+        Note:
+            権限チェックはルーター層の ProjectMemberDep で行われます。
+
+        Args:
+            project_id: プロジェクトID
+            session_id: セッションID
+            user_id: 実行ユーザーID
+            chat_create: チャット作成リクエスト
+
+        Returns:
+            AnalysisChatJobResponse: 受け付けたジョブ
+
+        Raises:
+            ValidationError: メッセージが空の場合
+            NotFoundError: セッションが見つからない、または入力ファイルが未選択の場合
+            ServiceUnavailableError: プロジェクトの実行待ち数が上限に達している場合
+        """
+        if not chat_create.message:
+            raise ValidationError("チャットメッセージは必須です")
+
+        session = await self.session_repository.get(session_id)
+        if not session or session.project_id != project_id:
+            raise NotFoundError(
+                "Session not found",
+                details={"session_id": str(session_id)},
+            )
+        if not session.input_file_id:
+            raise NotFoundError(
+                "Input file not selected",
+                details={"session_id": str(session_id)},
+            )
+
+        job = chat_job_manager.submit(
+            project_id=project_id,
+            session_id=session_id,
+            user_id=user_id,
+            message=chat_create.message,
+            runner=_run_chat_job,
+        )
+        return job.to_response()
+
+    def get_chat_job(
+        self,
+        project_id: uuid.UUID,
+        session_id: uuid.UUID,
+        job_id: uuid.UUID,
+    ) -> ChatJob:
+        """AIチャットの実行ジョブを取得します。
+
+        Args:
+            project_id: プロジェクトID
+            session_id: セッションID
+            job_id: ジョブID
+
+        Returns:
+            ChatJob: ジョブ
+
+        Raises:
+            NotFoundError: ジョブが見つからない（保持期間切れ、別セッションのジョブを含む）場合
+        """
+        job = chat_job_manager.get(job_id)
+        if not job or job.project_id != project_id or job.session_id != session_id:
+            raise NotFoundError(
+                "Chat job not found",
+                details={"job_id": str(job_id)},
+            )
+        return job
+
     async def execute_chat(
         self,
         project_id: uuid.UUID,
         session_id: uuid.UUID,
         chat_create: Any,
+        on_event: Callable[[str, dict[str, Any]], None] | None = None,
     ) -> AnalysisSessionDetailResponse:
         """AIエージェントとチャットを実行します。
 
-        Phase 3.1で完全実装予定。タイムアウト: 10分。
+        チャット実行ジョブの本体として、バックグラウンドで呼び出されます。
 
         Note:
             権限チェックはルーター層の ProjectMemberDep で行われます。
@@ -105,12 +192,14 @@ class AnalysisSessionAnalysisService(AnalysisSessionServiceBase):
             project_id: プロジェクトID
             session_id: セッションID
             chat_create: チャット作成リクエスト
+            on_event: ツール呼び出し・トークン生成の経過を受け取る関数
 
         Returns:
             AnalysisSessionDetailResponse: チャット応答
 
         Raises:
             NotFoundError: セッションが見つからない場合
+            ServiceUnavailableError: チャット実行の待機数が上限に達している場合
         """
         # user messageを取得
         user_message = chat_create.message
@@ -119,11 +208,13 @@ class AnalysisSessionAnalysisService(AnalysisSessionServiceBase):
 
         # セッションを取得し、stateとagentを構築
         session = await self._get_session_with_full_relations(session_id)
-        state = self._build_state(session)
+        file_frames = await self._load_file_frames(session.files)
+        state = self._build_state(session, file_frames=file_frames)
         agent = self._build_agent(state)
 
-        # チャットを実行
-        agent.chat(user_message)
+        # チャットを実行（実行枠を確保し、LLM呼び出し・ツール処理をイベントループから切り離して実行）
+        async with agent_worker_pool.chat_slot():
+            await agent.achat(user_message, on_event=on_event)
 
         # 新しいsnapshotを作成し、今のstateを保存
         current_snapshot_order = session.current_snapshot.snapshot_order if session.current_snapshot else 0
@@ -133,39 +224,41 @@ class AnalysisSessionAnalysisService(AnalysisSessionServiceBase):
             snapshot_order=new_snapshot_order,
         )
         new_snapshot_id = new_snapshot.id
-        # ステップを保存
-        # TODO: stepのbulk_createを実装してパフォーマンス改善
-        for step_idx, step in enumerate(state.all_steps):
-            await self.step_repository.create(
-                snapshot_id=new_snapshot_id,
-                name=step["name"],
-                step_order=step_idx,
-                type=step["type"],
-                input=step["data_source"],
-                config=step["config"],
-            )
-        # チャット履歴保存
+        # ステップ・チャット履歴を一括保存（件数に関わらずINSERTはそれぞれ1回）
+        await self.step_repository.bulk_create(
+            snapshot_id=new_snapshot_id,
+            steps=[
+                {
+                    "name": step["name"],
+                    "step_order": step_idx,
+                    "type": step["type"],
+                    "input": step["data_source"],
+                    "config": step["config"],
+                }
+                for step_idx, step in enumerate(state.all_steps)
+            ],
+        )
         await self.chat_repository.bulk_create(
             snapshot_id=new_snapshot_id,
             chat_list=state.chat_history,
+            start_order=0,
         )
         # セッションのcurrent_snapshot_idを更新（スナップショットIDを設定）
         session = await self.session_repository.update(session, current_snapshot_id=new_snapshot_id)
 
-        # リレーションを取得してレスポンスを構築
+        # リレーションを一括取得してレスポンスを構築
         await self.db.commit()
-        session = await self.session_repository.get_with_relations(session.id)
+        session = await self.session_repository.get_with_snapshots(session.id)
         if not session:
             raise NotFoundError("Session not found after creation")
-        snapshots = await self.snapshot_repository.list_by_session(session.id)
-        for snap in snapshots:
-            snap_with_relations = await self.snapshot_repository.get_with_relations(snap.id)
-            if snap_with_relations:
-                snap.chats = snap_with_relations.chats
-                snap.steps = snap_with_relations.steps
+        snapshots = list(session.snapshots)
         files = await self.file_repository.list_by_session(session.id)
 
-        return self._build_session_detail_response(session, snapshots, files)
+        # 保存済みの新しいsnapshotに対応するstateとしてキャッシュに登録（レスポンス構築時の再計算を回避）
+        self._store_state(session, snapshots, files, state)
+
+        file_frames = await self._load_file_frames(files)
+        return self._build_session_detail_response(session, snapshots, files, file_frames)
 
     @transactional
     async def restore_snapshot(
@@ -206,6 +299,7 @@ class AnalysisSessionAnalysisService(AnalysisSessionServiceBase):
 
         # セッションのcurrent_snapshot_idを更新（スナップショットIDを設定）
         session = await self.session_repository.update(session, current_snapshot_id=snapshot.id)
+        analysis_state_cache.invalidate_session(session_id)
 
         # current_snapshot以降のsnapshot（後続分）を削除する（chat, stepも一緒に）
         snapshots = await self.snapshot_repository.list_by_session(session_id)
@@ -219,7 +313,8 @@ class AnalysisSessionAnalysisService(AnalysisSessionServiceBase):
         # ファイルを取得
         files = await self.file_repository.list_by_session(session_id)
 
-        return self._build_session_detail_response(session, snapshots, files)
+        file_frames = await self._load_file_frames(files)
+        return self._build_session_detail_response(session, snapshots, files, file_frames)
 
     async def get_chat_messages(
         self,
@@ -281,6 +376,8 @@ class AnalysisSessionAnalysisService(AnalysisSessionServiceBase):
         self,
         project_id: uuid.UUID,
         session_id: uuid.UUID,
+        skip: int = 0,
+        limit: int | None = None,
     ) -> list[AnalysisSnapshotResponse]:
         """セッションのスナップショット一覧を取得します。
 
@@ -290,6 +387,8 @@ class AnalysisSessionAnalysisService(AnalysisSessionServiceBase):
         Args:
             project_id: プロジェクトID
             session_id: セッションID
+            skip: スキップ数
+            limit: 取得件数（Noneの場合は全件）
 
         Returns:
             list[AnalysisSnapshotResponse]: スナップショット一覧
@@ -306,7 +405,7 @@ class AnalysisSessionAnalysisService(AnalysisSessionServiceBase):
             )
 
         # スナップショット一覧を取得（リレーション含む）
-        snapshots = await self.snapshot_repository.list_by_session_with_relations(session_id)
+        snapshots = await self.snapshot_repository.list_by_session_with_relations(session_id, skip=skip, limit=limit)
 
         return [
             AnalysisSnapshotResponse(
@@ -348,6 +447,31 @@ class AnalysisSessionAnalysisService(AnalysisSessionServiceBase):
             for snap in snapshots
         ]
 
+    async def count_snapshots(
+        self,
+        project_id: uuid.UUID,
+        session_id: uuid.UUID,
+    ) -> int:
+        """セッションのスナップショット数を取得します。
+
+        Args:
+            project_id: プロジェクトID
+            session_id: セッションID
+
+        Returns:
+            int: スナップショット数
+
+        Raises:
+            NotFoundError: セッションが見つからない場合
+        """
+        session = await self.session_repository.get(session_id)
+        if not session or session.project_id != project_id:
+            raise NotFoundError(
+                "Session not found",
+                details={"session_id": str(session_id)},
+            )
+        return await self.snapshot_repository.count(session_id=session_id)
+
     @transactional
     async def create_snapshot(
         self,
@@ -395,28 +519,12 @@ class AnalysisSessionAnalysisService(AnalysisSessionServiceBase):
             parent_snapshot_id=parent_snapshot_id,
         )
 
-        # 現在のスナップショットのステップをコピー
+        # 現在のスナップショットのステップ・チャット履歴を一括コピー（ステップ設定はハッシュ参照のみ）
         if current_snapshot:
             steps = await self.step_repository.list_by_snapshot(current_snapshot.id)
-            for step in steps:
-                await self.step_repository.create(
-                    snapshot_id=new_snapshot.id,
-                    name=step.name,
-                    step_order=step.step_order,
-                    type=step.type,
-                    input=step.input,
-                    config=step.config,
-                )
-
-            # チャット履歴もコピー
-            chats = await self.chat_repository.list_by_snapshot(current_snapshot.id)
-            for chat in chats:
-                await self.chat_repository.create(
-                    snapshot_id=new_snapshot.id,
-                    chat_order=chat.chat_order,
-                    role=chat.role,
-                    message=chat.message,
-                )
+            await self.step_repository.copy_to_snapshot(steps, new_snapshot.id)
+            chats = await self.chat_repository.list_by_snapshot(current_snapshot.id, limit=None)
+            await self.chat_repository.copy_to_snapshot(chats, new_snapshot.id)
 
         # セッションのcurrent_snapshot_idを更新（スナップショットIDを設定）
         await self.session_repository.update(session, current_snapshot_id=new_snapshot.id)
@@ -518,3 +626,14 @@ class AnalysisSessionAnalysisService(AnalysisSessionServiceBase):
             chat_id=str(chat_id),
             session_id=str(session_id),
         )
+
+
+async def _run_chat_job(job: ChatJob, db: AsyncSession) -> AnalysisSessionDetailResponse:
+    """チャット実行ジョブの本体（ジョブ専用のDBセッションでexecute_chatを実行）。"""
+    service = AnalysisSessionAnalysisService(db)
+    return await service.execute_chat(
+        job.project_id,
+        job.session_id,
+        AnalysisChatCreate(message=job.message),
+        on_event=job.publish,
+    )
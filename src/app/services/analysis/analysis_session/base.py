@@ -4,6 +4,7 @@
 """
 
 import json
+import uuid
 from typing import Any
 
 import pandas as pd
@@ -32,6 +33,8 @@ from app.schemas.analysis import (
 from app.services import storage as storage_module
 from app.services.analysis.agent.agent import AnalysisAgent
 from app.services.analysis.agent.state import AnalysisState
+from app.services.analysis.analysis_session.input_data import input_frame_cache, load_input_frame
+from app.services.analysis.analysis_session.state_cache import analysis_state_cache
 from app.services.storage import StorageService
 
 logger = get_logger(__name__)
@@ -64,13 +67,24 @@ class AnalysisSessionServiceBase:
         session: Any,
         snapshots: list[Any],
         files: list[Any],
+        file_frames: dict[uuid.UUID, pd.DataFrame] | None = None,
+        compact: bool = False,
+        result_offset: int = 0,
+        result_limit: int | None = None,
     ) -> AnalysisSessionDetailResponse:
         """セッション詳細レスポンスを構築します。
 
+        compact=Trueの場合は現在のスナップショットのみチャット・ステップを展開し、
+        それ以外のスナップショットはヘッダー（ID、順序、日時）のみ、ファイルはデータを省略します。
+
         Args:
             session: セッションモデル
-            snapshots: スナップショットのリスト
+            snapshots: スナップショットのリスト（compact=Trueの場合は現在のスナップショットのみリレーションロード済みであればよい）
             files: ファイルのリスト
+            file_frames: _load_file_framesで読み込んだ入力データ（Parquet保存のファイルがある場合は必須、compact=Trueでは入力ファイルのみ）
+            compact: 軽量表示にするかどうか
+            result_offset: 各ステップのresult_dataの開始行
+            result_limit: 各ステップのresult_dataの取得行数（Noneの場合は全行）
 
         Returns:
             AnalysisSessionDetailResponse: セッション詳細レスポンス
@@ -78,6 +92,17 @@ class AnalysisSessionServiceBase:
         snapshot_responses = []
         current_snapshot_order = session.current_snapshot.snapshot_order if session.current_snapshot else 0
         for snap in snapshots:
+            if compact and snap.snapshot_order != current_snapshot_order:
+                snapshot_responses.append(
+                    AnalysisSnapshotResponse(
+                        id=snap.id,
+                        snapshot_order=snap.snapshot_order,
+                        parent_snapshot_id=snap.parent_snapshot_id,
+                        created_at=snap.created_at,
+                        updated_at=snap.updated_at,
+                    )
+                )
+                continue
             chat_responses = [
                 AnalysisChatResponse(
                     id=chat.id,
@@ -91,13 +116,17 @@ class AnalysisSessionServiceBase:
             ]
             step_responses = []
             if snap.snapshot_order == current_snapshot_order and session.input_file_id is not None:
-                state = self._build_state(session, snapshots, files)
+                state = self._get_shared_state(session, snapshots, files, file_frames)
             else:
                 state = None
             for step in snap.steps:
-                # result_dataをDataFrameから辞書リストに変換
+                # result_dataをDataFrameから辞書リストに変換（指定された範囲のみ）
+                result_data_total = None
                 if state is not None and state.all_steps[step.step_order]["result_data"] is not None:
-                    result_data = state.all_steps[step.step_order]["result_data"].to_dict(orient="records")
+                    result_frame = state.all_steps[step.step_order]["result_data"]
+                    result_data_total = len(result_frame)
+                    result_end = None if result_limit is None else result_offset + result_limit
+                    result_data = result_frame.iloc[result_offset:result_end].to_dict(orient="records")
                 else:
                     result_data = None
                 # result_formulaをそのまま取得
@@ -125,6 +154,7 @@ class AnalysisSessionServiceBase:
                         input=step.input,
                         config=step.config,
                         result_data=result_data,
+                        result_data_total=result_data_total,
                         result_formula=result_formula,
                         result_chart=result_chart,
                         result_table=result_table,
@@ -151,7 +181,7 @@ class AnalysisSessionServiceBase:
                 project_file_name=f.project_file.original_filename if f.project_file else "",
                 sheet_name=f.sheet_name,
                 axis_config=f.axis_config,
-                data=f.data,
+                data=None if compact else self._get_file_records(f, file_frames),
                 created_at=f.created_at,
                 updated_at=f.updated_at,
             )
@@ -184,17 +214,48 @@ class AnalysisSessionServiceBase:
             updated_at=session.updated_at,
         )
 
-    def _build_state(self, session: Any, snapshots: list[Any] | None = None, files: list[Any] | None = None) -> AnalysisState:
+    def _build_state(
+        self,
+        session: Any,
+        snapshots: list[Any] | None = None,
+        files: list[Any] | None = None,
+        file_frames: dict[uuid.UUID, pd.DataFrame] | None = None,
+    ) -> AnalysisState:
         """分析セッションの現在のsnapshotと選択ファイルからAnalysisStateを構築します。
 
+        キャッシュ済みのstateがあれば複製して返すため、返り値は自由に変更できます。
+
         Args:
             session: 分析セッションモデル
             snapshots: スナップショットのリスト（指定しない場合はsession.snapshotsを使用）
             files: ファイルのリスト（指定しない場合はsession.filesを使用）
+            file_frames: _load_file_framesで読み込んだ入力データ
 
         Returns:
             AnalysisState: 分析状態オブジェクト
         """
+        return self._get_shared_state(session, snapshots, files, file_frames).clone()
+
+    def _get_shared_state(
+        self,
+        session: Any,
+        snapshots: list[Any] | None = None,
+        files: list[Any] | None = None,
+        file_frames: dict[uuid.UUID, pd.DataFrame] | None = None,
+    ) -> AnalysisState:
+        """キャッシュ済み（なければ構築してキャッシュした）AnalysisStateを取得します。
+
+        返り値はキャッシュと共有されるため、読み取り専用として扱ってください。
+
+        Args:
+            session: 分析セッションモデル
+            snapshots: スナップショットのリスト（指定しない場合はsession.snapshotsを使用）
+            files: ファイルのリスト（指定しない場合はsession.filesを使用）
+            file_frames: _load_file_framesで読み込んだ入力データ
+
+        Returns:
+            AnalysisState: 分析状態オブジェクト（共有）
+        """
         # snapshots, filesが指定されていない場合はセッションから取得
         # NOTE: deepcopy前にリストを取得しないとDetachedInstanceErrorが発生する
         if snapshots is None:
@@ -202,6 +263,66 @@ class AnalysisSessionServiceBase:
         if files is None:
             files = list(session.files)
 
+        input_file, snapshot = self._resolve_state_source(session, snapshots, files)
+        cache_key = (session.id, snapshot.id, input_file.id)
+        cache_version = self._get_state_version(input_file, snapshot)
+        state = analysis_state_cache.get(cache_key, cache_version)
+        if state is not None:
+            return state
+
+        # stateを初期化
+        input_file_data = self._get_input_frame(input_file, file_frames)
+        step_list = []
+        for step in snapshot.steps:
+            step_list.append(
+                {
+                    "name": step.name,
+                    "type": step.type,
+                    "data_source": step.input,
+                    "config": step.config,
+                    "result_data": None,
+                    "result_formula": None,
+                    "result_chart": None,
+                    "result_table": None,
+                }
+            )
+        chat_list = []
+        for chat in snapshot.chats:
+            chat_list.append((chat.role, chat.message))
+        state = AnalysisState(input_file_data, step_list, chat_list)
+        analysis_state_cache.put(cache_key, cache_version, state)
+        return state
+
+    def _store_state(self, session: Any, snapshots: list[Any], files: list[Any], state: AnalysisState) -> None:
+        """永続化済みのstateをキャッシュに登録します。
+
+        チャット実行後など、DBに保存した内容と一致するstateが手元にある場合に使用し、
+        直後のレスポンス構築で再計算が発生しないようにします。
+
+        Args:
+            session: 分析セッションモデル（保存後に再取得したもの）
+            snapshots: スナップショットのリスト（保存後に再取得したもの）
+            files: ファイルのリスト
+            state: 保存したstate（登録後は変更しないこと）
+        """
+        input_file, snapshot = self._resolve_state_source(session, snapshots, files)
+        cache_key = (session.id, snapshot.id, input_file.id)
+        analysis_state_cache.put(cache_key, self._get_state_version(input_file, snapshot), state)
+
+    def _resolve_state_source(self, session: Any, snapshots: list[Any], files: list[Any]) -> tuple[Any, Any]:
+        """state構築に使用する入力ファイルと現在のスナップショットを取得します。
+
+        Args:
+            session: 分析セッションモデル
+            snapshots: スナップショットのリスト
+            files: ファイルのリスト
+
+        Returns:
+            tuple[Any, Any]: (入力ファイルモデル, 現在のスナップショットモデル)
+
+        Raises:
+            NotFoundError: セッション、入力ファイル、スナップショットが見つからない場合
+        """
         # セッションを取得
         session_id = session.id
         if not session:
@@ -218,9 +339,9 @@ class AnalysisSessionServiceBase:
         input_file = None
         for file in files:
             if file.id == session.input_file_id:
-                input_file = file.data
+                input_file = file
                 break
-        if not input_file:
+        if input_file is None or not (input_file.data_path or input_file.data):
             raise NotFoundError(
                 "Input file data not found",
                 details={"file_id": str(session.input_file_id)},
@@ -235,30 +356,78 @@ class AnalysisSessionServiceBase:
                     "current_snapshot": current_snapshot_order,
                 },
             )
+        return input_file, snapshots[current_snapshot_order]
 
-        # stateを初期化
-        input_data_rows = input_file
-        input_file_data = pd.DataFrame.from_records(input_data_rows)
-        snapshot = snapshots[current_snapshot_order]
-        step_list = []
-        for step in snapshot.steps:
-            step_list.append(
-                {
-                    "name": step.name,
-                    "type": step.type,
-                    "data_source": step.input,
-                    "config": step.config,
-                    "result_data": None,
-                    "result_formula": None,
-                    "result_chart": None,
-                    "result_table": None,
-                }
+    async def _load_file_frames(self, files: list[Any]) -> dict[uuid.UUID, pd.DataFrame]:
+        """Parquetで保存された入力データをストレージから読み込みます。
+
+        Args:
+            files: ファイルのリスト
+
+        Returns:
+            dict[uuid.UUID, pd.DataFrame]: ファイルIDをキーとする入力データ（共有オブジェクトのため変更しないこと）
+        """
+        return {f.id: await load_input_frame(self.storage, f) for f in files if f.data_path}
+
+    @staticmethod
+    def _get_input_frame(file: Any, file_frames: dict[uuid.UUID, pd.DataFrame] | None) -> pd.DataFrame:
+        """ファイルの入力データをDataFrameとして取得します。
+
+        Args:
+            file: 分析ファイルモデル
+            file_frames: _load_file_framesで読み込んだ入力データ
+
+        Returns:
+            pd.DataFrame: 入力データ
+
+        Raises:
+            NotFoundError: Parquetの入力データが読み込まれていない場合
+        """
+        if not file.data_path:
+            return pd.DataFrame.from_records(file.data)
+        frame = (file_frames or {}).get(file.id)
+        if frame is None:
+            frame = input_frame_cache.get(file.data_path)
+        if frame is None:
+            raise NotFoundError(
+                "Input file data not loaded",
+                details={"file_id": str(file.id), "data_path": file.data_path},
             )
-        chat_list = []
-        for chat in snapshot.chats:
-            chat_list.append((chat.role, chat.message))
-        state = AnalysisState(input_file_data, step_list, chat_list)
-        return state
+        return frame
+
+    @classmethod
+    def _get_file_records(cls, file: Any, file_frames: dict[uuid.UUID, pd.DataFrame] | None) -> list[dict[str, Any]]:
+        """レスポンス用にファイルの入力データを辞書リストで取得します。
+
+        Args:
+            file: 分析ファイルモデル
+            file_frames: _load_file_framesで読み込んだ入力データ
+
+        Returns:
+            list[dict[str, Any]]: 入力データ
+        """
+        if not file.data_path:
+            return file.data if file.data else []
+        return cls._get_input_frame(file, file_frames).to_dict(orient="records")
+
+    @staticmethod
+    def _get_state_version(input_file: Any, snapshot: Any) -> tuple[Any, ...]:
+        """キャッシュ検証用に、state構築元データのバージョンを算出します。
+
+        他ワーカーでの更新も検知できるよう、入力ファイルとステップの更新日時、チャットIDを使用します。
+
+        Args:
+            input_file: 入力ファイルモデル
+            snapshot: スナップショットモデル（steps, chatsロード済み）
+
+        Returns:
+            tuple[Any, ...]: バージョン
+        """
+        return (
+            input_file.updated_at,
+            tuple((step.id, step.updated_at) for step in snapshot.steps),
+            tuple(chat.id for chat in snapshot.chats),
+        )
 
     def _build_agent(self, state: AnalysisState) -> AnalysisAgent:
         """AnalysisStateからAnalysisAgentを構築します。
@@ -0,0 +1,377 @@
+"""AIチャット実行ジョブ。
+
+AIチャットをHTTPリクエストから切り離してバックグラウンドで実行し、
+進捗（ツール呼び出し・トークン生成）をイベントとして配信します。
+
+ジョブ仕様:
+    - 受付: submit()でジョブを登録し、ジョブIDを即座に返す（実行はバックグラウンドのタスク）
+    - 同時実行数: プロジェクト毎にANALYSIS_CHAT_MAX_RUNS_PER_PROJECTまで。超過分は受付順に待機し、
+      待機数がANALYSIS_CHAT_MAX_PENDING_PER_PROJECTを超える場合はServiceUnavailableError（503）を返す
+    - タイムアウト: ANALYSIS_CHAT_JOB_TIMEOUT_SECONDS（既定10分）を超えたジョブは失敗とする
+    - イベント: status, tool_start, tool_end, token, completed, failed を連番付きで保持し、
+      Server-Sent Events形式で途中から再取得できる（Last-Event-ID）
+    - 保持期間: 終了したジョブはANALYSIS_CHAT_JOB_RETENTION_SECONDS経過後に破棄する
+
+Note:
+    - ジョブはクライアントの切断と無関係に最後まで実行され、結果（新しいスナップショット）はDBに保存されます。
+    - ジョブはプロセス内で管理するため、状態・イベントの取得は受付したワーカーで行う必要があります
+      （複数ワーカー構成ではセッションアフィニティを設定してください）。
+    - ジョブの実行には、リクエストとは別のDBセッション（session_factory）を使用します。
+"""
+
+import asyncio
+import json
+import uuid
+from collections import defaultdict, deque
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.middlewares.metrics import analysis_chat_jobs_pending, analysis_chat_jobs_running, analysis_chat_jobs_total
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.exceptions import AppException, ServiceUnavailableError
+from app.core.logging import get_logger
+from app.schemas.analysis import AnalysisChatJobResponse, AnalysisSessionDetailResponse
+
+logger = get_logger(__name__)
+
+FINISHED_STATUSES = ("succeeded", "failed")
+
+
+@dataclass
+class ChatJobEvent:
+    """チャットジョブのイベント。
+
+    Attributes:
+        id: イベント番号（1始まりの連番）
+        event: イベント種別
+        data: イベントデータ
+    """
+
+    id: int
+    event: str
+    data: dict[str, Any]
+
+    def to_sse(self) -> str:
+        """Server-Sent Events形式の文字列に変換します。"""
+        payload = json.dumps(self.data, ensure_ascii=False, default=str)
+        return f"id: {self.id}\nevent: {self.event}\ndata: {payload}\n\n"
+
+
+@dataclass
+class ChatJob:
+    """チャット実行ジョブ。
+
+    Attributes:
+        project_id: プロジェクトID
+        session_id: セッションID
+        user_id: 実行ユーザーID
+        message: ユーザーメッセージ
+        id: ジョブID
+        status: ジョブ状態（queued, running, succeeded, failed）
+        error: エラーメッセージ
+        result: 更新後のセッション詳細
+        created_at: 受付日時
+        started_at: 実行開始日時
+        finished_at: 終了日時
+        events: 発生したイベントのリスト
+    """
+
+    project_id: uuid.UUID
+    session_id: uuid.UUID
+    user_id: uuid.UUID
+    message: str
+    id: uuid.UUID = field(default_factory=uuid.uuid4)
+    status: str = "queued"
+    error: str | None = None
+    result: AnalysisSessionDetailResponse | None = None
+    created_at: datetime = field(default_factory=lambda: datetime.now(UTC))
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    events: list[ChatJobEvent] = field(default_factory=list)
+    _updated: asyncio.Event | None = field(default=None, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        """ジョブが終了しているかどうか。"""
+        return self.status in FINISHED_STATUSES
+
+    def publish(self, event: str, data: dict[str, Any]) -> None:
+        """イベントを追加し、待機中の購読者に通知します（イベントループ上で呼び出すこと）。
+
+        Args:
+            event: イベント種別
+            data: イベントデータ
+        """
+        self.events.append(ChatJobEvent(id=len(self.events) + 1, event=event, data=data))
+        if self._updated is not None:
+            self._updated.set()
+            self._updated = None
+
+    async def wait_for_events(self, after: int, timeout: float | None = None) -> bool:
+        """指定したイベント番号より後のイベントが追加されるまで待機します。
+
+        Args:
+            after: 取得済みのイベント番号
+            timeout: 最大待機時間（秒）
+
+        Returns:
+            bool: 新しいイベントがある場合True、タイムアウトした場合False
+        """
+        if len(self.events) > after:
+            return True
+        if self._updated is None:
+            self._updated = asyncio.Event()
+        try:
+            await asyncio.wait_for(self._updated.wait(), timeout=timeout)
+        except TimeoutError:
+            return False
+        return True
+
+    async def stream_sse(self, last_event_id: int = 0, heartbeat_seconds: float = 15.0) -> AsyncIterator[str]:
+        """イベントをServer-Sent Events形式で配信します。
+
+        last_event_idより後のイベントから配信し、ジョブが終了して全イベントを配信した時点で終了します。
+        新しいイベントがない間はheartbeat_seconds毎にコメント行を送信します。
+
+        Args:
+            last_event_id: 取得済みのイベント番号（再接続時のLast-Event-ID）
+            heartbeat_seconds: キープアライブの送信間隔（秒）
+
+        Yields:
+            str: Server-Sent Events形式のイベント
+        """
+        cursor = max(last_event_id, 0)
+        while True:
+            while cursor < len(self.events):
+                yield self.events[cursor].to_sse()
+                cursor += 1
+            if self.finished:
+                return
+            if not await self.wait_for_events(cursor, timeout=heartbeat_seconds):
+                yield ": keep-alive\n\n"
+
+    def to_response(self) -> AnalysisChatJobResponse:
+        """レスポンススキーマに変換します。"""
+        return AnalysisChatJobResponse(
+            job_id=self.id,
+            session_id=self.session_id,
+            status=self.status,
+            message=self.message,
+            error=self.error,
+            result=self.result,
+            created_at=self.created_at,
+            started_at=self.started_at,
+            finished_at=self.finished_at,
+        )
+
+
+ChatJobRunner = Callable[[ChatJob, AsyncSession], Awaitable[AnalysisSessionDetailResponse]]
+
+
+class ChatJobManager:
+    """チャット実行ジョブの受付・実行・状態管理を行うクラス。"""
+
+    def __init__(
+        self,
+        max_runs_per_project: int,
+        max_pending_per_project: int,
+        timeout_seconds: float,
+        retention_seconds: int,
+    ):
+        """ジョブマネージャーを初期化します。
+
+        Args:
+            max_runs_per_project: プロジェクト毎の同時実行数の上限
+            max_pending_per_project: プロジェクト毎の実行待ち数の上限
+            timeout_seconds: ジョブのタイムアウト（秒）
+            retention_seconds: 終了したジョブを保持する時間（秒）
+        """
+        self.max_runs_per_project = max_runs_per_project
+        self.max_pending_per_project = max_pending_per_project
+        self.timeout_seconds = timeout_seconds
+        self.retention_seconds = retention_seconds
+        self.session_factory: Callable[[], Any] = AsyncSessionLocal
+        self._jobs: dict[uuid.UUID, ChatJob] = {}
+        self._running: defaultdict[uuid.UUID, int] = defaultdict(int)
+        self._pending: defaultdict[uuid.UUID, deque[tuple[ChatJob, ChatJobRunner]]] = defaultdict(deque)
+        self._tasks: set[asyncio.Task] = set()
+
+    def submit(
+        self,
+        project_id: uuid.UUID,
+        session_id: uuid.UUID,
+        user_id: uuid.UUID,
+        message: str,
+        runner: ChatJobRunner,
+    ) -> ChatJob:
+        """ジョブを受け付けます。
+
+        プロジェクトの同時実行数に空きがあれば即座に実行を開始し、なければ実行待ちにします。
+
+        Args:
+            project_id: プロジェクトID
+            session_id: セッションID
+            user_id: 実行ユーザーID
+            message: ユーザーメッセージ
+            runner: ジョブ本体（ジョブとDBセッションを受け取り、更新後のセッション詳細を返す）
+
+        Returns:
+            ChatJob: 受け付けたジョブ
+
+        Raises:
+            ServiceUnavailableError: プロジェクトの実行待ち数が上限に達している場合
+        """
+        self._prune()
+        pending = self._pending[project_id]
+        if self._running[project_id] >= self.max_runs_per_project and len(pending) >= self.max_pending_per_project:
+            analysis_chat_jobs_total.labels(status="rejected").inc()
+            raise ServiceUnavailableError(
+                "このプロジェクトで実行中のチャットが多すぎます。しばらくしてから再度お試しください",
+                details={"reason": "overload", "project_id": str(project_id), "retry_after": 30},
+            )
+
+        job = ChatJob(project_id=project_id, session_id=session_id, user_id=user_id, message=message)
+        self._jobs[job.id] = job
+        job.publish("status", {"status": job.status})
+        analysis_chat_jobs_total.labels(status="submitted").inc()
+        logger.info(
+            "チャットジョブを受け付けました",
+            job_id=str(job.id),
+            project_id=str(project_id),
+            session_id=str(session_id),
+        )
+
+        if self._running[project_id] < self.max_runs_per_project:
+            self._start(job, runner)
+        else:
+            pending.append((job, runner))
+            analysis_chat_jobs_pending.inc()
+        return job
+
+    def get(self, job_id: uuid.UUID) -> ChatJob | None:
+        """ジョブを取得します。
+
+        Args:
+            job_id: ジョブID
+
+        Returns:
+            ChatJob | None: ジョブ、存在しない（破棄済みを含む）場合はNone
+        """
+        return self._jobs.get(job_id)
+
+    async def wait(self, job_id: uuid.UUID) -> ChatJob:
+        """ジョブが終了するまで待機します。
+
+        Args:
+            job_id: ジョブID
+
+        Returns:
+            ChatJob: 終了したジョブ
+
+        Raises:
+            KeyError: ジョブが存在しない場合
+        """
+        job = self._jobs[job_id]
+        while not job.finished:
+            await job.wait_for_events(len(job.events))
+        return job
+
+    async def shutdown(self) -> None:
+        """実行中・実行待ちのジョブをキャンセルします。"""
+        for queue in self._pending.values():
+            for job, _ in queue:
+                self._finish(job, "failed", error="サーバーの停止によりキャンセルされました")
+            queue.clear()
+        analysis_chat_jobs_pending.set(0)
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _start(self, job: ChatJob, runner: ChatJobRunner) -> None:
+        """ジョブの実行を開始します。"""
+        self._running[job.project_id] += 1
+        analysis_chat_jobs_running.inc()
+        task = asyncio.create_task(self._run(job, runner), name=f"chat-job-{job.id}")
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, job: ChatJob, runner: ChatJobRunner) -> None:
+        """ジョブを実行し、終了後に同じプロジェクトの実行待ちジョブを開始します。"""
+        job.status = "running"
+        job.started_at = datetime.now(UTC)
+        job.publish("status", {"status": job.status})
+        try:
+            async with self.session_factory() as db:
+                result = await asyncio.wait_for(runner(job, db), timeout=self.timeout_seconds)
+        except TimeoutError:
+            self._finish(job, "failed", error=f"チャットの実行がタイムアウトしました（{self.timeout_seconds:g}秒）")
+        except asyncio.CancelledError:
+            self._finish(job, "failed", error="サーバーの停止によりキャンセルされました")
+            raise
+        except AppException as e:
+            self._finish(job, "failed", error=e.message)
+        except Exception as e:
+            logger.exception(
+                "チャットジョブの実行中にエラーが発生しました",
+                job_id=str(job.id),
+                error_type=type(e).__name__,
+            )
+            self._finish(job, "failed", error=str(e))
+        else:
+            job.result = result
+            self._finish(job, "succeeded")
+        finally:
+            self._running[job.project_id] -= 1
+            analysis_chat_jobs_running.dec()
+            pending = self._pending[job.project_id]
+            if pending:
+                next_job, next_runner = pending.popleft()
+                analysis_chat_jobs_pending.dec()
+                self._start(next_job, next_runner)
+            if not self._running[job.project_id] and not pending:
+                del self._running[job.project_id]
+                del self._pending[job.project_id]
+
+    def _finish(self, job: ChatJob, status: str, error: str | None = None) -> None:
+        """ジョブを終了状態にし、終了イベントを追加します。"""
+        job.status = status
+        job.error = error
+        job.finished_at = datetime.now(UTC)
+        analysis_chat_jobs_total.labels(status=status).inc()
+        if status == "succeeded":
+            current_snapshot = job.result.current_snapshot if job.result else None
+            job.publish("completed", {"status": status, "current_snapshot": current_snapshot})
+        else:
+            job.publish("failed", {"status": status, "error": error})
+        logger.info(
+            "チャットジョブが終了しました",
+            job_id=str(job.id),
+            status=status,
+            error=error,
+        )
+
+    def _prune(self) -> None:
+        """保持期間を過ぎた終了済みジョブを破棄します。"""
+        now = datetime.now(UTC)
+        expired = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.finished_at is not None and (now - job.finished_at).total_seconds() > self.retention_seconds
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+chat_job_manager = ChatJobManager(
+    max_runs_per_project=settings.ANALYSIS_CHAT_MAX_RUNS_PER_PROJECT,
+    max_pending_per_project=settings.ANALYSIS_CHAT_MAX_PENDING_PER_PROJECT,
+    timeout_seconds=settings.ANALYSIS_CHAT_JOB_TIMEOUT_SECONDS,
+    retention_seconds=settings.ANALYSIS_CHAT_JOB_RETENTION_SECONDS,
+)
@@ -184,24 +184,35 @@ class AnalysisSessionCrudService(AnalysisSessionServiceBase):
         snapshots = await self.snapshot_repository.list_by_session_with_relations(session.id)
         files = await self.file_repository.list_by_session(session.id)
 
-        return self._build_session_detail_response(session, snapshots, files)
+        file_frames = await self._load_file_frames(files)
+        return self._build_session_detail_response(session, snapshots, files, file_frames)
 
     async def get_session(
         self,
         project_id: uuid.UUID,
         session_id: uuid.UUID,
+        compact: bool = False,
+        result_offset: int = 0,
+        result_limit: int | None = None,
     ) -> AnalysisSessionDetailResponse:
         """分析セッション詳細を取得します。
 
         ステップ、ファイル、チャット履歴を含む完全な情報を返します。
         N+1クエリを回避するため、selectinloadを使用します。
 
+        compact=Trueの場合は現在のスナップショットのみステップ・チャットを取得し、
+        その他のスナップショットはヘッダーのみ、ファイルはデータを省略して返します。
+        入力データも選択中の入力ファイルのみ読み込みます。
+
         Note:
             権限チェックはルーター層の ProjectMemberDep で行われます。
 
         Args:
             project_id: プロジェクトID
             session_id: セッションID
+            compact: 軽量表示にするかどうか
+            result_offset: 各ステップのresult_dataの開始行
+            result_limit: 各ステップのresult_dataの取得行数（Noneの場合は全行）
 
         Returns:
             AnalysisSessionDetailResponse: セッション詳細
@@ -224,11 +235,34 @@ class AnalysisSessionCrudService(AnalysisSessionServiceBase):
                 details={"session_id": str(session_id), "project_id": str(project_id)},
             )
 
-        # スナップショットをリレーション付きで一括取得（N+1回避）
-        snapshots = await self.snapshot_repository.list_by_session_with_relations(session_id)
+        if not compact:
+            # スナップショットをリレーション付きで一括取得（N+1回避）
+            snapshots = await self.snapshot_repository.list_by_session_with_relations(session_id)
+            files = await self.file_repository.list_by_session(session_id)
+
+            file_frames = await self._load_file_frames(files)
+            return self._build_session_detail_response(
+                session, snapshots, files, file_frames, result_offset=result_offset, result_limit=result_limit
+            )
+
+        # 軽量表示: スナップショットはヘッダーのみ取得し、現在のスナップショットだけリレーションをロード
+        snapshots = await self.snapshot_repository.list_by_session(session_id)
+        current_snapshot_order = session.current_snapshot.snapshot_order if session.current_snapshot else 0
+        for snapshot in snapshots:
+            if snapshot.snapshot_order == current_snapshot_order:
+                await self.snapshot_repository.get_with_relations(snapshot.id)
         files = await self.file_repository.list_by_session(session_id)
 
-        return self._build_session_detail_response(session, snapshots, files)
+        file_frames = await self._load_file_frames([f for f in files if f.id == session.input_file_id])
+        return self._build_session_detail_response(
+            session,
+            snapshots,
+            files,
+            file_frames,
+            compact=True,
+            result_offset=result_offset,
+            result_limit=result_limit,
+        )
 
     @transactional
     async def delete_session(
@@ -277,7 +311,7 @@ class AnalysisSessionCrudService(AnalysisSessionServiceBase):
         """分析セッションを複製します。
 
         セッションとその関連データ（スナップショット、ステップ、チャット、ファイル）を
-        深いコピーで複製します。
+        INSERT ... SELECTで複製します。クエリ数は履歴の長さに依存しません。
 
         Note:
             権限チェックはルーター層の ProjectMemberDep で行われます。
@@ -295,7 +329,7 @@ class AnalysisSessionCrudService(AnalysisSessionServiceBase):
             NotFoundError: セッションが見つからない場合
         """
         # 複製元セッションを取得
-        original_session = await self.session_repository.get_with_relations(session_id)
+        original_session = await self.session_repository.get(session_id)
         if not original_session:
             raise NotFoundError(
                 "セッションが見つかりません",
@@ -308,7 +342,7 @@ class AnalysisSessionCrudService(AnalysisSessionServiceBase):
                 details={"session_id": str(session_id), "project_id": str(project_id)},
             )
 
-        # 新しいセッションを作成（current_snapshot_idはスナップショット複製後に設定）
+        # 新しいセッションを作成（current_snapshot_id, input_file_idは複製後に設定）
         new_session = await self.session_repository.create(
             project_id=project_id,
             issue_id=original_session.issue_id,
@@ -316,73 +350,28 @@ class AnalysisSessionCrudService(AnalysisSessionServiceBase):
             status=original_session.status if hasattr(original_session, "status") else "draft",
         )
 
-        # 元のcurrent_snapshot_idを保存
-        original_current_snapshot_id = original_session.current_snapshot_id
-
-        # スナップショットを複製
-        original_snapshots = await self.snapshot_repository.list_by_session(session_id)
-        snapshot_id_mapping: dict[uuid.UUID, uuid.UUID] = {}
-
-        for original_snap in original_snapshots:
-            # 親スナップショットIDをマッピング
-            parent_id = None
-            if hasattr(original_snap, "parent_snapshot_id") and original_snap.parent_snapshot_id:
-                parent_id = snapshot_id_mapping.get(original_snap.parent_snapshot_id)
-
-            new_snap = await self.snapshot_repository.create(
-                session_id=new_session.id,
-                snapshot_order=original_snap.snapshot_order,
-                parent_snapshot_id=parent_id,
-            )
-            snapshot_id_mapping[original_snap.id] = new_snap.id
-
-            # ステップを複製
-            original_steps = await self.step_repository.list_by_snapshot(original_snap.id)
-            for step in original_steps:
-                await self.step_repository.create(
-                    snapshot_id=new_snap.id,
-                    name=step.name,
-                    step_order=step.step_order,
-                    type=step.type,
-                    input=step.input,
-                    config=step.config,
-                )
-
-            # チャットを複製
-            original_chats = await self.chat_repository.list_by_snapshot(original_snap.id)
-            for chat in original_chats:
-                await self.chat_repository.create(
-                    snapshot_id=new_snap.id,
-                    chat_order=chat.chat_order,
-                    role=chat.role,
-                    message=chat.message,
-                )
-
-        # ファイルを複製
-        original_files = await self.file_repository.list_by_session(session_id)
-        for file in original_files:
-            await self.file_repository.create(
-                session_id=new_session.id,
-                project_file_id=file.project_file_id,
-                sheet_name=file.sheet_name,
-                axis_config=file.axis_config,
-                data=file.data,
-            )
-
-        # current_snapshot_idを設定（元のスナップショットに対応する新しいスナップショットID）
-        if original_current_snapshot_id and original_current_snapshot_id in snapshot_id_mapping:
-            new_current_snapshot_id = snapshot_id_mapping[original_current_snapshot_id]
-            new_session = await self.session_repository.update(new_session, current_snapshot_id=new_current_snapshot_id)
+        # スナップショット・ステップ・チャット・ファイルをINSERT ... SELECTで一括複製
+        # （履歴の長さに関わらずクエリ数は一定、IDの付け替えはサーバー側で行う）
+        snapshot_id_mapping = await self.snapshot_repository.copy_to_session(session_id, new_session.id)
+        await self.step_repository.copy_from_snapshots(snapshot_id_mapping)
+        await self.chat_repository.copy_from_snapshots(snapshot_id_mapping)
+        file_id_mapping = await self.file_repository.copy_to_session(session_id, new_session.id)
+
+        # current_snapshot_id, input_file_idを複製後のIDに付け替え
+        new_session = await self.session_repository.update(
+            new_session,
+            current_snapshot_id=snapshot_id_mapping.get(original_session.current_snapshot_id),
+            input_file_id=file_id_mapping.get(original_session.input_file_id),
+        )
 
-        # リレーションを取得してレスポンスを構築
+        # リレーションを一括取得してレスポンスを構築
         await self.db.commit()
-        new_session_with_relations = await self.session_repository.get_with_relations(new_session.id)
+        new_session_with_relations = await self.session_repository.get_with_snapshots(new_session.id)
         if not new_session_with_relations:
             raise NotFoundError("セッション複製後の取得に失敗しました")
         new_session = new_session_with_relations
-
-        # スナップショットをリレーション付きで一括取得（N+1回避）
-        snapshots = await self.snapshot_repository.list_by_session_with_relations(new_session.id)
+        snapshots = list(new_session.snapshots)
         files = await self.file_repository.list_by_session(new_session.id)
 
-        return self._build_session_detail_response(new_session, snapshots, files)
+        file_frames = await self._load_file_frames(files)
+        return self._build_session_detail_response(new_session, snapshots, files, file_frames)
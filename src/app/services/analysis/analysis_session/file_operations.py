@@ -16,11 +16,14 @@ from app.schemas.analysis import (
     AnalysisFileConfigResponse,
     AnalysisFileCreate,
     AnalysisFileResponse,
+    AnalysisFileRowsResponse,
     AnalysisFileUpdate,
     AnalysisSessionDetailResponse,
 )
 from app.services.analysis.analysis_session.base import AnalysisSessionServiceBase
 from app.services.analysis.analysis_session.excel_parser import parse_hierarchical_excel
+from app.services.analysis.analysis_session.input_data import save_input_data
+from app.services.analysis.analysis_session.state_cache import analysis_state_cache
 from app.services.storage.excel import get_excel_sheet_names, read_excel_sheet
 
 logger = get_logger(__name__)
@@ -69,6 +72,7 @@ class AnalysisSessionFileService(AnalysisSessionServiceBase):
 
         # ファイル一覧を取得
         files = await self.file_repository.list_by_session(session_id)
+        file_frames = await self._load_file_frames(files)
 
         return [
             AnalysisFileResponse(
@@ -78,13 +82,73 @@ class AnalysisSessionFileService(AnalysisSessionServiceBase):
                 project_file_name=f.project_file.original_filename if f.project_file else "",
                 sheet_name=f.sheet_name,
                 axis_config=f.axis_config,
-                data=f.data if f.data else [],
+                data=self._get_file_records(f, file_frames),
                 created_at=f.created_at,
                 updated_at=f.updated_at,
             )
             for f in files
         ]
 
+    async def get_file_rows(
+        self,
+        project_id: uuid.UUID,
+        session_id: uuid.UUID,
+        file_id: uuid.UUID,
+        skip: int = 0,
+        limit: int = 1000,
+    ) -> AnalysisFileRowsResponse:
+        """セッションに登録されたファイルの入力データを指定範囲の行だけ取得します。
+
+        Note:
+            権限チェックはルーター層の ProjectMemberDep で行われます。
+
+        Args:
+            project_id: プロジェクトID
+            session_id: セッションID
+            file_id: 分析ファイルID
+            skip: スキップする行数
+            limit: 取得する行数
+
+        Returns:
+            AnalysisFileRowsResponse: データ行一覧
+
+        Raises:
+            NotFoundError: セッションまたはファイルが見つからない場合
+        """
+        # セッションの存在確認
+        session = await self.session_repository.get(session_id)
+        if not session or session.project_id != project_id:
+            raise NotFoundError(
+                "Session not found",
+                details={"session_id": str(session_id)},
+            )
+
+        # ファイルの存在確認
+        file = await self.file_repository.get(file_id)
+        if not file or file.session_id != session_id:
+            raise NotFoundError(
+                "File not found",
+                details={"file_id": str(file_id)},
+            )
+
+        if file.data_path:
+            file_frames = await self._load_file_frames([file])
+            frame = self._get_input_frame(file, file_frames)
+            total = len(frame)
+            rows = frame.iloc[skip : skip + limit].to_dict(orient="records")
+        else:
+            records = file.data or []
+            total = len(records)
+            rows = records[skip : skip + limit]
+
+        return AnalysisFileRowsResponse(
+            file_id=file.id,
+            rows=rows,
+            total=total,
+            skip=skip,
+            limit=limit,
+        )
+
     @transactional
     async def upload_session_file(
         self,
@@ -297,10 +361,12 @@ class AnalysisSessionFileService(AnalysisSessionServiceBase):
 
         # 選択された軸に基づいてデータを整形
         required_columns = selected_axis_values + ["科目", "値"]
-        update_data["data"] = values[required_columns].to_dict(orient="records")  # type: ignore[call-overload]
+        input_data = values[required_columns].reset_index(drop=True)
+        update_data.update(await save_input_data(self.storage, project_id, input_data))
 
         # ファイルを更新
         analysis_file = await self.file_repository.update(analysis_file, **update_data)
+        analysis_state_cache.invalidate_session(session_id)
 
         # リレーションを再取得
         updated_file = await self.file_repository.get_with_project_file(file_id)
@@ -324,7 +390,7 @@ class AnalysisSessionFileService(AnalysisSessionServiceBase):
             project_file_name=updated_file.project_file.original_filename if updated_file.project_file else "",
             sheet_name=updated_file.sheet_name,
             axis_config=updated_file.axis_config,
-            data=updated_file.data,
+            data=input_data.to_dict(orient="records"),  # type: ignore[arg-type]
             created_at=updated_file.created_at,
             updated_at=updated_file.updated_at,
         )
@@ -369,6 +435,7 @@ class AnalysisSessionFileService(AnalysisSessionServiceBase):
 
         # セッションの入力ファイルを更新
         session = await self.session_repository.update(session, input_file_id=file_id)
+        analysis_state_cache.invalidate_session(session_id)
 
         # 0より大きなsnapshot（後続分）を削除する（chat, stepも一緒に）
         snapshots = await self.snapshot_repository.list_by_session(session_id)
@@ -382,4 +449,5 @@ class AnalysisSessionFileService(AnalysisSessionServiceBase):
         # ファイルを取得
         files = await self.file_repository.list_by_session(session_id)
 
-        return self._build_session_detail_response(session, snapshots, files)
+        file_frames = await self._load_file_frames(files)
+        return self._build_session_detail_response(session, snapshots, files, file_frames)
@@ -0,0 +1,171 @@
+"""分析入力データストア。
+
+parse_hierarchical_excel()で整形した分析入力データを、StorageService経由で
+Parquetファイルとして保存・読み込みします。DBのAnalysisFileにはパス・スキーマ・行数のみを保持します。
+
+保存仕様:
+    - パス: analysis/input/{project_id}/{sha256}.parquet（内容アドレス）
+    - 軸列と科目列はカテゴリ型（辞書エンコード）で保存
+    - 同一内容のファイルは再アップロードせず共有する（セッション複製時もパスを共有）
+
+Note:
+    - パスは内容から決まり不変のため、デコード済みDataFrameはプロセス内でパス単位にキャッシュします。
+    - キャッシュから返すDataFrameは共有オブジェクトのため、変更しないでください。
+    - data_pathを持たない既存行は、従来通りdata（JSONB）から読み込みます。
+"""
+
+import hashlib
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Any
+
+import pandas as pd
+
+from app.core.config import settings
+from app.core.exceptions import ValidationError
+from app.core.logging import get_logger
+from app.services.storage import StorageService
+from app.services.storage.columnar import dataframe_to_parquet, describe_schema, parquet_to_dataframe
+
+logger = get_logger(__name__)
+
+INPUT_DATA_PATH_PREFIX = "analysis/input"
+VALUE_COLUMN = "値"
+
+
+class InputFrameCache:
+    """デコード済み入力データのLRUキャッシュ（data_pathをキーとする）。"""
+
+    def __init__(self, max_entries: int):
+        """キャッシュを初期化します。
+
+        Args:
+            max_entries: 保持する最大エントリ数（0以下でキャッシュ無効）
+        """
+        self.max_entries = max_entries
+        self._frames: OrderedDict[str, pd.DataFrame] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def get(self, path: str) -> pd.DataFrame | None:
+        """キャッシュからDataFrameを取得します。
+
+        Args:
+            path: データパス
+
+        Returns:
+            pd.DataFrame | None: キャッシュ済みのDataFrame、存在しない場合はNone
+        """
+        with self._lock:
+            frame = self._frames.get(path)
+            if frame is not None:
+                self._frames.move_to_end(path)
+            return frame
+
+    def put(self, path: str, frame: pd.DataFrame) -> None:
+        """DataFrameをキャッシュに登録します。
+
+        Args:
+            path: データパス
+            frame: 登録するDataFrame（登録後は変更しないこと）
+        """
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._frames[path] = frame
+            self._frames.move_to_end(path)
+            while len(self._frames) > self.max_entries:
+                self._frames.popitem(last=False)
+
+    def clear(self) -> None:
+        """全エントリを破棄します。"""
+        with self._lock:
+            self._frames.clear()
+
+
+input_frame_cache = InputFrameCache(max_entries=settings.ANALYSIS_INPUT_FRAME_CACHE_SIZE)
+
+
+async def save_input_data(
+    storage: StorageService,
+    project_id: uuid.UUID,
+    df: pd.DataFrame,
+) -> dict[str, Any]:
+    """分析入力データをParquetとして保存します。
+
+    値列以外（軸列・科目列）はカテゴリ型で保存します。
+    値列に数値と文字列が混在するなどParquetに変換できない場合は、従来通りdata（JSONB）に保存します。
+
+    Args:
+        storage: ストレージサービス
+        project_id: プロジェクトID
+        df: 保存するDataFrame
+
+    Returns:
+        dict[str, Any]: AnalysisFileの更新値（data_path, data_schema, row_count, data）
+
+    Raises:
+        ValidationError: アップロードに失敗した場合
+    """
+    categorical_columns = [col for col in df.columns if col != VALUE_COLUMN]
+    try:
+        payload = dataframe_to_parquet(df, categorical_columns=categorical_columns)
+    except ValidationError as e:
+        logger.warning(
+            "Parquetに変換できないためJSONBで保存します",
+            project_id=str(project_id),
+            error=e.details.get("error") if e.details else None,
+        )
+        return {
+            "data_path": None,
+            "data_schema": None,
+            "row_count": len(df),
+            "data": df.to_dict(orient="records"),
+        }
+    digest = hashlib.sha256(payload).hexdigest()
+    path = f"{INPUT_DATA_PATH_PREFIX}/{project_id}/{digest}.parquet"
+
+    if not await storage.exists("", path):
+        await storage.upload("", path, payload)
+
+    input_frame_cache.put(path, df.reset_index(drop=True))
+    logger.debug(
+        "分析入力データを保存しました",
+        data_path=path,
+        row_count=len(df),
+        size_bytes=len(payload),
+    )
+    return {
+        "data_path": path,
+        "data_schema": describe_schema(df),
+        "row_count": len(df),
+        "data": [],
+    }
+
+
+async def load_input_frame(storage: StorageService, analysis_file: Any) -> pd.DataFrame:
+    """分析ファイルの入力データをDataFrameとして読み込みます。
+
+    Args:
+        storage: ストレージサービス
+        analysis_file: 分析ファイルモデル
+
+    Returns:
+        pd.DataFrame: 入力データ（共有オブジェクトのため変更しないこと）
+
+    Raises:
+        NotFoundError: Parquetファイルが存在しない場合
+        ValidationError: 読み込みに失敗した場合
+    """
+    path = analysis_file.data_path
+    if not path:
+        return pd.DataFrame.from_records(analysis_file.data or [])
+
+    frame = input_frame_cache.get(path)
+    if frame is None:
+        frame = parquet_to_dataframe(await storage.download("", path))
+        input_frame_cache.put(path, frame)
+    return frame
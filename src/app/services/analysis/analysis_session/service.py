@@ -16,10 +16,12 @@ from typing import Any
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.schemas.analysis import (
+    AnalysisChatJobResponse,
     AnalysisChatResponse,
     AnalysisFileConfigResponse,
     AnalysisFileCreate,
     AnalysisFileResponse,
+    AnalysisFileRowsResponse,
     AnalysisFileUpdate,
     AnalysisSessionCreate,
     AnalysisSessionDetailResponse,
@@ -30,6 +32,7 @@ from app.schemas.analysis import (
     AnalysisStepResponse,
 )
 from app.services.analysis.analysis_session.analysis_operations import AnalysisSessionAnalysisService
+from app.services.analysis.analysis_session.chat_job import ChatJob
 from app.services.analysis.analysis_session.crud import AnalysisSessionCrudService
 from app.services.analysis.analysis_session.file_operations import AnalysisSessionFileService
 from app.services.analysis.analysis_session.step_operations import AnalysisSessionStepService
@@ -82,9 +85,12 @@ class AnalysisSessionService:
         self,
         project_id: uuid.UUID,
         session_id: uuid.UUID,
+        compact: bool = False,
+        result_offset: int = 0,
+        result_limit: int | None = None,
     ) -> AnalysisSessionDetailResponse:
         """分析セッション詳細を取得します。"""
-        return await self._crud_service.get_session(project_id, session_id)
+        return await self._crud_service.get_session(project_id, session_id, compact, result_offset, result_limit)
 
     async def delete_session(
         self,
@@ -115,6 +121,17 @@ class AnalysisSessionService:
         """セッションに登録されたファイル一覧を取得します。"""
         return await self._file_service.list_session_files(project_id, session_id)
 
+    async def get_file_rows(
+        self,
+        project_id: uuid.UUID,
+        session_id: uuid.UUID,
+        file_id: uuid.UUID,
+        skip: int = 0,
+        limit: int = 1000,
+    ) -> AnalysisFileRowsResponse:
+        """セッションに登録されたファイルの入力データを指定範囲の行だけ取得します。"""
+        return await self._file_service.get_file_rows(project_id, session_id, file_id, skip, limit)
+
     async def upload_session_file(
         self,
         project_id: uuid.UUID,
@@ -154,6 +171,25 @@ class AnalysisSessionService:
         """分析セッションの結果を取得します。"""
         return await self._analysis_service.get_session_result(project_id, session_id)
 
+    async def submit_chat(
+        self,
+        project_id: uuid.UUID,
+        session_id: uuid.UUID,
+        user_id: uuid.UUID,
+        chat_create: Any,
+    ) -> AnalysisChatJobResponse:
+        """AIチャットの実行ジョブを受け付けます。"""
+        return await self._analysis_service.submit_chat(project_id, session_id, user_id, chat_create)
+
+    def get_chat_job(
+        self,
+        project_id: uuid.UUID,
+        session_id: uuid.UUID,
+        job_id: uuid.UUID,
+    ) -> ChatJob:
+        """AIチャットの実行ジョブを取得します。"""
+        return self._analysis_service.get_chat_job(project_id, session_id, job_id)
+
     async def execute_chat(
         self,
         project_id: uuid.UUID,
@@ -198,9 +234,19 @@ class AnalysisSessionService:
         self,
         project_id: uuid.UUID,
         session_id: uuid.UUID,
+        skip: int = 0,
+        limit: int | None = None,
     ) -> list[AnalysisSnapshotResponse]:
         """セッションのスナップショット一覧を取得します。"""
-        return await self._analysis_service.list_snapshots(project_id, session_id)
+        return await self._analysis_service.list_snapshots(project_id, session_id, skip, limit)
+
+    async def count_snapshots(
+        self,
+        project_id: uuid.UUID,
+        session_id: uuid.UUID,
+    ) -> int:
+        """セッションのスナップショット数を取得します。"""
+        return await self._analysis_service.count_snapshots(project_id, session_id)
 
     async def create_snapshot(
         self,
@@ -0,0 +1,207 @@
+"""分析ステートキャッシュ。
+
+構築済みのAnalysisStateをプロセス内にLRUで保持し、セッション詳細の取得や
+チャット実行のたびにpandasパイプラインを再実行しないようにします。
+
+キャッシュ仕様:
+    - キー: (session_id, snapshot_id, input_file_id)
+    - 上限: 保持するDataFrameの合計バイト数（エントリ数ではない）
+    - 検証: エントリ毎にバージョン（入力ファイル・ステップの更新日時、チャットID）を保持し、
+      他ワーカーでの更新などでDB側と一致しない場合はキャッシュミスとして扱う
+    - 無効化: スナップショット復元・ファイル設定更新・入力ファイル選択・ステップ操作時に
+      セッション単位で破棄する
+
+Note:
+    - キャッシュから取得したstateは共有オブジェクトです。変更する場合は
+      AnalysisState.clone()で複製してから使用してください。
+    - プロセスローカルのため、複数ワーカー環境ではワーカー毎に独立したキャッシュになります。
+"""
+
+import threading
+import uuid
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass
+
+import pandas as pd
+
+from app.api.middlewares.metrics import (
+    analysis_state_cache_bytes,
+    analysis_state_cache_entries,
+    analysis_state_cache_evictions_total,
+    analysis_state_cache_hits_total,
+    analysis_state_cache_misses_total,
+)
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.services.analysis.agent.state import AnalysisState
+
+logger = get_logger(__name__)
+
+StateCacheKey = tuple[uuid.UUID, uuid.UUID, uuid.UUID]
+
+
+@dataclass
+class _StateCacheEntry:
+    """キャッシュエントリ。
+
+    Attributes:
+        state: 構築済みのAnalysisState
+        version: 構築元データのバージョン
+        size_bytes: 保持しているDataFrameの推定バイト数
+    """
+
+    state: AnalysisState
+    version: Hashable
+    size_bytes: int
+
+
+def estimate_state_bytes(state: AnalysisState) -> int:
+    """AnalysisStateが保持するDataFrameの合計バイト数を推定します。
+
+    Args:
+        state: 対象のAnalysisState
+
+    Returns:
+        int: 元データと各ステップの結果データ・結果テーブルの合計バイト数
+    """
+    frames = [state.original_df]
+    for step in state.all_steps:
+        frames.append(step.get("result_data"))
+        frames.append(step.get("result_table"))
+
+    total = 0
+    seen: set[int] = set()
+    for frame in frames:
+        if isinstance(frame, pd.DataFrame) and id(frame) not in seen:
+            seen.add(id(frame))
+            total += int(frame.memory_usage(index=True, deep=True).sum())
+    return total
+
+
+class AnalysisStateCache:
+    """バイト数上限付きのAnalysisState LRUキャッシュ。
+
+    スレッドセーフです（チャット実行をワーカースレッドで行う場合にも共有できます）。
+    """
+
+    def __init__(self, max_bytes: int):
+        """キャッシュを初期化します。
+
+        Args:
+            max_bytes: 保持するDataFrameの合計バイト数の上限（0以下でキャッシュ無効）
+        """
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[StateCacheKey, _StateCacheEntry] = OrderedDict()
+        self._current_bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """キャッシュが有効かどうか。"""
+        return self.max_bytes > 0
+
+    @property
+    def current_bytes(self) -> int:
+        """現在保持しているDataFrameの合計バイト数。"""
+        return self._current_bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: StateCacheKey, version: Hashable) -> AnalysisState | None:
+        """キャッシュからstateを取得します。
+
+        バージョンが一致しないエントリは破棄し、キャッシュミスとして扱います。
+
+        Args:
+            key: (session_id, snapshot_id, input_file_id)
+            version: 構築元データのバージョン
+
+        Returns:
+            AnalysisState | None: キャッシュ済みのstate（共有オブジェクト）、存在しない場合はNone
+        """
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.version != version:
+                self._remove(key, reason="stale")
+                entry = None
+            if entry is None:
+                analysis_state_cache_misses_total.inc()
+                return None
+            self._entries.move_to_end(key)
+            analysis_state_cache_hits_total.inc()
+            return entry.state
+
+    def put(self, key: StateCacheKey, version: Hashable, state: AnalysisState) -> None:
+        """stateをキャッシュに登録します。
+
+        上限を超える場合は最も長く使われていないエントリから追い出します。
+        単体で上限を超えるstateはキャッシュしません。
+
+        Args:
+            key: (session_id, snapshot_id, input_file_id)
+            version: 構築元データのバージョン
+            state: 登録するstate（登録後は変更しないこと）
+        """
+        if not self.enabled:
+            return
+
+        size_bytes = estimate_state_bytes(state)
+        if size_bytes > self.max_bytes:
+            logger.debug(
+                "分析ステートが大きすぎるためキャッシュしません",
+                session_id=str(key[0]),
+                size_bytes=size_bytes,
+                max_bytes=self.max_bytes,
+            )
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key, reason="replaced")
+            while self._entries and self._current_bytes + size_bytes > self.max_bytes:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key, reason="capacity")
+            self._entries[key] = _StateCacheEntry(state=state, version=version, size_bytes=size_bytes)
+            self._current_bytes += size_bytes
+            self._update_gauges()
+
+    def invalidate_session(self, session_id: uuid.UUID) -> int:
+        """セッションに属する全エントリを破棄します。
+
+        Args:
+            session_id: セッションID
+
+        Returns:
+            int: 破棄したエントリ数
+        """
+        with self._lock:
+            keys = [key for key in self._entries if key[0] == session_id]
+            for key in keys:
+                self._remove(key, reason="invalidated")
+            return len(keys)
+
+    def clear(self) -> None:
+        """全エントリを破棄します。"""
+        with self._lock:
+            self._entries.clear()
+            self._current_bytes = 0
+            self._update_gauges()
+
+    def _remove(self, key: StateCacheKey, reason: str) -> None:
+        """エントリを削除します（ロック取得済みで呼び出すこと）。"""
+        entry = self._entries.pop(key)
+        self._current_bytes -= entry.size_bytes
+        analysis_state_cache_evictions_total.labels(reason=reason).inc()
+        self._update_gauges()
+
+    def _update_gauges(self) -> None:
+        analysis_state_cache_bytes.set(self._current_bytes)
+        analysis_state_cache_entries.set(len(self._entries))
+
+
+analysis_state_cache = AnalysisStateCache(max_bytes=settings.ANALYSIS_STATE_CACHE_MAX_BYTES)
@@ -12,6 +12,7 @@ from app.core.exceptions import NotFoundError
 from app.core.logging import get_logger
 from app.schemas.analysis import AnalysisStepResponse
 from app.services.analysis.analysis_session.base import AnalysisSessionServiceBase
+from app.services.analysis.analysis_session.state_cache import analysis_state_cache
 
 logger = get_logger(__name__)
 
@@ -64,7 +65,8 @@ class AnalysisSessionStepService(AnalysisSessionServiceBase):
         session = await self._get_session_with_full_relations(session_id)
 
         # state構築、ステップを追加・適用
-        state = self._build_state(session)
+        file_frames = await self._load_file_frames(session.files)
+        state = self._build_state(session, file_frames=file_frames)
         state.add_step(name=step_name, type=step_type, data=data_source)
         state.apply(step_index=-1, include_following=False)
         new_step = state.all_steps[-1]
@@ -80,6 +82,7 @@ class AnalysisSessionStepService(AnalysisSessionServiceBase):
             config=new_step["config"],
         )
         await self.db.commit()
+        analysis_state_cache.invalidate_session(session_id)
 
         # レスポンス構築
         if new_step["result_data"] is not None:
@@ -159,7 +162,8 @@ class AnalysisSessionStepService(AnalysisSessionServiceBase):
         updated_config = config if config is not None else target_step.config
 
         # state構築、ステップを更新・適用
-        state = self._build_state(session)
+        file_frames = await self._load_file_frames(session.files)
+        state = self._build_state(session, file_frames=file_frames)
         state.all_steps[step_index]["name"] = updated_name
         state.all_steps[step_index]["type"] = updated_type
         state.all_steps[step_index]["data_source"] = updated_data_source
@@ -188,6 +192,7 @@ class AnalysisSessionStepService(AnalysisSessionServiceBase):
             config=updated_config,
         )
         await self.db.commit()
+        analysis_state_cache.invalidate_session(session_id)
         await self.db.refresh(updated_step)
 
         # レスポンス構築
@@ -260,4 +265,5 @@ class AnalysisSessionStepService(AnalysisSessionServiceBase):
         # ステップを削除
         await self.step_repository.delete(step_id)
         await self.db.commit()
+        analysis_state_cache.invalidate_session(session_id)
         return
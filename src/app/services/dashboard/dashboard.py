@@ -1,16 +1,24 @@
 """ダッシュボードサービス。
 
 このモジュールは、ダッシュボード機能のビジネスロジックを提供します。
+
+統計情報・チャートデータはcache_managerのget_or_set()でキャッシュし、
+有効期限切れ後はDASHBOARD_CACHE_STALE_SECONDSの間、古い値を返しつつ
+バックグラウンド（独自のDBセッション）で再計算します。
 """
 
-import asyncio
 import uuid
+from collections.abc import Awaitable, Callable
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
-from sqlalchemy import Date, case, cast, func, select
+from pydantic import BaseModel
+from sqlalchemy import Date, Row, Select, case, cast, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import cache_manager
+from app.core.config import settings
+from app.core.database import get_async_session_context, parallel_query_executor
 from app.models.analysis.analysis_session import AnalysisSession
 from app.models.analysis.analysis_snapshot import AnalysisSnapshot
 from app.models.driver_tree.driver_tree import DriverTree
@@ -31,6 +39,8 @@ from app.schemas.dashboard.dashboard import (
     UserStats,
 )
 
+DASHBOARD_CACHE_TAG = "dashboard"
+
 
 class DashboardService:
     """ダッシュボードサービスクラス。
@@ -47,25 +57,47 @@ class DashboardService:
         self.db = db
 
     async def get_stats(self) -> DashboardStatsResponse:
-        """統計情報を取得。
+        """統計情報を取得（キャッシュ付き）。
+
+        Returns:
+            DashboardStatsResponse: 統計情報
+        """
+
+        async def refresh() -> dict[str, Any]:
+            async with get_async_session_context() as session:
+                return (await DashboardService(session)._compute_stats()).model_dump(mode="json")
+
+        data = await cache_manager.get_or_set(
+            "dashboard:stats",
+            lambda: self._dump(self._compute_stats()),
+            settings.DASHBOARD_CACHE_TTL_SECONDS,
+            stale_ttl=settings.DASHBOARD_CACHE_STALE_SECONDS,
+            tags=[DASHBOARD_CACHE_TAG],
+            refresh=refresh,
+        )
+        return DashboardStatsResponse.model_validate(data)
+
+    async def _compute_stats(self) -> DashboardStatsResponse:
+        """統計情報を集計。
 
         条件付きCOUNTを使用して、テーブルごとに1クエリで全統計を取得します。
-        並行処理により、5つのクエリを同時実行します（14クエリ → 5クエリ → 並列実行）。
+        5つのクエリはparallel_query_executorで別々のセッションに分けて同時実行します。
 
         Returns:
             DashboardStatsResponse: 統計情報
         """
-        # 5つの独立したクエリを並行実行
-        project_result, session_result, tree_result, user_result, file_result = await asyncio.gather(
+        # 5つの独立したクエリを別々のセッションで並行実行
+        project_row, session_row, tree_row, user_row, file_row = await parallel_query_executor.run(
+            self.db,
             # プロジェクト統計（1クエリで全カウントを取得）
-            self.db.execute(
+            self._fetch_one(
                 select(
                     func.count(Project.id).label("total"),
                     func.count(case((Project.is_active == True, 1))).label("active"),  # noqa: E712
                 )
             ),
             # セッション統計（1クエリで全カウントを取得）
-            self.db.execute(
+            self._fetch_one(
                 select(
                     func.count(AnalysisSession.id).label("total"),
                     func.count(case((AnalysisSession.status == "draft", 1))).label("draft"),
@@ -74,7 +106,7 @@ class DashboardService:
                 )
             ),
             # ツリー統計（1クエリで全カウントを取得）
-            self.db.execute(
+            self._fetch_one(
                 select(
                     func.count(DriverTree.id).label("total"),
                     func.count(case((DriverTree.status == "draft", 1))).label("draft"),
@@ -83,14 +115,14 @@ class DashboardService:
                 )
             ),
             # ユーザー統計（1クエリで全カウントを取得）
-            self.db.execute(
+            self._fetch_one(
                 select(
                     func.count(UserAccount.id).label("total"),
                     func.count(case((UserAccount.is_active == True, 1))).label("active"),  # noqa: E712
                 )
             ),
             # ファイル統計（1クエリで全カウントとサイズを取得）
-            self.db.execute(
+            self._fetch_one(
                 select(
                     func.count(ProjectFile.id).label("total"),
                     func.coalesce(func.sum(ProjectFile.file_size), 0).label("total_size"),
@@ -98,15 +130,10 @@ class DashboardService:
             ),
         )
 
-        project_row = project_result.one()
         project_total = project_row.total or 0
         project_active = project_row.active or 0
         project_archived = project_total - project_active
 
-        session_row = session_result.one()
-        tree_row = tree_result.one()
-        user_row = user_result.one()
-        file_row = file_result.one()
 
         return DashboardStatsResponse(
             projects=ProjectStats(
@@ -138,9 +165,47 @@ class DashboardService:
         )
 
     async def get_charts(self, days: int = 30) -> DashboardChartsResponse:
-        """チャートデータを取得。
+        """チャートデータを取得（キャッシュ付き）。
+
+        Args:
+            days: 集計対象日数（デフォルト30日）
+
+        Returns:
+            DashboardChartsResponse: チャートデータ
+        """
+
+        async def refresh() -> dict[str, Any]:
+            async with get_async_session_context() as session:
+                return (await DashboardService(session)._compute_charts(days)).model_dump(mode="json")
+
+        data = await cache_manager.get_or_set(
+            f"dashboard:charts:{days}",
+            lambda: self._dump(self._compute_charts(days)),
+            settings.DASHBOARD_CACHE_TTL_SECONDS,
+            stale_ttl=settings.DASHBOARD_CACHE_STALE_SECONDS,
+            tags=[DASHBOARD_CACHE_TAG],
+            refresh=refresh,
+        )
+        return DashboardChartsResponse.model_validate(data)
+
+    @staticmethod
+    def _fetch_one(stmt: Select[Any]) -> Callable[[AsyncSession], Awaitable[Row[Any]]]:
+        """ステートメントを実行して1行を取得する関数を返します（parallel_query_executor用）。"""
+
+        async def fetch(session: AsyncSession) -> Row[Any]:
+            return (await session.execute(stmt)).one()
+
+        return fetch
+
+    @staticmethod
+    async def _dump(response: Awaitable[BaseModel]) -> dict[str, Any]:
+        """レスポンスをキャッシュ可能なJSON互換の辞書に変換します。"""
+        return (await response).model_dump(mode="json")
+
+    async def _compute_charts(self, days: int) -> DashboardChartsResponse:
+        """チャートデータを集計。
 
-        並行処理により、複数のチャートデータを同時取得してパフォーマンスを向上させます。
+        parallel_query_executorにより、複数のチャートデータを別々のセッションで同時取得します。
 
         Args:
             days: 集計対象日数（デフォルト30日）
@@ -150,24 +215,25 @@ class DashboardService:
         """
         start_date = datetime.now(UTC) - timedelta(days=days)
 
-        # 7つの独立したクエリを並行実行
-        results = await asyncio.gather(
+        # 独立したクエリを別々のセッションで並行実行
+        results = await parallel_query_executor.run(
+            self.db,
             # セッション作成トレンド（日別）
-            self._get_creation_trend(AnalysisSession, start_date, days),
+            lambda session: DashboardService(session)._get_creation_trend(AnalysisSession, start_date, days),
             # ツリー作成トレンド（日別）
-            self._get_creation_trend(DriverTree, start_date, days),
+            lambda session: DashboardService(session)._get_creation_trend(DriverTree, start_date, days),
             # スナップショット作成トレンド（日別）
-            self._get_snapshot_trend(days),
+            lambda session: DashboardService(session)._get_snapshot_trend(days),
             # プロジェクト状態分布 - アクティブ
-            self.db.scalar(select(func.count(Project.id)).where(Project.is_active == True)),  # noqa: E712
+            lambda session: session.scalar(select(func.count(Project.id)).where(Project.is_active == True)),  # noqa: E712
             # プロジェクト状態分布 - アーカイブ
-            self.db.scalar(select(func.count(Project.id)).where(Project.is_active == False)),  # noqa: E712
+            lambda session: session.scalar(select(func.count(Project.id)).where(Project.is_active == False)),  # noqa: E712
             # プロジェクト進捗率
-            self._get_project_progress(),
+            lambda session: DashboardService(session)._get_project_progress(),
             # ユーザーアクティビティ - アクティブ
-            self.db.scalar(select(func.count(UserAccount.id)).where(UserAccount.is_active == True)),  # noqa: E712
+            lambda session: session.scalar(select(func.count(UserAccount.id)).where(UserAccount.is_active == True)),  # noqa: E712
             # ユーザーアクティビティ - 非アクティブ
-            self.db.scalar(select(func.count(UserAccount.id)).where(UserAccount.is_active == False)),  # noqa: E712
+            lambda session: session.scalar(select(func.count(UserAccount.id)).where(UserAccount.is_active == False)),  # noqa: E712
         )
 
         # 型を明示的に指定して個別に変数に代入
@@ -368,7 +434,7 @@ class DashboardService:
 
         複数のデータソースから最近のアクティビティを集約して返します。
         各リソースタイプから必要最小限のデータを取得し、メモリ上でマージします。
-        asyncio.gatherにより4つのクエリを並行実行し、レスポンス時間を短縮します。
+        parallel_query_executorにより4つのクエリを別々のセッションで並行実行し、レスポンス時間を短縮します。
 
         Args:
             skip: スキップ数
@@ -380,12 +446,13 @@ class DashboardService:
         # 各リソースから取得する件数（skip + limit で必要な件数を確保）
         fetch_limit = skip + limit
 
-        # 4つのクエリを並行実行
-        projects, sessions, trees, files = await asyncio.gather(
-            self._get_recent_projects(fetch_limit),
-            self._get_recent_sessions(fetch_limit),
-            self._get_recent_trees(fetch_limit),
-            self._get_recent_files(fetch_limit),
+        # 4つのクエリを別々のセッションで並行実行
+        projects, sessions, trees, files = await parallel_query_executor.run(
+            self.db,
+            lambda session: DashboardService(session)._get_recent_projects(fetch_limit),
+            lambda session: DashboardService(session)._get_recent_sessions(fetch_limit),
+            lambda session: DashboardService(session)._get_recent_trees(fetch_limit),
+            lambda session: DashboardService(session)._get_recent_files(fetch_limit),
         )
 
         # 結果をマージ
@@ -0,0 +1,256 @@
+"""ドライバーツリー計算キャッシュ。
+
+コンパイル済みの計算プランとノード毎の計算結果をプロセス内にLRUで保持し、
+ツリー計算のたびにツリー全体のロード・コンパイル・評価を行わないようにします。
+
+キャッシュ仕様:
+    - キー: tree_id
+    - 上限: ツリー数（DRIVER_TREE_CALCULATION_CACHE_SIZE）
+    - 検証: エントリ毎に構築元のDriverTree.structure_version / data_versionを保持し、DB側と比較する
+        - 両方一致: 計算結果をそのまま使用
+        - structure_versionのみ一致: 計算プランを再利用し、変更ノード（不明な場合は全ノード）を再計算
+        - structure_versionが不一致: キャッシュミス
+    - 無効化: ノード・リレーションシップの追加・削除・変更、数式インポート、リセット時に
+      ツリー単位で破棄する（構造の変更）
+    - 変更ノードの記録: ノードのラベル・タイプ、施策の変更、シートの再読み込み時に
+      トランザクションのコミット後に記録する（データの変更、ロールバック時は記録しない）
+
+Note:
+    - キャッシュから取得した計算結果は共有オブジェクトです。変更する場合は複製してから使用してください。
+    - プロセスローカルのため、複数ワーカー環境ではワーカー毎に独立したキャッシュになります。
+      他ワーカーでの変更はバージョンの不一致として検出し、変更ノードが不明なため全ノードを再計算します。
+"""
+
+import threading
+import uuid
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+import numpy as np
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.api.middlewares.metrics import (
+    driver_tree_calculation_cache_entries,
+    driver_tree_calculation_cache_evictions_total,
+    driver_tree_calculation_cache_lookups_total,
+)
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.services.driver_tree.tree_evaluator import CompiledTree, TreeRows
+
+logger = get_logger(__name__)
+
+# コミット待ちの変更を保持するSession.infoのキー
+_PENDING_CHANGES_KEY = "driver_tree_calculation_changes"
+
+
+@dataclass(frozen=True, eq=False)
+class TreeCalculation:
+    """キャッシュする計算結果。
+
+    Attributes:
+        plan: 計算プラン
+        rows: 計算対象の行
+        values: (ノード数, 行数) の計算結果
+        structure_version: 構築元のDriverTree.structure_version
+        data_version: 構築元のDriverTree.data_version
+    """
+
+    plan: CompiledTree
+    rows: TreeRows
+    values: np.ndarray
+    structure_version: int
+    data_version: int
+
+
+class TreeCalculationCache:
+    """ツリー数上限付きの計算結果LRUキャッシュ。
+
+    スレッドセーフです。
+    """
+
+    def __init__(self, max_entries: int):
+        """キャッシュを初期化します。
+
+        Args:
+            max_entries: 保持するツリー数の上限（0以下でキャッシュ無効）
+        """
+        self.max_entries = max_entries
+        self._entries: OrderedDict[uuid.UUID, TreeCalculation] = OrderedDict()
+        # ツリー毎の (記録済みの最新data_version, 変更ノードID（不明な場合はNone）)
+        self._changes: dict[uuid.UUID, tuple[int, frozenset[uuid.UUID] | None]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """キャッシュが有効かどうか。"""
+        return self.max_entries > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(
+        self,
+        tree_id: uuid.UUID,
+        structure_version: int,
+        data_version: int,
+    ) -> tuple[TreeCalculation | None, frozenset[uuid.UUID] | None]:
+        """キャッシュから計算結果を取得します。
+
+        Args:
+            tree_id: ツリーID
+            structure_version: DB上のDriverTree.structure_version
+            data_version: DB上のDriverTree.data_version
+
+        Returns:
+            tuple[TreeCalculation | None, frozenset[uuid.UUID] | None]: (計算結果, 再計算が必要なノードID)
+                - (None, None): キャッシュミス
+                - (計算結果, 空集合): 計算結果をそのまま使用可能
+                - (計算結果, ノードID): 指定ノードとその祖先ノードの再計算が必要
+                - (計算結果, None): 計算プランのみ使用可能（全ノードの再計算が必要）
+        """
+        if not self.enabled:
+            return None, None
+
+        with self._lock:
+            entry = self._entries.get(tree_id)
+            if entry is not None and entry.structure_version != structure_version:
+                self._remove(tree_id, reason="stale")
+                entry = None
+            if entry is None:
+                driver_tree_calculation_cache_lookups_total.labels(result="miss").inc()
+                return None, None
+
+            self._entries.move_to_end(tree_id)
+            if entry.data_version == data_version:
+                driver_tree_calculation_cache_lookups_total.labels(result="hit").inc()
+                return entry, frozenset()
+
+            recorded_version, changed_node_ids = self._changes.get(tree_id, (entry.data_version, None))
+            if recorded_version == data_version and changed_node_ids is not None:
+                driver_tree_calculation_cache_lookups_total.labels(result="incremental").inc()
+                return entry, changed_node_ids
+
+            driver_tree_calculation_cache_lookups_total.labels(result="rebind").inc()
+            return entry, None
+
+    def put(self, tree_id: uuid.UUID, calculation: TreeCalculation) -> None:
+        """計算結果をキャッシュに登録します。
+
+        同じ構造でより新しいデータの計算結果が登録済みの場合は登録しません。
+        上限を超える場合は最も長く使われていないエントリから追い出します。
+
+        Args:
+            tree_id: ツリーID
+            calculation: 登録する計算結果（登録後は変更しないこと）
+        """
+        if not self.enabled:
+            return
+
+        with self._lock:
+            existing = self._entries.get(tree_id)
+            if (
+                existing is not None
+                and existing.structure_version == calculation.structure_version
+                and existing.data_version > calculation.data_version
+            ):
+                return
+
+            self._entries[tree_id] = calculation
+            self._entries.move_to_end(tree_id)
+            change = self._changes.get(tree_id)
+            if change is not None and change[0] <= calculation.data_version:
+                del self._changes[tree_id]
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)), reason="capacity")
+            driver_tree_calculation_cache_entries.set(len(self._entries))
+
+    def invalidate(self, tree_id: uuid.UUID) -> None:
+        """ツリーのエントリを破棄します（構造の変更時）。
+
+        Args:
+            tree_id: ツリーID
+        """
+        with self._lock:
+            if tree_id in self._entries:
+                self._remove(tree_id, reason="invalidated")
+            self._changes.pop(tree_id, None)
+
+    def record_changes(
+        self,
+        tree_id: uuid.UUID,
+        data_version: int,
+        node_ids: Iterable[uuid.UUID] | None = None,
+    ) -> None:
+        """データの変更を記録します（次回の取得時に変更ノードのみ再計算します）。
+
+        記録済みのバージョンから連続しない場合（他ワーカーでの変更を含む場合）は、
+        変更ノードが不明なものとして全ノードを再計算します。
+
+        Args:
+            tree_id: ツリーID
+            data_version: 変更後のDriverTree.data_version
+            node_ids: 変更されたノードID（Noneの場合は全ノード）
+        """
+        with self._lock:
+            entry = self._entries.get(tree_id)
+            if entry is None:
+                self._changes.pop(tree_id, None)
+                return
+
+            recorded_version, changed_node_ids = self._changes.get(tree_id, (entry.data_version, frozenset()))
+            if node_ids is None or changed_node_ids is None or data_version != recorded_version + 1:
+                self._changes[tree_id] = (data_version, None)
+            else:
+                self._changes[tree_id] = (data_version, changed_node_ids | frozenset(node_ids))
+
+    def record_changes_on_commit(
+        self,
+        db: AsyncSession,
+        tree_id: uuid.UUID,
+        data_version: int,
+        node_ids: Iterable[uuid.UUID] | None = None,
+    ) -> None:
+        """トランザクションのコミット後にデータの変更を記録します（ロールバック時は破棄します）。
+
+        Args:
+            db: 変更を行ったセッション
+            tree_id: ツリーID
+            data_version: 変更後のDriverTree.data_version
+            node_ids: 変更されたノードID（Noneの場合は全ノード）
+        """
+        pending = db.sync_session.info.setdefault(_PENDING_CHANGES_KEY, [])
+        pending.append((tree_id, data_version, None if node_ids is None else frozenset(node_ids)))
+
+    def clear(self) -> None:
+        """全エントリを破棄します。"""
+        with self._lock:
+            self._entries.clear()
+            self._changes.clear()
+            driver_tree_calculation_cache_entries.set(0)
+
+    def _remove(self, tree_id: uuid.UUID, reason: str) -> None:
+        """エントリを削除します（ロック取得済みで呼び出すこと）。"""
+        del self._entries[tree_id]
+        self._changes.pop(tree_id, None)
+        driver_tree_calculation_cache_evictions_total.labels(reason=reason).inc()
+        driver_tree_calculation_cache_entries.set(len(self._entries))
+
+
+tree_calculation_cache = TreeCalculationCache(max_entries=settings.DRIVER_TREE_CALCULATION_CACHE_SIZE)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending_changes(session: Session) -> None:
+    """コミットしたトランザクションで記録したデータの変更をキャッシュに反映します。"""
+    for tree_id, data_version, node_ids in session.info.pop(_PENDING_CHANGES_KEY, []):
+        tree_calculation_cache.record_changes(tree_id, data_version, node_ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_changes(session: Session) -> None:
+    """ロールバックしたトランザクションで記録したデータの変更を破棄します。"""
+    session.info.pop(_PENDING_CHANGES_KEY, None)
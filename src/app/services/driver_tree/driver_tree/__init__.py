@@ -184,5 +184,16 @@ class DriverTreeService:
         """シミュレーション結果をExcel/CSV形式でエクスポートします。"""
         return await self._calculation_service.download_simulation_output(project_id, tree_id, format, user_id)
 
+    async def simulate_policies(
+        self,
+        project_id: uuid.UUID,
+        tree_id: uuid.UUID,
+        policy_id_list: list[uuid.UUID] | None,
+        scenario_list: list[list[uuid.UUID]] | None,
+        user_id: uuid.UUID,
+    ) -> dict[str, Any]:
+        """施策の組み合わせ毎のKPIへの効果をシミュレーションします。"""
+        return await self._calculation_service.simulate_policies(project_id, tree_id, policy_id_list, scenario_list, user_id)
+
 
 __all__ = ["DriverTreeService"]
@@ -6,18 +6,11 @@
 import uuid
 from typing import Any
 
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from app.core.exceptions import NotFoundError, ValidationError
 from app.core.logging import get_logger
-from app.models.driver_tree import (
-    DriverTree,
-    DriverTreeNode,
-    DriverTreeRelationship,
-    DriverTreeRelationshipChild,
-)
+from app.models.driver_tree import DriverTree, DriverTreeNode
 from app.repositories.driver_tree import (
     DriverTreeCategoryRepository,
     DriverTreeFormulaRepository,
@@ -25,6 +18,8 @@ from app.repositories.driver_tree import (
     DriverTreePolicyRepository,
     DriverTreeRepository,
 )
+from app.services.driver_tree.calculation_cache import tree_calculation_cache
+from app.services.driver_tree.tree_graph import TreeGraph
 
 logger = get_logger(__name__)
 
@@ -77,76 +72,55 @@ class DriverTreeServiceBase:
 
         return tree
 
+    async def _invalidate_calculation(self, tree_id: uuid.UUID) -> None:
+        """ツリー構造の変更に伴い、計算結果のキャッシュを無効化します。
+
+        Args:
+            tree_id: ツリーID
+        """
+        await self.tree_repository.increment_versions([tree_id], structure=True)
+        tree_calculation_cache.invalidate(tree_id)
+
     async def _build_tree_response(self, tree: DriverTree) -> dict[str, Any]:
         """ツリーレスポンスを構築します。
 
+        隣接関係とノードをそれぞれ1回のクエリで取得して構築します（TreeGraphを参照）。
+
         Args:
             tree: ツリーモデル
 
         Returns:
             dict[str, Any]: ツリーレスポンス
         """
-        # ツリーをリレーションシップ含めて再取得
-        result = await self.db.execute(
-            select(DriverTree)
-            .where(DriverTree.id == tree.id)
-            .options(
-                selectinload(DriverTree.root_node),
-                selectinload(DriverTree.relationships)
-                .selectinload(DriverTreeRelationship.children)
-                .selectinload(DriverTreeRelationshipChild.child_node),
-                selectinload(DriverTree.relationships).selectinload(DriverTreeRelationship.parent_node),
-            )
-        )
-        tree = result.scalar_one()
-
-        # ノード情報を収集
-        nodes = []
-        node_ids: set[uuid.UUID] = set()
-
-        # ルートノードを追加
-        if tree.root_node:
-            nodes.append(self._node_to_dict(tree.root_node))
-            node_ids.add(tree.root_node.id)
-
-        # リレーションシップからノードを収集
-        relationships = []
-        for rel in tree.relationships:
-            # 親ノード
-            if rel.parent_node and rel.parent_node.id not in node_ids:
-                nodes.append(self._node_to_dict(rel.parent_node))
-                node_ids.add(rel.parent_node.id)
-
-            # 子ノード
-            child_id_list = []
-            for child in rel.children:
-                child_id_list.append(child.child_node_id)
-                if child.child_node and child.child_node_id not in node_ids:
-                    nodes.append(self._node_to_dict(child.child_node))
-                    node_ids.add(child.child_node_id)
-
-            relationships.append(
-                {
-                    "parent_id": rel.parent_node_id,
-                    "operator": rel.operator,
-                    "child_id_list": child_id_list,
-                }
-            )
+        graph = TreeGraph.from_edges(await self.tree_repository.get_graph_edges(tree_id=tree.id))
+        root_ids = [tree.root_node_id] if tree.root_node_id else []
+        node_ids = list(dict.fromkeys([*root_ids, *graph.node_ids()]))
+        nodes = await self.node_repository.get_many(node_ids)
+        levels = graph.levels(tree.root_node_id) if tree.root_node_id else {}
+        root_node = nodes.get(tree.root_node_id) if tree.root_node_id else None
 
         return {
             "tree_id": tree.id,
-            "name": tree.root_node.label if tree.root_node else "",
+            "name": root_node.label if root_node else "",
             "description": "",
-            "root": self._node_to_dict(tree.root_node) if tree.root_node else None,
-            "nodes": nodes,
-            "relationship": relationships,
+            "root": self._node_to_dict(root_node, levels.get(root_node.id)) if root_node else None,
+            "nodes": [self._node_to_dict(nodes[node_id], levels.get(node_id)) for node_id in node_ids if node_id in nodes],
+            "relationship": [
+                {
+                    "parent_id": parent_id,
+                    "operator": graph.operators[parent_id],
+                    "child_id_list": list(child_ids),
+                }
+                for parent_id, child_ids in graph.children.items()
+            ],
         }
 
-    def _node_to_dict(self, node: DriverTreeNode) -> dict[str, Any]:
+    def _node_to_dict(self, node: DriverTreeNode, level: int | None = None) -> dict[str, Any]:
         """ノードを辞書形式に変換します。
 
         Args:
             node: ノードモデル
+            level: ルートノードからの階層
 
         Returns:
             dict[str, Any]: ノード辞書
@@ -157,6 +131,7 @@ class DriverTreeServiceBase:
             "node_type": node.node_type,
             "position_x": node.position_x or 0,
             "position_y": node.position_y or 0,
+            "level": level,
         }
 
     async def _validate_no_circular_reference(
@@ -168,6 +143,7 @@ class DriverTreeServiceBase:
 
         親ノードが子孫ノードに含まれていないかをチェックします。
         親→子→孫→親のような循環が発生する場合はValidationErrorを発生させます。
+        親ノードが属するツリーの隣接関係を1回のクエリで取得し、メモリ上でたどります。
 
         Args:
             parent_node_id: 親ノードID
@@ -187,39 +163,20 @@ class DriverTreeServiceBase:
             )
 
         # 子ノードの子孫をたどって親ノードが含まれていないかチェック
-        visited: set[uuid.UUID] = set()
-        to_check: list[uuid.UUID] = list(child_node_ids)
-
-        while to_check:
-            current_id = to_check.pop()
-            if current_id in visited:
-                continue
-            visited.add(current_id)
-
-            # このノードの子ノードを取得
-            result = await self.db.execute(
-                select(DriverTreeRelationshipChild.child_node_id)
-                .join(
-                    DriverTreeRelationship,
-                    DriverTreeRelationshipChild.relationship_id == DriverTreeRelationship.id,
-                )
-                .where(DriverTreeRelationship.parent_node_id == current_id)
+        graph = TreeGraph.from_edges(await self.tree_repository.get_graph_edges(node_id=parent_node_id))
+        path = graph.find_cycle(parent_node_id, child_node_ids)
+        if path is not None:
+            raise ValidationError(
+                "循環参照が検出されました: 親ノードが子孫ノードに存在します",
+                details={
+                    "parent_node_id": str(parent_node_id),
+                    "circular_path_via": str(path[-2]),
+                    "circular_path": [str(node_id) for node_id in path],
+                },
             )
-            descendant_ids = [row[0] for row in result.fetchall()]
-
-            for descendant_id in descendant_ids:
-                if descendant_id == parent_node_id:
-                    raise ValidationError(
-                        "循環参照が検出されました: 親ノードが子孫ノードに存在します",
-                        details={
-                            "parent_node_id": str(parent_node_id),
-                            "circular_path_via": str(current_id),
-                        },
-                    )
-                to_check.append(descendant_id)
 
         logger.debug(
             "循環参照チェック完了",
             parent_node_id=str(parent_node_id),
-            checked_nodes=len(visited),
+            checked_nodes=len(graph.children),
         )
@@ -3,15 +3,46 @@
 このモジュールは、ドライバーツリーの計算・出力機能を提供します。
 """
 
-import io
 import uuid
+from collections.abc import Iterator
+from itertools import chain, combinations
 from typing import Any
 
+import numpy as np
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
+from app.core.exceptions import NotFoundError, ValidationError
 from app.core.logging import get_logger
+from app.models.driver_tree import DriverTree, DriverTreeDataFrame
+from app.repositories.driver_tree import DriverTreeDataFrameRepository
+from app.services.driver_tree.calculation_cache import TreeCalculation, tree_calculation_cache
 from app.services.driver_tree.driver_tree.base import DriverTreeServiceBase
+from app.services.driver_tree.tabular_export import (
+    CSV_MEDIA_TYPE,
+    XLSX_MEDIA_TYPE,
+    ExportSheet,
+    sheet_titles,
+    stream_csv,
+    stream_xlsx,
+)
+from app.services.driver_tree.tree_evaluator import (
+    SUBJECT_COLUMN_NAME,
+    VALUE_COLUMN_NAME,
+    CompiledTree,
+    affected_steps,
+    bind_inputs,
+    bind_nodes,
+    build_rows,
+    compile_tree,
+    evaluate,
+    evaluate_scenarios,
+    iter_records,
+    output_order,
+    rebind_nodes,
+    to_calculated_data,
+)
 
 logger = get_logger(__name__)
 
@@ -26,6 +57,7 @@ class DriverTreeCalculationService(DriverTreeServiceBase):
             db: SQLAlchemyの非同期データベースセッション
         """
         super().__init__(db)
+        self.data_frame_repository = DriverTreeDataFrameRepository(db)
 
     async def get_tree_data(
         self,
@@ -35,6 +67,13 @@ class DriverTreeCalculationService(DriverTreeServiceBase):
     ) -> dict[str, Any]:
         """ツリー全体の計算を実行し結果を取得します。
 
+        ツリー構造をトポロジカル順の計算プランにコンパイルし、入力ノードをデータフレームの列、
+        定数ノードを数値に割り当てて、全ノードをメタデータ行（FY × 地域 × 対象 等）ごとに
+        NumPy配列として一括評価します（計算仕様はtree_evaluatorを参照）。
+
+        計算プランと計算結果はツリーのバージョン毎にキャッシュし（calculation_cacheを参照）、
+        ノードのデータのみ変更された場合は変更ノードとその祖先ノードのみ再計算します。
+
         Note:
             権限チェックはルーター層の ProjectMemberDep で行われます。
 
@@ -45,7 +84,9 @@ class DriverTreeCalculationService(DriverTreeServiceBase):
 
         Returns:
             dict[str, Any]: 計算結果
-                - calculated_data_list: list - 計算データ一覧
+                - calculated_data_list: list - 計算データ一覧（ルートノードが先頭）
+                    - columns: メタデータの列名 + "値"
+                    - records: 行毎の {列名: 値}（値が無い行はNone）
 
         Raises:
             NotFoundError: ツリーが見つからない場合
@@ -57,33 +98,264 @@ class DriverTreeCalculationService(DriverTreeServiceBase):
             user_id=str(user_id),
         )
 
-        await self._get_tree_with_validation(project_id, tree_id)
+        tree = await self._get_tree_with_validation(project_id, tree_id)
+        calculation = await self._calculate(tree)
+        calculated_data_list = to_calculated_data(calculation.plan, calculation.rows, calculation.values)
+
+        logger.info(
+            "ツリー計算を完了しました",
+            tree_id=str(tree_id),
+            node_count=len(calculated_data_list),
+            row_count=calculation.rows.count,
+        )
+
+        return {
+            "calculated_data_list": calculated_data_list,
+        }
+
+    async def _calculate(self, tree: DriverTree) -> TreeCalculation:
+        """ツリーを計算します（キャッシュ済みの計算プラン・計算結果を可能な限り再利用します）。
+
+        Args:
+            tree: ツリー
+
+        Returns:
+            TreeCalculation: 計算結果（キャッシュと共有するため変更しないこと）
+
+        Raises:
+            ValidationError: 計算エラー
+        """
+        versions = await self.tree_repository.get_versions(tree.id)
+        cached, changed_node_ids = tree_calculation_cache.get(tree.id, *versions)
+        if cached is not None and changed_node_ids is not None and not changed_node_ids:
+            return cached
+
+        calculation = None
+        if cached is not None and changed_node_ids:
+            calculation = await self._recalculate_changed_nodes(tree.id, versions, cached, changed_node_ids)
+        elif cached is not None:
+            # 計算プランを再利用し、全ノードのデータを再バインド
+            nodes = await self.tree_repository.get_calculation_nodes(tree.id, cached.plan.node_ids)
+            calculation = await self._evaluate(versions, rebind_nodes(cached.plan, nodes))
+        if calculation is None:
+            nodes, relationships = await self.tree_repository.get_calculation_graph(tree.id)
+            calculation = await self._evaluate(versions, compile_tree(nodes, relationships, tree.root_node_id))
+
+        tree_calculation_cache.put(tree.id, calculation)
+        return calculation
+
+    async def _evaluate(self, versions: tuple[int, int], plan: CompiledTree) -> TreeCalculation:
+        """計算プランの全ノードを評価します。"""
+        metadata_frames = await self._get_metadata_frames(plan)
+        rows = build_rows(metadata_frames, plan.inputs.values())
+        return TreeCalculation(
+            plan=plan,
+            rows=rows,
+            values=evaluate(plan, bind_inputs(plan, rows.count)),
+            structure_version=versions[0],
+            data_version=versions[1],
+        )
+
+    async def _recalculate_changed_nodes(
+        self,
+        tree_id: uuid.UUID,
+        versions: tuple[int, int],
+        cached: TreeCalculation,
+        changed_node_ids: frozenset[uuid.UUID],
+    ) -> TreeCalculation | None:
+        """変更ノードとその祖先ノードのみ再計算します。
+
+        変更ノードの入力データが別のシート・計算対象の行の外を参照する場合は
+        計算対象の行が変わるため、再計算せずNoneを返します。
+
+        Returns:
+            TreeCalculation | None: 計算結果（全ノードの評価が必要な場合はNone）
+        """
+        nodes = await self.tree_repository.get_calculation_nodes(tree_id, changed_node_ids)
+        if len(nodes) != len(changed_node_ids):
+            return None
+        plan = rebind_nodes(cached.plan, nodes)
+
+        file_ids = {frame.driver_tree_file_id for frame in plan.inputs.values()}
+        cached_file_ids = {frame.driver_tree_file_id for frame in cached.plan.inputs.values()}
+        index = plan.index
+        indexes = [index[node.id] for node in nodes]
+        changed_frames = [plan.inputs[i] for i in indexes if i in plan.inputs]
+        if file_ids != cached_file_ids or build_rows((), changed_frames).count > cached.rows.count:
+            return None
+
+        values = bind_nodes(plan, cached.values.copy(), indexes)
+        return TreeCalculation(
+            plan=plan,
+            rows=cached.rows,
+            values=evaluate(plan, values, affected_steps(plan, indexes)),
+            structure_version=versions[0],
+            data_version=versions[1],
+        )
+
+    async def _get_metadata_frames(self, plan: CompiledTree) -> list[DriverTreeDataFrame]:
+        """入力ノードに紐づくシートのメタデータ列（「科目」以外のデータフレーム）を取得します。
+
+        Raises:
+            ValidationError: 入力ノードのデータが複数のシートにまたがる場合
+        """
+        file_ids = {frame.driver_tree_file_id for frame in plan.inputs.values()}
+        if not file_ids:
+            return []
+        if len(file_ids) > 1:
+            raise ValidationError(
+                "入力ノードのデータは同じシートから選択してください",
+                details={"driver_tree_file_ids": sorted(str(file_id) for file_id in file_ids)},
+            )
+        frames = await self.data_frame_repository.list_by_file(file_ids.pop())
+        return [frame for frame in frames if frame.column_name != SUBJECT_COLUMN_NAME]
+
+    async def simulate_policies(
+        self,
+        project_id: uuid.UUID,
+        tree_id: uuid.UUID,
+        policy_id_list: list[uuid.UUID] | None,
+        scenario_list: list[list[uuid.UUID]] | None,
+        user_id: uuid.UUID,
+    ) -> dict[str, Any]:
+        """施策の組み合わせ毎のKPIへの効果をシミュレーションします。
 
-        # ツリー構造から計算データを構築
-        calculated_data_list = []
+        施策の値を対象ノードの全行に加算したシナリオを、シナリオ毎にツリーを評価せず
+        (シナリオ数, 行数) の配列として一括評価します（tree_evaluator.evaluate_scenariosを参照）。
+        KPIはルートノードの全行の合計値です。同じノードの施策を複数適用した場合は値を合算します。
 
-        # ノード情報をツリーレスポンスから取得
-        tree_response = await self._build_tree_response(await self._get_tree_with_validation(project_id, tree_id))
-        for node in tree_response.get("nodes", []):
-            calculated_data_list.append(
+        Note:
+            権限チェックはルーター層の ProjectMemberDep で行われます。
+
+        Args:
+            project_id: プロジェクトID
+            tree_id: ツリーID
+            policy_id_list: 対象の施策IDリスト（Noneの場合はツリーの全施策）
+            scenario_list: シナリオ毎に適用する施策IDリスト（Noneの場合は対象の施策の全ての組み合わせ）
+            user_id: ユーザーID
+
+        Returns:
+            dict[str, Any]: シミュレーション結果
+                - tree_id: uuid - ツリーID
+                - kpi_node_id: uuid - KPIノード（ルートノード）ID
+                - kpi_node_label: str - KPIノード名
+                - baseline_value: float | None - 施策適用前のKPI値
+                - scenarios: list[dict] - シナリオ結果（費用対効果の順）
+                - scenario_count: int - シナリオ数
+
+        Raises:
+            NotFoundError: ツリー・施策が見つからない場合
+            ValidationError: ルートノードが未設定、シナリオ数が上限を超える場合、または計算エラー
+        """
+        logger.info(
+            "施策シミュレーションを実行中",
+            tree_id=str(tree_id),
+            user_id=str(user_id),
+        )
+
+        tree = await self._get_tree_with_validation(project_id, tree_id)
+        calculation = await self._calculate(tree)
+        plan = calculation.plan
+        if plan.root_index is None:
+            raise ValidationError(
+                "ルートノードが設定されていないためシミュレーションできません",
+                details={"tree_id": str(tree_id)},
+            )
+
+        policies = {policy.id: policy for policy in await self.policy_repository.list_by_tree(tree.id)}
+        policy_ids = list(dict.fromkeys(policies if policy_id_list is None else policy_id_list))
+        if scenario_list is None:
+            scenario_count = 2 ** len(policy_ids) - 1
+        else:
+            scenario_count = len(scenario_list)
+            policy_ids = list(dict.fromkeys([*policy_ids, *chain.from_iterable(scenario_list)]))
+        unknown = [str(policy_id) for policy_id in policy_ids if policy_id not in policies]
+        if unknown:
+            raise NotFoundError(
+                "このツリーに施策が見つかりません",
+                details={"tree_id": str(tree_id), "policy_ids": unknown},
+            )
+        if scenario_count > settings.DRIVER_TREE_SIMULATION_MAX_SCENARIOS:
+            raise ValidationError(
+                "シナリオ数が上限を超えています。対象の施策を絞り込んでください",
+                details={"scenario_count": scenario_count, "max_scenarios": settings.DRIVER_TREE_SIMULATION_MAX_SCENARIOS},
+            )
+        scenarios = self._policy_combinations(policy_ids) if scenario_list is None else scenario_list
+
+        # シナリオ×施策の選択行列から、シナリオ×対象ノードの加算値を行列積で求める
+        position = {policy_id: j for j, policy_id in enumerate(policy_ids)}
+        selection = np.zeros((len(scenarios), len(policy_ids)))
+        for i, scenario in enumerate(scenarios):
+            selection[i, [position[policy_id] for policy_id in set(scenario)]] = 1.0
+        target_indexes = list(dict.fromkeys(plan.index[policies[policy_id].node_id] for policy_id in policy_ids))
+        assignment = np.zeros((len(policy_ids), len(target_indexes)))
+        for j, policy_id in enumerate(policy_ids):
+            assignment[j, target_indexes.index(plan.index[policies[policy_id].node_id])] = 1.0
+        policy_values = np.array([policies[policy_id].value for policy_id in policy_ids], dtype=float)
+        costs = np.array([policies[policy_id].cost or 0.0 for policy_id in policy_ids], dtype=float)
+        durations = np.array([policies[policy_id].duration_months or 0 for policy_id in policy_ids], dtype=int)
+
+        deltas = (selection * policy_values) @ assignment
+        kpi_rows = evaluate_scenarios(plan, calculation.values, target_indexes, deltas, plan.root_index)
+        baseline = self._sum_rows(calculation.values[plan.root_index][np.newaxis])[0]
+        kpi_values = self._sum_rows(kpi_rows)
+        total_costs = selection @ costs
+        duration_months = np.where(selection > 0, durations, 0).max(axis=1, initial=0)
+
+        results = []
+        for i, scenario in enumerate(scenarios):
+            kpi_value = kpi_values[i]
+            difference = None if kpi_value is None or baseline is None else kpi_value - baseline
+            results.append(
                 {
-                    "node_id": node["node_id"],
-                    "label": node["label"],
-                    "columns": [],
-                    "records": [],
+                    "policy_id_list": list(dict.fromkeys(scenario)),
+                    "kpi_value": kpi_value,
+                    "difference": difference,
+                    "difference_percent": difference / abs(baseline) * 100 if difference is not None and baseline else None,
+                    "total_cost": float(total_costs[i]),
+                    "duration_months": int(duration_months[i]) or None,
+                    "cost_effectiveness": difference / total_costs[i] if difference is not None and total_costs[i] > 0 else None,
                 }
             )
+        results.sort(
+            key=lambda result: (
+                result["cost_effectiveness"] is None,
+                -(result["cost_effectiveness"] or 0.0),
+                result["difference"] is None,
+                -(result["difference"] or 0.0),
+            )
+        )
+        for rank, result in enumerate(results, start=1):
+            result["rank"] = rank
 
         logger.info(
-            "ツリー計算を完了しました",
+            "施策シミュレーションを完了しました",
             tree_id=str(tree_id),
-            node_count=len(calculated_data_list),
+            policy_count=len(policy_ids),
+            scenario_count=len(results),
         )
 
         return {
-            "calculated_data_list": calculated_data_list,
+            "tree_id": tree.id,
+            "kpi_node_id": plan.node_ids[plan.root_index],
+            "kpi_node_label": plan.labels[plan.root_index],
+            "baseline_value": baseline,
+            "scenarios": results,
+            "scenario_count": len(results),
         }
 
+    @staticmethod
+    def _sum_rows(values: np.ndarray) -> list[float | None]:
+        """シナリオ毎に全行の値の合計を求めます（値が1行も無いシナリオはNone）。"""
+        totals = np.nansum(values, axis=1)
+        has_value = np.isfinite(values).any(axis=1)
+        return [float(total) if valid else None for total, valid in zip(totals.tolist(), has_value.tolist(), strict=True)]
+
+    @staticmethod
+    def _policy_combinations(policy_ids: list[uuid.UUID]) -> list[list[uuid.UUID]]:
+        """施策の全ての組み合わせ（空の組み合わせを除く）を列挙します。"""
+        return [list(scenario) for size in range(1, len(policy_ids) + 1) for scenario in combinations(policy_ids, size)]
+
     async def download_simulation_output(
         self,
         project_id: uuid.UUID,
@@ -93,7 +365,12 @@ class DriverTreeCalculationService(DriverTreeServiceBase):
     ) -> StreamingResponse:
         """シミュレーション結果をExcel/CSV形式でエクスポートします。
 
-        全ノードの計算結果を含みます。
+        全ノードの行毎の計算結果を含みます。ファイル全体をメモリ上に構築せず、
+        行を順に書き出してストリーミングします（tabular_exportを参照）。
+
+        出力形式:
+            - CSV: ノード×行毎に1行（node_id, label, メタデータの列..., value）
+            - Excel: 先頭にノード一覧のシート、続けて1ノード1シート（メタデータの列..., 値）
 
         Note:
             権限チェックはルーター層の ProjectMemberDep で行われます。
@@ -109,6 +386,7 @@ class DriverTreeCalculationService(DriverTreeServiceBase):
 
         Raises:
             NotFoundError: ツリーが見つからない場合
+            ValidationError: 計算エラー
         """
         logger.info(
             "シミュレーション結果をエクスポート中",
@@ -117,52 +395,55 @@ class DriverTreeCalculationService(DriverTreeServiceBase):
             user_id=str(user_id),
         )
 
-        await self._get_tree_with_validation(project_id, tree_id)
-
-        # 計算結果を取得
-        result = await self.get_tree_data(project_id, tree_id, user_id)
+        tree = await self._get_tree_with_validation(project_id, tree_id)
+        calculation = await self._calculate(tree)
 
         if format == "csv":
-            # CSV形式で出力
-            output = io.StringIO()
-            output.write("node_id,label,value\n")
-
-            for data in result.get("calculated_data_list", []):
-                output.write(f"{data['node_id']},{data['label']},\n")
-
-            content = output.getvalue().encode("utf-8-sig")
-            media_type = "text/csv"
+            content = stream_csv(["node_id", "label", *calculation.rows.columns, "value"], self._iter_csv_records(calculation))
+            media_type = CSV_MEDIA_TYPE
             filename = f"simulation_{tree_id}.csv"
         else:
-            # Excel形式で出力
-            import openpyxl
-
-            wb = openpyxl.Workbook()
-            ws = wb.active
-            if ws is not None:
-                ws.title = "シミュレーション結果"
-
-                # ヘッダー
-                ws.append(["ノードID", "ラベル", "値"])
-
-                # データ
-                for data in result.get("calculated_data_list", []):
-                    ws.append([str(data["node_id"]), data["label"], ""])
-
-            output_bytes = io.BytesIO()
-            wb.save(output_bytes)
-            content = output_bytes.getvalue()
-            media_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+            content = stream_xlsx(self._iter_sheets(calculation))
+            media_type = XLSX_MEDIA_TYPE
             filename = f"simulation_{tree_id}.xlsx"
 
         logger.info(
-            "シミュレーション結果をエクスポートしました",
+            "シミュレーション結果のエクスポートを開始しました",
             tree_id=str(tree_id),
             format=format,
+            node_count=calculation.plan.node_count,
+            row_count=calculation.rows.count,
         )
 
         return StreamingResponse(
-            io.BytesIO(content),
+            content,
             media_type=media_type,
             headers={"Content-Disposition": f'attachment; filename="{filename}"'},
         )
+
+    @staticmethod
+    def _iter_csv_records(calculation: TreeCalculation) -> Iterator[tuple[Any, ...]]:
+        """CSVに出力する行をノード×行毎に順に返します。"""
+        plan = calculation.plan
+        for i in output_order(plan):
+            for record in iter_records(calculation.rows, calculation.values, i):
+                yield (plan.node_ids[i], plan.labels[i], *record)
+
+    @classmethod
+    def _iter_sheets(cls, calculation: TreeCalculation) -> Iterator[ExportSheet]:
+        """Excelに出力するシート（ノード一覧、1ノード1シート）を順に返します。"""
+        plan = calculation.plan
+        order = output_order(plan)
+        titles = sheet_titles(["シミュレーション結果", *(plan.labels[i] for i in order)])
+        totals = cls._sum_rows(calculation.values)
+        yield ExportSheet(
+            title=titles[0],
+            columns=["ノードID", "ラベル", "シート名", "合計"],
+            rows=(
+                (str(plan.node_ids[i]), plan.labels[i], title, totals[i])
+                for i, title in zip(order, titles[1:], strict=True)
+            ),
+        )
+        columns = [*calculation.rows.columns, VALUE_COLUMN_NAME]
+        for i, title in zip(order, titles[1:], strict=True):
+            yield ExportSheet(title=title, columns=columns, rows=iter_records(calculation.rows, calculation.values, i))
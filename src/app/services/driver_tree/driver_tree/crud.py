@@ -18,6 +18,7 @@ from app.models.driver_tree import (
     DriverTreeRelationship,
     DriverTreeRelationshipChild,
 )
+from app.services.driver_tree.calculation_cache import tree_calculation_cache
 from app.services.driver_tree.driver_tree.base import DriverTreeServiceBase
 from app.services.driver_tree.formula_parser import FormulaParser
 
@@ -219,6 +220,7 @@ class DriverTreeCrudService(DriverTreeServiceBase):
         # 数式を解析してノードとリレーションシップを作成
         for formula in formulas:
             await self._parse_and_create_nodes(tree, formula, position_x, position_y)
+        await self._invalidate_calculation(tree.id)
 
         # ルートノードの位置を更新（root_node_idで存在確認し、リポジトリから取得）
         if tree.root_node_id:
@@ -359,6 +361,7 @@ class DriverTreeCrudService(DriverTreeServiceBase):
             await self.db.delete(relationship)
 
         await self.db.flush()
+        await self._invalidate_calculation(tree.id)
 
         reset_at = datetime.now(UTC)
 
@@ -415,6 +418,7 @@ class DriverTreeCrudService(DriverTreeServiceBase):
 
         # ツリーを削除（CASCADEで関連データも削除される）
         await self.tree_repository.delete(tree_id)
+        tree_calculation_cache.invalidate(tree_id)
 
         deleted_at = datetime.now(UTC)
 
@@ -14,8 +14,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.decorators import measure_performance, transactional
 from app.core.exceptions import NotFoundError
 from app.core.logging import get_logger
-from app.repositories.driver_tree import DriverTreeFileRepository
+from app.repositories.driver_tree import DriverTreeFileRepository, DriverTreeRepository
 from app.repositories.project import ProjectFileRepository
+from app.services.driver_tree.calculation_cache import tree_calculation_cache
 from app.services.storage import StorageService
 from app.services.storage.excel import get_excel_sheet_names
 from app.services.storage.validation import check_file_size, sanitize_filename, validate_excel_file
@@ -30,6 +31,7 @@ class FileOperationsMixin:
         db: データベースセッション
         file_repository: DriverTreeFileリポジトリ
         project_file_repository: ProjectFileリポジトリ
+        tree_repository: DriverTreeリポジトリ
         storage: ストレージサービス
         container: コンテナ名（service.pyで定義）
     """
@@ -37,6 +39,7 @@ class FileOperationsMixin:
     db: AsyncSession
     file_repository: DriverTreeFileRepository
     project_file_repository: ProjectFileRepository
+    tree_repository: DriverTreeRepository
     storage: StorageService
     container: str
 
@@ -209,6 +212,12 @@ class FileOperationsMixin:
             )
 
         # 4. DBレコードを削除（cascade deleteでDriverTreeFile、DriverTreeDataFrameも削除される）
+        #    シートのデータを参照するツリーの計算結果のキャッシュを無効化
+        sheets = await self.file_repository.list_by_project_file(file_id)
+        tree_ids = await self.tree_repository.list_ids_by_sheets([sheet.id for sheet in sheets])
+        versions = await self.tree_repository.increment_versions(tree_ids, structure=False)
+        for tree_id, data_version in versions.items():
+            tree_calculation_cache.record_changes_on_commit(self.db, tree_id, data_version)
         await self.project_file_repository.delete(file_id)
 
         logger.info(
@@ -11,7 +11,7 @@
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.repositories.driver_tree import DriverTreeDataFrameRepository, DriverTreeFileRepository
+from app.repositories.driver_tree import DriverTreeDataFrameRepository, DriverTreeFileRepository, DriverTreeRepository
 from app.repositories.project import ProjectFileRepository
 from app.services import storage as storage_module
 from app.services.storage import StorageService
@@ -48,5 +48,6 @@ class DriverTreeFileService(FileOperationsMixin, SheetOperationsMixin, ColumnCon
         self.file_repository = DriverTreeFileRepository(db)
         self.data_frame_repository = DriverTreeDataFrameRepository(db)
         self.project_file_repository = ProjectFileRepository(db)
+        self.tree_repository = DriverTreeRepository(db)
         # モジュール経由でアクセスすることでテスト時のモックが効くようにする
         self.storage: StorageService = storage if storage is not None else storage_module.get_storage_service()
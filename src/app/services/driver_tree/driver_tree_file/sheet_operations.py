@@ -14,8 +14,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.decorators import measure_performance, transactional
 from app.core.exceptions import NotFoundError
 from app.core.logging import get_logger
-from app.repositories.driver_tree import DriverTreeDataFrameRepository, DriverTreeFileRepository
+from app.repositories.driver_tree import DriverTreeDataFrameRepository, DriverTreeFileRepository, DriverTreeRepository
 from app.repositories.project import ProjectFileRepository
+from app.services.driver_tree.calculation_cache import tree_calculation_cache
 from app.services.storage import StorageService
 
 from .excel_parser import parse_driver_tree_excel
@@ -31,6 +32,7 @@ class SheetOperationsMixin:
         file_repository: DriverTreeFileリポジトリ
         data_frame_repository: DriverTreeDataFrameリポジトリ
         project_file_repository: ProjectFileリポジトリ
+        tree_repository: DriverTreeリポジトリ
         storage: ストレージサービス
         container: コンテナ名（service.pyで定義）
     """
@@ -39,6 +41,7 @@ class SheetOperationsMixin:
     file_repository: DriverTreeFileRepository
     data_frame_repository: DriverTreeDataFrameRepository
     project_file_repository: ProjectFileRepository
+    tree_repository: DriverTreeRepository
     storage: StorageService
     container: str
 
@@ -394,6 +397,7 @@ class SheetOperationsMixin:
         await self.file_repository.update(driver_tree_file, axis_config={})
 
         # 6. 関連するDriverTreeDataFrameを全削除
+        await self._invalidate_tree_calculations([sheet_id])
         data_frames = await self.data_frame_repository.list_by_file(sheet_id)
         for data_frame in data_frames:
             await self.data_frame_repository.delete(data_frame.id)
@@ -490,6 +494,7 @@ class SheetOperationsMixin:
             )
 
         # 6. 既存のDataFrameを全削除
+        await self._invalidate_tree_calculations([sheet_id])
         existing_data_frames = await self.data_frame_repository.list_by_file(sheet_id)
         for data_frame in existing_data_frames:
             await self.data_frame_repository.delete(data_frame.id)
@@ -526,6 +531,19 @@ class SheetOperationsMixin:
         result.update(await self.list_selected_sheets(project_id, user_id))
         return result
 
+    async def _invalidate_tree_calculations(self, sheet_ids: list[uuid.UUID]) -> None:
+        """シートのデータを参照するツリーの計算結果のキャッシュを無効化します。
+
+        データフレームの削除前に呼び出してください（削除後はノードとの紐づけが解除されるため）。
+
+        Args:
+            sheet_ids: シート（DriverTreeFile）IDのリスト
+        """
+        tree_ids = await self.tree_repository.list_ids_by_sheets(sheet_ids)
+        versions = await self.tree_repository.increment_versions(tree_ids, structure=False)
+        for tree_id, data_version in versions.items():
+            tree_calculation_cache.record_changes_on_commit(self.db, tree_id, data_version)
+
     @measure_performance
     async def get_sheet_detail(
         self,
@@ -3,8 +3,8 @@
 このモジュールは、ドライバーツリーノードのCRUD操作を提供します。
 """
 
-import io
 import uuid
+from collections.abc import Iterable
 from typing import Any
 
 from fastapi.responses import StreamingResponse
@@ -20,6 +20,7 @@ from app.models.driver_tree import (
     DriverTreeRelationshipChild,
 )
 from app.services.driver_tree.driver_tree_node.base import DriverTreeNodeServiceBase
+from app.services.driver_tree.tabular_export import CSV_MEDIA_TYPE, stream_csv
 
 logger = get_logger(__name__)
 
@@ -107,6 +108,7 @@ class DriverTreeNodeCrudService(DriverTreeNodeServiceBase):
             position_x=position_x,
             position_y=position_y,
         )
+        await self._invalidate_calculation(tree.id)
 
         logger.info(
             "ノードを作成しました",
@@ -295,6 +297,12 @@ class DriverTreeNodeCrudService(DriverTreeNodeServiceBase):
                 details={"node_id": str(node_id)},
             )
 
+        # 計算結果のキャッシュを無効化（座標のみの変更は計算に影響しない）
+        if operator is not None or children_id_list is not None:
+            await self._invalidate_calculation(tree.id)
+        elif "label" in update_data or "node_type" in update_data:
+            await self._invalidate_calculation(tree.id, [node_id])
+
         logger.info(
             "ノードを更新しました",
             node_id=str(node_id),
@@ -365,6 +373,7 @@ class DriverTreeNodeCrudService(DriverTreeNodeServiceBase):
 
         # ノードを削除
         await self.node_repository.delete(node_id)
+        await self._invalidate_calculation(tree.id)
 
         logger.info(
             "ノードを削除しました",
@@ -405,28 +414,23 @@ class DriverTreeNodeCrudService(DriverTreeNodeServiceBase):
 
         node = await self._get_node_with_validation(node_id)
 
-        # CSV形式で出力
-        output = io.StringIO()
-        output.write("node_id,label,node_type,value\n")
-
-        # 入力ノードのデータを出力
-        if node.node_type == "入力" and node.data_frame and node.data_frame.data:
-            raw_data = node.data_frame.data
-            for key, value in raw_data.items():
-                output.write(f"{node.id},{node.label},{node.node_type},{key}:{value}\n")
+        # 入力ノードのデータを行毎に出力（レスポンス送信時に読み出すため、ORM属性は先に取得しておく）
+        prefix = (node.id, node.label, node.node_type)
+        data = node.data_frame.data if node.node_type == "入力" and node.data_frame else None
+        if data:
+            records: Iterable[tuple[Any, ...]] = ((*prefix, f"{key}:{value}") for key, value in data.items())
         else:
-            output.write(f"{node.id},{node.label},{node.node_type},\n")
+            records = [(*prefix, None)]
 
-        content = output.getvalue().encode("utf-8-sig")
         filename = f"node_preview_{node_id}.csv"
 
         logger.info(
-            "ノードプレビューをダウンロードしました",
+            "ノードプレビューのダウンロードを開始しました",
             node_id=str(node_id),
         )
 
         return StreamingResponse(
-            io.BytesIO(content),
-            media_type="text/csv",
+            stream_csv(["node_id", "label", "node_type", "value"], records),
+            media_type=CSV_MEDIA_TYPE,
             headers={"Content-Disposition": f'attachment; filename="{filename}"'},
         )
@@ -61,7 +61,7 @@ class DriverTreeNodePolicyService(DriverTreeNodeServiceBase):
             user_id=str(user_id),
         )
 
-        await self._get_node_with_validation(node_id)
+        node = await self._get_node_with_validation(node_id)
 
         # 施策を作成
         await self.policy_repository.create(
@@ -69,6 +69,7 @@ class DriverTreeNodePolicyService(DriverTreeNodeServiceBase):
             label=name,
             value=value,
         )
+        await self._invalidate_calculation(node.driver_tree_id, [node_id])
 
         logger.info(
             "施策を作成しました",
@@ -149,7 +150,7 @@ class DriverTreeNodePolicyService(DriverTreeNodeServiceBase):
             user_id=str(user_id),
         )
 
-        await self._get_node_with_validation(node_id)
+        node = await self._get_node_with_validation(node_id)
 
         # 施策を取得
         policy = await self.policy_repository.get(policy_id)
@@ -174,6 +175,7 @@ class DriverTreeNodePolicyService(DriverTreeNodeServiceBase):
 
         if update_data:
             await self.policy_repository.update(policy, **update_data)
+            await self._invalidate_calculation(node.driver_tree_id, [node_id])
 
         logger.info(
             "施策を更新しました",
@@ -214,7 +216,7 @@ class DriverTreeNodePolicyService(DriverTreeNodeServiceBase):
             user_id=str(user_id),
         )
 
-        await self._get_node_with_validation(node_id)
+        node = await self._get_node_with_validation(node_id)
 
         # 施策を取得
         policy = await self.policy_repository.get(policy_id)
@@ -232,6 +234,7 @@ class DriverTreeNodePolicyService(DriverTreeNodeServiceBase):
 
         # 施策を削除
         await self.policy_repository.delete(policy_id)
+        await self._invalidate_calculation(node.driver_tree_id, [node_id])
 
         logger.info(
             "施策を削除しました",
@@ -0,0 +1,131 @@
+"""ドライバーツリーの表形式エクスポート。
+
+計算結果などの表データをCSV/Excel形式でストリーミング出力します。
+ファイル全体をメモリ上に構築せず、行をイテラブルから順に書き出して一定サイズ毎に送出するため、
+行数が増えてもメモリ使用量はほぼ一定です。
+
+出力形式:
+    - CSV: 行毎に書き出し、CHUNK_SIZE 毎に送出する（UTF-8 BOM付き）
+    - Excel: openpyxlの書き込み専用ブックでシート毎の行を一時ファイルに書き出し、
+      保存したファイルを CHUNK_SIZE 毎に送出する（1ノード1シート 等の複数シート）
+
+使用例:
+    >>> sheets = [ExportSheet(title="売上", columns=["FY", "値"], rows=iter([["2024", 100.0]]))]
+    >>> StreamingResponse(stream_xlsx(sheets), media_type=XLSX_MEDIA_TYPE)
+"""
+
+import asyncio
+import csv
+import io
+import re
+import tempfile
+from collections.abc import AsyncIterator, Iterable, Sequence
+from dataclasses import dataclass
+from typing import IO, Any
+
+CSV_MEDIA_TYPE = "text/csv"
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# 1回に送出するサイズ（CSVは文字数、Excelはバイト数）
+CHUNK_SIZE = 64 * 1024
+
+# Excelのシート名の制約（31文字以内、[]:*?/\ は使用不可）
+_SHEET_TITLE_MAX_LENGTH = 31
+_INVALID_SHEET_TITLE_CHARS = re.compile(r"[\[\]:*?/\\]")
+
+
+@dataclass(frozen=True)
+class ExportSheet:
+    """Excelに出力するシート。
+
+    Attributes:
+        title: シート名（Excelで使用できない文字・長さは出力時に補正します）
+        columns: 列名
+        rows: 行のイテラブル（出力時に1度だけ順に読み出します）
+    """
+
+    title: str
+    columns: Sequence[str]
+    rows: Iterable[Sequence[Any]]
+
+
+async def stream_csv(columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> AsyncIterator[bytes]:
+    """CSVを行毎に書き出し、一定サイズ毎に送出します。
+
+    Args:
+        columns: 列名
+        rows: 行のイテラブル
+
+    Yields:
+        bytes: CSVの断片（先頭にUTF-8 BOMを含む）
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    buffer.write("\ufeff")
+    writer.writerow(columns)
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= CHUNK_SIZE:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+async def stream_xlsx(sheets: Iterable[ExportSheet]) -> AsyncIterator[bytes]:
+    """複数シートのExcelファイルを書き込み専用ブックで作成し、一定サイズ毎に送出します。
+
+    ブックの作成はスレッドで行うため、シートの行はDBアクセスを伴わないイテラブルにしてください。
+
+    Args:
+        sheets: 出力するシート（この順に作成します）
+
+    Yields:
+        bytes: Excelファイルの断片
+    """
+    with tempfile.TemporaryFile() as file:
+        await asyncio.to_thread(_write_workbook, sheets, file)
+        file.seek(0)
+        while chunk := await asyncio.to_thread(file.read, CHUNK_SIZE):
+            yield chunk
+
+
+def sheet_titles(titles: Iterable[str]) -> list[str]:
+    """Excelで使用できるシート名に補正します（使用できない文字の置換、長さの制限、重複の解消）。
+
+    Args:
+        titles: シート名の候補
+
+    Returns:
+        list[str]: 補正後のシート名（titles と同じ順）
+    """
+    result: list[str] = []
+    used: set[str] = set()
+    for title in titles:
+        base = _INVALID_SHEET_TITLE_CHARS.sub("_", title).strip("'")[:_SHEET_TITLE_MAX_LENGTH] or "Sheet"
+        candidate = base
+        suffix = 2
+        while candidate.lower() in used:
+            marker = f"({suffix})"
+            candidate = base[: _SHEET_TITLE_MAX_LENGTH - len(marker)] + marker
+            suffix += 1
+        used.add(candidate.lower())
+        result.append(candidate)
+    return result
+
+
+def _write_workbook(sheets: Iterable[ExportSheet], file: IO[bytes]) -> None:
+    """書き込み専用ブックにシートを順に書き出し、ファイルに保存します。"""
+    import openpyxl
+
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet_list = list(sheets)
+    for sheet, title in zip(sheet_list, sheet_titles(sheet.title for sheet in sheet_list), strict=True):
+        worksheet = workbook.create_sheet(title=title)
+        worksheet.append(list(sheet.columns))
+        for row in sheet.rows:
+            worksheet.append(list(row))
+    if not sheet_list:
+        workbook.create_sheet()
+    workbook.save(file)
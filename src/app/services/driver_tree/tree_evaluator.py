@@ -0,0 +1,531 @@
+"""ドライバーツリー計算エンジン。
+
+このモジュールは、ドライバーツリーのノードとリレーションシップを計算プランにコンパイルし、
+全ノードをメタデータ行（FY × 地域 × 対象 等）ごとのNumPy配列として一括評価する機能を提供します。
+
+計算仕様:
+    - 入力ノード: 紐づくDriverTreeDataFrameの値
+      （「科目」列の場合はノードラベルと同名の科目の値、それ以外の列は列の値）
+    - 定数ノード: ノードラベルを数値として解釈した値（全行で同じ値）
+    - 計算ノード: 子ノードの値をorder_index順に演算子で畳み込んだ値
+        - "+": 合計、"-": 先頭 - 残りの合計、"*": 積、"/": 先頭 / 残りの積
+        - 演算子なし: 先頭の子ノードの値
+    - 子ノードを持つノードはノードタイプに関わらず子ノードから計算します
+    - 値が無い行（データ未設定、0除算等）はNaNとして伝播し、出力ではNoneとします
+
+使用例:
+    >>> plan = compile_tree(nodes, relationships)
+    >>> rows = build_rows(metadata_frames)
+    >>> values = evaluate(plan, bind_inputs(plan, rows.count))
+    >>> calculated_data_list = to_calculated_data(plan, rows, values)
+
+    変更されたノードのみ再計算する場合:
+    >>> plan = rebind_nodes(plan, changed_nodes)
+    >>> indexes = [plan.index[node.id] for node in changed_nodes]
+    >>> values = bind_nodes(plan, values.copy(), indexes)
+    >>> values = evaluate(plan, values, affected_steps(plan, indexes))
+
+    施策（ノードへの加算値）のシナリオを一括評価する場合:
+    >>> kpi = evaluate_scenarios(plan, values, target_indexes, deltas, plan.root_index)
+"""
+
+import uuid
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass, field, replace
+from typing import Any
+
+import numpy as np
+
+from app.core.exceptions import ValidationError
+from app.models.driver_tree import DriverTreeDataFrame, DriverTreeNode, DriverTreeRelationship
+
+# 「科目」列のデータフレーム名（データは {科目名: {行番号: 値}} 形式）
+SUBJECT_COLUMN_NAME = "科目"
+
+# 計算結果の値の列名
+VALUE_COLUMN_NAME = "値"
+
+SUPPORTED_OPERATORS = ("+", "-", "*", "/")
+
+
+@dataclass(frozen=True, eq=False)
+class CalculationStep:
+    """計算ノード1つ分の計算手順。
+
+    Attributes:
+        node_index: 計算結果を格納するノードの位置
+        operator: 演算子（+, -, *, / のいずれか、または None）
+        child_indexes: 子ノードの位置（order_index順）
+    """
+
+    node_index: int
+    operator: str | None
+    child_indexes: np.ndarray
+
+
+@dataclass(frozen=True, eq=False)
+class CompiledTree:
+    """コンパイル済みの計算プラン。
+
+    ノードは位置（インデックス）で参照し、計算手順は子ノードが親ノードより先になる
+    トポロジカル順に並んでいます。
+
+    Attributes:
+        node_ids: ノードID（位置順）
+        labels: ノードラベル（位置順）
+        root_index: ルートノードの位置（ルートノードが無い場合はNone）
+        steps: 計算手順（トポロジカル順）
+        constants: 定数ノードの位置と値
+        inputs: 入力ノードの位置と紐づくデータフレーム
+        parents: ノード毎の親ノードの位置（位置順）
+    """
+
+    node_ids: tuple[uuid.UUID, ...]
+    labels: tuple[str, ...]
+    root_index: int | None
+    steps: tuple[CalculationStep, ...]
+    constants: dict[int, float] = field(default_factory=dict)
+    inputs: dict[int, DriverTreeDataFrame] = field(default_factory=dict)
+    parents: tuple[tuple[int, ...], ...] = ()
+
+    @property
+    def node_count(self) -> int:
+        """ノード数。"""
+        return len(self.node_ids)
+
+    @property
+    def index(self) -> dict[uuid.UUID, int]:
+        """ノードIDと位置の対応。"""
+        return {node_id: i for i, node_id in enumerate(self.node_ids)}
+
+    @property
+    def computed_indexes(self) -> frozenset[int]:
+        """計算ノード（子ノードを持つノード）の位置。"""
+        return frozenset(step.node_index for step in self.steps)
+
+
+@dataclass(frozen=True)
+class TreeRows:
+    """計算対象の行（メタデータの組み合わせ）。
+
+    Attributes:
+        columns: メタデータの列名（FY、地域、対象 等）
+        values: 列毎の行の値（columns と同じ順）
+        count: 行数
+    """
+
+    columns: tuple[str, ...]
+    values: tuple[list[str | None], ...]
+    count: int
+
+
+def compile_tree(
+    nodes: Sequence[DriverTreeNode],
+    relationships: Iterable[DriverTreeRelationship],
+    root_node_id: uuid.UUID | None = None,
+) -> CompiledTree:
+    """ツリー構造を計算プランにコンパイルします。
+
+    Args:
+        nodes: ツリーの全ノード（data_frameをロード済み）
+        relationships: ツリーの全リレーションシップ（childrenをロード済み）
+        root_node_id: ルートノードID
+
+    Returns:
+        CompiledTree: 計算プラン
+
+    Raises:
+        ValidationError: 演算子・定数が不正、ツリー外のノードを参照、または循環参照がある場合
+    """
+    index = {node.id: i for i, node in enumerate(nodes)}
+
+    # 親ノード毎の子ノード（order_index順）
+    children_by_parent: dict[int, tuple[str | None, list[int]]] = {}
+    for rel in relationships:
+        if rel.operator is not None and rel.operator not in SUPPORTED_OPERATORS:
+            raise ValidationError(
+                "サポートされていない演算子です",
+                details={"parent_node_id": str(rel.parent_node_id), "operator": rel.operator},
+            )
+        parent = index.get(rel.parent_node_id)
+        child_ids = [child.child_node_id for child in sorted(rel.children, key=lambda child: child.order_index)]
+        missing = [str(child_id) for child_id in [rel.parent_node_id, *child_ids] if child_id not in index]
+        if parent is None or missing:
+            raise ValidationError(
+                "ツリーに存在しないノードが参照されています",
+                details={"node_ids": missing},
+            )
+        if not child_ids:
+            continue
+        if parent in children_by_parent:
+            raise ValidationError(
+                "1つのノードに複数のリレーションシップが設定されています",
+                details={"parent_node_id": str(rel.parent_node_id)},
+            )
+        children_by_parent[parent] = (rel.operator, [index[child_id] for child_id in child_ids])
+
+    # 入力・定数ノードのバインド
+    constants: dict[int, float] = {}
+    inputs: dict[int, DriverTreeDataFrame] = {}
+    for i, node in enumerate(nodes):
+        if i not in children_by_parent:
+            _bind_node(node, i, constants, inputs)
+
+    parents: list[list[int]] = [[] for _ in nodes]
+    for parent, (_, children) in children_by_parent.items():
+        for child in dict.fromkeys(children):
+            parents[child].append(parent)
+
+    return CompiledTree(
+        node_ids=tuple(node.id for node in nodes),
+        labels=tuple(node.label for node in nodes),
+        root_index=index.get(root_node_id) if root_node_id is not None else None,
+        steps=_topological_steps(nodes, children_by_parent),
+        constants=constants,
+        inputs=inputs,
+        parents=tuple(tuple(node_parents) for node_parents in parents),
+    )
+
+
+def rebind_nodes(plan: CompiledTree, nodes: Iterable[DriverTreeNode]) -> CompiledTree:
+    """ノードのラベル・タイプ・データフレームの変更を計算プランに反映します。
+
+    ツリー構造（リレーションシップ）は変更しません。元の計算プランは変更せず、新しい計算プランを返します。
+
+    Args:
+        plan: 計算プラン
+        nodes: 変更されたノード（data_frameをロード済み、計算プランに含まれるノード）
+
+    Returns:
+        CompiledTree: 変更を反映した計算プラン
+
+    Raises:
+        ValidationError: 定数ノードのラベルが不正、または計算プランに無いノードの場合
+    """
+    index = plan.index
+    computed = plan.computed_indexes
+    labels = list(plan.labels)
+    constants = dict(plan.constants)
+    inputs = dict(plan.inputs)
+    for node in nodes:
+        i = index.get(node.id)
+        if i is None:
+            raise ValidationError(
+                "ツリーに存在しないノードが参照されています",
+                details={"node_ids": [str(node.id)]},
+            )
+        labels[i] = node.label
+        constants.pop(i, None)
+        inputs.pop(i, None)
+        if i not in computed:
+            _bind_node(node, i, constants, inputs)
+    return replace(plan, labels=tuple(labels), constants=constants, inputs=inputs)
+
+
+def _bind_node(
+    node: DriverTreeNode,
+    i: int,
+    constants: dict[int, float],
+    inputs: dict[int, DriverTreeDataFrame],
+) -> None:
+    """子ノードを持たないノードを定数・入力として割り当てます。
+
+    Raises:
+        ValidationError: 定数ノードのラベルを数値として解釈できない場合
+    """
+    if node.node_type == "定数":
+        try:
+            constants[i] = float(node.label)
+        except ValueError as err:
+            raise ValidationError(
+                "定数ノードのラベルを数値として解釈できません",
+                details={"node_id": str(node.id), "label": node.label},
+            ) from err
+    elif node.node_type == "入力" and node.data_frame is not None:
+        inputs[i] = node.data_frame
+
+
+def _topological_steps(
+    nodes: Sequence[DriverTreeNode],
+    children_by_parent: dict[int, tuple[str | None, list[int]]],
+) -> tuple[CalculationStep, ...]:
+    """計算ノードを子ノードが先になる順に並べます（Kahnのアルゴリズム）。
+
+    Raises:
+        ValidationError: 循環参照がある場合
+    """
+    pending = {parent: len(set(children)) for parent, (_, children) in children_by_parent.items()}
+    parents_of: dict[int, list[int]] = {}
+    for parent, (_, children) in children_by_parent.items():
+        for child in set(children):
+            parents_of.setdefault(child, []).append(parent)
+
+    # 計算ノード以外（葉）から順に解決
+    ready = [i for i in range(len(nodes)) if i not in children_by_parent]
+    steps: list[CalculationStep] = []
+    while ready:
+        resolved = ready.pop()
+        if resolved in children_by_parent:
+            operator, children = children_by_parent[resolved]
+            steps.append(CalculationStep(resolved, operator, np.asarray(children, dtype=np.intp)))
+        for parent in parents_of.get(resolved, []):
+            pending[parent] -= 1
+            if pending[parent] == 0:
+                ready.append(parent)
+
+    if len(steps) < len(children_by_parent):
+        cyclic = [str(nodes[parent].id) for parent, count in pending.items() if count > 0]
+        raise ValidationError(
+            "循環参照が検出されました: ツリーを計算できません",
+            details={"node_ids": cyclic},
+        )
+    return tuple(steps)
+
+
+def build_rows(metadata_frames: Sequence[DriverTreeDataFrame], inputs: Iterable[DriverTreeDataFrame] = ()) -> TreeRows:
+    """メタデータ列から計算対象の行を構築します。
+
+    行数はメタデータ列と入力データの行番号の最大値から決まります。
+    データが無い場合（入力ノードが未設定のツリー）は1行として計算します。
+
+    Args:
+        metadata_frames: シートのメタデータ列（「科目」以外のデータフレーム）
+        inputs: 入力ノードに紐づくデータフレーム
+
+    Returns:
+        TreeRows: 計算対象の行
+    """
+    count = 0
+    for frame in [*metadata_frames, *inputs]:
+        for key in _iter_row_keys(frame):
+            count = max(count, key + 1)
+
+    if count == 0:
+        return TreeRows(columns=(), values=(), count=1)
+
+    columns: list[str] = []
+    values: list[list[str | None]] = []
+    for frame in metadata_frames:
+        column: list[str | None] = [None] * count
+        for key, value in (frame.data or {}).items():
+            column[int(key)] = None if value is None else str(value)
+        columns.append(frame.column_name)
+        values.append(column)
+    return TreeRows(columns=tuple(columns), values=tuple(values), count=count)
+
+
+def _iter_row_keys(frame: DriverTreeDataFrame) -> Iterable[int]:
+    """データフレームの行番号を列挙します。"""
+    data = frame.data or {}
+    if frame.column_name == SUBJECT_COLUMN_NAME:
+        for series in data.values():
+            if isinstance(series, dict):
+                yield from (int(key) for key in series)
+    else:
+        yield from (int(key) for key in data)
+
+
+def bind_inputs(plan: CompiledTree, row_count: int) -> np.ndarray:
+    """入力・定数ノードの値を格納した評価用の配列を作成します。
+
+    Args:
+        plan: 計算プラン
+        row_count: 行数
+
+    Returns:
+        np.ndarray: (ノード数, 行数) の配列（入力・定数ノード以外はNaN）
+    """
+    values = np.full((plan.node_count, row_count), np.nan)
+    return bind_nodes(plan, values, [*plan.constants, *plan.inputs])
+
+
+def bind_nodes(plan: CompiledTree, values: np.ndarray, indexes: Iterable[int]) -> np.ndarray:
+    """指定したノードの行を入力・定数ノードの値で上書きします（それ以外のノードはNaN）。
+
+    Args:
+        plan: 計算プラン
+        values: 評価用の配列（指定したノードの行を上書きします）
+        indexes: ノードの位置
+
+    Returns:
+        np.ndarray: 上書き後の配列（valuesと同じオブジェクト）
+    """
+    row_count = values.shape[1]
+    for i in indexes:
+        values[i] = np.nan
+        if i in plan.constants:
+            values[i] = plan.constants[i]
+            continue
+        frame = plan.inputs.get(i)
+        if frame is None:
+            continue
+        data = frame.data or {}
+        series = data.get(plan.labels[i]) if frame.column_name == SUBJECT_COLUMN_NAME else data
+        if not isinstance(series, dict):
+            continue
+        for key, value in series.items():
+            row = int(key)
+            if row < row_count:
+                values[i, row] = _to_float(value)
+    return values
+
+
+def _to_float(value: Any) -> float:
+    """値を数値に変換します（変換できない場合はNaN）。"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def affected_steps(plan: CompiledTree, indexes: Iterable[int]) -> tuple[CalculationStep, ...]:
+    """指定したノードとその祖先ノードの計算手順を取得します（変更ノードの再計算用）。
+
+    Args:
+        plan: 計算プラン
+        indexes: 変更されたノードの位置
+
+    Returns:
+        tuple[CalculationStep, ...]: 再計算が必要な計算手順（トポロジカル順）
+    """
+    affected: set[int] = set()
+    pending = list(indexes)
+    while pending:
+        i = pending.pop()
+        if i in affected:
+            continue
+        affected.add(i)
+        pending.extend(plan.parents[i])
+    return tuple(step for step in plan.steps if step.node_index in affected)
+
+
+def evaluate(plan: CompiledTree, values: np.ndarray, steps: Iterable[CalculationStep] | None = None) -> np.ndarray:
+    """計算プランに従って計算ノードを評価します。
+
+    Args:
+        plan: 計算プラン
+        values: bind_inputs()で作成した配列（計算ノードの行を上書きします）
+        steps: 評価する計算手順（トポロジカル順、省略時は全計算ノード）
+
+    Returns:
+        np.ndarray: (ノード数, 行数) の計算結果（値が無い行はNaN）
+    """
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        for step in plan.steps if steps is None else steps:
+            values[step.node_index] = _apply_operator(step.operator, values[step.child_indexes])
+    values[~np.isfinite(values)] = np.nan
+    return values
+
+
+def evaluate_scenarios(
+    plan: CompiledTree,
+    values: np.ndarray,
+    target_indexes: Sequence[int],
+    deltas: np.ndarray,
+    output_index: int,
+) -> np.ndarray:
+    """ノードの値に加算するシナリオを一括で評価します（施策シミュレーション用）。
+
+    シナリオ毎にツリーを評価するのではなく、対象ノードとその祖先ノードのみを
+    (シナリオ数, 行数) の配列として計算手順毎に一括評価します。
+    対象ノードが計算ノードの場合は、子ノードから計算した値に加算します。
+
+    Args:
+        plan: 計算プラン
+        values: evaluate()の計算結果（変更しません）
+        target_indexes: 加算対象のノードの位置（重複なし）
+        deltas: (シナリオ数, 対象ノード数) のノード毎の加算値
+        output_index: 結果を取得するノードの位置
+
+    Returns:
+        np.ndarray: (シナリオ数, 行数) の出力ノードの計算結果（値が無い行はNaN）
+    """
+    scenario_count = deltas.shape[0]
+    row_count = values.shape[1]
+    target_deltas = {i: deltas[:, j, np.newaxis] for j, i in enumerate(target_indexes)}
+    steps = affected_steps(plan, target_indexes)
+
+    # 対象ノード・祖先ノードのシナリオ毎の値（それ以外のノードは全シナリオで共通）
+    scenario_values: dict[int, np.ndarray] = {}
+
+    def node_values(i: int) -> np.ndarray:
+        if i in scenario_values:
+            return scenario_values[i]
+        return np.broadcast_to(values[i], (scenario_count, row_count))
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        computed = plan.computed_indexes
+        for i, delta in target_deltas.items():
+            if i not in computed:
+                scenario_values[i] = values[i] + delta
+        for step in steps:
+            result = _apply_operator(step.operator, np.stack([node_values(child) for child in step.child_indexes]))
+            if step.node_index in target_deltas:
+                result = result + target_deltas[step.node_index]
+            scenario_values[step.node_index] = result
+
+    output = np.array(node_values(output_index), dtype=float)
+    output[~np.isfinite(output)] = np.nan
+    return output
+
+
+def _apply_operator(operator: str | None, children: np.ndarray) -> np.ndarray:
+    """子ノードの値（先頭の軸が子ノード）を演算子で畳み込みます。"""
+    if operator == "+":
+        return children.sum(axis=0)
+    if operator == "-":
+        return children[0] - children[1:].sum(axis=0)
+    if operator == "*":
+        return children.prod(axis=0)
+    if operator == "/":
+        return children[0] / children[1:].prod(axis=0)
+    return children[0]
+
+
+def to_calculated_data(plan: CompiledTree, rows: TreeRows, values: np.ndarray) -> list[dict[str, Any]]:
+    """計算結果をノード毎の列・レコード形式に変換します。
+
+    ルートノードを先頭に、その他のノードはノードの順に並べます。
+
+    Args:
+        plan: 計算プラン
+        rows: 計算対象の行
+        values: evaluate()の計算結果
+
+    Returns:
+        list[dict[str, Any]]: ノード毎の計算データ（node_id, label, columns, records）
+    """
+    columns = [*rows.columns, VALUE_COLUMN_NAME]
+    return [
+        {
+            "node_id": plan.node_ids[i],
+            "label": plan.labels[i],
+            "columns": columns,
+            "records": [dict(zip(columns, record, strict=True)) for record in iter_records(rows, values, i)],
+        }
+        for i in output_order(plan)
+    ]
+
+
+def output_order(plan: CompiledTree) -> list[int]:
+    """出力するノードの位置をルートノードを先頭に、その他のノードはノードの順に並べます。"""
+    order = list(range(plan.node_count))
+    if plan.root_index is not None:
+        order.remove(plan.root_index)
+        order.insert(0, plan.root_index)
+    return order
+
+
+def iter_records(rows: TreeRows, values: np.ndarray, index: int) -> Iterator[tuple[Any, ...]]:
+    """ノードの計算結果を行毎に (メタデータの値..., 値) として順に返します（値が無い行はNone）。
+
+    Args:
+        rows: 計算対象の行
+        values: evaluate()の計算結果
+        index: ノードの位置
+
+    Yields:
+        tuple[Any, ...]: rows.columns の順のメタデータの値と計算結果
+    """
+    node_values = (None if np.isnan(value) else value for value in values[index].tolist())
+    yield from zip(*rows.values, node_values, strict=True)
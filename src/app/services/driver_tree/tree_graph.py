@@ -0,0 +1,138 @@
+"""ドライバーツリーのグラフ索引。
+
+ツリーの隣接関係（リレーションシップと子ノード）を1回のクエリで読み込み、
+親ノードID → 子ノードIDの配列 の索引としてメモリ上に保持します。
+循環参照チェック、ツリーレスポンスの構築、階層（レベル）の算出、部分木の取得に使用し、
+ノードを1つたどる毎にクエリを発行しないようにします。
+
+使用例:
+    >>> graph = TreeGraph.from_edges(await tree_repository.get_graph_edges(tree_id=tree.id))
+    >>> path = graph.find_cycle(parent_node_id, child_node_ids)
+    >>> levels = graph.levels(tree.root_node_id)
+    >>> subtree = graph.subtree(node_id)
+"""
+
+import uuid
+from collections import deque
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class TreeGraph:
+    """ツリーの隣接関係の索引。
+
+    Attributes:
+        children: 親ノードID → 子ノードID（order_index順、リレーションシップの作成順）
+        operators: 親ノードID → 演算子
+    """
+
+    children: dict[uuid.UUID, tuple[uuid.UUID, ...]]
+    operators: dict[uuid.UUID, str | None]
+
+    @classmethod
+    def from_edges(cls, edges: Iterable[tuple[uuid.UUID, str | None, uuid.UUID | None]]) -> "TreeGraph":
+        """隣接関係の行から索引を構築します。
+
+        Args:
+            edges: (親ノードID, 演算子, 子ノードID) の行（DriverTreeRepository.get_graph_edgesを参照）
+
+        Returns:
+            TreeGraph: グラフ索引
+        """
+        children: dict[uuid.UUID, list[uuid.UUID]] = {}
+        operators: dict[uuid.UUID, str | None] = {}
+        for parent_id, operator, child_id in edges:
+            child_ids = children.setdefault(parent_id, [])
+            operators.setdefault(parent_id, operator)
+            if child_id is not None:
+                child_ids.append(child_id)
+        return cls(
+            children={parent_id: tuple(child_ids) for parent_id, child_ids in children.items()},
+            operators=operators,
+        )
+
+    def node_ids(self) -> list[uuid.UUID]:
+        """リレーションシップに含まれるノードIDを、親ノード・子ノードの順に重複なく返します。"""
+        return list(dict.fromkeys(node_id for parent_id, child_ids in self.children.items() for node_id in (parent_id, *child_ids)))
+
+    def subtree(self, node_id: uuid.UUID) -> list[uuid.UUID]:
+        """ノードとその子孫ノードのIDを深さ優先（子ノードはorder_index順）で重複なく返します。
+
+        Args:
+            node_id: 部分木のルートとするノードID
+
+        Returns:
+            list[uuid.UUID]: 部分木のノードID（先頭は node_id）
+        """
+        visited: dict[uuid.UUID, None] = {}
+        stack = [node_id]
+        while stack:
+            current_id = stack.pop()
+            if current_id in visited:
+                continue
+            visited[current_id] = None
+            stack.extend(reversed(self.children.get(current_id, ())))
+        return list(visited)
+
+    def find_cycle(self, parent_node_id: uuid.UUID, child_node_ids: Iterable[uuid.UUID]) -> list[uuid.UUID] | None:
+        """親ノードに子ノードを設定した場合に循環参照になる経路を探します。
+
+        子ノードのいずれかから既存のリレーションシップをたどって親ノードに到達する場合に循環参照になります。
+
+        Args:
+            parent_node_id: 親ノードID
+            child_node_ids: 設定する子ノードID
+
+        Returns:
+            list[uuid.UUID] | None: 子ノードから親ノードまでの経路（循環参照にならない場合はNone）
+        """
+        previous: dict[uuid.UUID, uuid.UUID | None] = {}
+        stack: list[uuid.UUID] = []
+        for child_id in child_node_ids:
+            if child_id not in previous:
+                previous[child_id] = None
+                stack.append(child_id)
+
+        while stack:
+            current_id = stack.pop()
+            if current_id == parent_node_id:
+                path = [current_id]
+                while (prev_id := previous[path[-1]]) is not None:
+                    path.append(prev_id)
+                return path[::-1]
+            for next_id in self.children.get(current_id, ()):
+                if next_id not in previous:
+                    previous[next_id] = current_id
+                    stack.append(next_id)
+        return None
+
+    def levels(self, root_node_id: uuid.UUID) -> dict[uuid.UUID, int]:
+        """ルートノードから到達できるノードの階層（ルートノードを0とする最長の経路の長さ）を求めます。
+
+        複数の親ノードを持つノードは最も深い親ノードの次の階層になるため、
+        階層順に配置すると親ノードは常に子ノードより上位の階層になります。
+        循環参照に含まれるノード（とその子孫ノード）には階層を割り当てません。
+
+        Args:
+            root_node_id: ルートノードID
+
+        Returns:
+            dict[uuid.UUID, int]: ノードID → 階層
+        """
+        reachable = self.subtree(root_node_id)
+        in_degree = dict.fromkeys(reachable, 0)
+        for node_id in reachable:
+            for child_id in self.children.get(node_id, ()):
+                in_degree[child_id] += 1
+
+        levels = {root_node_id: 0}
+        queue = deque([root_node_id]) if in_degree[root_node_id] == 0 else deque()
+        while queue:
+            node_id = queue.popleft()
+            for child_id in self.children.get(node_id, ()):
+                levels[child_id] = max(levels.get(child_id, 0), levels[node_id] + 1)
+                in_degree[child_id] -= 1
+                if in_degree[child_id] == 0:
+                    queue.append(child_id)
+        return {node_id: levels[node_id] for node_id in reachable if in_degree[node_id] == 0}
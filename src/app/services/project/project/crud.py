@@ -12,6 +12,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.decorators import measure_performance, transactional
 from app.core.exceptions import AuthorizationError, NotFoundError, ValidationError
 from app.core.logging import get_logger
+from app.core.principal_cache import principal_cache
 from app.models import Project, ProjectMember, ProjectRole
 from app.models.analysis import AnalysisSession
 from app.models.driver_tree import DriverTree
@@ -406,6 +407,7 @@ class ProjectCrudService(ProjectServiceBase):
 
         # プロジェクトを削除（CASCADEでDBからもファイルメタデータ削除）
         await self.repository.delete(project_id)
+        await principal_cache.invalidate_project(project_id)
 
         logger.info(
             "プロジェクトを削除しました",
@@ -10,6 +10,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.decorators import measure_performance, transactional
 from app.core.exceptions import AuthorizationError, NotFoundError, ValidationError
 from app.core.logging import get_logger
+from app.core.principal_cache import principal_cache
 from app.models import ProjectMember, ProjectRole
 from app.schemas import ProjectMemberBulkError, ProjectMemberCreate
 from app.services.project.project_member.base import ProjectMemberServiceBase
@@ -461,6 +462,7 @@ class ProjectMemberCrudService(ProjectMemberServiceBase):
 
             await self.db.flush()
             await self.db.refresh(updated_member)
+            await principal_cache.invalidate_member(updated_member.project_id, updated_member.user_id)
 
             logger.info(
                 "メンバーロールを正常に更新しました",
@@ -550,6 +552,7 @@ class ProjectMemberCrudService(ProjectMemberServiceBase):
             await self.repository.delete(member_id)
 
             await self.db.flush()
+            await principal_cache.invalidate_member(member.project_id, member.user_id)
 
             logger.info(
                 "メンバーを正常に削除しました",
@@ -10,6 +10,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.decorators import measure_performance, transactional
 from app.core.exceptions import NotFoundError, ValidationError
 from app.core.logging import get_logger
+from app.core.principal_cache import principal_cache
 from app.services.project.project_member.base import ProjectMemberServiceBase
 
 logger = get_logger(__name__)
@@ -71,6 +72,7 @@ class ProjectMemberLeaveService(ProjectMemberServiceBase):
             await self.repository.delete(member.id)
 
             await self.db.flush()
+            await principal_cache.invalidate_member(project_id, user_id)
 
             logger.info(
                 "プロジェクトから正常に退出しました",
@@ -3,13 +3,14 @@
 共通UI設計書（UI-004〜UI-005）に基づくグローバル検索機能を提供します。
 """
 
-import asyncio
 import re
 import uuid
+from collections.abc import Awaitable, Callable
 
 from sqlalchemy import or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.database import parallel_query_executor
 from app.core.logging import get_logger
 from app.models.analysis import AnalysisSession
 from app.models.driver_tree import DriverTree
@@ -40,7 +41,7 @@ class GlobalSearchService:
     ) -> SearchResponse:
         """グローバル検索を並行処理で高速実行します。
 
-        asyncio.gatherにより複数の検索タイプを同時実行し、レスポンス時間を短縮します。
+        parallel_query_executorにより検索タイプ毎に別々のセッションで同時実行し、レスポンス時間を短縮します。
 
         Args:
             query: 検索クエリ
@@ -55,25 +56,31 @@ class GlobalSearchService:
         limit = query.limit
 
         # 実行する検索タスクを構築
-        search_tasks = []
+        search_tasks: list[Callable[[AsyncSession], Awaitable[list[SearchResultInfo]]]] = []
 
         if SearchTypeEnum.PROJECT in types:
-            search_tasks.append(self._search_projects(search_text, user_id, limit))
+            search_tasks.append(
+                lambda session: GlobalSearchService(session)._search_projects(search_text, user_id, limit)
+            )
 
         if SearchTypeEnum.SESSION in types:
             search_tasks.append(
-                self._search_sessions(search_text, user_id, project_id, limit)
+                lambda session: GlobalSearchService(session)._search_sessions(search_text, user_id, project_id, limit)
             )
 
         if SearchTypeEnum.FILE in types:
-            search_tasks.append(self._search_files(search_text, user_id, project_id, limit))
+            search_tasks.append(
+                lambda session: GlobalSearchService(session)._search_files(search_text, user_id, project_id, limit)
+            )
 
         if SearchTypeEnum.TREE in types:
-            search_tasks.append(self._search_trees(search_text, user_id, project_id, limit))
+            search_tasks.append(
+                lambda session: GlobalSearchService(session)._search_trees(search_text, user_id, project_id, limit)
+            )
 
-        # 全ての検索を並行実行
+        # 全ての検索を別々のセッションで並行実行
         if search_tasks:
-            results_list = await asyncio.gather(*search_tasks)
+            results_list = await parallel_query_executor.run(self.db, *search_tasks)
             # 結果をフラットに統合
             all_results: list[SearchResultInfo] = []
             for results in results_list:
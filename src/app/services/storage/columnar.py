@@ -0,0 +1,91 @@
+"""カラムナ（Parquet）操作ユーティリティ。
+
+DataFrameをParquet形式でシリアライズ・デシリアライズする機能を提供します。
+
+主な機能:
+    - DataFrameのParquetエンコード（カテゴリ列の辞書エンコード、zstd圧縮）
+    - ParquetデータからのDataFrameデコード
+    - スキーマ情報の取得
+"""
+
+from io import BytesIO
+from typing import Any
+
+import pandas as pd
+
+from app.core.exceptions import ValidationError
+
+PARQUET_COMPRESSION = "zstd"
+
+
+def dataframe_to_parquet(
+    df: pd.DataFrame,
+    categorical_columns: list[str] | None = None,
+) -> bytes:
+    """DataFrameをParquet形式にエンコードします。
+
+    categorical_columnsに指定した列はカテゴリ型に変換し、辞書エンコードで保存します。
+
+    Args:
+        df: エンコード対象のDataFrame
+        categorical_columns: カテゴリ型として保存する列名のリスト
+
+    Returns:
+        bytes: Parquetデータ
+
+    Raises:
+        ValidationError: エンコードに失敗した場合（列内で型が混在している場合など）
+    """
+    try:
+        encoded = df.reset_index(drop=True)
+        if categorical_columns:
+            encoded = encoded.astype({col: "category" for col in categorical_columns if col in encoded.columns})
+        buffer = BytesIO()
+        encoded.to_parquet(buffer, engine="pyarrow", index=False, compression=PARQUET_COMPRESSION)
+        return buffer.getvalue()
+    except Exception as e:
+        raise ValidationError(
+            "Parquetへの変換に失敗しました",
+            details={"error": str(e)},
+        ) from e
+
+
+def parquet_to_dataframe(data: bytes) -> pd.DataFrame:
+    """ParquetデータをDataFrameにデコードします。
+
+    カテゴリ型で保存された列は元の値の型に戻して返します
+    （groupby等でカテゴリ型特有の挙動にならないようにするため）。
+
+    Args:
+        data: Parquetデータ
+
+    Returns:
+        pd.DataFrame: デコードしたDataFrame
+
+    Raises:
+        ValidationError: デコードに失敗した場合
+    """
+    try:
+        df = pd.read_parquet(BytesIO(data), engine="pyarrow")
+    except Exception as e:
+        raise ValidationError(
+            "Parquetの読み込みに失敗しました",
+            details={"error": str(e)},
+        ) from e
+
+    categorical_columns = [col for col in df.columns if isinstance(df[col].dtype, pd.CategoricalDtype)]
+    if categorical_columns:
+        df = df.astype({col: df[col].cat.categories.dtype for col in categorical_columns})
+    return df
+
+
+def describe_schema(df: pd.DataFrame) -> list[dict[str, Any]]:
+    """DataFrameのスキーマ情報（列名と型）を取得します。
+
+    Args:
+        df: 対象のDataFrame
+
+    Returns:
+        list[dict[str, Any]]: 列ごとの {"name": 列名, "dtype": 型名} のリスト
+    """
+    return [{"name": str(col), "dtype": str(dtype)} for col, dtype in df.dtypes.items()]
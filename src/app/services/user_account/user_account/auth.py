@@ -11,6 +11,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.decorators import measure_performance, transactional
 from app.core.exceptions import NotFoundError, ValidationError
 from app.core.logging import get_logger
+from app.core.principal_cache import principal_cache
 from app.models import UserAccount
 from app.services.user_account.user_account.base import UserAccountServiceBase
 
@@ -43,6 +44,9 @@ class UserAccountAuthService(UserAccountServiceBase):
         存在しない場合は自動的に新しいユーザーアカウントを作成します。
         既存ユーザーの場合、メール/表示名が変更されていれば更新します。
 
+        認証キャッシュ（principal_cache）にユーザーがあり、メール/表示名/ロールに
+        変更がない場合はDBに問い合わせずにキャッシュから返します。
+
         Args:
             azure_oid: Azure AD Object ID（一意識別子）
             email: メールアドレス
@@ -56,6 +60,10 @@ class UserAccountAuthService(UserAccountServiceBase):
             ValidationError: メールアドレスの重複など、検証エラーが発生した場合
             Exception: データベース操作で予期しないエラーが発生した場合
         """
+        cached_user = await principal_cache.get_user(self.db, azure_oid)
+        if cached_user is not None and not self._has_claim_changes(cached_user, email, display_name, roles):
+            return cached_user
+
         logger.info(
             "Azure OIDでユーザーを取得または作成中",
             azure_oid=azure_oid,
@@ -126,6 +134,7 @@ class UserAccountAuthService(UserAccountServiceBase):
                     )
 
                 logger.debug("既存ユーザーを取得しました", user_id=str(user.id), email=user.email)
+                await principal_cache.set_user(user)
                 return user
 
             # 新規ユーザーを作成
@@ -162,6 +171,7 @@ class UserAccountAuthService(UserAccountServiceBase):
                 azure_oid=azure_oid,
             )
 
+            await principal_cache.set_user(new_user)
             return new_user
 
         except ValidationError:
@@ -176,6 +186,20 @@ class UserAccountAuthService(UserAccountServiceBase):
             )
             raise
 
+    @staticmethod
+    def _has_claim_changes(
+        user: UserAccount,
+        email: str,
+        display_name: str | None,
+        roles: list[str] | None,
+    ) -> bool:
+        """トークンのメール/表示名/ロールがユーザー情報と異なるかを判定します。"""
+        return (
+            user.email != email
+            or bool(display_name and user.display_name != display_name)
+            or (roles is not None and user.roles != roles)
+        )
+
     @measure_performance
     @transactional
     async def update_last_login(self, user_id: uuid.UUID, client_ip: str | None = None) -> UserAccount:
@@ -208,6 +232,7 @@ class UserAccountAuthService(UserAccountServiceBase):
             user.last_login = datetime.now(UTC)
             await self.db.flush()
             await self.db.refresh(user)
+            await principal_cache.invalidate_user(user.azure_oid)
 
             # refreshの後、明示的に設定した値は必ず存在するはず
             last_login = user.last_login
@@ -11,6 +11,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.decorators import cache_result, measure_performance, transactional
 from app.core.exceptions import NotFoundError, ValidationError
 from app.core.logging import get_logger
+from app.core.principal_cache import principal_cache
 from app.models import UserAccount
 from app.services.user_account.user_account.base import UserAccountServiceBase
 
@@ -237,6 +238,7 @@ class UserAccountCrudService(UserAccountServiceBase):
 
         # 更新実行
         updated_user = await self.repository.update(user, **update_data)
+        await principal_cache.invalidate_user(updated_user.azure_oid)
 
         logger.info(
             "ユーザー情報を更新しました",
@@ -274,6 +276,7 @@ class UserAccountCrudService(UserAccountServiceBase):
 
         # 削除実行
         await self.repository.delete(user_id)
+        await principal_cache.invalidate_user(user.azure_oid)
 
         logger.info(
             "ユーザーを削除しました",
@@ -310,6 +313,7 @@ class UserAccountCrudService(UserAccountServiceBase):
 
         # 有効化実行
         updated_user = await self.repository.update(user, is_active=True)
+        await principal_cache.invalidate_user(updated_user.azure_oid)
 
         logger.info(
             "ユーザーを有効化しました",
@@ -347,6 +351,7 @@ class UserAccountCrudService(UserAccountServiceBase):
 
         # 無効化実行
         updated_user = await self.repository.update(user, is_active=False)
+        await principal_cache.invalidate_user(updated_user.azure_oid)
 
         logger.info(
             "ユーザーを無効化しました",
@@ -386,6 +391,7 @@ class UserAccountCrudService(UserAccountServiceBase):
 
         # ロール更新実行
         updated_user = await self.repository.update(user, roles=roles)
+        await principal_cache.invalidate_user(updated_user.azure_oid)
 
         logger.info(
             "ユーザーロールを更新しました",
@@ -0,0 +1,75 @@
+"""操作履歴・監査ログの一括書き込みのテスト。
+
+このモジュールは、app.api.middlewares.audit_writerのキュー・一括INSERT・停止時の書き込みをテストします。
+"""
+
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.api.middlewares.audit_writer import AuditRecordWriter
+from app.models import AuditLog, UserActivity
+
+
+def create_writer(max_queue_size: int = 100, batch_size: int = 100) -> tuple[AuditRecordWriter, MagicMock]:
+    """テスト用の一括書き込みとモックセッションを作成します。"""
+    session = MagicMock()
+    session.execute = AsyncMock()
+    session.commit = AsyncMock()
+
+    @asynccontextmanager
+    async def session_factory():
+        yield session
+
+    writer = AuditRecordWriter(
+        max_queue_size=max_queue_size,
+        batch_size=batch_size,
+        flush_interval_ms=10_000,
+        put_timeout_seconds=0,
+    )
+    writer.session_factory = session_factory
+    return writer, session
+
+
+class TestAuditRecordWriter:
+    """AuditRecordWriterのテスト。"""
+
+    @pytest.mark.asyncio
+    async def test_shutdown_flushes_queue_with_one_insert_per_table(self):
+        """[test_audit_writer-001] 停止時にキューのレコードがテーブル毎に1回のINSERTで書き込まれること。"""
+        # Arrange
+        writer, session = create_writer()
+        for i in range(3):
+            writer.submit(UserActivity, {"endpoint": f"/api/v1/projects/{i}"})
+        await writer.put(AuditLog, {"action": "CREATE"})
+
+        # Act
+        await writer.shutdown()
+
+        # Assert
+        assert session.execute.await_count == 2
+        assert session.commit.await_count == 2
+        rows = [call.args[1] for call in session.execute.await_args_list]
+        assert sorted(len(r) for r in rows) == [1, 3]
+        assert all("created_at" in row for r in rows for row in r)
+        assert writer.queue_depth == 0
+
+    @pytest.mark.asyncio
+    async def test_submit_drops_when_queue_is_full(self):
+        """[test_audit_writer-002] キューが満杯・停止済みの場合はレコードが破棄されること。"""
+        # Arrange
+        writer, _ = create_writer(max_queue_size=1)
+
+        # Act
+        first = writer.submit(UserActivity, {"endpoint": "/a"})
+        second = writer.submit(UserActivity, {"endpoint": "/b"})
+        timed_out = await writer.put(AuditLog, {"action": "CREATE"})
+        await writer.shutdown()
+        after_shutdown = writer.submit(UserActivity, {"endpoint": "/c"})
+
+        # Assert
+        assert first is True
+        assert second is False
+        assert timed_out is False
+        assert after_shutdown is False
@@ -0,0 +1,99 @@
+"""ミドルウェア共有リクエストコンテキストのテスト。
+
+RequestContextがリクエストボディを1回だけ読み込み、
+後続のアプリケーションに同じボディを渡すことを検証します。
+"""
+
+import pytest
+
+from app.api.middlewares.context import RequestContext
+
+
+def create_scope(method: str = "POST", content_type: str = "application/json") -> dict:
+    """テスト用のASGIスコープを作成します。"""
+    return {
+        "type": "http",
+        "method": method,
+        "path": "/api/v1/projects",
+        "query_string": b"",
+        "headers": [(b"content-type", content_type.encode())],
+        "client": ("127.0.0.1", 50000),
+    }
+
+
+def create_receive(chunks: list[bytes]):
+    """ボディを複数チャンクに分けて返すreceiveを作成します。"""
+    messages = [{"type": "http.request", "body": chunk, "more_body": index < len(chunks) - 1} for index, chunk in enumerate(chunks)]
+    calls = {"count": 0}
+
+    async def receive():
+        calls["count"] += 1
+        if messages:
+            return messages.pop(0)
+        return {"type": "http.disconnect"}
+
+    return receive, calls
+
+
+class TestRequestContext:
+    """RequestContextのユニットテスト。"""
+
+    def test_from_scope_returns_same_context(self):
+        """[test_context-001] 同じスコープからは同じコンテキストが返されること。"""
+        # Arrange
+        scope = create_scope()
+
+        # Act
+        first = RequestContext.from_scope(scope)
+        second = RequestContext.from_scope(scope)
+
+        # Assert
+        assert first is second
+        assert scope["state"][RequestContext.STATE_KEY] is first
+        assert first.request.state.request_context is first
+
+    @pytest.mark.asyncio
+    async def test_buffer_body_replays_body_once(self):
+        """[test_context-002] JSONボディが1回だけ読み込まれ、後続に同じボディが渡されること。"""
+        # Arrange
+        scope = create_scope()
+        receive, calls = create_receive([b'{"name": "test", ', b'"password": "secret"}'])
+        context = RequestContext.from_scope(scope)
+
+        # Act
+        replay = await context.buffer_body(receive)
+        replay_again = await context.buffer_body(replay)
+        message = await replay_again()
+
+        # Assert
+        assert calls["count"] == 2
+        assert replay_again is replay
+        assert message == {"type": "http.request", "body": context.body, "more_body": False}
+        assert context.json_body == {"name": "test", "password": "secret"}
+        assert context.masked_json_body["password"] == "***MASKED***"
+        assert context.masked_json_body["name"] == "test"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "method,content_type",
+        [
+            ("GET", "application/json"),
+            ("POST", "multipart/form-data; boundary=xyz"),
+        ],
+        ids=["get", "multipart"],
+    )
+    async def test_buffer_body_skips_non_json(self, method: str, content_type: str):
+        """[test_context-003] JSON以外・ボディなしのメソッドではボディを読み込まないこと。"""
+        # Arrange
+        scope = create_scope(method=method, content_type=content_type)
+        receive, calls = create_receive([b"data"])
+        context = RequestContext.from_scope(scope)
+
+        # Act
+        result = await context.buffer_body(receive)
+
+        # Assert
+        assert result is receive
+        assert calls["count"] == 0
+        assert context.body is None
+        assert context.json_body is None
@@ -1,6 +1,6 @@
 """CORSとレート制限のミドルウェアテスト。"""
 
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from httpx import AsyncClient
@@ -8,6 +8,13 @@ from httpx import AsyncClient
 from app.api.middlewares.rate_limit import RateLimitMiddleware
 
 
+def create_memory_middleware(**kwargs) -> RateLimitMiddleware:
+    """Redis未接続（インメモリ判定）のレート制限ミドルウェアを作成します。"""
+    middleware = RateLimitMiddleware(app=None, **kwargs)
+    middleware.limiter._cache = MagicMock(is_redis_available=MagicMock(return_value=False))
+    return middleware
+
+
 @pytest.mark.asyncio
 async def test_cors_with_origin_header_returns_cors_headers(client: AsyncClient):
     """[test_rate_limit-001] CORS ヘッダーのテスト。"""
@@ -56,26 +63,22 @@ class TestRateLimitMiddleware:
     async def test_rate_limit_threshold(self, max_calls, request_count, should_be_limited):
         """[test_rate_limit-003/005] レート制限の閾値テスト（パラメータ化）。"""
         # Arrange
-        middleware = RateLimitMiddleware(app=None, calls=max_calls, period=60)
+        middleware = create_memory_middleware(calls=max_calls, period=60)
         client_id = "test:client"
-        current_time = 1000.0
-
-        # 既存のリクエストを記録（request_count - 1回、最後の1回はチェックで追加される）
-        if request_count > 1:
-            for i in range(request_count - 1):
-                middleware._memory_store[client_id] = middleware._memory_store.get(client_id, [])
-                middleware._memory_store[client_id].append(current_time + i)
 
         # Act
-        is_limited, count = middleware._check_rate_limit_memory(client_id, current_time + 10)
+        for _ in range(request_count):
+            rule, result = await middleware._check_rate_limit(client_id, "/api/v1/projects")
 
         # Assert
+        assert rule.calls == max_calls
         if should_be_limited:
-            assert is_limited is True
-            assert count >= max_calls
+            assert result.allowed is False
+            assert result.remaining == 0
+            assert result.retry_after > 0
         else:
-            assert is_limited is False
-            assert count < max_calls
+            assert result.allowed is True
+            assert result.remaining == max_calls - request_count
 
     @pytest.mark.asyncio
     async def test_rate_limit_response_has_correct_headers(self):
@@ -96,24 +99,23 @@ class TestRateLimitMiddleware:
 
     @pytest.mark.asyncio
     async def test_rate_limit_cleanup_old_entries(self):
-        """[test_rate_limit-006] 古いエントリが期間外でクリーンアップされることを確認。"""
+        """[test_rate_limit-006] 期間が経過するとリクエスト数が回復することを確認。"""
         # Arrange
-        middleware = RateLimitMiddleware(app=None, calls=10, period=60)
+        middleware = create_memory_middleware(calls=10, period=60)
         client_id = "test:client"
-
-        # 古いエントリを追加（70秒前）
+        rule = middleware.default_rule
         old_time = 1000.0
-        middleware._memory_store[client_id] = [old_time]
+        for _ in range(10):
+            middleware.limiter.local.consume(client_id, rule, now=old_time)
 
-        # Act - 現在時刻でチェック（old_timeから70秒後）
-        current_time = old_time + 70
-        is_limited, count = middleware._check_rate_limit_memory(client_id, current_time)
+        # Act - 上限に達した直後と、70秒後にチェック
+        limited = middleware.limiter.local.consume(client_id, rule, now=old_time)
+        recovered = middleware.limiter.local.consume(client_id, rule, now=old_time + 70)
 
         # Assert
-        assert is_limited is False
-        # 古いエントリはクリーンアップされ、新しいエントリのみ
-        assert len(middleware._memory_store[client_id]) == 1
-        assert middleware._memory_store[client_id][0] == current_time
+        assert limited.allowed is False
+        assert recovered.allowed is True
+        assert recovered.remaining == 9
 
     @pytest.mark.asyncio
     @pytest.mark.parametrize(
@@ -151,17 +153,62 @@ class TestRateLimitMiddleware:
 
     @pytest.mark.asyncio
     async def test_memory_store_cleanup_prevents_leak(self):
-        """[test_rate_limit-009] メモリストアがmax_memory_entriesを超えた場合にクリーンアップされることを確認。"""
+        """[test_rate_limit-009] インメモリのクライアント数がmax_memory_entriesを超えないことを確認。"""
         # Arrange
-        middleware = RateLimitMiddleware(app=None, max_memory_entries=10)
+        middleware = create_memory_middleware(max_memory_entries=10)
 
-        # 11クライアント分のエントリを追加
+        # Act - 11クライアント分のリクエスト
         for i in range(11):
-            middleware._memory_store[f"client:{i}"] = [float(i)]
+            await middleware._check_rate_limit(f"client:{i}", "/health")
+
+        # Assert - 最も古いクライアントから破棄される
+        assert len(middleware.limiter.local) == 10
+        assert "client:0" not in middleware.limiter.local._buckets
+
+    @pytest.mark.parametrize(
+        "client_id,path,expected_key,expected_rule",
+        [
+            ("ip:10.0.0.1", "/api/v1/projects", "ip:10.0.0.1", (100, 60)),
+            ("ip:10.0.0.1", "/api/v1/auth/login", "ip:10.0.0.1:/api/v1/auth", (10, 60)),
+            ("ip:10.0.0.1", "/api/v1/authx", "ip:10.0.0.1", (100, 60)),
+            ("ip:10.0.0.1", "/api/v1/auth/admin/reset", "ip:10.0.0.1:/api/v1/auth/admin", (2, 60)),
+            ("user:vip", "/api/v1/auth/login", "user:vip:/api/v1/auth", (1000, 60)),
+        ],
+        ids=["default", "route", "route_boundary", "longest_prefix", "user_override"],
+    )
+    def test_resolve_rule(self, client_id, path, expected_key, expected_rule):
+        """[test_rate_limit-010] ルート別・クライアント別のルールが優先順位どおりに適用されることを確認。"""
+        # Arrange
+        middleware = RateLimitMiddleware(
+            app=None,
+            calls=100,
+            period=60,
+            route_limits={"/api/v1/auth": (10, 60), "/api/v1/auth/admin/": (2, 60)},
+            user_limits={"user:vip": (1000, 60)},
+        )
+
+        # Act
+        key, rule = middleware._resolve_rule(client_id, path)
+
+        # Assert
+        assert key == expected_key
+        assert (rule.calls, rule.period) == expected_rule
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_response_uses_applied_rule(self):
+        """[test_rate_limit-011] 制限超過時に適用したルールと再試行までの秒数を返すことを確認。"""
+        # Arrange
+        middleware = create_memory_middleware(calls=100, period=60, route_limits={"/api/v1/auth": (2, 60)})
+        for _ in range(2):
+            await middleware._check_rate_limit("ip:10.0.0.1", "/api/v1/auth/login")
 
         # Act
-        middleware._cleanup_memory_store()
+        rule, result = await middleware._check_rate_limit("ip:10.0.0.1", "/api/v1/auth/login")
+        response = middleware._create_rate_limit_response(rule, result.retry_after)
 
         # Assert
-        # 80%まで削減されるはず (10 * 0.8 = 8)
-        assert len(middleware._memory_store) <= 10
+        assert result.allowed is False
+        assert response.status_code == 429
+        assert 1 <= int(response.headers["Retry-After"]) <= 30
+        body = response.body.decode()
+        assert '"limit":2' in body.replace(" ", "")
@@ -6,13 +6,18 @@ Happy Pathとビジネスルールエラーのみをテストします。
 対応エンドポイント:
     - GET /api/v1/project/{project_id}/analysis/session - セッション一覧取得
     - POST /api/v1/project/{project_id}/analysis/session - セッション作成
-    - GET /api/v1/project/{project_id}/analysis/session/{session_id} - セッション詳細取得
+    - GET /api/v1/project/{project_id}/analysis/session/{session_id} - セッション詳細取得（軽量表示を含む）
+    - GET /api/v1/project/{project_id}/analysis/session/{session_id}/snapshot - スナップショット履歴のページ取得
     - GET /api/v1/project/{project_id}/analysis/{session_id}/result - 分析結果取得
     - PUT /api/v1/project/{project_id}/analysis/{session_id} - セッション更新
     - DELETE /api/v1/project/{project_id}/analysis/session/{session_id} - セッション削除
     - GET /api/v1/project/{project_id}/analysis/session/{session_id}/file - ファイル一覧取得
+    - GET /api/v1/project/{project_id}/analysis/session/{session_id}/file/{file_id}/rows - ファイルデータ行取得
     - POST /api/v1/project/{project_id}/analysis/session/{session_id}/file - ファイルアップロード
     - PATCH /api/v1/project/{project_id}/analysis/session/{session_id}/file/{file_id} - ファイル設定更新
+    - POST /api/v1/project/{project_id}/analysis/session/{session_id}/chat - チャット実行ジョブ受付
+    - GET /api/v1/project/{project_id}/analysis/session/{session_id}/chat/job/{job_id} - チャット実行ジョブ取得
+    - GET /api/v1/project/{project_id}/analysis/session/{session_id}/chat/job/{job_id}/events - 進捗配信
 """
 
 
@@ -127,6 +132,38 @@ async def test_get_session_success(client: AsyncClient, override_auth, test_data
     assert result["projectId"] == str(project.id)
 
 
+@pytest.mark.asyncio
+async def test_get_session_compact(client: AsyncClient, override_auth, test_data_seeder):
+    """[test_analysis_sessions-023] 軽量表示のセッション詳細取得とスナップショット履歴のページ取得。"""
+    # Arrange
+    data = await test_data_seeder.seed_analysis_session_dataset()
+    project = data["project"]
+    owner = data["owner"]
+    session = data["session"]
+    project_file = await test_data_seeder.create_project_file(project=project, uploader=owner)
+    await test_data_seeder.create_analysis_file(session=session, project_file=project_file)
+    for order in range(1, 3):
+        await test_data_seeder.create_analysis_snapshot(session=session, snapshot_order=order)
+    await test_data_seeder.db.commit()
+    override_auth(owner)
+    base_url = f"/api/v1/project/{project.id}/analysis/session/{session.id}"
+
+    # Act
+    detail_response = await client.get(base_url, params={"view": "compact", "resultLimit": 10})
+    history_response = await client.get(f"{base_url}/snapshot", params={"skip": 1, "limit": 1})
+
+    # Assert
+    assert detail_response.status_code == 200
+    detail = detail_response.json()
+    assert [snap["snapshotOrder"] for snap in detail["snapshotList"]] == [0, 1, 2]
+    assert detail["fileList"][0]["data"] is None
+
+    assert history_response.status_code == 200
+    history = history_response.json()
+    assert [snap["snapshotOrder"] for snap in history["snapshots"]] == [1]
+    assert history["total"] == 3
+
+
 # ================================================================================
 # GET /api/v1/project/{project_id}/analysis/{session_id}/result - 分析結果取得
 # ================================================================================
@@ -263,6 +300,37 @@ async def test_list_session_files_success(client: AsyncClient, override_auth, te
     assert len(result["files"]) == 1
 
 
+@pytest.mark.asyncio
+async def test_get_file_rows_success(client: AsyncClient, override_auth, test_data_seeder):
+    """[test_analysis_sessions-024] ファイルデータ行のページ取得の成功ケース。"""
+    # Arrange
+    data = await test_data_seeder.seed_analysis_session_dataset()
+    project = data["project"]
+    owner = data["owner"]
+    session = data["session"]
+
+    project_file = await test_data_seeder.create_project_file(project=project, uploader=owner)
+    analysis_file = await test_data_seeder.create_analysis_file(
+        session=session,
+        project_file=project_file,
+        data=[{"科目": "売上", "値": value} for value in range(5)],
+    )
+    await test_data_seeder.db.commit()
+    override_auth(owner)
+
+    # Act
+    response = await client.get(
+        f"/api/v1/project/{project.id}/analysis/session/{session.id}/file/{analysis_file.id}/rows",
+        params={"skip": 2, "limit": 2},
+    )
+
+    # Assert
+    assert response.status_code == 200
+    result = response.json()
+    assert result["rows"] == [{"科目": "売上", "値": 2}, {"科目": "売上", "値": 3}]
+    assert result["total"] == 5
+
+
 # ================================================================================
 # POST /api/v1/project/{project_id}/analysis/session/{session_id}/file - ファイルアップロード
 # ================================================================================
@@ -533,7 +601,7 @@ async def test_delete_step_success(client: AsyncClient, override_auth, test_data
 
 
 # ================================================================================
-# POST /api/v1/project/{project_id}/analysis/{session_id}/chat - チャット実行
+# POST /api/v1/project/{project_id}/analysis/{session_id}/chat - チャット実行ジョブ受付
 # ================================================================================
 
 
@@ -541,10 +609,13 @@ async def test_delete_step_success(client: AsyncClient, override_auth, test_data
 async def test_execute_chat_success(client: AsyncClient, override_auth, test_data_seeder, mock_analysis_agent):
     """[test_analysis_sessions-018] チャット実行の成功ケース。
 
-    メッセージ送信→エージェント応答→新スナップショット作成→チャット履歴保存を確認。
+    メッセージ送信→ジョブ受付（202）→エージェント応答→新スナップショット作成→チャット履歴保存を確認。
     """
+    import uuid
     from unittest.mock import patch
 
+    from app.services.analysis.analysis_session.chat_job import chat_job_manager
+
     # Arrange
     data = await test_data_seeder.seed_analysis_session_dataset()
     project = data["project"]
@@ -576,10 +647,18 @@ async def test_execute_chat_success(client: AsyncClient, override_auth, test_dat
             f"/api/v1/project/{project.id}/analysis/session/{session.id}/chat",
             json=request_body,
         )
+        assert response.status_code == 202
+        job_id = response.json()["jobId"]
+        await chat_job_manager.wait(uuid.UUID(job_id))
+
+    job_response = await client.get(f"/api/v1/project/{project.id}/analysis/session/{session.id}/chat/job/{job_id}")
+    events_response = await client.get(f"/api/v1/project/{project.id}/analysis/session/{session.id}/chat/job/{job_id}/events")
 
     # Assert
-    assert response.status_code == 200
-    result = response.json()
+    assert job_response.status_code == 200
+    job = job_response.json()
+    assert job["status"] == "succeeded"
+    result = job["result"]
     # 新しいスナップショットが作成されている
     assert result["currentSnapshot"] == 1
     # スナップショット一覧に新しいスナップショットが含まれる
@@ -588,6 +667,10 @@ async def test_execute_chat_success(client: AsyncClient, override_auth, test_dat
     new_snapshot = result["snapshotList"][1]
     assert len(new_snapshot["chat"]) == 3
     assert new_snapshot["chat"][2]["role"] == "assistant"
+    # 進捗イベントが配信される
+    assert events_response.status_code == 200
+    assert events_response.headers["content-type"].startswith("text/event-stream")
+    assert "event: completed" in events_response.text
 
 
 @pytest.mark.asyncio
@@ -303,6 +303,37 @@ async def test_get_tree_data_success(client: AsyncClient, override_auth, test_da
     assert "calculatedDataList" in result
 
 
+# ================================================================================
+# POST /api/v1/project/{project_id}/driver-tree/tree/{tree_id}/simulation - 施策シミュレーション
+# ================================================================================
+
+
+@pytest.mark.asyncio
+async def test_simulate_policies_success(client: AsyncClient, override_auth, test_data_seeder):
+    """[test_driver_tree-014] 施策シミュレーションの成功ケース。"""
+    # Arrange
+    data = await test_data_seeder.seed_driver_tree_dataset()
+    project = data["project"]
+    owner = data["owner"]
+    tree = data["tree"]
+    policy = data["policy"]
+    override_auth(owner)
+
+    # Act
+    response = await client.post(
+        f"/api/v1/project/{project.id}/driver-tree/tree/{tree.id}/simulation",
+        json={"scenarioList": [[str(policy.id)]]},
+    )
+
+    # Assert
+    assert response.status_code == 200
+    result = response.json()
+    assert result["kpiNodeId"] == str(data["root_node"].id)
+    assert result["scenarioCount"] == 1
+    assert result["scenarios"][0]["policyIdList"] == [str(policy.id)]
+    assert result["scenarios"][0]["rank"] == 1
+
+
 # ================================================================================
 # GET /api/v1/project/{project_id}/driver-tree/tree/{tree_id}/output - ファイルダウンロード
 # ================================================================================
@@ -4,10 +4,12 @@
 データベース接続を必要としません。
 """
 
+import json
 from unittest.mock import AsyncMock, patch
 
 import pytest
 
+from app.core.cache import CacheManager
 from app.core.decorators import cache_result, transactional
 
 # データベース不要のユニットテストとしてマーク
@@ -36,14 +38,15 @@ class TestCacheResult:
     async def test_cache_result_scenarios(self, cache_state, expected_from_cache):
         """[test_data_access-001,002] キャッシュの動作をテスト（ヒット/ミス）。"""
         # Arrange
-        mock_cache = AsyncMock()
+        cache = CacheManager(key_prefix="test")
+        cache._redis = AsyncMock()
         if cache_state == "hit":
-            mock_cache.get.return_value = {"cached": "data"}
+            cache._redis.get.return_value = json.dumps({"v": {"cached": "data"}, "f": None})
         else:
-            mock_cache.get.return_value = None  # キャッシュミス
+            cache._redis.get.return_value = None  # キャッシュミス
 
         # Act
-        with patch("app.core.decorators.data_access.cache_manager", mock_cache):
+        with patch("app.core.decorators.data_access.cache_manager", cache):
 
             @cache_result(ttl=300, key_prefix="test")
             async def test_func(arg1: int):
@@ -55,17 +58,17 @@ class TestCacheResult:
             if expected_from_cache:
                 # キャッシュヒット時にキャッシュから返却される
                 assert result == {"cached": "data"}
-                assert mock_cache.get.called
+                assert cache._redis.get.called
                 # キャッシュヒットなので関数は実行されない（dbデータは返らない）
             else:
                 # キャッシュミス時に関数実行後キャッシュに保存される
                 assert result == {"db": "data"}
-                assert mock_cache.get.called
-                assert mock_cache.set.called
-                # setが正しい引数で呼ばれているか確認
-                set_call_args = mock_cache.set.call_args
-                assert set_call_args[0][1] == {"db": "data"}  # value
-                assert set_call_args[0][2] == 300  # ttl
+                assert cache._redis.get.called
+                assert cache._redis.setex.called
+                # setexが正しい引数で呼ばれているか確認
+                set_call_args = cache._redis.setex.call_args
+                assert set_call_args[0][1] == 300  # ttl
+                assert json.loads(set_call_args[0][2])["v"] == {"db": "data"}  # value
 
 
 class TestTransactional:
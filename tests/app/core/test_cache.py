@@ -0,0 +1,107 @@
+"""2段キャッシュ（L1 + Redis）のテスト。
+
+このモジュールは、app.core.cacheの同時実行の集約・期限切れ値の返却・タグ無効化・L1の上限をテストします。
+"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock
+
+import orjson
+import pytest
+
+from app.core.cache import INVALIDATE_TAGS_SCRIPT, CacheManager, LocalCache
+
+
+def create_cache_manager(redis_value=None) -> CacheManager:
+    """Redisをモックしたキャッシュマネージャーを作成します。"""
+    cache = CacheManager(key_prefix="test")
+    cache._redis = AsyncMock()
+    cache._redis.get.return_value = redis_value
+    cache._eval = AsyncMock()
+    return cache
+
+
+class TestCacheManager:
+    """CacheManagerのテスト。"""
+
+    @pytest.mark.asyncio
+    async def test_get_or_set_coalesces_concurrent_misses(self):
+        """[test_cache-001] 同一キーの同時キャッシュミスでfactoryが1回だけ実行されること。"""
+        # Arrange
+        cache = create_cache_manager()
+        calls = 0
+
+        async def factory():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"total": 1}
+
+        # Act
+        results = await asyncio.gather(*(cache.get_or_set("stats", factory, 60) for _ in range(10)))
+
+        # Assert
+        assert calls == 1
+        assert results == [{"total": 1}] * 10
+        cache._redis.setex.assert_awaited_once()
+        assert await cache.get("stats") == {"total": 1}  # L1から取得
+
+    @pytest.mark.asyncio
+    async def test_get_or_set_returns_stale_value_and_refreshes(self):
+        """[test_cache-002] 新鮮期限切れの値が即座に返され、バックグラウンドで再計算されること。"""
+        # Arrange
+        stale = orjson.dumps({"v": {"total": 1}, "f": time.time() - 1})
+        cache = create_cache_manager(redis_value=stale)
+        factory = AsyncMock(return_value={"total": 0})
+        refresh = AsyncMock(return_value={"total": 2})
+
+        # Act
+        result = await cache.get_or_set("stats", factory, 60, stale_ttl=300, local_ttl=0, refresh=refresh)
+        await asyncio.sleep(0)
+        await asyncio.gather(*cache._inflight.values())
+
+        # Assert
+        assert result == {"total": 1}
+        factory.assert_not_awaited()
+        refresh.assert_awaited_once()
+        key, ttl, raw = cache._redis.setex.call_args[0]
+        assert ttl == 360
+        assert orjson.loads(raw)["v"] == {"total": 2}
+
+    @pytest.mark.asyncio
+    async def test_invalidate_tags_removes_local_and_redis_entries(self):
+        """[test_cache-003] タグ単位の無効化でL1のエントリが削除され、Redisのスクリプトが1回実行されること。"""
+        # Arrange
+        cache = create_cache_manager()
+        await cache.set("a", 1, 60, local_ttl=10, tags=["dashboard"])
+        await cache.set("b", 2, 60, local_ttl=10, tags=["other"])
+
+        # Act
+        await cache.invalidate_tags("dashboard")
+
+        # Assert
+        assert cache._local.get(cache._make_key("a")) is None
+        assert cache._local.get(cache._make_key("b")) is not None
+        cache._eval.assert_awaited_with(INVALIDATE_TAGS_SCRIPT, [cache._make_key("tag:dashboard")], [])
+
+
+class TestLocalCache:
+    """LocalCacheのテスト。"""
+
+    def test_evicts_least_recently_used_entry(self):
+        """[test_cache-004] 件数上限を超えた場合に最も長く使われていないエントリが破棄されること。"""
+        # Arrange
+        local = LocalCache(max_entries=2, max_bytes=1024)
+        local.set("a", b"1", 10, None, ())
+        local.set("b", b"2", 10, None, ())
+        local.get("a")
+
+        # Act
+        local.set("c", b"3", 10, None, ())
+
+        # Assert
+        assert len(local) == 2
+        assert local.get("b") is None
+        assert local.get("a") is not None
+        assert local.get("c") is not None
@@ -0,0 +1,88 @@
+"""読み取りクエリの並行実行のテスト。
+
+このモジュールは、app.core.databaseのParallelQueryExecutorの独立セッションでの実行・接続数の制限・
+失敗時のキャンセルをテストします。
+"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import ParallelQueryExecutor
+
+
+class TestParallelQueryExecutor:
+    """ParallelQueryExecutorのテスト。"""
+
+    @pytest.mark.asyncio
+    async def test_run_uses_separate_sessions_with_concurrency_cap(self, db_session: AsyncSession):
+        """[test_database-001] クエリ毎に別のセッションで実行され、同時実行数が上限以下で結果が引数の順に返ること。"""
+        # Arrange
+        executor = ParallelQueryExecutor(max_concurrency=2)
+        sessions: list[AsyncSession] = []
+        running = 0
+        max_running = 0
+
+        def query(value: int):
+            async def run(session: AsyncSession) -> int:
+                nonlocal running, max_running
+                sessions.append(session)
+                running += 1
+                max_running = max(max_running, running)
+                await asyncio.sleep(0.01)
+                result = await session.scalar(text(f"SELECT {value}"))
+                running -= 1
+                return result
+
+            return run
+
+        # Act
+        results = await executor.run(db_session, *(query(i) for i in range(5)))
+
+        # Assert
+        assert results == [0, 1, 2, 3, 4]
+        assert max_running == 2
+        assert db_session not in sessions
+        assert len({id(session) for session in sessions}) == 5
+
+    @pytest.mark.asyncio
+    async def test_run_sequentially_when_concurrency_is_one(self, db_session: AsyncSession):
+        """[test_database-002] 上限が1の場合は呼び出し元のセッションで順に実行されること。"""
+        # Arrange
+        executor = ParallelQueryExecutor(max_concurrency=1)
+        sessions: list[AsyncSession] = []
+
+        async def query(session: AsyncSession) -> int:
+            sessions.append(session)
+            return await session.scalar(text("SELECT 1"))
+
+        # Act
+        results = await executor.run(db_session, query, query)
+
+        # Assert
+        assert results == [1, 1]
+        assert sessions == [db_session, db_session]
+
+    @pytest.mark.asyncio
+    async def test_run_cancels_remaining_queries_on_failure(self, db_session: AsyncSession):
+        """[test_database-003] いずれかのクエリが失敗した場合に残りのクエリがキャンセルされ、例外が送出されること。"""
+        # Arrange
+        executor = ParallelQueryExecutor(max_concurrency=2)
+        cancelled = asyncio.Event()
+
+        async def failing(session: AsyncSession) -> None:
+            raise ValueError("query failed")
+
+        async def slow(session: AsyncSession) -> None:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        # Act & Assert
+        with pytest.raises(ValueError, match="query failed"):
+            await executor.run(db_session, slow, failing)
+        assert cancelled.is_set()
@@ -0,0 +1,112 @@
+"""認証ユーザー・メンバーシップのキャッシュのテスト。
+
+このモジュールは、app.core.principal_cacheのL1/L2参照と無効化をテストします。
+"""
+
+import json
+import uuid
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.core.cache import CacheManager
+from app.core.principal_cache import PrincipalCache
+from app.models import ProjectMember, ProjectRole, UserAccount
+
+
+def create_principal_cache(redis_value=None) -> PrincipalCache:
+    """Redisをモックしたキャッシュマネージャーで認証キャッシュを作成します。"""
+    cache = CacheManager(key_prefix="test")
+    cache._redis = MagicMock()
+    cache._redis.get = AsyncMock(return_value=redis_value)
+    cache._redis.setex = AsyncMock()
+    cache._redis.delete = AsyncMock()
+    cache._eval = AsyncMock()
+    return PrincipalCache(cache=cache, ttl_seconds=60, local_ttl_seconds=5)
+
+
+def create_db() -> MagicMock:
+    """結合したインスタンスをそのまま返すモックセッションを作成します。"""
+    db = MagicMock()
+    db.merge = AsyncMock(side_effect=lambda instance, load: instance)
+    return db
+
+
+def create_user() -> UserAccount:
+    """テスト用のユーザーを作成します。"""
+    now = datetime.now(UTC)
+    return UserAccount(
+        id=uuid.uuid4(),
+        azure_oid="oid-1",
+        email="user@example.com",
+        display_name="User",
+        roles=["User"],
+        is_active=True,
+        last_login=None,
+        login_count=0,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+class TestPrincipalCache:
+    """PrincipalCacheのテスト。"""
+
+    @pytest.mark.asyncio
+    async def test_get_user_hits_local_cache_without_redis(self):
+        """[test_principal_cache-001] 登録したユーザーがL1から取得され、Redisを参照しないこと。"""
+        # Arrange
+        principal_cache = create_principal_cache()
+        user = create_user()
+        await principal_cache.set_user(user)
+
+        # Act
+        cached = await principal_cache.get_user(create_db(), "oid-1")
+
+        # Assert
+        assert cached is not None
+        assert cached.id == user.id
+        assert cached.roles == ["User"]
+        principal_cache.cache._redis.get.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_get_member_decodes_redis_value(self):
+        """[test_principal_cache-002] Redisの値（JSON）がカラムの型に戻されること。"""
+        # Arrange
+        project_id, user_id = uuid.uuid4(), uuid.uuid4()
+        joined_at = datetime.now(UTC)
+        values = {
+            "id": str(uuid.uuid4()),
+            "project_id": str(project_id),
+            "user_id": str(user_id),
+            "role": ProjectRole.PROJECT_MANAGER,
+            "joined_at": joined_at,
+            "added_by": None,
+            "last_activity_at": None,
+        }
+        principal_cache = create_principal_cache(redis_value=json.dumps({"v": values, "f": None}, default=str))
+
+        # Act
+        member = await principal_cache.get_member(create_db(), project_id, user_id)
+
+        # Assert
+        assert isinstance(member, ProjectMember)
+        assert member.project_id == project_id
+        assert member.role == ProjectRole.PROJECT_MANAGER
+        assert member.joined_at == joined_at
+
+    @pytest.mark.asyncio
+    async def test_invalidate_user_removes_both_tiers(self):
+        """[test_principal_cache-003] 無効化でL1とRedisの両方から削除されること。"""
+        # Arrange
+        principal_cache = create_principal_cache()
+        await principal_cache.set_user(create_user())
+
+        # Act
+        await principal_cache.invalidate_user("oid-1")
+        cached = await principal_cache.get_user(create_db(), "oid-1")
+
+        # Assert
+        assert cached is None
+        principal_cache.cache._redis.delete.assert_awaited_once()
@@ -0,0 +1,79 @@
+"""レート制限の判定ロジックのテスト。
+
+このモジュールは、app.core.rate_limiterのRedis判定とインメモリフォールバックをテストします。
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.core.rate_limiter import GCRA_SCRIPT, LocalTokenBucket, RateLimiter, RateLimitRule
+
+
+def create_cache(available: bool, reply=None) -> MagicMock:
+    """テスト用のキャッシュマネージャーを作成します。"""
+    cache = MagicMock()
+    cache.is_redis_available.return_value = available
+    cache.run_script = AsyncMock(return_value=reply)
+    return cache
+
+
+class TestRateLimiter:
+    """RateLimiterのテスト。"""
+
+    @pytest.mark.asyncio
+    async def test_hit_uses_single_redis_script_call(self):
+        """[test_rate_limiter-001] Redis利用時はLuaスクリプト1回で判定されること。"""
+        # Arrange
+        cache = create_cache(available=True, reply=[0, 0, 1500, 60000])
+        limiter = RateLimiter(cache=cache)
+
+        # Act
+        result = await limiter.hit("ip:10.0.0.1", RateLimitRule(calls=100, period=60))
+
+        # Assert
+        cache.run_script.assert_awaited_once_with(GCRA_SCRIPT, keys=["rate_limit:ip:10.0.0.1"], args=[100, 60000])
+        assert result.allowed is False
+        assert result.limit == 100
+        assert result.retry_after == 1.5
+        assert result.reset_after == 60.0
+        assert len(limiter.local) == 0
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("available", [False, True], ids=["not_connected", "script_error"])
+    async def test_hit_falls_back_to_local_bucket(self, available: bool):
+        """[test_rate_limiter-002] Redis未接続・スクリプトエラー時はローカルのトークンバケットで判定されること。"""
+        # Arrange
+        cache = create_cache(available=available, reply=None)
+        limiter = RateLimiter(cache=cache)
+        rule = RateLimitRule(calls=2, period=60)
+
+        # Act
+        results = [await limiter.hit("ip:10.0.0.1", rule) for _ in range(3)]
+
+        # Assert
+        assert [result.allowed for result in results] == [True, True, False]
+        assert [result.remaining for result in results] == [1, 0, 0]
+
+
+class TestLocalTokenBucket:
+    """LocalTokenBucketのテスト。"""
+
+    def test_consume_refills_tokens_over_time(self):
+        """[test_rate_limiter-003] 経過時間に応じてトークンが補充され、再試行までの秒数が返されること。"""
+        # Arrange
+        bucket = LocalTokenBucket()
+        rule = RateLimitRule(calls=10, period=60)
+        for _ in range(10):
+            bucket.consume("client", rule, now=0.0)
+
+        # Act
+        limited = bucket.consume("client", rule, now=3.0)
+        refilled = bucket.consume("client", rule, now=6.0)
+
+        # Assert
+        assert limited.allowed is False
+        assert limited.retry_after == pytest.approx(3.0)
+        assert refilled.allowed is True
+        assert refilled.remaining == 0
+        assert refilled.reset_after == pytest.approx(60.0)
@@ -0,0 +1,79 @@
+"""操作履歴の集計サービスのテスト。"""
+
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import UserAccount, UserActivityHourlyStat
+from app.models.audit.user_activity import UserActivity
+from app.repositories.admin.user_activity_rollup_repository import split_range
+from app.services.admin.activity_rollup_service import ActivityRollupService
+from app.services.admin.statistics_service import StatisticsService
+
+
+@pytest.mark.asyncio
+async def test_rollup_merges_with_unrolled_activity(db_session: AsyncSession):
+    """[test_activity_rollup_service-001] 集計済みの時間帯と未集計の操作履歴が合算され、再実行で二重計上されないこと。"""
+    # Arrange
+    now = datetime.now(UTC)
+    user = UserAccount(
+        azure_oid=f"azure-oid-{uuid.uuid4()}",
+        email=f"test-{uuid.uuid4()}@example.com",
+        display_name="Test User",
+    )
+    db_session.add(user)
+    await db_session.flush()
+    for created_at, status in [
+        (now - timedelta(hours=3), 200),
+        (now - timedelta(hours=3), 500),
+        (now, 404),
+    ]:
+        db_session.add(
+            UserActivity(
+                user_id=user.id,
+                action_type="READ",
+                endpoint="/api/v1/test",
+                method="GET",
+                response_status=status,
+                duration_ms=100,
+                created_at=created_at,
+            )
+        )
+    await db_session.commit()
+    service = ActivityRollupService(db_session)
+
+    # Act
+    rolled_until, _ = await service.rollup(now)
+    again, has_more = await service.rollup(now)
+    stats = StatisticsService(db_session)
+    totals = await stats.rollup_repository.get_request_totals(None, None, rolled_until)
+    error_by_type = await stats._get_error_by_type()
+
+    # Assert
+    assert rolled_until is not None
+    assert again == rolled_until
+    assert has_more is False
+    rolled_count = await db_session.scalar(select(func.sum(UserActivityHourlyStat.request_count)))
+    assert rolled_count == 2
+    assert totals == {"total_count": 3, "error_count": 2, "duration_ms_sum": 300}
+    assert error_by_type == {"Not Found": 1, "Internal Server Error": 1}
+
+
+def test_split_range():
+    """[test_activity_rollup_service-002] 取得範囲が集計済みの終了日時で分割されること。"""
+    # Arrange
+    rolled_until = datetime(2026, 1, 10, 12, tzinfo=UTC)
+    start = datetime(2026, 1, 10, tzinfo=UTC)
+    end = datetime(2026, 1, 11, tzinfo=UTC)
+
+    # Act & Assert
+    assert split_range(start, end, None) == (None, (start, end))
+    assert split_range(start, end, rolled_until) == ((start, rolled_until), (rolled_until, end))
+    assert split_range(None, None, rolled_until) == ((None, rolled_until), (rolled_until, None))
+    assert split_range(rolled_until + timedelta(hours=1), None, rolled_until) == (
+        None,
+        (rolled_until + timedelta(hours=1), None),
+    )
@@ -0,0 +1,90 @@
+"""ストレージ使用量サービスのテスト。"""
+
+import uuid
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Project, ProjectFile, ProjectStorageUsage, UserAccount
+from app.services.admin.statistics_service import StatisticsService
+from app.services.admin.storage_usage_service import StorageUsageService
+
+
+async def _create_project(db_session: AsyncSession) -> tuple[UserAccount, Project]:
+    user = UserAccount(
+        azure_oid=f"azure-oid-{uuid.uuid4()}",
+        email=f"test-{uuid.uuid4()}@example.com",
+        display_name="Test User",
+    )
+    db_session.add(user)
+    await db_session.flush()
+    project = Project(
+        name="Test Project",
+        code=f"TEST-{uuid.uuid4().hex[:6]}",
+        created_by=user.id,
+        is_active=True,
+    )
+    db_session.add(project)
+    await db_session.flush()
+    return user, project
+
+
+def _project_file(project: Project, user: UserAccount, file_size: int) -> ProjectFile:
+    return ProjectFile(
+        project_id=project.id,
+        filename=f"{uuid.uuid4()}.pdf",
+        original_filename="test.pdf",
+        file_path=f"projects/{project.id}/{uuid.uuid4()}.pdf",
+        file_size=file_size,
+        mime_type="application/pdf",
+        uploaded_by=user.id,
+    )
+
+
+@pytest.mark.asyncio
+async def test_usage_updated_on_file_add_and_delete(db_session: AsyncSession):
+    """[test_storage_usage_service-001] ファイルの追加・削除で使用量が差分更新されること。"""
+    # Arrange
+    user, project = await _create_project(db_session)
+    kept = _project_file(project, user, 1000)
+    removed = _project_file(project, user, 300)
+    db_session.add_all([kept, removed])
+    await db_session.commit()
+
+    # Act
+    await db_session.delete(removed)
+    await db_session.commit()
+    usage = await db_session.get(ProjectStorageUsage, project.id, populate_existing=True)
+    overview = await StatisticsService(db_session).get_overview()
+
+    # Assert
+    assert usage is not None
+    assert usage.file_count == 1
+    assert usage.total_bytes == 1000
+    assert overview.storage.total_bytes == 1000
+
+
+@pytest.mark.asyncio
+async def test_reconcile_detects_orphan_and_missing_blobs(db_session: AsyncSession):
+    """[test_storage_usage_service-002] 整合処理でストレージとの不整合が検出され、使用量が再計算されること。"""
+    # Arrange
+    user, project = await _create_project(db_session)
+    project_file = _project_file(project, user, 500)
+    missing = _project_file(project, user, 200)
+    db_session.add_all([project_file, missing])
+    await db_session.commit()
+    storage = AsyncMock()
+    storage.list_blobs.return_value = [project_file.file_path, f"projects/{project.id}/orphan.pdf"]
+    service = StorageUsageService(db_session, storage=storage)
+
+    # Act
+    result = await service.reconcile()
+    trend = await StatisticsService(db_session).get_storage_statistics(days=7)
+
+    # Assert
+    storage.list_blobs.assert_awaited_once_with("", prefix="projects/")
+    assert result == {"blob_count": 2, "orphan_blob_count": 1, "missing_blob_count": 1}
+    assert trend.total_bytes == 700
+    assert len(trend.usage_trend) == 7
+    assert trend.usage_trend[-1].value == 700.0
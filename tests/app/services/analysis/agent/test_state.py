@@ -355,6 +355,101 @@ def test_apply_invalid_step_type():
     assert "不明なステップタイプ" in str(exc_info.value)
 
 
+def create_state_with_branching_steps() -> AnalysisState:
+    """step_0 / step_1 がoriginalを、step_2 がstep_0を参照するAnalysisStateを作成します。"""
+    state = create_empty_state()
+    state.add_step("日本フィルタ", "filter", "original")
+    state.set_filter(0, {"category_filter": {"地域": ["日本"]}, "numeric_filter": {}, "table_filter": {}})
+    state.add_step("売上フィルタ", "filter", "original")
+    state.set_filter(1, {"category_filter": {"科目": ["売上"]}, "numeric_filter": {}, "table_filter": {}})
+    state.add_step("営業フィルタ", "filter", "step_0")
+    state.set_filter(2, {"category_filter": {"部門": ["営業"]}, "numeric_filter": {}, "table_filter": {}})
+    return state
+
+
+def test_apply_skips_unchanged_step():
+    """[test_state-043] 設定と上流が変わっていないステップは再計算されない。"""
+    # Arrange
+    state = create_state_with_filter_step()
+    state.apply(0)
+    result_data = state.all_steps[0]["result_data"]
+    fingerprint = state.all_steps[0]["fingerprint"]
+
+    # Act
+    state.apply(0)
+
+    # Assert
+    assert fingerprint is not None
+    assert state.all_steps[0]["fingerprint"] == fingerprint
+    assert state.all_steps[0]["result_data"] is result_data
+
+
+def test_apply_recomputes_only_dependent_steps():
+    """[test_state-044] 依存関係のある下流ステップのみ再計算される。"""
+    # Arrange
+    state = create_state_with_branching_steps()
+    independent_result = state.all_steps[1]["result_data"]
+    dependent_fingerprint = state.all_steps[2]["fingerprint"]
+
+    # Act
+    state.set_filter(
+        0,
+        {
+            "category_filter": {"地域": ["日本"]},
+            "numeric_filter": {
+                "column": "値",
+                "filter_type": "range",
+                "enable_min": True,
+                "min_value": 600.0,
+                "include_min": True,
+                "enable_max": False,
+                "max_value": 100.0,
+                "include_max": True,
+            },
+            "table_filter": {},
+        },
+    )
+
+    # Assert
+    assert state.get_downstream_steps(0) == [2]
+    assert state.all_steps[1]["result_data"] is independent_result
+    assert state.all_steps[2]["fingerprint"] != dependent_fingerprint
+    assert state.all_steps[2]["result_data"]["値"].tolist() == [1000]
+
+
+def test_get_dependencies_includes_table_filter():
+    """[test_state-045] テーブルフィルタのtable_dfも依存関係に含まれる。"""
+    # Arrange
+    state = create_state_with_branching_steps()
+    state.all_steps[2]["config"]["table_filter"] = {
+        "table_df": "step_1",
+        "key_columns": ["部門"],
+        "exclude_mode": False,
+        "enable": True,
+    }
+
+    # Act
+    dependencies = state.get_dependencies(2)
+
+    # Assert
+    assert dependencies == [0, 1]
+    assert state.get_downstream_steps(1) == [2]
+
+
+def test_set_source_data_invalidates_fingerprint():
+    """[test_state-046] 元データを差し替えるとフィンガープリントが変わる。"""
+    # Arrange
+    state = create_state_with_filter_step()
+    state.apply(0)
+    fingerprint = state.all_steps[0]["fingerprint"]
+
+    # Act
+    state.set_source_data(create_test_dataframe())
+
+    # Assert
+    assert state.compute_fingerprint(0) != fingerprint
+
+
 # ================================================================================
 # get_filter / set_filter テスト
 # ================================================================================
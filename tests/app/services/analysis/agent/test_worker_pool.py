@@ -0,0 +1,140 @@
+"""AgentWorkerPoolのテスト。
+
+このテストファイルは、分析エージェント実行プールをテストします。
+
+対応メソッド:
+    - run: スレッドプールでの同期関数実行
+    - chat_slot: チャット実行枠の確保（同時実行数制限、待機数上限）
+    - AnalysisStateTool._arun: 実行プールでのツール実行
+    - ToolTrackingHandler: 並行実行時のツール出力の対応付け
+"""
+
+import asyncio
+import threading
+import uuid
+
+import pandas as pd
+import pytest
+
+from app.core.exceptions import ServiceUnavailableError
+from app.services.analysis.agent.state import AnalysisState
+from app.services.analysis.agent.utils.tools import GetStepOverviewTool, ToolTrackingHandler
+from app.services.analysis.agent.worker_pool import AgentWorkerPool
+
+
+@pytest.fixture
+def pool():
+    """テスト用の実行プールを提供します。"""
+    worker_pool = AgentWorkerPool(max_workers=2, max_concurrency=1, max_queue=1)
+    yield worker_pool
+    worker_pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_run_in_worker_thread(pool):
+    """[test_worker_pool-001] 同期関数がイベントループとは別のワーカースレッドで実行されること。"""
+    # Arrange
+    loop_thread = threading.current_thread().name
+
+    # Act
+    result = await pool.run(lambda x, y=0: (threading.current_thread().name, x + y), 1, y=2)
+
+    # Assert
+    thread_name, value = result
+    assert value == 3
+    assert thread_name != loop_thread
+    assert thread_name.startswith("analysis-agent")
+
+
+@pytest.mark.asyncio
+async def test_chat_slot_limits_concurrency(pool):
+    """[test_worker_pool-002] 同時実行数の上限を超えたチャットは枠が空くまで待機すること。"""
+    # Arrange
+    release = asyncio.Event()
+    order: list[str] = []
+
+    async def first():
+        async with pool.chat_slot():
+            order.append("first-start")
+            await release.wait()
+            order.append("first-end")
+
+    async def second():
+        async with pool.chat_slot():
+            order.append("second-start")
+
+    # Act
+    first_task = asyncio.create_task(first())
+    await asyncio.sleep(0)
+    second_task = asyncio.create_task(second())
+    await asyncio.sleep(0.01)
+    waiting = pool.waiting
+    release.set()
+    await asyncio.gather(first_task, second_task)
+
+    # Assert
+    assert waiting == 1
+    assert order == ["first-start", "first-end", "second-start"]
+    assert pool.active == 0
+    assert pool.waiting == 0
+
+
+@pytest.mark.asyncio
+async def test_chat_slot_rejects_when_queue_full(pool):
+    """[test_worker_pool-003] 待機数が上限に達している場合はServiceUnavailableErrorになること。"""
+    # Arrange
+    release = asyncio.Event()
+
+    async def hold():
+        async with pool.chat_slot():
+            await release.wait()
+
+    running = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+    queued = asyncio.create_task(hold())
+    await asyncio.sleep(0.01)
+
+    # Act & Assert
+    with pytest.raises(ServiceUnavailableError) as exc_info:
+        async with pool.chat_slot():
+            pass
+    assert exc_info.value.status_code == 503
+
+    release.set()
+    await asyncio.gather(running, queued)
+
+
+@pytest.mark.asyncio
+async def test_tool_arun_serialized_with_state_lock():
+    """[test_worker_pool-004] 同じロックを共有するツールの非同期実行が直列化され、結果が返されること。"""
+    # Arrange
+    df = pd.DataFrame({"地域": ["日本"], "科目": ["売上"], "値": [100]})
+    state = AnalysisState(df, [], [])
+    state.add_step("フィルタ", "filter", "original")
+    lock = asyncio.Lock()
+    tools = [GetStepOverviewTool(state), GetStepOverviewTool(state)]
+    for tool in tools:
+        tool.bind_state_lock(lock)
+
+    # Act
+    results = await asyncio.gather(*[tool.arun("") for tool in tools])
+
+    # Assert
+    assert all("フィルタ" in result for result in results)
+    assert not lock.locked()
+
+
+def test_tool_tracking_handler_matches_output_by_run_id():
+    """[test_worker_pool-005] 並行実行されたツールの出力が開始時の呼び出しに対応付けられること。"""
+    # Arrange
+    handler = ToolTrackingHandler()
+    first_id, second_id = uuid.uuid4(), uuid.uuid4()
+    handler.on_tool_start({"name": "get_filter"}, "0", run_id=first_id)
+    handler.on_tool_start({"name": "get_step_overview"}, "", run_id=second_id)
+
+    # Act
+    handler.on_tool_end("フィルタ設定", run_id=first_id)
+    handler.on_tool_end("ステップ概要", run_id=second_id)
+
+    # Assert
+    assert [usage["output"] for usage in handler.tool_usage] == ["フィルタ設定", "ステップ概要"]
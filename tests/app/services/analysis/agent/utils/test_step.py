@@ -10,6 +10,8 @@
     - filter_data: データフィルタリング
 """
 
+import time
+
 import numpy as np
 import pandas as pd
 import pytest
@@ -320,6 +322,97 @@ def test_apply_aggregation_missing_column():
     assert "存在しません" in str(exc_info.value)
 
 
+def test_apply_aggregation_multiple_methods_order():
+    """[test_step-037] 複数科目・複数集計方法の結果が元の組み合わせ順・科目名順で並ぶこと。"""
+    # Arrange
+    df = pd.DataFrame(
+        {
+            "地域": ["日本", "アメリカ", "日本", "アメリカ", "日本", "アメリカ"],
+            "科目": ["売上", "売上", "売上", "コスト", "コスト", "コスト"],
+            "値": [1000, 1500, "不明", 300, 500, 900],
+        }
+    )
+    step_data = create_step_data_for_aggregation()
+    step_data["config"]["aggregation_config"] = [
+        {"name": "売上合計", "subject": "売上", "method": "sum"},
+        {"name": "コスト最大", "subject": "コスト", "method": "max"},
+        {"name": "件数", "subject": "コスト", "method": "count"},
+        {"name": "原価率", "subject": ["コスト最大", "売上合計"], "method": "/"},
+    ]
+
+    # Act
+    apply_aggregation(df, step_data)
+
+    # Assert
+    result = step_data["result_data"]
+    assert list(result.columns) == ["地域", "科目", "値"]
+    assert result.values.tolist() == [
+        ["日本", "コスト最大", 500],
+        ["日本", "件数", 1],
+        ["日本", "原価率", 0.5],
+        ["日本", "売上合計", 1000],
+        ["アメリカ", "コスト最大", 900],
+        ["アメリカ", "件数", 2],
+        ["アメリカ", "原価率", 0.6],
+        ["アメリカ", "売上合計", 1500],
+    ]
+
+
+def test_apply_aggregation_divide_by_zero():
+    """[test_step-038] 0/0は0、それ以外の0除算はNaNになること。"""
+    # Arrange
+    df = pd.DataFrame(
+        {
+            "地域": ["日本", "日本", "アメリカ", "アメリカ"],
+            "科目": ["売上", "数量", "売上", "数量"],
+            "値": [0, 0, 1500, 0],
+        }
+    )
+    step_data = create_step_data_for_aggregation()
+    step_data["config"]["aggregation_config"] = [
+        {"name": "売上合計", "subject": "売上", "method": "sum"},
+        {"name": "数量合計", "subject": "数量", "method": "sum"},
+        {"name": "単価", "subject": ["売上合計", "数量合計"], "method": "/"},
+    ]
+
+    # Act
+    apply_aggregation(df, step_data)
+
+    # Assert
+    result = step_data["result_data"]
+    unit_price = result[result["科目"] == "単価"].set_index("地域")["値"]
+    assert unit_price["日本"] == 0
+    assert np.isnan(unit_price["アメリカ"])
+
+
+def test_apply_aggregation_many_subjects_large_data():
+    """[test_step-039] 30科目の集計が大規模データでも1回のgroupbyで高速に処理されること。"""
+    # Arrange
+    regions = [f"地域{i}" for i in range(100)]
+    products = [f"製品{i}" for i in range(100)]
+    subjects = [f"科目{i}" for i in range(30)]
+    index = pd.MultiIndex.from_product([regions, products, subjects], names=["地域", "製品", "科目"])
+    df = index.to_frame(index=False)
+    df["値"] = np.arange(len(df)) % 97
+    step_data = create_step_data_for_aggregation()
+    step_data["config"]["aggregation_config"] = [
+        {"name": f"{subject}合計", "subject": subject, "method": "sum"} for subject in subjects
+    ]
+
+    # Act
+    start = time.perf_counter()
+    apply_aggregation(df, step_data)
+    elapsed = time.perf_counter() - start
+
+    # Assert
+    result = step_data["result_data"]
+    assert len(df) == 300_000
+    assert len(result) == 100 * 30
+    expected = df[(df["地域"] == "地域0") & (df["科目"] == "科目0")]["値"].sum()
+    assert result[(result["地域"] == "地域0") & (result["科目"] == "科目0合計")]["値"].iloc[0] == expected
+    assert elapsed < 5.0
+
+
 # ================================================================================
 # apply_filters テスト
 # ================================================================================
@@ -540,6 +633,83 @@ def test_filter_data_table_filter_include():
     assert all(result["地域"] == "日本")
 
 
+def test_filter_data_combined_filters_topk_after_category():
+    """[test_step-040] 組み合わせ時、TopKはカテゴリフィルタ後の行から選ばれ、数値でない行は保持されること。"""
+    # Arrange
+    df = pd.DataFrame(
+        {
+            "地域": ["日本", "日本", "アメリカ", "日本", "日本", "アメリカ"],
+            "部門": ["営業", "開発", "営業", "開発", "営業", "開発"],
+            "値": [100, 300, 900, "不明", 200, 800],
+        }
+    )
+    numeric_filter = {"column": "値", "filter_type": "topk", "k_value": 2, "ascending": False}
+    table_filter = [{"key_columns": ["部門"], "exclude_mode": True}, pd.DataFrame({"部門": ["営業"]})]
+
+    # Act
+    topk_result = filter_data(df, category_filter={"地域": ["日本"]}, numeric_filter=numeric_filter)
+    combined_result = filter_data(
+        df,
+        category_filter={"地域": ["日本"]},
+        numeric_filter=numeric_filter,
+        table_filter=table_filter,
+    )
+
+    # Assert
+    assert topk_result["値"].tolist() == [300, "不明", 200]
+    assert topk_result.index.tolist() == [1, 3, 4]
+    assert combined_result["値"].tolist() == [300, "不明"]
+    assert combined_result["部門"].tolist() == ["開発", "開発"]
+
+
+def test_filter_data_table_filter_multiple_keys():
+    """[test_step-041] 複数キー列のテーブルフィルタで、キーの組み合わせ単位で除外されること（元データは変更されない）。"""
+    # Arrange
+    df = create_test_dataframe()
+    original = df.copy()
+    exclude_df = pd.DataFrame({"地域": ["日本", "アメリカ", "日本"], "部門": ["営業", "開発", "営業"]})
+    table_filter = [{"key_columns": ["地域", "部門"], "exclude_mode": True}, exclude_df]
+
+    # Act
+    result = filter_data(df, table_filter=table_filter)
+
+    # Assert
+    assert list(zip(result["地域"], result["部門"], strict=True)) == [("日本", "開発"), ("アメリカ", "営業")]
+    pd.testing.assert_frame_equal(df, original)
+
+
+def test_apply_filters_large_data():
+    """[test_step-042] 100万行のデータでカテゴリ・TopK・テーブルフィルタの組み合わせが高速に処理されること。"""
+    # Arrange
+    rows = 1_000_000
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "地域": rng.choice(["日本", "アメリカ", "イギリス", "ドイツ"], rows),
+            "製品": rng.choice([f"製品{i}" for i in range(200)], rows),
+            "科目": rng.choice(["売上", "原価"], rows),
+            "値": rng.normal(size=rows),
+        }
+    )
+    exclude_df = pd.DataFrame({"製品": [f"製品{i}" for i in range(0, 200, 3)]})
+    step_data = create_step_data_for_filter()
+    step_data["config"]["category_filter"] = {"地域": ["日本", "アメリカ"]}
+    step_data["config"]["numeric_filter"] = {"column": "値", "filter_type": "topk", "k_value": 1000, "ascending": False}
+    step_data["config"]["table_filter"] = {"enable": True, "key_columns": ["製品"], "exclude_mode": True}
+
+    # Act
+    start = time.perf_counter()
+    apply_filters(df, step_data, exclude_df)
+    elapsed = time.perf_counter() - start
+
+    # Assert
+    result = step_data["result_data"]
+    assert 0 < len(result) <= 1000
+    assert set(result["地域"]) <= {"日本", "アメリカ"}
+    assert not result["製品"].isin(exclude_df["製品"]).any()
+    assert elapsed < 5.0
+
+
 # ================================================================================
 # apply_transform テスト
 # ================================================================================
@@ -675,6 +845,125 @@ def test_apply_transform_empty_data():
     assert step_data["result_data"] is None or step_data["result_data"].empty
 
 
+def test_apply_transform_add_subject_formula():
+    """[test_step-033] 計算式で科目追加（軸の組み合わせごと、存在しない科目は0）。"""
+    # Arrange
+    df = create_test_dataframe()
+    step_data = create_step_data_for_transform()
+    step_data["config"]["transform_config"]["operations"] = [
+        {
+            "operation_type": "add_subject",
+            "target_name": "利益",
+            "calculation": {"type": "formula", "formula_type": "-", "operands": ["売上", "コスト"]},
+        }
+    ]
+
+    # Act
+    apply_transform(df, step_data)
+
+    # Assert
+    result = step_data["result_data"]
+    profit = result[result["科目"] == "利益"]
+    assert len(result) == len(df) + 4
+    assert profit[["地域", "部門", "値"]].values.tolist() == [
+        ["日本", "営業", 500],
+        ["日本", "開発", 2000],
+        ["アメリカ", "営業", 1500],
+        ["アメリカ", "開発", 1700],
+    ]
+
+
+def test_apply_transform_add_subject_divide_by_zero():
+    """[test_step-034] 0除算の結果は0になること。"""
+    # Arrange
+    df = pd.DataFrame(
+        {
+            "地域": ["日本", "日本", "アメリカ", "アメリカ"],
+            "科目": ["売上", "数量", "売上", "数量"],
+            "値": [1000, 4, 1500, 0],
+        }
+    )
+    step_data = create_step_data_for_transform()
+    step_data["config"]["transform_config"]["operations"] = [
+        {
+            "operation_type": "add_subject",
+            "target_name": "単価",
+            "calculation": {"type": "formula", "formula_type": "/", "operands": ["売上", "数量"]},
+        }
+    ]
+
+    # Act
+    apply_transform(df, step_data)
+
+    # Assert
+    result = step_data["result_data"]
+    assert result[result["科目"] == "単価"]["値"].tolist() == [250.0, 0.0]
+
+
+def test_apply_transform_modify_subject():
+    """[test_step-035] 既存科目の変更（別科目のコピー、定数との計算）。"""
+    # Arrange
+    df = create_test_dataframe()
+    step_data = create_step_data_for_transform()
+    step_data["config"]["transform_config"]["operations"] = [
+        {
+            "operation_type": "modify_subject",
+            "target_name": "コスト",
+            "calculation": {"type": "copy", "copy_from": "売上"},
+        },
+        {
+            "operation_type": "modify_subject",
+            "target_name": "売上",
+            "calculation": {"type": "formula", "formula_type": "*", "operands": ["売上"], "constant_value": 2},
+        },
+    ]
+
+    # Act
+    apply_transform(df, step_data)
+
+    # Assert
+    result = step_data["result_data"]
+    assert len(result) == len(df)
+    assert result["値"].tolist() == [2000, 4000, 3000, 5000, 1000, 2500]
+
+
+def test_apply_transform_subject_operations_large_data():
+    """[test_step-036] 10万行超のデータで科目の追加・変更が列演算で高速に処理されること。"""
+    # Arrange
+    regions = [f"地域{i}" for i in range(200)]
+    products = [f"製品{i}" for i in range(200)]
+    index = pd.MultiIndex.from_product([regions, products, ["売上", "コスト", "数量"]], names=["地域", "製品", "科目"])
+    df = index.to_frame(index=False)
+    df["値"] = np.arange(len(df)) % 1000 + 1
+    step_data = create_step_data_for_transform()
+    step_data["config"]["transform_config"]["operations"] = [
+        {
+            "operation_type": "add_subject",
+            "target_name": "利益",
+            "calculation": {"type": "formula", "formula_type": "-", "operands": ["売上", "コスト"]},
+        },
+        {
+            "operation_type": "modify_subject",
+            "target_name": "数量",
+            "calculation": {"type": "formula", "formula_type": "/", "operands": ["利益", "数量"]},
+        },
+    ]
+
+    # Act
+    start = time.perf_counter()
+    apply_transform(df, step_data)
+    elapsed = time.perf_counter() - start
+
+    # Assert
+    result = step_data["result_data"]
+    assert len(df) == 120_000
+    assert len(result) == 160_000
+    first = result[(result["地域"] == "地域0") & (result["製品"] == "製品0")].set_index("科目")["値"]
+    assert first["利益"] == -1
+    assert first["数量"] == pytest.approx(-1 / 3)
+    assert elapsed < 5.0
+
+
 # ================================================================================
 # init_category_filter テスト
 # ================================================================================
@@ -310,3 +310,84 @@ async def test_delete_chat_message_chat_not_found(db_session: AsyncSession):
             await service.delete_chat_message(project_id, session_id, chat_id)
 
         assert "Chat message not found" in str(exc_info.value)
+
+
+async def create_chat_history(db_session: AsyncSession, snapshot_id: uuid.UUID, count: int) -> None:
+    """テスト用のチャット履歴を一括作成します。"""
+    from app.repositories.analysis import AnalysisChatRepository
+
+    await AnalysisChatRepository(db_session).bulk_create(
+        snapshot_id=snapshot_id,
+        chat_list=[("user" if i % 2 else "assistant", f"メッセージ{i}") for i in range(count)],
+        start_order=0,
+    )
+
+
+@pytest.mark.asyncio
+async def test_create_snapshot_bulk_copy(db_session: AsyncSession, test_data_seeder):
+    """[test_analysis_operations-011] スナップショット作成時にステップ・チャットが件数に関わらず一括コピーされること。"""
+    from sqlalchemy import event
+
+    from app.schemas.analysis import AnalysisSnapshotCreate
+
+    # Arrange
+    data = await test_data_seeder.seed_analysis_session_dataset()
+    session, snapshot = data["session"], data["snapshot"]
+    session.current_snapshot_id = snapshot.id
+    for i in range(30):
+        await test_data_seeder.create_analysis_step(snapshot=snapshot, name=f"ステップ{i}", step_order=i, config={"i": i})
+    await create_chat_history(db_session, snapshot.id, 5)
+    await db_session.commit()
+
+    service = AnalysisSessionAnalysisService(db_session)
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db_session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", record)
+
+    # Act
+    try:
+        result = await service.create_snapshot(data["project"].id, session.id, AnalysisSnapshotCreate())
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    # Assert
+    assert [step.name for step in result.step] == [f"ステップ{i}" for i in range(30)]
+    assert [step.config for step in result.step] == [{"i": i} for i in range(30)]
+    assert [chat.chat_order for chat in result.chat] == list(range(5))
+    inserts = [s for s in statements if s.lstrip().upper().startswith("INSERT INTO ANALYSIS_STEP")]
+    assert len(inserts) == 1
+    assert len([s for s in statements if s.lstrip().upper().startswith("INSERT INTO ANALYSIS_CHAT")]) == 1
+
+
+@pytest.mark.asyncio
+async def test_create_snapshot_shares_step_configs(db_session: AsyncSession, test_data_seeder):
+    """[test_analysis_operations-012] スナップショット間で同じステップ設定が共有され、一覧取得時に解決されること。"""
+    from sqlalchemy import func, select
+
+    from app.models.analysis import AnalysisStepConfig
+    from app.schemas.analysis import AnalysisSnapshotCreate
+
+    # Arrange
+    data = await test_data_seeder.seed_analysis_session_dataset()
+    project, session, snapshot = data["project"], data["session"], data["snapshot"]
+    session.current_snapshot_id = snapshot.id
+    config = {"result_table": [{"科目": "売上", "値": i} for i in range(100)]}
+    for i in range(3):
+        await test_data_seeder.create_analysis_step(snapshot=snapshot, name=f"ステップ{i}", step_order=i, config=config | {"i": i})
+    await db_session.commit()
+    service = AnalysisSessionAnalysisService(db_session)
+
+    # Act
+    await service.create_snapshot(project.id, session.id, AnalysisSnapshotCreate())
+    snapshots = await service.list_snapshots(project.id, session.id)
+
+    # Assert
+    config_count = await db_session.scalar(select(func.count()).select_from(AnalysisStepConfig))
+    assert config_count == 3
+    assert len(snapshots) == 2
+    for snap in snapshots:
+        assert [step.config for step in snap.step] == [config | {"i": i} for i in range(3)]
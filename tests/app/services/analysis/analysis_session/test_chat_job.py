@@ -0,0 +1,161 @@
+"""AIチャット実行ジョブのテスト。
+
+このテストファイルは、チャット実行ジョブの受付・実行・イベント配信をテストします。
+
+対応メソッド:
+    - ChatJobManager.submit: ジョブ受付（プロジェクト毎の同時実行数、実行待ち数上限）
+    - ChatJobManager._run: ジョブ実行（成功、タイムアウト）
+    - ChatJob.stream_sse: Server-Sent Events形式のイベント配信（Last-Event-IDからの再開）
+"""
+
+import asyncio
+import uuid
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.exceptions import ServiceUnavailableError
+from app.services.analysis.analysis_session.chat_job import ChatJob, ChatJobManager
+
+
+@asynccontextmanager
+async def fake_session():
+    """ジョブ実行用のダミーDBセッションを提供します。"""
+    yield None
+
+
+@pytest.fixture
+def manager():
+    """テスト用のジョブマネージャーを提供します。"""
+    job_manager = ChatJobManager(
+        max_runs_per_project=1,
+        max_pending_per_project=1,
+        timeout_seconds=1.0,
+        retention_seconds=3600,
+    )
+    job_manager.session_factory = fake_session
+    return job_manager
+
+
+def create_runner(release: asyncio.Event | None = None):
+    """進捗イベントを発行して結果を返すジョブ本体を作成します。"""
+
+    async def runner(job: ChatJob, db):
+        job.publish("tool_start", {"tool": "add_step", "input": "{}"})
+        if release is not None:
+            await release.wait()
+        job.publish("tool_end", {"tool": "add_step", "output": "ok"})
+        return SimpleNamespace(current_snapshot=1)
+
+    return runner
+
+
+def submit(manager: ChatJobManager, project_id: uuid.UUID, runner) -> ChatJob:
+    """ジョブを受け付けます。"""
+    return manager.submit(project_id, uuid.uuid4(), uuid.uuid4(), "売上を分析してください", runner)
+
+
+@pytest.mark.asyncio
+async def test_submit_and_run_success(manager):
+    """[test_chat_job-001] ジョブが実行され、進捗イベントと完了イベントが記録されること。"""
+    # Arrange
+    project_id = uuid.uuid4()
+
+    # Act
+    job = submit(manager, project_id, create_runner())
+    finished = await manager.wait(job.id)
+
+    # Assert
+    assert finished.status == "succeeded"
+    assert finished.result.current_snapshot == 1
+    assert [event.event for event in finished.events] == ["status", "status", "tool_start", "tool_end", "completed"]
+    assert finished.events[-1].data == {"status": "succeeded", "current_snapshot": 1}
+    assert manager.get(job.id) is job
+
+
+@pytest.mark.asyncio
+async def test_submit_queues_over_project_limit(manager):
+    """[test_chat_job-002] プロジェクトの同時実行数を超えたジョブは実行待ちになり、順番に実行されること。"""
+    # Arrange
+    project_id = uuid.uuid4()
+    release = asyncio.Event()
+
+    # Act
+    first = submit(manager, project_id, create_runner(release))
+    second = submit(manager, project_id, create_runner())
+    other = submit(manager, uuid.uuid4(), create_runner())
+    await asyncio.sleep(0.01)
+    statuses = (first.status, second.status, other.status)
+    release.set()
+    await manager.wait(second.id)
+
+    # Assert
+    assert statuses == ("running", "queued", "succeeded")
+    assert first.status == "succeeded"
+    assert second.status == "succeeded"
+    assert second.started_at >= first.finished_at
+
+
+@pytest.mark.asyncio
+async def test_submit_rejects_when_pending_full(manager):
+    """[test_chat_job-003] 実行待ち数が上限に達している場合はServiceUnavailableErrorになること。"""
+    # Arrange
+    project_id = uuid.uuid4()
+    release = asyncio.Event()
+    submit(manager, project_id, create_runner(release))
+    queued = submit(manager, project_id, create_runner())
+
+    # Act & Assert
+    with pytest.raises(ServiceUnavailableError) as exc_info:
+        submit(manager, project_id, create_runner())
+    assert exc_info.value.status_code == 503
+
+    release.set()
+    await manager.wait(queued.id)
+
+
+@pytest.mark.asyncio
+async def test_run_timeout_marks_failed(manager):
+    """[test_chat_job-004] タイムアウトしたジョブは失敗となり、次の実行待ちジョブが開始されること。"""
+    # Arrange
+    manager.timeout_seconds = 0.05
+    project_id = uuid.uuid4()
+    never = asyncio.Event()
+
+    # Act
+    slow = submit(manager, project_id, create_runner(never))
+    queued = submit(manager, project_id, create_runner())
+    await manager.wait(slow.id)
+    await manager.wait(queued.id)
+
+    # Assert
+    assert slow.status == "failed"
+    assert "タイムアウト" in slow.error
+    assert slow.events[-1].event == "failed"
+    assert queued.status == "succeeded"
+
+
+@pytest.mark.asyncio
+async def test_stream_sse_resumes_from_last_event_id(manager):
+    """[test_chat_job-005] Last-Event-IDより後のイベントから配信され、ジョブ終了時にストリームが終了すること。"""
+    # Arrange
+    release = asyncio.Event()
+    job = submit(manager, uuid.uuid4(), create_runner(release))
+    await asyncio.sleep(0.01)
+
+    # Act
+    async def collect():
+        return [chunk async for chunk in job.stream_sse(last_event_id=2, heartbeat_seconds=0.01)]
+
+    stream_task = asyncio.create_task(collect())
+    await asyncio.sleep(0.03)
+    release.set()
+    chunks = await stream_task
+
+    # Assert
+    events = [chunk for chunk in chunks if not chunk.startswith(":")]
+    assert events[0].startswith("id: 3\nevent: tool_start\n")
+    assert events[-1].startswith("id: 5\nevent: completed\n")
+    assert '"tool": "add_step"' in events[0]
+    assert ": keep-alive\n\n" in chunks
@@ -5,14 +5,16 @@
 対応メソッド:
     - list_sessions: セッション一覧取得
     - create_session: セッション作成
-    - get_session: セッション詳細取得
+    - get_session: セッション詳細取得（軽量表示を含む）
     - delete_session: セッション削除
     - list_session_files: ファイル一覧取得
+    - get_file_rows: ファイルデータ行取得
     - upload_session_file: ファイルアップロード
     - update_file_config: ファイル設定更新
     - select_input_file: 入力ファイル選択
     - get_session_result: 分析結果取得
     - restore_snapshot: スナップショット復元
+    - duplicate_session: セッション複製
 """
 
 import uuid
@@ -486,3 +488,160 @@ async def test_restore_snapshot_not_found(db_session: AsyncSession, test_data_se
     # Act & Assert
     with pytest.raises(NotFoundError):
         await service.restore_snapshot(session_id=session.id, snapshot_order=999)
+
+
+# ================================================================================
+# セッション複製
+# ================================================================================
+
+
+@pytest.mark.asyncio
+async def test_duplicate_session_success(db_session: AsyncSession, test_data_seeder):
+    """[test_analysis_session-024] セッション複製でスナップショット・ステップ・チャット・ファイルが一括複製されること。"""
+    from sqlalchemy import event, select
+
+    from app.models.analysis import AnalysisSession, AnalysisSnapshot
+    from app.repositories.analysis import AnalysisChatRepository
+
+    # Arrange
+    data = await test_data_seeder.seed_analysis_session_dataset()
+    project, owner, session, first = data["project"], data["owner"], data["session"], data["snapshot"]
+    project_file = await test_data_seeder.create_project_file(project=project, uploader=owner)
+    analysis_file = await test_data_seeder.create_analysis_file(
+        session=session,
+        project_file=project_file,
+        data=[{"科目": "売上", "値": 100}],
+    )
+    snapshots = [first]
+    for order in range(1, 10):
+        snapshot = await test_data_seeder.create_analysis_snapshot(session=session, snapshot_order=order)
+        snapshot.parent_snapshot_id = snapshots[-1].id
+        snapshots.append(snapshot)
+    for snapshot in snapshots:
+        for i in range(3):
+            await test_data_seeder.create_analysis_step(
+                snapshot=snapshot,
+                name=f"ステップ{i}",
+                step_order=i,
+                step_type="filter",
+                config={"category_filter": {"科目": ["売上"]}, "numeric_filter": {}, "table_filter": {}, "i": i},
+            )
+        await AnalysisChatRepository(db_session).bulk_create(snapshot.id, [("user", "分析して"), ("assistant", "了解")], start_order=0)
+    session.current_snapshot_id = snapshots[5].id
+    session.input_file_id = analysis_file.id
+    await db_session.commit()
+
+    service = AnalysisSessionService(db_session)
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db_session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", record)
+
+    # Act
+    try:
+        result = await service.duplicate_session(project.id, session.id, owner.id)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    # Assert
+    assert result.id != session.id
+    assert result.current_snapshot == 5
+    assert [snap.snapshot_order for snap in result.snapshot_list] == list(range(10))
+    for snap in result.snapshot_list:
+        assert [step.name for step in snap.step] == ["ステップ0", "ステップ1", "ステップ2"]
+        assert [step.config["i"] for step in snap.step] == [0, 1, 2]
+        assert [chat.message for chat in snap.chat] == ["分析して", "了解"]
+    # 10スナップショット×（3ステップ＋2チャット）でもINSERTはテーブル毎に1回
+    inserts = [statement.split("(")[0].strip() for statement in statements if statement.startswith("INSERT")]
+    assert inserts == [
+        "INSERT INTO analysis_session",
+        "INSERT INTO analysis_snapshot",
+        "INSERT INTO analysis_step",
+        "INSERT INTO analysis_chat",
+        "INSERT INTO analysis_file",
+    ]
+
+    new_session = await db_session.scalar(select(AnalysisSession).where(AnalysisSession.id == result.id))
+    new_snapshots = (
+        await db_session.scalars(
+            select(AnalysisSnapshot).where(AnalysisSnapshot.session_id == result.id).order_by(AnalysisSnapshot.snapshot_order)
+        )
+    ).all()
+    assert new_snapshots[0].parent_snapshot_id is None
+    assert [snap.parent_snapshot_id for snap in new_snapshots[1:]] == [snap.id for snap in new_snapshots[:-1]]
+    assert new_session.current_snapshot_id == new_snapshots[5].id
+    assert new_session.input_file_id not in (None, analysis_file.id)
+
+
+@pytest.mark.asyncio
+async def test_get_session_compact(db_session: AsyncSession, test_data_seeder):
+    """[test_analysis_session-025] 軽量表示では現在のスナップショットのみ展開され、result_dataが指定範囲に絞られること。"""
+    # Arrange
+    data = await test_data_seeder.seed_analysis_session_dataset()
+    project, owner, session, first = data["project"], data["owner"], data["session"], data["snapshot"]
+    project_file = await test_data_seeder.create_project_file(project=project, uploader=owner)
+    analysis_file = await test_data_seeder.create_analysis_file(
+        session=session,
+        project_file=project_file,
+        data=[{"科目": "売上", "値": value} for value in range(5)],
+    )
+    snapshots = [first]
+    for order in range(1, 3):
+        snapshots.append(await test_data_seeder.create_analysis_snapshot(session=session, snapshot_order=order))
+    for snapshot in snapshots:
+        await test_data_seeder.create_analysis_step(
+            snapshot=snapshot,
+            name="フィルタ",
+            step_order=0,
+            step_type="filter",
+            config={"category_filter": {"科目": ["売上"]}, "numeric_filter": {}, "table_filter": {}},
+        )
+    session.current_snapshot_id = snapshots[1].id
+    session.input_file_id = analysis_file.id
+    await db_session.commit()
+    db_session.expunge_all()
+    service = AnalysisSessionService(db_session)
+
+    # Act
+    result = await service.get_session(project.id, session.id, compact=True, result_offset=1, result_limit=2)
+
+    # Assert
+    assert result.current_snapshot == 1
+    assert [snap.snapshot_order for snap in result.snapshot_list] == [0, 1, 2]
+    assert result.snapshot_list[0].step == [] and result.snapshot_list[2].step == []
+    step = result.snapshot_list[1].step[0]
+    assert step.result_data == [{"科目": "売上", "値": 1}, {"科目": "売上", "値": 2}]
+    assert step.result_data_total == 5
+    assert result.file_list[0].id == analysis_file.id
+    assert result.file_list[0].data is None
+
+
+@pytest.mark.asyncio
+async def test_get_file_rows(db_session: AsyncSession, test_data_seeder):
+    """[test_analysis_session-026] ファイルの入力データが指定範囲の行だけ取得できること。"""
+    # Arrange
+    data = await test_data_seeder.seed_analysis_session_dataset()
+    project, owner, session = data["project"], data["owner"], data["session"]
+    project_file = await test_data_seeder.create_project_file(project=project, uploader=owner)
+    analysis_file = await test_data_seeder.create_analysis_file(
+        session=session,
+        project_file=project_file,
+        data=[{"科目": "売上", "値": value} for value in range(5)],
+    )
+    await db_session.commit()
+    service = AnalysisSessionService(db_session)
+
+    # Act
+    result = await service.get_file_rows(project.id, session.id, analysis_file.id, skip=3, limit=10)
+
+    # Assert
+    assert result.file_id == analysis_file.id
+    assert result.rows == [{"科目": "売上", "値": 3}, {"科目": "売上", "値": 4}]
+    assert result.total == 5
+    assert (result.skip, result.limit) == (3, 10)
+
+    with pytest.raises(NotFoundError):
+        await service.get_file_rows(project.id, session.id, uuid.uuid4())
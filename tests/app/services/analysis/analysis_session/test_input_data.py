@@ -0,0 +1,139 @@
+"""分析入力データストアのテスト。
+
+このテストファイルは、分析入力データのParquet保存・読み込みをテストします。
+
+対応メソッド:
+    - save_input_data: Parquet保存（内容アドレス、JSONBフォールバック）
+    - load_input_frame: 読み込み（キャッシュ、既存JSONB行）
+"""
+
+import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pandas as pd
+import pytest
+
+from app.services.analysis.analysis_session.input_data import (
+    input_frame_cache,
+    load_input_frame,
+    save_input_data,
+)
+
+
+def create_input_dataframe() -> pd.DataFrame:
+    """テスト用の分析入力データを作成します。"""
+    return pd.DataFrame(
+        {
+            "地域": ["日本", "アメリカ", "日本", "アメリカ"],
+            "科目": ["売上", "売上", "原価", "原価"],
+            "値": [1000.0, 1500.0, 400.0, 600.0],
+        }
+    )
+
+
+def create_storage_mock(exists: bool = False) -> AsyncMock:
+    """アップロード内容を保持するストレージモックを作成します。"""
+    storage = AsyncMock()
+    uploaded: dict[str, bytes] = {}
+
+    async def upload(container: str, path: str, data: bytes) -> bool:
+        uploaded[path] = data
+        return True
+
+    async def download(container: str, path: str) -> bytes:
+        return uploaded[path]
+
+    storage.upload.side_effect = upload
+    storage.download.side_effect = download
+    storage.exists.return_value = exists
+    storage.uploaded = uploaded
+    return storage
+
+
+@pytest.mark.asyncio
+async def test_save_input_data_success():
+    """[test_input_data-001] Parquetとして保存され、パス・スキーマ・行数が返されること。"""
+    # Arrange
+    storage = create_storage_mock()
+    project_id = uuid.uuid4()
+    df = create_input_dataframe()
+
+    # Act
+    result = await save_input_data(storage, project_id, df)
+
+    # Assert
+    assert result["data_path"].startswith(f"analysis/input/{project_id}/")
+    assert result["data_path"].endswith(".parquet")
+    assert result["row_count"] == 4
+    assert result["data"] == []
+    assert [col["name"] for col in result["data_schema"]] == ["地域", "科目", "値"]
+    storage.upload.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_save_input_data_same_content_shares_path():
+    """[test_input_data-002] 同一内容は同じパスになり、既存の場合は再アップロードしないこと。"""
+    # Arrange
+    project_id = uuid.uuid4()
+    first = await save_input_data(create_storage_mock(), project_id, create_input_dataframe())
+    storage = create_storage_mock(exists=True)
+
+    # Act
+    second = await save_input_data(storage, project_id, create_input_dataframe())
+
+    # Assert
+    assert second["data_path"] == first["data_path"]
+    storage.upload.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_save_input_data_mixed_values_fallback_to_jsonb():
+    """[test_input_data-003] Parquetに変換できないデータはJSONBで保存されること。"""
+    # Arrange
+    storage = create_storage_mock()
+    df = pd.DataFrame({"科目": ["売上", "原価"], "値": [100, "abc"]})
+
+    # Act
+    result = await save_input_data(storage, uuid.uuid4(), df)
+
+    # Assert
+    assert result["data_path"] is None
+    assert result["data"] == [{"科目": "売上", "値": 100}, {"科目": "原価", "値": "abc"}]
+    storage.upload.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_load_input_frame_from_storage():
+    """[test_input_data-004] キャッシュにない場合はストレージから読み込みデコードされること。"""
+    # Arrange
+    storage = create_storage_mock()
+    df = create_input_dataframe()
+    result = await save_input_data(storage, uuid.uuid4(), df)
+    input_frame_cache.clear()
+    analysis_file = SimpleNamespace(data_path=result["data_path"], data=[])
+
+    # Act
+    frame = await load_input_frame(storage, analysis_file)
+    cached = await load_input_frame(storage, analysis_file)
+
+    # Assert
+    pd.testing.assert_frame_equal(frame, df)
+    assert cached is frame
+    storage.download.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_load_input_frame_legacy_jsonb():
+    """[test_input_data-005] data_pathがない既存行はdata（JSONB）から読み込まれること。"""
+    # Arrange
+    storage = create_storage_mock()
+    records = create_input_dataframe().to_dict(orient="records")
+    analysis_file = SimpleNamespace(data_path=None, data=records)
+
+    # Act
+    frame = await load_input_frame(storage, analysis_file)
+
+    # Assert
+    assert frame.to_dict(orient="records") == records
+    storage.download.assert_not_awaited()
@@ -45,7 +45,7 @@ async def test_init_service(db_session: AsyncSession):
             "get_session",
             ["project_id", "session_id"],
             {},
-            ["project_id", "session_id"],
+            ["project_id", "session_id", False, 0, None],
         ),
         (
             "delete_session",
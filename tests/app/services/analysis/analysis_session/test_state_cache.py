@@ -0,0 +1,163 @@
+"""AnalysisStateCacheのテスト。
+
+このテストファイルは、構築済みAnalysisStateのLRUキャッシュをテストします。
+
+対応メソッド:
+    - get/put: 取得・登録（ヒット/ミス、バージョン検証）
+    - バイト数上限による追い出し
+    - invalidate_session: セッション単位の無効化
+    - AnalysisState.clone: キャッシュ共有stateの複製
+"""
+
+import uuid
+
+import pandas as pd
+
+from app.services.analysis.agent.state import AnalysisState
+from app.services.analysis.analysis_session.state_cache import AnalysisStateCache, estimate_state_bytes
+
+
+def create_state(rows: int = 10) -> AnalysisState:
+    """テスト用のAnalysisStateを作成します。"""
+    df = pd.DataFrame(
+        {
+            "地域": ["日本"] * rows,
+            "科目": ["売上"] * rows,
+            "値": list(range(rows)),
+        }
+    )
+    steps = [
+        {
+            "name": "フィルタ",
+            "type": "filter",
+            "data_source": "original",
+            "config": {"category_filter": {"地域": ["日本"]}, "numeric_filter": {}, "table_filter": {}},
+        }
+    ]
+    return AnalysisState(df, steps, [("user", "こんにちは")])
+
+
+def create_key(session_id: uuid.UUID | None = None) -> tuple[uuid.UUID, uuid.UUID, uuid.UUID]:
+    """テスト用のキャッシュキーを作成します。"""
+    return (session_id or uuid.uuid4(), uuid.uuid4(), uuid.uuid4())
+
+
+def test_get_hit_and_miss():
+    """[test_state_cache-001] 登録済みキーはヒット、未登録キーはミスになること。"""
+    # Arrange
+    cache = AnalysisStateCache(max_bytes=10 * 1024 * 1024)
+    state = create_state()
+    key = create_key()
+
+    # Act
+    miss = cache.get(key, "v1")
+    cache.put(key, "v1", state)
+    hit = cache.get(key, "v1")
+
+    # Assert
+    assert miss is None
+    assert hit is state
+    assert len(cache) == 1
+    assert cache.current_bytes == estimate_state_bytes(state)
+
+
+def test_get_stale_version():
+    """[test_state_cache-002] バージョン不一致のエントリは破棄されミスになること。"""
+    # Arrange
+    cache = AnalysisStateCache(max_bytes=10 * 1024 * 1024)
+    key = create_key()
+    cache.put(key, "v1", create_state())
+
+    # Act
+    result = cache.get(key, "v2")
+
+    # Assert
+    assert result is None
+    assert len(cache) == 0
+    assert cache.current_bytes == 0
+
+
+def test_put_evicts_least_recently_used_by_bytes():
+    """[test_state_cache-003] バイト数上限を超えると最も古く使われたエントリから追い出されること。"""
+    # Arrange
+    size = estimate_state_bytes(create_state(rows=1000))
+    cache = AnalysisStateCache(max_bytes=size * 2 + size // 2)
+    key1, key2, key3 = create_key(), create_key(), create_key()
+    cache.put(key1, "v", create_state(rows=1000))
+    cache.put(key2, "v", create_state(rows=1000))
+    cache.get(key1, "v")  # key1を最近使用にする
+
+    # Act
+    cache.put(key3, "v", create_state(rows=1000))
+
+    # Assert
+    assert cache.get(key1, "v") is not None
+    assert cache.get(key2, "v") is None
+    assert cache.get(key3, "v") is not None
+    assert cache.current_bytes <= cache.max_bytes
+
+
+def test_put_skips_oversized_state():
+    """[test_state_cache-004] 単体で上限を超えるstateはキャッシュされないこと。"""
+    # Arrange
+    cache = AnalysisStateCache(max_bytes=1)
+    key = create_key()
+
+    # Act
+    cache.put(key, "v", create_state())
+
+    # Assert
+    assert len(cache) == 0
+    assert cache.get(key, "v") is None
+
+
+def test_invalidate_session():
+    """[test_state_cache-005] 指定セッションのエントリのみ破棄されること。"""
+    # Arrange
+    cache = AnalysisStateCache(max_bytes=10 * 1024 * 1024)
+    session_id = uuid.uuid4()
+    key1, key2, other = create_key(session_id), create_key(session_id), create_key()
+    for key in (key1, key2, other):
+        cache.put(key, "v", create_state())
+
+    # Act
+    removed = cache.invalidate_session(session_id)
+
+    # Assert
+    assert removed == 2
+    assert cache.get(key1, "v") is None
+    assert cache.get(key2, "v") is None
+    assert cache.get(other, "v") is not None
+
+
+def test_disabled_cache():
+    """[test_state_cache-006] max_bytesが0の場合はキャッシュしないこと。"""
+    # Arrange
+    cache = AnalysisStateCache(max_bytes=0)
+    key = create_key()
+
+    # Act
+    cache.put(key, "v", create_state())
+
+    # Assert
+    assert cache.enabled is False
+    assert cache.get(key, "v") is None
+
+
+def test_clone_isolated_from_cached_state():
+    """[test_state_cache-007] clone()したstateの変更がキャッシュ済みstateに影響しないこと。"""
+    # Arrange
+    state = create_state()
+    state.apply(0)
+
+    # Act
+    cloned = state.clone()
+    cloned.add_step(name="集計", type="aggregate", data="step_0")
+    cloned.all_steps[0]["config"]["category_filter"]["地域"].append("アメリカ")
+    cloned.chat_history.append(("assistant", "はい"))
+
+    # Assert
+    assert len(state.all_steps) == 1
+    assert state.all_steps[0]["config"]["category_filter"]["地域"] == ["日本"]
+    assert len(state.chat_history) == 1
+    assert cloned.all_steps[0]["result_data"] is state.all_steps[0]["result_data"]
@@ -4,16 +4,20 @@
 
 対応メソッド:
     - get_tree_data: ツリーデータ取得（計算実行）
+    - simulate_policies: 施策シミュレーション
     - download_simulation_output: シミュレーション結果ダウンロード
 """
 
 import uuid
+from unittest.mock import AsyncMock
 
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import NotFoundError
+from app.repositories.driver_tree import DriverTreeRepository
 from app.services.driver_tree.driver_tree.calculation import DriverTreeCalculationService
+from app.services.driver_tree.driver_tree_node import DriverTreeNodeService
 
 # ================================================================================
 # get_tree_data テスト
@@ -110,6 +114,85 @@ async def test_get_tree_data_not_found_errors(
         )
 
 
+@pytest.mark.asyncio
+async def test_get_tree_data_recalculates_changed_nodes(db_session: AsyncSession, test_data_seeder, monkeypatch):
+    """[test_calculation-009] ノードのデータ変更後はツリー全体を再コンパイルせず、変更ノードと祖先ノードのみ再計算されること。"""
+    # Arrange
+    data = await test_data_seeder.seed_driver_tree_dataset()
+    project = data["project"]
+    owner = data["owner"]
+    tree = data["tree"]
+    root_id = data["root_node"].id
+    child_ids = [node.id for node in data["child_nodes"]]
+    service = DriverTreeCalculationService(db_session)
+    node_service = DriverTreeNodeService(db_session)
+    await service.get_tree_data(project_id=project.id, tree_id=tree.id, user_id=owner.id)
+    # 以降はツリー全体の読み込みが行われないこと
+    monkeypatch.setattr(DriverTreeRepository, "get_calculation_graph", AsyncMock(side_effect=AssertionError))
+
+    # Act
+    for child_id, label in zip(child_ids, ["3", "5"], strict=True):
+        await node_service.update_node(project.id, child_id, label, "定数", None, None, None, None, owner.id)
+    result = await service.get_tree_data(project_id=project.id, tree_id=tree.id, user_id=owner.id)
+    await node_service.update_node(project.id, child_ids[0], "10", None, None, None, None, None, owner.id)
+    updated = await service.get_tree_data(project_id=project.id, tree_id=tree.id, user_id=owner.id)
+
+    # Assert
+    values = {item["node_id"]: item["records"][0]["値"] for item in result["calculated_data_list"]}
+    assert values == {root_id: 8.0, child_ids[0]: 3.0, child_ids[1]: 5.0}
+    assert updated["calculated_data_list"][0]["node_id"] == root_id
+    assert updated["calculated_data_list"][0]["records"] == [{"値": 15.0}]
+
+
+# ================================================================================
+# simulate_policies テスト
+# ================================================================================
+
+
+@pytest.mark.asyncio
+async def test_simulate_policies_ranks_combinations(db_session: AsyncSession, test_data_seeder):
+    """[test_calculation-010] 施策の全ての組み合わせが評価され、費用対効果の順に並ぶこと。"""
+    # Arrange
+    data = await test_data_seeder.seed_driver_tree_dataset()
+    project = data["project"]
+    owner = data["owner"]
+    tree = data["tree"]
+    child_nodes = data["child_nodes"]
+    node_service = DriverTreeNodeService(db_session)
+    for node, label in zip(child_nodes, ["3", "5"], strict=True):
+        await node_service.update_node(project.id, node.id, label, "定数", None, None, None, None, owner.id)
+    expensive = data["policy"]
+    expensive.cost = 30.0
+    expensive.duration_months = 6
+    cheap = await test_data_seeder.create_driver_tree_policy(node=child_nodes[1], label="低コスト施策", value=4.0)
+    cheap.cost = 2.0
+    await db_session.commit()
+    service = DriverTreeCalculationService(db_session)
+
+    # Act
+    result = await service.simulate_policies(
+        project_id=project.id,
+        tree_id=tree.id,
+        policy_id_list=None,
+        scenario_list=None,
+        user_id=owner.id,
+    )
+
+    # Assert
+    assert result["kpi_node_id"] == data["root_node"].id
+    assert result["baseline_value"] == 8.0
+    assert result["scenario_count"] == 3
+    scenarios = result["scenarios"]
+    assert [scenario["policy_id_list"] for scenario in scenarios] == [[cheap.id], [expensive.id, cheap.id], [expensive.id]]
+    assert [scenario["rank"] for scenario in scenarios] == [1, 2, 3]
+    assert [scenario["kpi_value"] for scenario in scenarios] == [12.0, 27.0, 23.0]
+    assert [scenario["difference"] for scenario in scenarios] == [4.0, 19.0, 15.0]
+    assert [scenario["total_cost"] for scenario in scenarios] == [2.0, 32.0, 30.0]
+    assert [scenario["duration_months"] for scenario in scenarios] == [None, 6, 6]
+    assert scenarios[0]["cost_effectiveness"] == 2.0
+    assert scenarios[0]["difference_percent"] == 50.0
+
+
 # ================================================================================
 # download_simulation_output テスト
 # ================================================================================
@@ -207,6 +207,43 @@ async def test_update_node_invalid_type(db_session: AsyncSession, test_data_seed
         )
 
 
+@pytest.mark.asyncio
+async def test_update_node_circular_reference(db_session: AsyncSession, test_data_seeder):
+    """[test_driver_tree_node-031] 子孫ノードを子ノードに設定する更新でValidationErrorになり、階層がレスポンスに含まれること。"""
+    # Arrange
+    data = await test_data_seeder.seed_driver_tree_dataset()
+    project = data["project"]
+    owner = data["owner"]
+    root_node = data["root_node"]
+    child_node1, child_node2 = data["child_nodes"]
+    # ルート → 子ノード1 → 子ノード2（子ノード2はルートの子でもある）
+    await test_data_seeder.create_driver_tree_relationship(
+        tree=data["tree"], parent_node=child_node1, child_nodes=[child_node2], operator="*"
+    )
+    await db_session.commit()
+
+    service = DriverTreeNodeService(db_session)
+    update_params = {
+        "project_id": project.id,
+        "label": None,
+        "node_type": None,
+        "position_x": None,
+        "position_y": None,
+        "operator": None,
+        "user_id": owner.id,
+    }
+
+    # Act
+    result = await service.update_node(**update_params, node_id=root_node.id, children_id_list=[child_node1.id, child_node2.id])
+    with pytest.raises(ValidationError) as exc_info:
+        await service.update_node(**update_params, node_id=child_node1.id, children_id_list=[root_node.id])
+
+    # Assert
+    levels = {node["node_id"]: node["level"] for node in result["tree"]["nodes"]}
+    assert levels == {root_node.id: 0, child_node1.id: 1, child_node2.id: 2}
+    assert exc_info.value.details["circular_path"] == [str(root_node.id), str(child_node1.id)]
+
+
 @pytest.mark.asyncio
 async def test_delete_node_success(db_session: AsyncSession, test_data_seeder):
     """[test_driver_tree_node-014] ノード削除の成功ケース。"""
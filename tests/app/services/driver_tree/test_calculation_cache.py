@@ -0,0 +1,75 @@
+"""TreeCalculationCacheのテスト。
+
+このテストファイルは、ドライバーツリー計算結果のLRUキャッシュをテストします。
+
+対応メソッド:
+    - get/put: 取得・登録（ヒット/ミス、バージョン検証）
+    - record_changes: 変更ノードの記録（変更ノードのみの再計算、全ノードの再計算）
+    - invalidate: ツリー単位の無効化
+"""
+
+import uuid
+
+import numpy as np
+
+from app.services.driver_tree.calculation_cache import TreeCalculation, TreeCalculationCache
+from app.services.driver_tree.tree_evaluator import CompiledTree, TreeRows
+
+
+def create_calculation(structure_version: int = 0, data_version: int = 0) -> TreeCalculation:
+    """テスト用の計算結果を作成します。"""
+    plan = CompiledTree(node_ids=(uuid.uuid4(),), labels=("1",), root_index=0, steps=(), constants={0: 1.0}, parents=((),))
+    return TreeCalculation(
+        plan=plan,
+        rows=TreeRows(columns=(), values=(), count=1),
+        values=np.ones((1, 1)),
+        structure_version=structure_version,
+        data_version=data_version,
+    )
+
+
+def test_get_validates_versions():
+    """[test_calculation_cache-001] バージョンが一致すればヒット、構造が異なればミス、データのみ異なれば全ノード再計算になること。"""
+    # Arrange
+    cache = TreeCalculationCache(max_entries=2)
+    tree_id = uuid.uuid4()
+    calculation = create_calculation(structure_version=1, data_version=3)
+
+    # Act
+    miss = cache.get(tree_id, 1, 3)
+    cache.put(tree_id, calculation)
+    hit = cache.get(tree_id, 1, 3)
+    rebind = cache.get(tree_id, 1, 4)
+    stale = cache.get(tree_id, 2, 4)
+
+    # Assert
+    assert miss == (None, None)
+    assert hit == (calculation, frozenset())
+    assert rebind == (calculation, None)
+    assert stale == (None, None)
+    assert len(cache) == 0
+
+
+def test_record_changes():
+    """[test_calculation_cache-002] 連続したデータ変更は変更ノードが蓄積され、連続しない変更・無効化では変更ノードが破棄されること。"""
+    # Arrange
+    cache = TreeCalculationCache(max_entries=2)
+    tree_id = uuid.uuid4()
+    other_tree_id = uuid.uuid4()
+    node_a, node_b = uuid.uuid4(), uuid.uuid4()
+    cache.put(tree_id, create_calculation(data_version=1))
+    cache.put(other_tree_id, create_calculation(data_version=1))
+
+    # Act
+    cache.record_changes(tree_id, 2, [node_a])
+    cache.record_changes(tree_id, 3, [node_b])
+    incremental = cache.get(tree_id, 0, 3)
+    cache.record_changes(other_tree_id, 3, [node_a])
+    skipped = cache.get(other_tree_id, 0, 3)
+    cache.put(tree_id, create_calculation(data_version=3))
+    cache.invalidate(tree_id)
+
+    # Assert
+    assert incremental[1] == frozenset({node_a, node_b})
+    assert skipped[1] is None
+    assert cache.get(tree_id, 0, 3) == (None, None)
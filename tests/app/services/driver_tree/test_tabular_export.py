@@ -0,0 +1,49 @@
+"""ドライバーツリーの表形式エクスポートのテスト。
+
+このテストファイルは、tabular_exportのCSV/Excelのストリーミング出力をテストします。
+"""
+
+import io
+
+import openpyxl
+import pytest
+
+from app.services.driver_tree import tabular_export
+from app.services.driver_tree.tabular_export import ExportSheet, stream_csv, stream_xlsx
+
+
+@pytest.mark.asyncio
+async def test_stream_csv_yields_chunks(monkeypatch):
+    """[test_tabular_export-001] CSVが行毎に書き出され、一定サイズ毎に分割して送出されること。"""
+    # Arrange
+    monkeypatch.setattr(tabular_export, "CHUNK_SIZE", 32)
+    rows = ((i, f"ラベル,{i}", None) for i in range(10))
+
+    # Act
+    chunks = [chunk async for chunk in stream_csv(["id", "label", "value"], rows)]
+
+    # Assert
+    assert len(chunks) > 1
+    lines = b"".join(chunks).decode("utf-8-sig").splitlines()
+    assert lines[0] == "id,label,value"
+    assert lines[1] == '0,"ラベル,0",'
+    assert len(lines) == 11
+
+
+@pytest.mark.asyncio
+async def test_stream_xlsx_writes_multiple_sheets():
+    """[test_tabular_export-002] 複数シートのExcelが出力され、シート名がExcelで使用できる名前に補正されること。"""
+    # Arrange
+    sheets = [
+        ExportSheet(title="売上/利益", columns=["FY", "値"], rows=(("2024", float(i)) for i in range(3))),
+        ExportSheet(title="売上/利益", columns=["FY", "値"], rows=iter([("2024", None)])),
+    ]
+
+    # Act
+    content = b"".join([chunk async for chunk in stream_xlsx(sheets)])
+
+    # Assert
+    workbook = openpyxl.load_workbook(io.BytesIO(content), read_only=True)
+    assert workbook.sheetnames == ["売上_利益", "売上_利益(2)"]
+    assert list(workbook["売上_利益"].values) == [("FY", "値"), ("2024", 0.0), ("2024", 1.0), ("2024", 2.0)]
+    assert list(workbook["売上_利益(2)"].values) == [("FY", "値"), ("2024", None)]
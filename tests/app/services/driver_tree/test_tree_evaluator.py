@@ -0,0 +1,197 @@
+"""ドライバーツリー計算エンジンのテスト。
+
+このテストファイルは、tree_evaluatorのコンパイル・評価・出力変換をテストします。
+"""
+
+import uuid
+
+import numpy as np
+import pytest
+
+from app.core.exceptions import ValidationError
+from app.models.driver_tree import (
+    DriverTreeDataFrame,
+    DriverTreeNode,
+    DriverTreeRelationship,
+    DriverTreeRelationshipChild,
+)
+from app.services.driver_tree.tree_evaluator import (
+    affected_steps,
+    bind_inputs,
+    bind_nodes,
+    build_rows,
+    compile_tree,
+    evaluate,
+    evaluate_scenarios,
+    rebind_nodes,
+    to_calculated_data,
+)
+
+
+def _node(label: str, node_type: str, data_frame: DriverTreeDataFrame | None = None) -> DriverTreeNode:
+    node = DriverTreeNode(id=uuid.uuid4(), label=label, node_type=node_type)
+    node.data_frame = data_frame
+    return node
+
+
+def _relationship(parent: DriverTreeNode, operator: str | None, children: list[DriverTreeNode]) -> DriverTreeRelationship:
+    relationship = DriverTreeRelationship(id=uuid.uuid4(), parent_node_id=parent.id, operator=operator)
+    # order_indexの逆順で追加し、order_index順に評価されることを確認する
+    relationship.children = [
+        DriverTreeRelationshipChild(child_node_id=child.id, order_index=i) for i, child in reversed(list(enumerate(children)))
+    ]
+    return relationship
+
+
+def test_evaluate_tree_over_metadata_rows():
+    """[test_tree_evaluator-001] 入力・定数・計算ノードがメタデータ行ごとに評価されること。"""
+    # Arrange
+    file_id = uuid.uuid4()
+    fy = DriverTreeDataFrame(driver_tree_file_id=file_id, column_name="FY", data={"0": "2024", "1": "2025", "2": "2026"})
+    subjects = {"単価": {"0": 100.0, "1": 120.0, "2": 150.0}, "数量": {"0": 10.0, "1": 0.0}}
+    price = _node("単価", "入力", DriverTreeDataFrame(driver_tree_file_id=file_id, column_name="科目", data=subjects))
+    quantity = _node("数量", "入力", DriverTreeDataFrame(driver_tree_file_id=file_id, column_name="科目", data=subjects))
+    cost = _node("30", "定数")
+    sales = _node("売上", "計算")
+    profit = _node("利益", "計算")
+    unit_sales = _node("数量あたり利益", "計算")
+    nodes = [price, quantity, cost, sales, profit, unit_sales]
+    relationships = [
+        _relationship(unit_sales, "/", [profit, quantity]),
+        _relationship(profit, "-", [sales, cost]),
+        _relationship(sales, "*", [price, quantity]),
+    ]
+
+    # Act
+    plan = compile_tree(nodes, relationships, profit.id)
+    rows = build_rows([fy], plan.inputs.values())
+    values = evaluate(plan, bind_inputs(plan, rows.count))
+    result = to_calculated_data(plan, rows, values)
+
+    # Assert
+    assert rows.count == 3
+    assert result[0]["node_id"] == profit.id
+    assert result[0]["columns"] == ["FY", "値"]
+    assert result[0]["records"] == [
+        {"FY": "2024", "値": 970.0},
+        {"FY": "2025", "値": -30.0},
+        {"FY": "2026", "値": None},
+    ]
+    by_label = {item["label"]: [record["値"] for record in item["records"]] for item in result}
+    assert by_label["30"] == [30.0, 30.0, 30.0]
+    # 0除算・データ欠損の行はNone
+    assert by_label["数量あたり利益"] == [97.0, None, None]
+
+
+def test_evaluate_tree_without_data():
+    """[test_tree_evaluator-002] データが紐づいていないツリーは1行で評価されること。"""
+    # Arrange
+    root = _node("合計", "計算")
+    left = _node("1.5", "定数")
+    right = _node("2", "定数")
+    missing = _node("未設定", "入力")
+    other = _node("欠損を含む合計", "計算")
+
+    # Act
+    plan = compile_tree(
+        [root, left, right, missing, other],
+        [_relationship(root, "+", [left, right]), _relationship(other, "+", [left, missing])],
+    )
+    rows = build_rows([], plan.inputs.values())
+    result = to_calculated_data(plan, rows, evaluate(plan, bind_inputs(plan, rows.count)))
+
+    # Assert
+    assert rows.count == 1
+    assert {item["label"]: item["records"] for item in result}["合計"] == [{"値": 3.5}]
+    assert {item["label"]: item["records"] for item in result}["欠損を含む合計"] == [{"値": None}]
+
+
+@pytest.mark.parametrize(
+    "error_type",
+    ["cycle", "invalid_constant", "invalid_operator", "unknown_node"],
+)
+def test_compile_tree_validation_errors(error_type: str):
+    """[test_tree_evaluator-003] 循環参照・不正な定数・不正な演算子・ツリー外のノードでValidationErrorになること。"""
+    # Arrange
+    a = _node("A", "計算")
+    b = _node("B", "計算")
+    c = _node("10", "定数")
+    nodes = [a, b, c]
+    if error_type == "cycle":
+        relationships = [_relationship(a, "+", [b, c]), _relationship(b, "+", [a])]
+    elif error_type == "invalid_constant":
+        c.label = "abc"
+        relationships = [_relationship(a, "+", [c])]
+    elif error_type == "invalid_operator":
+        relationships = [_relationship(a, "%", [b, c])]
+    else:
+        relationships = [_relationship(a, "+", [c, _node("X", "入力")])]
+
+    # Act & Assert
+    with pytest.raises(ValidationError):
+        compile_tree(nodes, relationships)
+
+
+def test_recalculate_changed_nodes():
+    """[test_tree_evaluator-004] 変更ノードとその祖先ノードのみ再計算した結果が全体の再計算と一致すること。"""
+    # Arrange
+    a = _node("2", "定数")
+    b = _node("3", "定数")
+    c = _node("4", "定数")
+    ab = _node("A+B", "計算")
+    bc = _node("B*C", "計算")
+    root = _node("合計", "計算")
+    nodes = [a, b, c, ab, bc, root]
+    relationships = [
+        _relationship(ab, "+", [a, b]),
+        _relationship(bc, "*", [b, c]),
+        _relationship(root, "-", [ab, bc]),
+    ]
+    plan = compile_tree(nodes, relationships, root.id)
+    values = evaluate(plan, bind_inputs(plan, 1))
+    c.label = "10"
+
+    # Act
+    updated = rebind_nodes(plan, [c])
+    indexes = [updated.index[c.id]]
+    steps = affected_steps(updated, indexes)
+    recalculated = evaluate(updated, bind_nodes(updated, values.copy(), indexes), steps)
+
+    # Assert
+    assert {plan.node_ids[step.node_index] for step in steps} == {bc.id, root.id}
+    assert values[plan.index[root.id], 0] == 5.0 - 12.0
+    assert recalculated[updated.index[root.id], 0] == 5.0 - 30.0
+    assert (recalculated == evaluate(updated, bind_inputs(updated, 1))).all()
+
+
+def test_evaluate_scenarios_matches_per_scenario_evaluation():
+    """[test_tree_evaluator-005] シナリオの一括評価の結果がシナリオ毎にノードの値を加算して評価した結果と一致すること。"""
+    # Arrange
+    a = _node("2", "定数")
+    b = _node("3", "定数")
+    c = _node("4", "定数")
+    ab = _node("A*B", "計算")
+    root = _node("合計", "計算")
+    relationships = [_relationship(ab, "*", [a, b]), _relationship(root, "+", [ab, c])]
+    plan = compile_tree([a, b, c, ab, root], relationships, root.id)
+    values = evaluate(plan, bind_inputs(plan, 1))
+    # 入力側の定数ノード（A）と計算ノード（A*B）への加算
+    target_indexes = [plan.index[a.id], plan.index[ab.id]]
+    deltas = np.array([[1.0, 0.0], [0.0, 10.0], [1.0, 10.0]])
+
+    # Act
+    result = evaluate_scenarios(plan, values, target_indexes, deltas, plan.root_index)
+
+    # Assert
+    expected = []
+    for a_delta, ab_delta in deltas:
+        scenario = values.copy()
+        scenario[plan.index[a.id]] += a_delta
+        scenario[plan.index[ab.id]] = scenario[plan.index[a.id]] * scenario[plan.index[b.id]] + ab_delta
+        scenario[plan.root_index] = scenario[plan.index[ab.id]] + scenario[plan.index[c.id]]
+        expected.append(scenario[plan.root_index])
+    assert result.shape == (3, 1)
+    assert result[:, 0].tolist() == [13.0, 20.0, 23.0]
+    assert (result == np.array(expected)).all()
+    # 元の計算結果は変更されないこと
+    assert values[plan.root_index, 0] == 10.0
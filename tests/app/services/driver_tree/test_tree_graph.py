@@ -0,0 +1,44 @@
+"""ドライバーツリーのグラフ索引のテスト。
+
+このテストファイルは、TreeGraphの部分木・循環参照の経路・階層の算出をテストします。
+"""
+
+import uuid
+
+from app.services.driver_tree.tree_graph import TreeGraph
+
+
+def test_subtree_and_levels():
+    """[test_tree_graph-001] 部分木が子ノードの順に重複なく返り、複数の親を持つノードは最も深い親の次の階層になること。"""
+    # Arrange
+    root, a, b, c, d = (uuid.uuid4() for _ in range(5))
+    edges = [(root, "+", a), (root, "+", b), (a, "*", c), (b, "-", a), (b, "-", d), (d, None, None)]
+
+    # Act
+    graph = TreeGraph.from_edges(edges)
+
+    # Assert
+    assert graph.children[d] == ()
+    assert graph.operators[b] == "-"
+    assert graph.node_ids() == [root, a, b, c, d]
+    assert graph.subtree(root) == [root, a, c, b, d]
+    assert graph.subtree(b) == [b, a, c, d]
+    assert graph.levels(root) == {root: 0, b: 1, a: 2, d: 2, c: 3}
+
+
+def test_find_cycle_and_levels_with_cycle():
+    """[test_tree_graph-002] 循環参照になる経路が検出され、循環に含まれるノードには階層が割り当てられないこと。"""
+    # Arrange
+    root, a, b, c = (uuid.uuid4() for _ in range(4))
+    graph = TreeGraph.from_edges([(root, "+", a), (a, "+", b)])
+    cyclic = TreeGraph.from_edges([(root, "+", a), (a, "+", b), (b, "+", a), (root, "+", c)])
+
+    # Act
+    path = graph.find_cycle(b, [root])
+    no_cycle = graph.find_cycle(a, [c])
+    levels = cyclic.levels(root)
+
+    # Assert
+    assert path == [root, a, b]
+    assert no_cycle is None
+    assert levels == {root: 0, c: 1}
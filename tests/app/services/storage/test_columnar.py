@@ -0,0 +1,89 @@
+"""カラムナ（Parquet）操作ユーティリティのテスト。
+
+columnar.pyの各関数を検証するテストです。
+"""
+
+from io import BytesIO
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from app.core.exceptions import ValidationError
+from app.services.storage.columnar import (
+    dataframe_to_parquet,
+    describe_schema,
+    parquet_to_dataframe,
+)
+
+
+def create_input_dataframe() -> pd.DataFrame:
+    """テスト用の分析入力データを作成します。"""
+    return pd.DataFrame(
+        {
+            "地域": ["日本", "アメリカ", "日本", "アメリカ"],
+            "科目": ["売上", "売上", "原価", "原価"],
+            "値": [1000.0, 1500.0, 400.0, 600.0],
+        }
+    )
+
+
+class TestParquetRoundTrip:
+    """dataframe_to_parquet/parquet_to_dataframe関数のテスト。"""
+
+    def test_round_trip_restores_original_values(self):
+        """[test_columnar-001] エンコード・デコードで元のDataFrameに戻ることを確認。"""
+        # Arrange
+        df = create_input_dataframe()
+
+        # Act
+        result = parquet_to_dataframe(dataframe_to_parquet(df, categorical_columns=["地域", "科目"]))
+
+        # Assert
+        pd.testing.assert_frame_equal(result, df)
+        assert result["地域"].dtype == object
+
+    def test_categorical_columns_are_dictionary_encoded(self):
+        """[test_columnar-002] 指定した列が辞書エンコードで保存されることを確認。"""
+        # Arrange
+        df = create_input_dataframe()
+
+        # Act
+        payload = dataframe_to_parquet(df, categorical_columns=["地域", "科目"])
+
+        # Assert
+        schema = pq.read_schema(BytesIO(payload))
+        assert str(schema.field("地域").type).startswith("dictionary")
+        assert str(schema.field("科目").type).startswith("dictionary")
+        assert schema.field("値").type == "double"
+
+    def test_encode_mixed_type_column_raises(self):
+        """[test_columnar-003] 型が混在する列はValidationErrorになることを確認。"""
+        # Arrange
+        df = pd.DataFrame({"科目": ["売上", "原価"], "値": [100, "abc"]})
+
+        # Act & Assert
+        with pytest.raises(ValidationError):
+            dataframe_to_parquet(df, categorical_columns=["科目"])
+
+    def test_decode_invalid_data_raises(self):
+        """[test_columnar-004] 不正なデータのデコードはValidationErrorになることを確認。"""
+        # Act & Assert
+        with pytest.raises(ValidationError):
+            parquet_to_dataframe(b"not a parquet file")
+
+
+class TestDescribeSchema:
+    """describe_schema関数のテスト。"""
+
+    def test_describe_schema(self):
+        """[test_columnar-005] 列名と型のリストを取得できることを確認。"""
+        # Act
+        result = describe_schema(create_input_dataframe())
+
+        # Assert
+        assert result == [
+            {"name": "地域", "dtype": "object"},
+            {"name": "科目", "dtype": "object"},
+            {"name": "値", "dtype": "float64"},
+        ]
@@ -3,6 +3,7 @@
 import asyncio
 import os
 from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
 from unittest.mock import AsyncMock, patch
 
 import pytest
@@ -10,6 +11,7 @@ from httpx import ASGITransport, AsyncClient
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
+from app.core.cache import cache_manager
 from app.core.config import settings
 from app.core.database import get_db
 from app.main import app
@@ -83,6 +85,17 @@ async def setup_test_database(event_loop, request):
     await drop_test_database()
 
 
+@pytest.fixture(autouse=True)
+def clear_local_cache():
+    """プロセス内キャッシュ（L1）をテスト毎に破棄します。
+
+    テーブルはテスト毎に作り直すため、前のテストの値が残らないようにします。
+    """
+    cache_manager.clear_local()
+    yield
+    cache_manager.clear_local()
+
+
 @pytest.fixture(scope="function")
 async def db_engine():
     """テスト用データベースエンジン。
@@ -172,7 +185,7 @@ def mock_analysis_agent():
 
     mock_agent = MagicMock()
 
-    def chat_side_effect(user_message):
+    def chat_side_effect(user_message, **kwargs):
         # userの発言を履歴に追加
         if not hasattr(mock_agent.state, "chat_history") or mock_agent.state.chat_history is None:
             mock_agent.state.chat_history = []
@@ -182,6 +195,7 @@ def mock_analysis_agent():
         return "分析を開始します。"
 
     mock_agent.chat.side_effect = chat_side_effect
+    mock_agent.achat = AsyncMock(side_effect=chat_side_effect)
 
     # デフォルトのchat_historyとall_stepsはstateにセットされる
     def agent_init(state):
@@ -212,12 +226,20 @@ async def client(db_session: AsyncSession, mock_storage_service) -> AsyncGenerat
         mock_storage_serviceは自動的にストレージサービスとして注入されます。
         テスト内でモックの戻り値を変更したい場合は、mock_storage_serviceフィクスチャを
         直接引数として受け取り、return_valueを変更してください。
+        チャットジョブもテスト用DBセッションで実行されます。
     """
+    from app.services.analysis.analysis_session.chat_job import chat_job_manager
 
     async def override_get_db():
         yield db_session
 
+    @asynccontextmanager
+    async def override_job_session():
+        yield db_session
+
     app.dependency_overrides[get_db] = override_get_db
+    original_session_factory = chat_job_manager.session_factory
+    chat_job_manager.session_factory = override_job_session
 
     # ストレージサービスをモック（統一パス: app.services.storage.get_storage_service）
     with patch(STORAGE_SERVICE_MOCK_PATH, return_value=mock_storage_service):
@@ -225,6 +247,7 @@ async def client(db_session: AsyncSession, mock_storage_service) -> AsyncGenerat
             yield test_client
 
     app.dependency_overrides.clear()
+    chat_job_manager.session_factory = original_session_factory
     # 非同期操作の完了を待機（Connection._cancel警告を防止）
     await asyncio.sleep(0.1)
 